@@ -14,6 +14,7 @@ define HELP_LOCAL
 
 	$(YELLOW)Native (uvicorn, hot reload — fastest dev loop):$(RESET)
 	make run$(RESET):           Run the API with uvicorn (requires `make install` first).
+	make serve$(RESET):         Run the API as the image does: pre-forked workers, WEB_CONCURRENCY of them (no reload).
 	make run-wip$(RESET) ($(GREEN)wip$(RESET)):     Run against a LOCAL pipelex checkout (editable overlay). Path: make run-wip PIPELEX_REPO=../_bridge
 
 	$(YELLOW)Docker (closest to what's deployed):$(RESET)
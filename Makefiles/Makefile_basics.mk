@@ -94,6 +94,11 @@ make docs-deploy              - Deploy documentation with mkdocs
 make openapi-export           - Export the FastAPI OpenAPI schema to docs/openapi/pipelex-api.openapi.yaml
 make openapi-check            - Fail if the committed OpenAPI artifact drifts from the app
 
+make bench-tools-cache        - Benchmark memoized lint/format against the bare engine
+make bench-completion-signature - Benchmark signing completion callbacks once per run against once per URL
+make bench-error-log          - Benchmark the error-log path: logfmt through the pipelex log against the JSON sink
+make check-import-time        - Fail if the startup import of api.main regresses (deferred modules, time budget)
+
 make agent-check              - Run check pipeline, silent on success (for AI agents)
 make agent-test               - Run unit tests, silent on success, output on failure (for AI agents)
 
@@ -116,8 +121,8 @@ export HELP
 	validate v check c cc \
 	merge-check-ruff-lint merge-check-ruff-format merge-check-mypy merge-check-pyright \
 	li check-unused-imports fix-unused-imports check-uv check-TODOs docs docs-check docs-deploy \
-	config-template cft \
-	openapi-export openapi-check \
+	config-template cft serve \
+	openapi-export openapi-check bench-tools-cache bench-completion-signature bench-error-log check-import-time \
 	test-count check-test-badge
 
 # `help` is owned by the root Makefile, which composes this $$HELP block with
@@ -397,6 +402,10 @@ run: env
 	$(call PRINT_TITLE,"Running API server with uvicorn")
 	$(VIRTUAL_ENV)/bin/uvicorn api.main:app --reload --log-level debug --port 8081
 
+serve: env
+	$(call PRINT_TITLE,"Running API server with pre-forked workers")
+	$(VENV_PYTHON) -m api.serve --port 8081
+
 ##########################################################################################
 ### MISCELLANEOUS
 ##########################################################################################
@@ -483,4 +492,21 @@ openapi-export: install
 
 openapi-check: install
 	$(call PRINT_TITLE,"Checking committed OpenAPI artifact against the app")
-	$(VENV_PYTHON) scripts/export_openapi.py --check $(OPENAPI_ARTIFACT)
\ No newline at end of file
+	$(VENV_PYTHON) scripts/export_openapi.py --check $(OPENAPI_ARTIFACT)
+
+bench-tools-cache: install
+	$(call PRINT_TITLE,"Benchmarking the lint/format result cache")
+	$(VENV_PYTHON) scripts/bench_tools_cache.py
+
+bench-completion-signature: install
+	$(call PRINT_TITLE,"Benchmarking completion callback signing")
+	$(VENV_PYTHON) scripts/bench_completion_signature.py
+
+bench-error-log: install
+	$(call PRINT_TITLE,"Benchmarking the error-log path")
+	$(VENV_PYTHON) scripts/bench_error_log.py
+
+
+check-import-time: install
+	$(call PRINT_TITLE,"Checking the startup import of api.main")
+	$(VENV_PYTHON) scripts/check_import_time.py
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""The sampled access log: one line per sampled request, with its latency, sizes, caller and cost.
+
+Only failures were logged (`emit_error_log`), so a successful request left no trace of how long
+it took, how big it was, whose it was or what it ran — nothing to find the expensive tenants and
+methods by. `AccessLogMiddleware` wraps the app (`api.main`) and, for a sample of requests, logs:
+
+- **The request.** `request_id`, `method`, `route` (the matched path template, e.g.
+  `/v1/execute`), `status`, `duration_ms`, and `request_bytes` / `response_bytes` as they crossed
+  the ASGI boundary.
+- **The caller and the method.** `user_id`, `pipe_code` and `pipeline_run_id`, read from the
+  request the way the error log reads them (`request_correlation_fields`).
+- **Its cost.** `cpu_ms` is the process CPU time (user + system, as `getrusage` counts it) spent
+  while the request was in flight, and `max_rss_growth_kib` how far the process's peak resident
+  memory rose meanwhile. Both are process-wide — a lane thread's library load is counted, and
+  so is any concurrent request's work — so each line also carries `concurrent`, the most other
+  requests that were in flight alongside it: at `0`, the figures are this request's alone.
+  `tracemalloc` would attribute allocations more finely, but it slows every allocation in the
+  process while tracing and keeps a single process-wide peak that concurrent requests would
+  reset under each other.
+
+Sampling is per route: `ACCESS_LOG_SAMPLE_RATE` (from `0`, the default, which turns the access
+log off, to `1`, every request) applies to every route, and `ACCESS_LOG_ROUTE_SAMPLE_RATES`
+overrides it per path template — `/v1/execute=1,/v1/lint=0.01` logs every run and one lint in
+a hundred. A sampled line records the `sample_rate` it was drawn at, so counts scale back up.
+Both are resolved once at startup (`api.main`), and an invalid value fails the boot, like the
+other logging settings. Lines go through `emit_log` at `info`, so they follow
+`ERROR_LOG_FORMAT` — under `json`, they are written off the request path (`api.log_sink`).
+
+While the access log is on, every request — sampled or not — is also observed in
+`http_request_seconds{route}` and `http_request_cpu_seconds{route}` in `api.metrics`.
+"""
+
+from __future__ import annotations
+
+import random
+import resource
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from fastapi import Request
+from pipelex.system.environment import get_optional_env
+
+from api.exception_handlers import emit_log, request_correlation_fields
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ACCESS_LOG_SAMPLE_RATE_ENV_VAR = "ACCESS_LOG_SAMPLE_RATE"
+ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR = "ACCESS_LOG_ROUTE_SAMPLE_RATES"
+
+# The `route` of a request no route matched (a 404, a CORS preflight answered by the middleware).
+UNMATCHED_ROUTE = "unmatched"
+
+
+class InvalidAccessLogConfigError(ValueError):
+    """Raised at startup when `ACCESS_LOG_SAMPLE_RATE` or `ACCESS_LOG_ROUTE_SAMPLE_RATES` is malformed."""
+
+
+@dataclass(frozen=True)
+class AccessLogSampling:
+    """The share of requests logged, by route."""
+
+    default_rate: float = 0.0
+    route_rates: dict[str, float] = field(default_factory=dict[str, float])
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_rate > 0 or any(rate > 0 for rate in self.route_rates.values())
+
+    def rate_for(self, route: str) -> float:
+        return self.route_rates.get(route, self.default_rate)
+
+
+def _parse_rate(raw: str, *, source: str) -> float:
+    try:
+        rate = float(raw)
+    except ValueError:
+        rate = -1.0
+    if not 0 <= rate <= 1:
+        msg = f"{source}: {raw.strip()!r} is not a sample rate. Use a number from 0 (never) to 1 (every request)."
+        raise InvalidAccessLogConfigError(msg)
+    return rate
+
+
+def resolve_access_log_sampling() -> AccessLogSampling:
+    """Resolve `ACCESS_LOG_SAMPLE_RATE` and `ACCESS_LOG_ROUTE_SAMPLE_RATES` to an `AccessLogSampling`.
+
+    Both unset (or blank) turn the access log off. The route list is comma-separated
+    `<path template>=<rate>` pairs. Raises `InvalidAccessLogConfigError` for a rate outside
+    `[0, 1]`, or a pair without a `=`.
+    """
+    raw_default = (get_optional_env(ACCESS_LOG_SAMPLE_RATE_ENV_VAR) or "").strip()
+    default_rate = _parse_rate(raw_default, source=ACCESS_LOG_SAMPLE_RATE_ENV_VAR) if raw_default else 0.0
+    route_rates: dict[str, float] = {}
+    for pair in (get_optional_env(ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR) or "").split(","):
+        if not pair.strip():
+            continue
+        route, separator, raw_rate = pair.partition("=")
+        if not separator or not route.strip():
+            msg = f"{ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR}: {pair.strip()!r} is not a `<route>=<rate>` pair."
+            raise InvalidAccessLogConfigError(msg)
+        route_rates[route.strip()] = _parse_rate(raw_rate, source=f"{ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR} ({route.strip()})")
+    return AccessLogSampling(default_rate=default_rate, route_rates=route_rates)
+
+
+def _max_rss_kib() -> int:
+    # Linux reports `ru_maxrss` in KiB.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class _Accounting:
+    """What one request in flight has measured so far."""
+
+    __slots__ = ("concurrent", "cpu_started", "max_rss_started", "request_bytes", "response_bytes", "started", "status")
+
+    def __init__(self, *, concurrent: int) -> None:
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self.max_rss_started = _max_rss_kib()
+        self.concurrent = concurrent
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status: int | None = None
+
+
+class AccessLogMiddleware:
+    """Pure-ASGI middleware that measures each HTTP request and logs a sample of them.
+
+    Wrapped around the whole FastAPI app in `api.main`, inside `RequestIdMiddleware` (so the
+    request id is bound) and outside Starlette's `ServerErrorMiddleware` (so the catch-all 500
+    is measured too). With sampling off it passes every request straight through.
+    """
+
+    def __init__(self, app: ASGIApp, *, sampling: AccessLogSampling) -> None:
+        self.app = app
+        self._sampling = sampling
+        self._in_flight: set[_Accounting] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._sampling.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        # Every request already in flight now has one more alongside it.
+        for other in self._in_flight:
+            other.concurrent = max(other.concurrent, len(self._in_flight))
+        accounting = _Accounting(concurrent=len(self._in_flight))
+        self._in_flight.add(accounting)
+
+        async def counting_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                accounting.request_bytes += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                accounting.status = message["status"]
+            elif message["type"] == "http.response.body":
+                accounting.response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            self._in_flight.discard(accounting)
+            self._record(scope, accounting)
+
+    def _record(self, scope: Scope, accounting: _Accounting) -> None:
+        duration = time.perf_counter() - accounting.started
+        cpu = time.process_time() - accounting.cpu_started
+        matched = scope.get("route")
+        route = getattr(matched, "path", None) or UNMATCHED_ROUTE
+        METRICS.observe("http_request_seconds", duration, route=route)
+        METRICS.observe("http_request_cpu_seconds", cpu, route=route)
+        rate = self._sampling.rate_for(route)
+        if rate <= 0 or random.random() >= rate:  # noqa: S311 — sampling, not a secret
+            return
+        emit_log(
+            fields={
+                "event": "access",
+                "request_id": scope.get("state", {}).get("request_id"),
+                "method": scope["method"],
+                "route": route,
+                "status": accounting.status,
+                "duration_ms": round(duration * 1000, 3),
+                "request_bytes": accounting.request_bytes,
+                "response_bytes": accounting.response_bytes,
+                **request_correlation_fields(Request(scope)),
+                "cpu_ms": round(cpu * 1000, 3),
+                "max_rss_growth_kib": _max_rss_kib() - accounting.max_rss_started,
+                "concurrent": accounting.concurrent,
+                "sample_rate": rate,
+            },
+            level="info",
+        )
@@ -0,0 +1,233 @@
+"""Per-caller API keys for `AUTH_MODE=api_key`: a registry of salted key hashes, and quota tiers.
+
+`API_KEY` is one key shared by every caller: no caller has an identity, so every run lands in
+the single-tenant namespace. `API_KEYS_FILE` names a TOML registry instead. Each entry maps one
+key to a `user_id`, the storage namespace its runs write to, and optionally to a quota tier:
+
+    [tiers.standard]
+    requests_per_minute = 600
+
+    [[keys]]
+    prefix = "plx_3f9a1c2b"    # the key's first 12 characters, not secret
+    salt = "9c1e…"             # hex, random per key
+    sha256 = "4b7d…"           # hex digest of salt + key
+    user_id = "team-analytics"
+    tier = "standard"          # optional; no tier, no limit
+
+The file holds no key, only hashes: `scripts/mint_api_key.py` mints a key and prints its entry.
+A presented key is looked up by its prefix (one dict lookup, however many keys there are), then
+verified by hashing it with that entry's salt and comparing the digests in constant time. A
+single SHA-256 is enough here, unlike for passwords: a minted key carries 256 random bits, so
+there is nothing for a slow hash to protect against guessing.
+
+A key with a tier is admitted through a token bucket of `requests_per_minute` capacity that
+refills continuously (`QuotaLimiter`). A caller past its rate is refused with a 429 and a
+`Retry-After`, until the bucket refills. Buckets live in process memory, so under `api.serve` each
+of the `workers` processes holds its own and admits its share of the rate: the tier is the
+server-wide total as long as the kernel spreads a caller's connections across the workers.
+"""
+
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+API_KEY_PREFIX_LEN = 12
+_MINTED_KEY_TAG = "plx_"
+_SALT_BYTES = 16
+
+
+class InvalidApiKeyRegistryError(ValueError):
+    """Raised when `API_KEYS_FILE` cannot be read or does not describe a valid registry."""
+
+
+@dataclass(frozen=True)
+class QuotaTier:
+    """A named request rate shared by the keys that reference it (each key has its own bucket)."""
+
+    name: str
+    requests_per_minute: int
+
+
+@dataclass(frozen=True)
+class ApiKeyRecord:
+    """One registered key: how to recognize it, and who presents it."""
+
+    prefix: str
+    salt: bytes
+    digest: bytes
+    user_id: str
+    tier: QuotaTier | None = None
+
+
+def hash_api_key(key: str, salt: bytes) -> bytes:
+    """The digest stored for `key` under `salt`."""
+    return hashlib.sha256(salt + key.encode()).digest()
+
+
+def mint_api_key() -> tuple[str, str]:
+    """A new random key and its registry prefix."""
+    key = f"{_MINTED_KEY_TAG}{secrets.token_hex(4)}{secrets.token_urlsafe(32)}"
+    return key, key[:API_KEY_PREFIX_LEN]
+
+
+def mint_api_key_entry(*, user_id: str, tier: str | None = None) -> tuple[str, str]:
+    """A new key, and the `[[keys]]` TOML entry that registers it. The key itself is not in the entry."""
+    key, prefix = mint_api_key()
+    salt = secrets.token_bytes(_SALT_BYTES)
+    lines = [
+        "[[keys]]",
+        f'prefix = "{prefix}"',
+        f'salt = "{salt.hex()}"',
+        f'sha256 = "{hash_api_key(key, salt).hex()}"',
+        # JSON string escapes are valid TOML basic-string escapes.
+        f"user_id = {json.dumps(user_id)}",
+    ]
+    if tier is not None:
+        lines.append(f"tier = {json.dumps(tier)}")
+    return key, "\n".join(lines) + "\n"
+
+
+class ApiKeyRegistry:
+    """The registered keys, by prefix."""
+
+    def __init__(self, records: list[ApiKeyRecord]) -> None:
+        self._by_prefix: dict[str, ApiKeyRecord] = {}
+        for record in records:
+            if len(record.prefix) != API_KEY_PREFIX_LEN:
+                msg = f"API key prefix {record.prefix!r} must be exactly {API_KEY_PREFIX_LEN} characters"
+                raise InvalidApiKeyRegistryError(msg)
+            if record.prefix in self._by_prefix:
+                msg = f"API key prefix {record.prefix!r} is registered twice"
+                raise InvalidApiKeyRegistryError(msg)
+            self._by_prefix[record.prefix] = record
+
+    def __len__(self) -> int:
+        return len(self._by_prefix)
+
+    @property
+    def records(self) -> list[ApiKeyRecord]:
+        return list(self._by_prefix.values())
+
+    def verify(self, key: str) -> ApiKeyRecord | None:
+        """The record `key` matches, or None. The digests are compared in constant time."""
+        record = self._by_prefix.get(key[:API_KEY_PREFIX_LEN])
+        if record is None:
+            return None
+        return record if hmac.compare_digest(hash_api_key(key, record.salt), record.digest) else None
+
+    @classmethod
+    def load(cls, path: Path) -> "ApiKeyRegistry":
+        """Read the registry at `path`, raising `InvalidApiKeyRegistryError` on any malformed entry."""
+        try:
+            document = tomllib.loads(path.read_text())
+        except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError) as exc:
+            msg = f"Cannot read the API key registry {path}: {exc}"
+            raise InvalidApiKeyRegistryError(msg) from exc
+        tiers = {name: _parse_tier(name, raw) for name, raw in _table(document, "tiers").items()}
+        raw_keys = document.get("keys", [])
+        if not isinstance(raw_keys, list):
+            msg = f"{path}: `keys` must be an array of tables ([[keys]])"
+            raise InvalidApiKeyRegistryError(msg)
+        return cls([_parse_record(index, raw, tiers) for index, raw in enumerate(cast("list[Any]", raw_keys))])
+
+
+def _table(document: dict[str, Any], name: str) -> dict[str, Any]:
+    table = document.get(name, {})
+    if not isinstance(table, dict):
+        msg = f"`{name}` must be a table"
+        raise InvalidApiKeyRegistryError(msg)
+    return cast("dict[str, Any]", table)
+
+
+def _parse_tier(name: str, raw: object) -> QuotaTier:
+    requests_per_minute = cast("dict[str, Any]", raw).get("requests_per_minute") if isinstance(raw, dict) else None
+    if not isinstance(requests_per_minute, int) or isinstance(requests_per_minute, bool) or requests_per_minute <= 0:
+        msg = f"Quota tier {name!r} needs a positive integer `requests_per_minute`"
+        raise InvalidApiKeyRegistryError(msg)
+    return QuotaTier(name=name, requests_per_minute=requests_per_minute)
+
+
+def _parse_record(index: int, raw: object, tiers: dict[str, QuotaTier]) -> ApiKeyRecord:
+    if not isinstance(raw, dict):
+        msg = f"keys[{index}] must be a table"
+        raise InvalidApiKeyRegistryError(msg)
+    entry = cast("dict[str, Any]", raw)
+    fields: dict[str, str] = {}
+    for field in ("prefix", "salt", "sha256", "user_id"):
+        value = entry.get(field)
+        if not isinstance(value, str) or not value:
+            msg = f"keys[{index}] needs a non-empty string `{field}`"
+            raise InvalidApiKeyRegistryError(msg)
+        fields[field] = value
+    try:
+        salt, digest = bytes.fromhex(fields["salt"]), bytes.fromhex(fields["sha256"])
+    except ValueError as exc:
+        msg = f"keys[{index}]: `salt` and `sha256` must be hex"
+        raise InvalidApiKeyRegistryError(msg) from exc
+    if len(digest) != hashlib.sha256().digest_size:
+        msg = f"keys[{index}]: `sha256` must be a SHA-256 digest"
+        raise InvalidApiKeyRegistryError(msg)
+    tier: QuotaTier | None = None
+    tier_name = entry.get("tier")
+    if tier_name is not None:
+        if not isinstance(tier_name, str) or tier_name not in tiers:
+            msg = f"keys[{index}] names an undefined quota tier {tier_name!r}"
+            raise InvalidApiKeyRegistryError(msg)
+        tier = tiers[tier_name]
+    return ApiKeyRecord(prefix=fields["prefix"], salt=salt, digest=digest, user_id=fields["user_id"], tier=tier)
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    refilled_at: float
+
+
+class QuotaLimiter:
+    """One token bucket per key with a tier, holding up to a minute's worth of this process's share of its rate.
+
+    `workers` is the number of processes serving side by side, each with its own limiter: a
+    bucket refills at `requests_per_minute / workers`, so together they admit the tier's rate.
+    A bucket always holds at least one request, so a tier slower than one request per worker per
+    minute still admits, at up to `workers` requests a minute in aggregate.
+    """
+
+    def __init__(self, *, workers: int = 1) -> None:
+        self.workers = workers
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, record: ApiKeyRecord) -> float | None:
+        """Spend one request of `record`'s tier. Returns None when admitted, else the seconds until it would be."""
+        if record.tier is None:
+            return None
+        share_per_minute = record.tier.requests_per_minute / self.workers
+        capacity = max(1.0, share_per_minute)
+        refill_per_second = share_per_minute / 60
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.prefix)
+            if bucket is None:
+                bucket = self._buckets[record.prefix] = _Bucket(tokens=capacity, refilled_at=now)
+            # Capped at the current tier's capacity: a key moved to a smaller tier by a reload
+            # does not keep the larger burst it had saved up.
+            bucket.tokens = min(capacity, bucket.tokens + (now - bucket.refilled_at) * refill_per_second)
+            bucket.refilled_at = now
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return None
+            return (1 - bucket.tokens) / refill_per_second
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+API_KEY_QUOTAS = QuotaLimiter()
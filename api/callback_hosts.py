@@ -0,0 +1,116 @@
+"""Callback host resolution: `/start` vets where a callback URL resolves, off the event loop and cached.
+
+`PipelineApiExtras` checks a callback URL's host as written: a literal private IP or a known
+internal name is refused, but `https://attacker.example/cb` passes and may resolve to
+`169.254.169.254`. `CALLBACK_HOST_RESOLVER` closes that gap:
+
+- **Resolved at `/start`.** Each callback host is resolved, and `/start` refuses with a 422
+  (`InvalidCallbackUrls`) a host that resolves to any private, loopback or metadata address —
+  a mixed answer included, since it is a rebinding signal. A host whose lookup fails or times
+  out is a 503 (`CallbackHostUnresolved`), which the caller may retry.
+  The rule is pipelex's (`pipelex.tools.network.host_rules`), the one its delivery guard applies.
+- **Off the event loop.** The lookup is `loop.getaddrinfo`, which runs the blocking resolver in
+  the default executor, bounded by `CALLBACK_DNS_TIMEOUT_MS`. Concurrent lookups of one host
+  share a single resolution, its failure included.
+- **Cached.** The vetted addresses of a host — or its refusal — are kept for
+  `CALLBACK_DNS_CACHE_SECONDS`, bounded by `CALLBACK_DNS_CACHE_KIB`, so a burst of runs calling
+  back to the same receiver resolves it once. A lookup that failed is not cached. The cache
+  and its single flight are `api.lru_cache.SingleFlightCache`.
+- **Not pinned.** Delivery is pipelex's `DeliveryExecutor`, which takes no transport, so the
+  callback is not dialed at the vetted address: the delivering process resolves the host again,
+  and pipelex's connect-time SSRF guard refuses a private answer then. This check turns the
+  common case — a host that is internal at `/start` — into a 422 instead of a failed delivery.
+
+Every lookup is counted in `callback_host_lookups_total{outcome}` (`cached`, `coalesced`,
+`resolved`, `blocked`, `unresolvable`), and each resolution observed in
+`callback_host_resolve_seconds`, in `api.metrics`.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from dataclasses import dataclass
+
+import httpcore
+from pipelex.tools.network.exceptions import SsrfBlockedError
+from pipelex.tools.network.ssrf_guard import resolve_to_allowed_ips
+
+from api.limits import CALLBACK_DNS_CACHE_BYTES, CALLBACK_DNS_CACHE_SECONDS, CALLBACK_DNS_TIMEOUT_SECONDS
+from api.lru_cache import SingleFlightCache
+from api.metrics import METRICS
+
+# Per-entry overhead on top of the host name and its addresses: the key tuple, the expiry.
+_RESOLUTION_OVERHEAD_BYTES = 128
+
+
+@dataclass(frozen=True)
+class _Resolution:
+    host: str
+    addresses: tuple[str, ...] = ()
+    refusal: str | None = None
+    failure: httpcore.ConnectError | httpcore.ConnectTimeout | None = None
+
+    def vetted(self) -> list[str]:
+        if self.failure is not None:
+            raise self.failure
+        if self.refusal is not None:
+            raise SsrfBlockedError(self.refusal)
+        return list(self.addresses)
+
+    def size(self) -> int | None:
+        if self.failure is not None:
+            # Shared with the lookups waiting on it, but not cached.
+            return None
+        return len(self.host) + sum(len(address) for address in self.addresses) + len(self.refusal or "") + _RESOLUTION_OVERHEAD_BYTES
+
+
+class CallbackHostResolver:
+    """Vetted addresses of callback hosts, resolved off the event loop and cached for a TTL."""
+
+    def __init__(self, *, ttl_seconds: float, timeout_seconds: float, max_bytes: int) -> None:
+        self._timeout_seconds = timeout_seconds
+        self._resolutions: SingleFlightCache[tuple[str, int], _Resolution] = SingleFlightCache(
+            "callback_dns", ttl_seconds=ttl_seconds, max_bytes=max_bytes
+        )
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """Every address `host` resolves to, each one vetted, for a connection to `port`.
+
+        Raises `SsrfBlockedError` when the host is an internal name or resolves to any disallowed
+        address, and `httpcore.ConnectError` / `httpcore.ConnectTimeout` when it does not resolve
+        in time.
+        """
+        key = (host.rstrip(".").lower(), port)
+        resolution, outcome = await self._resolutions.run(key, functools.partial(self._lookup, key), size=_Resolution.size)
+        if outcome != "computed":
+            METRICS.increment("callback_host_lookups_total", outcome=outcome)
+        return resolution.vetted()
+
+    async def _lookup(self, key: tuple[str, int]) -> _Resolution:
+        host, port = key
+        started = time.perf_counter()
+        try:
+            addresses = await resolve_to_allowed_ips(host, port=port, timeout=self._timeout_seconds)
+        except SsrfBlockedError as exc:
+            METRICS.increment("callback_host_lookups_total", outcome="blocked")
+            return _Resolution(host=host, refusal=str(exc))
+        except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+            METRICS.increment("callback_host_lookups_total", outcome="unresolvable")
+            return _Resolution(host=host, failure=exc)
+        else:
+            METRICS.increment("callback_host_lookups_total", outcome="resolved")
+            return _Resolution(host=host, addresses=tuple(addresses))
+        finally:
+            METRICS.observe("callback_host_resolve_seconds", time.perf_counter() - started)
+
+    def clear(self) -> None:
+        """Forget every cached resolution (a test reset)."""
+        self._resolutions.clear()
+
+
+CALLBACK_HOST_RESOLVER = CallbackHostResolver(
+    ttl_seconds=CALLBACK_DNS_CACHE_SECONDS,
+    timeout_seconds=CALLBACK_DNS_TIMEOUT_SECONDS,
+    max_bytes=CALLBACK_DNS_CACHE_BYTES,
+)
@@ -0,0 +1,117 @@
+"""Deadline and client-disconnect cancellation for long-running route work.
+
+A synchronous `/execute` run holds a loaded library, a materialized bundle temp
+dir, and a worker slot for as long as it runs. Without a bound, a run that
+hangs — or one whose caller has already hung up — keeps all three until it
+finishes for nobody. `run_cancellable` races the work against two stop
+conditions and cancels the work task on whichever fires first:
+
+- **deadline** — the run outlived `timeout_seconds` → 504 `RunDeadlineExceeded`.
+- **disconnect** — the ASGI server reported `http.disconnect` → 499 `ClientClosedRequest`.
+
+Cancellation is a real `Task.cancel()`: the `CancelledError` unwinds through
+the runner's own `finally` blocks (library teardown, pipeline-manager cleanup),
+and the helper awaits that unwinding BEFORE it raises, so by the time the
+route's `_bundle_run_source` context exits, the run has released everything it
+held. Each cancellation is logged (`event=run_cancelled`) and counted
+(`runs_cancelled_total{reason=…}` in `api.metrics`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from enum import StrEnum
+from typing import TYPE_CHECKING, TypeVar
+
+from api.errors import raise_client_closed_request, raise_gateway_timeout
+from api.exception_handlers import emit_error_log, request_correlation_fields
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from typing import Any
+
+    from fastapi import Request
+
+_T = TypeVar("_T")
+
+# How often the disconnect watcher polls the ASGI receive channel. `Request.is_disconnected`
+# is a non-blocking peek, so polling is cheap; a second is well under any realistic run length.
+DISCONNECT_POLL_INTERVAL_SECONDS = 1.0
+
+
+class CancellationReason(StrEnum):
+    DEADLINE = "deadline"
+    CLIENT_DISCONNECT = "client_disconnect"
+
+
+async def _wait_for_disconnect(request: Request, *, poll_interval: float) -> None:
+    """Return once the client has disconnected; never returns while it is still connected.
+
+    Polled rather than event-driven: ASGI surfaces a disconnect only as a `receive()` message,
+    and the route has already consumed the body, so nothing else is reading that channel.
+    """
+    while not await request.is_disconnected():  # noqa: ASYNC110 — no event to wait on, see above
+        await asyncio.sleep(poll_interval)
+
+
+def _record_cancellation(request: Request, *, reason: CancellationReason, timeout_seconds: float, elapsed_seconds: float) -> None:
+    METRICS.increment("runs_cancelled_total", reason=reason)
+    emit_error_log(
+        fields={
+            "event": "run_cancelled",
+            "reason": reason,
+            "timeout_seconds": timeout_seconds,
+            "elapsed_ms": round(elapsed_seconds * 1000),
+            **request_correlation_fields(request),
+        },
+        as_error=False,
+    )
+
+
+async def run_cancellable(
+    request: Request,
+    work: Coroutine[Any, Any, _T],
+    *,
+    timeout_seconds: float,
+    poll_interval: float = DISCONNECT_POLL_INTERVAL_SECONDS,
+) -> _T:
+    """Await `work`, cancelling it at `timeout_seconds` or when the client disconnects.
+
+    Returns `work`'s result, or re-raises its exception, when it finishes first.
+    Otherwise the work task is cancelled and awaited to completion of its cleanup,
+    then a 504 (deadline) or 499 (disconnect) `ApiError` is raised. If the route
+    itself is cancelled (server shutdown), the work task is cancelled with it and the
+    cancellation propagates — also while the work is unwinding from a deadline or disconnect.
+    """
+    started = time.monotonic()
+    work_task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request, poll_interval=poll_interval))
+    try:
+        done, _ = await asyncio.wait({work_task, watcher}, timeout=timeout_seconds, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        work_task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+    if work_task in done:
+        return work_task.result()
+
+    reason = CancellationReason.CLIENT_DISCONNECT if watcher in done else CancellationReason.DEADLINE
+    work_task.cancel()
+    # Wait for the run to unwind (library teardown, run deregistration) before the caller's
+    # context managers release the bundle dir underneath it. `asyncio.wait` does not raise the
+    # work task's own cancellation, so a `CancelledError` aimed at this handler (server shutdown,
+    # an outer timeout) still propagates from here.
+    await asyncio.wait({work_task})
+    if not work_task.cancelled():
+        # A failure raised while unwinding is superseded by the cancellation we are about to report.
+        work_task.exception()
+    current_task = asyncio.current_task()
+    if current_task is not None and current_task.cancelling():
+        raise asyncio.CancelledError
+    _record_cancellation(request, reason=reason, timeout_seconds=timeout_seconds, elapsed_seconds=time.monotonic() - started)
+    if reason == CancellationReason.CLIENT_DISCONNECT:
+        raise_client_closed_request("The client disconnected before the run finished; the run was cancelled.")
+    raise_gateway_timeout(f"The run did not finish within its {timeout_seconds:g}s deadline and was cancelled.")
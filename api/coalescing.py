@@ -0,0 +1,72 @@
+"""Request coalescing: identical concurrent `/validate`, `/resolve` and `/build/inputs` calls share one verdict.
+
+When a team opens the same method in the app, every client sends the same body to the same
+diagnostic routes within milliseconds, and each call loads the whole library again. Those routes
+are pure functions of their body, so `COALESCER` runs one of them and hands its response to the
+rest:
+
+- **Keyed on the canonical request.** The key is the route plus a digest of the validated request
+  model dumped to JSON with sorted keys, so two bodies that differ only in whitespace or key
+  order — dict fields included — coalesce.
+- **Single flight.** While a computation runs, an identical request waits for it instead of
+  starting another (`api.lru_cache.SingleFlight`). The routes load the library on their lane's
+  threads, so a burst is in flight together. Nothing is kept once the computation is done, so
+  nothing is held long enough to go stale.
+- **Only verdicts are shared.** A `2xx` response is shared, headers and all; an error is not, and
+  each waiting request then computes for itself.
+
+`request_coalescing_total{route, outcome}` in `api.metrics` counts, per route, the requests that
+`computed` and the ones that were `shared` a response — the load taken off the library loader.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from fastapi.responses import Response
+
+from api.lru_cache import SingleFlight
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from pydantic import BaseModel
+
+
+def _is_verdict(response: Response) -> bool:
+    return response.status_code < HTTPStatus.MULTIPLE_CHOICES
+
+
+def _copy(response: Response) -> Response:
+    copy = Response(content=bytes(response.body), status_code=response.status_code)
+    copy.raw_headers = list(response.raw_headers)
+    return copy
+
+
+class RequestCoalescer:
+    """One computation per distinct request in flight, its response shared with identical requests."""
+
+    def __init__(self) -> None:
+        self._flights: SingleFlight[bytes, Response] = SingleFlight()
+
+    async def run(self, route: str, request_data: BaseModel, compute: Callable[[], Awaitable[Response]]) -> Response:
+        """`compute()`'s response, or the one an identical `route` request in flight produced."""
+        canonical = json.dumps(request_data.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        key = hashlib.sha256(f"{route}\0{canonical}".encode()).digest()
+
+        async def counted() -> Response:
+            METRICS.increment("request_coalescing_total", route=route, outcome="computed")
+            return await compute()
+
+        response, outcome = await self._flights.run(key, counted, share=_is_verdict)
+        if outcome == "computed":
+            return response
+        METRICS.increment("request_coalescing_total", route=route, outcome="shared")
+        return _copy(response)
+
+
+COALESCER = RequestCoalescer()
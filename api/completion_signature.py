@@ -0,0 +1,58 @@
+"""Completion callback signatures: how a receiver knows a `/start` callback came from this server.
+
+Every callback of a run carries **`X-Completion-Signature: <hex>`**, `HMAC-SHA256(
+COMPLETION_CALLBACK_SECRET, pipeline_run_id)`. It depends only on the run, so `/start` computes it
+once (`CompletionSigner.headers`) and all of the run's `callback_urls` share it. The process that
+delivers the callback is pipelex's `DeliveryExecutor`, which posts the headers it was handed at
+`/start` unchanged and offers no hook to sign at send time — so the signature covers neither the
+body nor a send time, and a receiver dedupes on `pipeline_run_id`.
+
+The secret is read from the environment and keyed once (`COMPLETION_SIGNER.load()`, at boot, and
+again on `SIGHUP`), not per callback. It is not required to boot: `/start` with `callback_urls` and
+no `COMPLETION_CALLBACK_SECRET` raises the same `EnvVarNotFoundError` (a 500) the per-call read did.
+"""
+
+import hashlib
+import hmac
+
+from pipelex.system.environment import get_optional_env
+from pipelex.system.exceptions import EnvVarNotFoundError
+
+COMPLETION_CALLBACK_SECRET_ENV_VAR = "COMPLETION_CALLBACK_SECRET"
+
+SIGNATURE_HEADER = "X-Completion-Signature"
+
+
+class CompletionSigner:
+    """The callback secret, read and keyed once, and the header it signs."""
+
+    def __init__(self) -> None:
+        self._keyed: hmac.HMAC | None = None
+        self._loaded = False
+
+    def load(self) -> None:
+        """(Re-)read the secret from the environment. Optional until a callback is signed."""
+        secret = get_optional_env(COMPLETION_CALLBACK_SECRET_ENV_VAR)
+        self._keyed = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256) if secret else None
+        self._loaded = True
+
+    @property
+    def configured(self) -> bool:
+        """Whether the secret is set, so callbacks can be signed."""
+        if not self._loaded:
+            # Never loaded (an in-process app without its lifespan): load on first use instead.
+            self.load()
+        return self._keyed is not None
+
+    def headers(self, pipeline_run_id: str) -> dict[str, str]:
+        """The `X-Completion-Signature` header every callback of `pipeline_run_id` carries."""
+        if not self.configured or self._keyed is None:
+            msg = f"Environment variable '{COMPLETION_CALLBACK_SECRET_ENV_VAR}' is required but not set"
+            raise EnvVarNotFoundError(msg)
+        # A copy of the HMAC keyed at load: the key schedule is paid once, not per run.
+        signature = self._keyed.copy()
+        signature.update(pipeline_run_id.encode("utf-8"))
+        return {SIGNATURE_HEADER: signature.hexdigest()}
+
+
+COMPLETION_SIGNER = CompletionSigner()
@@ -24,6 +24,15 @@ class ErrorType(StrEnum):
     INVALID_TOKEN = "InvalidToken"
     TOKEN_EXPIRED = "TokenExpired"
     SERVER_MISCONFIGURED = "ServerMisconfigured"
+    # A registered API key (`API_KEYS_FILE`) spent its quota tier's request rate: a 429 with
+    # `Retry-After`, until its bucket refills.
+    RATE_LIMITED = "RateLimited"
+    # A priority lane (`api.lanes`) shed the request: its queue was full, or no slot freed up
+    # before the lane's queue deadline. A 503 with `Retry-After` — the request itself was fine.
+    LANE_OVERLOADED = "LaneOverloaded"
+    # `/start` could not resolve a callback URL's host (`api.callback_hosts`): the lookup failed
+    # or timed out. A 503 with `Retry-After` — the resolver, not the URL, is what failed.
+    CALLBACK_HOST_UNRESOLVED = "CallbackHostUnresolved"
 
     # A caller hit `/start` on a deployment whose resolved orchestration mode cannot do genuine
     # async (its orchestrator's `supports_fire_and_forget` is False — e.g. the in-process `direct`
@@ -47,12 +56,26 @@ class ErrorType(StrEnum):
     # sandbox-hosted. Running customer code in-process is refused (403): the bundle-with-code
     # transport is a sandbox-hosted capability only. Use a sandbox-hosted deployment.
     CUSTOM_CODE_REQUIRES_SANDBOX = "CustomCodeRequiresSandbox"
+    # An `Idempotency-Key` already used by this caller on this route was sent again with a
+    # different body (`api.idempotency`). A 422: replaying the first request's result for another
+    # request would be wrong, and running it would defeat the key.
+    IDEMPOTENCY_KEY_MISMATCH = "IdempotencyKeyMismatch"
+
+    # A `/tools/ws` message named a document the session has not opened (or already closed).
+    UNKNOWN_DOCUMENT = "UnknownDocument"
 
     # A caller selected a closure by `method_ref` on `/resolve` or `/codegen`. The request envelope
     # accepts the field (it is the registry hinge the spec pins), but no method-registry resolution
     # exists on this server yet — an honest 501, never a silent empty verdict.
     METHOD_REF_NOT_SUPPORTED = "MethodRefNotSupported"
 
+    # Run cancellation (`/execute`). The run outlived its deadline — the caller's `timeout_seconds`
+    # extra, capped by `MAX_EXECUTE_TIMEOUT_SECONDS` — and was cancelled: a 504. Or the caller
+    # hung up mid-run and the run was cancelled rather than finished for nobody: a 499, logged for
+    # the operator (the caller is gone and never reads it).
+    RUN_DEADLINE_EXCEEDED = "RunDeadlineExceeded"
+    CLIENT_CLOSED_REQUEST = "ClientClosedRequest"
+
     # Misc
     PACKAGE_NOT_FOUND = "PackageNotFound"
     # The `error_type` for the catch-all 500 emitted by `handle_unexpected_error`
@@ -15,6 +15,7 @@ are the single translation point for everything the API does not author
 itself.
 """
 
+import math
 from typing import Any, NoReturn
 
 from pipelex.base_exceptions import ErrorDomain
@@ -102,6 +103,32 @@ def raise_unauthenticated(message: str, error_type: ErrorType = ErrorType.UNAUTH
     )
 
 
+def raise_too_many_requests(message: str, *, retry_after_seconds: float, error_type: ErrorType = ErrorType.RATE_LIMITED) -> NoReturn:
+    """Raise a 429 RFC 7807 problem response, with `Retry-After` in whole seconds (rounded up)."""
+    _raise_api_error(
+        error_type=error_type,
+        message=message,
+        status=429,
+        error_domain=ErrorDomain.INPUT,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after_seconds)))},
+    )
+
+
+def raise_service_unavailable(message: str, *, retry_after_seconds: float, error_type: ErrorType) -> NoReturn:
+    """Raise a 503 RFC 7807 problem response for load the server sheds, with `Retry-After` in whole seconds.
+
+    For a healthy server that is momentarily full — the request was fine and may be retried as
+    is. Classified `RUNTIME` domain: neither the request nor the configuration is at fault.
+    """
+    _raise_api_error(
+        error_type=error_type,
+        message=message,
+        status=503,
+        error_domain=ErrorDomain.RUNTIME,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after_seconds)))},
+    )
+
+
 def raise_not_implemented(message: str, error_type: ErrorType) -> NoReturn:
     """Raise a 501 RFC 7807 problem response for a spec'd capability this server does not implement yet.
 
@@ -124,3 +151,23 @@ def raise_internal_server_error(message: str, error_type: ErrorType) -> NoReturn
     the caller, fixes it.
     """
     _raise_api_error(error_type=error_type, message=message, status=500, error_domain=ErrorDomain.CONFIG)
+
+
+def raise_gateway_timeout(message: str, error_type: ErrorType = ErrorType.RUN_DEADLINE_EXCEEDED) -> NoReturn:
+    """Raise a 504 RFC 7807 problem response for a run cancelled at its deadline.
+
+    Classified `RUNTIME` domain: the request was well-formed and the server was
+    healthy, the run simply did not finish in the time it was allowed.
+    """
+    _raise_api_error(error_type=error_type, message=message, status=504, error_domain=ErrorDomain.RUNTIME)
+
+
+def raise_client_closed_request(message: str) -> NoReturn:
+    """Raise a 499 RFC 7807 problem response for a run cancelled because the caller disconnected.
+
+    499 is the de-facto "client closed request" status (nginx's). Nobody reads
+    the body — the connection is gone — but raising through the usual path is
+    what gets the cancellation its `event=api_error` log line with the
+    request's correlation fields.
+    """
+    _raise_api_error(error_type=ErrorType.CLIENT_CLOSED_REQUEST, message=message, status=499, error_domain=ErrorDomain.INPUT)
@@ -40,6 +40,7 @@ from pipelex.plugins.registrar import HttpErrorMapperFn
 
 from api.error_types import ErrorType
 from api.errors import ApiError
+from api.log_sink import ERROR_LOG_SINK, LogLevel
 from api.problem_document import PROBLEM_JSON_MEDIA_TYPE, build_problem_document, build_problem_document_from_api_error
 
 if TYPE_CHECKING:
@@ -106,7 +107,7 @@ def _pipeline_run_id_of(request: Request) -> str | None:
     return getattr(request.state, "pipeline_run_id", None)
 
 
-def _request_correlation_fields(request: Request) -> dict[str, str | None]:
+def request_correlation_fields(request: Request) -> dict[str, str | None]:
     """Return the request-scoped correlation fields every error log carries.
 
     Single source of truth for the `user_id` / `pipe_code` / `pipeline_run_id`
@@ -178,19 +179,36 @@ def _logfmt_value(value: Any) -> str:
 def emit_error_log(*, fields: dict[str, Any], as_error: bool) -> None:
     """Emit one structured error-log line from a flat field map.
 
+    `as_error` picks the level — `error` (with traceback) for
+    operator-actionable failures, `warning` for `INPUT`-domain caller
+    mistakes. See `emit_log` for how the line is rendered.
+    """
+    emit_log(fields=fields, level="error" if as_error else "warning")
+
+
+def emit_log(*, fields: dict[str, Any], level: LogLevel) -> None:
+    """Emit one structured log line from a flat field map, at `level`.
+
     The pipelex `log` object renders a single message string rather than
     indexed key/value fields, so the fields are flattened to a `key=value`
-    run: greppable today, and a clean migration target once a JSON log sink
-    lands. `None`-valued fields are dropped. `as_error` picks the level —
-    `error` (with traceback) for operator-actionable failures, `warning` for
-    `INPUT`-domain caller mistakes. Caller-controlled values go through
-    `_logfmt_value` so a crafted `detail` can't forge log fields.
+    run. `None`-valued fields are dropped. An `error` line carries the
+    traceback of the exception being handled. Caller-controlled values go
+    through `_logfmt_value` so a crafted `detail` can't forge log fields.
+
+    Under `ERROR_LOG_FORMAT=json` the same field map is queued to the JSON
+    sink instead (`api.log_sink`), and is encoded and written off the
+    request path.
     """
+    if ERROR_LOG_SINK.is_running:
+        ERROR_LOG_SINK.emit(fields, level=level)
+        return
     rendered = " ".join(f"{key}={_logfmt_value(value)}" for key, value in fields.items() if value is not None)
-    if as_error:
+    if level == "error":
         log.error(rendered, include_exception=True)
-    else:
+    elif level == "warning":
         log.warning(rendered)
+    else:
+        log.info(rendered)
 
 
 def _emit_at_error_level(status: int) -> bool:
@@ -231,7 +249,7 @@ def _log_error_report(report: ErrorReport, *, request: Request, request_id: str
         "event": "api_error",
         "request_id": request_id,
         "route": request.url.path,
-        **_request_correlation_fields(request),
+        **request_correlation_fields(request),
         "error_type": report.error_type,
         "error_category": report.error_category,
         "error_domain": report.error_domain,
@@ -280,7 +298,7 @@ def _log_api_authored_error(*, document: dict[str, Any], status: int, request: R
         "event": "api_error",
         "request_id": request_id,
         "route": request.url.path,
-        **_request_correlation_fields(request),
+        **request_correlation_fields(request),
         "error_type": document.get("error_type"),
         "error_domain": error_domain,
         "retryable": document.get("retryable"),
@@ -461,7 +479,7 @@ async def handle_unexpected_error(request: Request, exc: Exception) -> Response:
             "event": "api_error",
             "request_id": request_id,
             "route": request.url.path,
-            **_request_correlation_fields(request),
+            **request_correlation_fields(request),
             "error_type": type(exc).__name__,
             "error_category": "unknown",
             "error_domain": ErrorDomain.RUNTIME,
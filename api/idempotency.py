@@ -0,0 +1,128 @@
+"""`Idempotency-Key` for `/execute` and `/start`: a retried request replays its first response.
+
+A client that loses the connection mid-`/execute` cannot tell whether its run happened, so it
+retries — and every retry re-ran the whole pipeline and re-billed its tokens. `/start` only
+refused a duplicate while the first run was still in flight (the 409 on a reused
+`pipeline_run_id`). With an `Idempotency-Key` header, `IDEMPOTENT_RUNS` makes the retry free:
+
+- **Replayed.** The first `2xx` response for a key is stored, with a digest of the request body,
+  for `IDEMPOTENCY_TTL_SECONDS`. A request with the same key and the same body gets that response
+  back, byte for byte and with its headers, plus `Idempotent-Replayed: true`, and runs nothing.
+- **Coalesced.** A duplicate that arrives while the first is still running waits for it and
+  replays its response, rather than starting a second run.
+- **Not stored on failure.** An error response is not stored: a retry after a failed or
+  cancelled first attempt runs again, which is what retrying a failure is for. Its waiting
+  duplicates run it again the same way, one at a time.
+- **Scoped.** A key belongs to the caller (`user_id`) and the route, so two callers, or `/execute`
+  and `/start`, never share one. Reusing a key with a different body is a 422
+  (`IdempotencyKeyMismatch`), not a silent replay of another request's result.
+
+The store (`api.lru_cache.SingleFlightCache`) is in-process, bounded in bytes by `IDEMPOTENCY_CACHE_MIB` (least recently used first
+out), so a retry is deduplicated by the worker that served the original; behind a load balancer
+without affinity, a retry reaching another worker runs again. `idempotency_requests_total{outcome}`
+(`stored`, `replayed`, `coalesced`, `mismatch`) in `api.metrics` counts what happened to each
+keyed request, and the store reports the `cache_*` series as `idempotency`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from fastapi.responses import Response
+
+from api.error_types import ErrorType
+from api.errors import raise_validation_error
+from api.limits import IDEMPOTENCY_CACHE_BYTES, IDEMPOTENCY_TTL_SECONDS
+from api.lru_cache import SingleFlightCache
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from fastapi import Request
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# Per-entry overhead on top of the response body: the digests, the status, the expiry.
+_STORED_RESPONSE_OVERHEAD_BYTES = 256
+
+
+@dataclass(frozen=True)
+class _StoredResponse:
+    fingerprint: bytes
+    response: Response
+
+    @property
+    def succeeded(self) -> bool:
+        return self.response.status_code < HTTPStatus.MULTIPLE_CHOICES
+
+    def size(self) -> int:
+        return len(self.response.body) + _STORED_RESPONSE_OVERHEAD_BYTES
+
+    def replay(self) -> Response:
+        replay = Response(content=bytes(self.response.body), status_code=self.response.status_code)
+        replay.raw_headers = list(self.response.raw_headers)
+        replay.headers[IDEMPOTENT_REPLAYED_HEADER] = "true"
+        return replay
+
+
+class IdempotentResponses:
+    """First `2xx` responses of keyed requests, replayed to their duplicates until they expire."""
+
+    def __init__(self, *, ttl_seconds: float, max_bytes: int) -> None:
+        self._responses: SingleFlightCache[bytes, _StoredResponse] = SingleFlightCache("idempotency", ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        # The body digest of each key's first request while it runs, so a mismatch is refused at once.
+        self._running: dict[bytes, bytes] = {}
+
+    async def run(self, request: Request, *, owner: str, compute: Callable[[], Awaitable[Response]]) -> Response:
+        """`compute()`'s response, or — for a request whose `Idempotency-Key` was seen — the first one's.
+
+        Without the header this is just `compute()`.
+        """
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if key is None:
+            return await compute()
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise_validation_error(message=f"{IDEMPOTENCY_KEY_HEADER} must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters")
+        slot = hashlib.sha256(f"{owner}\0{request.url.path}\0{key}".encode()).digest()
+        fingerprint = hashlib.sha256(await request.body()).digest()
+        running = self._running.get(slot)
+        if running is not None:
+            self._check_fingerprint(running, fingerprint)
+
+        async def run_first() -> _StoredResponse:
+            self._running[slot] = fingerprint
+            try:
+                return _StoredResponse(fingerprint=fingerprint, response=await compute())
+            finally:
+                del self._running[slot]
+
+        stored, outcome = await self._responses.run(slot, run_first, size=_StoredResponse.size, share=lambda stored: stored.succeeded)
+        if outcome == "computed":
+            if stored.succeeded:
+                METRICS.increment("idempotency_requests_total", outcome="stored")
+            return stored.response
+        self._check_fingerprint(stored.fingerprint, fingerprint)
+        METRICS.increment("idempotency_requests_total", outcome="replayed" if outcome == "cached" else "coalesced")
+        return stored.replay()
+
+    @staticmethod
+    def _check_fingerprint(expected: bytes, actual: bytes) -> None:
+        if expected != actual:
+            METRICS.increment("idempotency_requests_total", outcome="mismatch")
+            raise_validation_error(
+                message=f"{IDEMPOTENCY_KEY_HEADER} was already used with a different request body",
+                error_type=ErrorType.IDEMPOTENCY_KEY_MISMATCH,
+            )
+
+    def clear(self) -> None:
+        """Forget every stored response (a test reset)."""
+        self._responses.clear()
+
+
+IDEMPOTENT_RUNS = IdempotentResponses(ttl_seconds=IDEMPOTENCY_TTL_SECONDS, max_bytes=IDEMPOTENCY_CACHE_BYTES)
@@ -0,0 +1,197 @@
+"""Hot reload of the inference config: backends, routing profiles and model decks.
+
+`Pipelex.make` reads `.pipelex/inference/` once, into the models manager, and nothing re-reads it:
+changing a backend file, `routing_profiles.toml` or a deck used to mean a process restart — dropped
+in-flight runs and a cold start. `lifespan` instead hands `Pipelex.make` `INFERENCE_CONFIG`, a
+models manager that keeps the loaded config as a *snapshot* (a plain `ModelManager`) it can replace:
+
+- `reload` builds a new snapshot from the files on disk, with the same secrets and gateway config
+  as the boot, validates it as the boot would, and only then swaps it in — one reference
+  assignment. A config that fails to load or validate leaves the current snapshot serving. The
+  SDK clients cached per backend are then dropped (not closed: an in-flight call still holds its
+  own), so a backend whose endpoint or credentials changed is reached through a new client.
+- Each request pins the snapshot current at its arrival (`pinned_inference_snapshot`, applied by
+  `api.middleware.InferenceSnapshotMiddleware`). The pin is a contextvar, so a run — and every task
+  it spawns, a `/start` background run included — finishes on the config it started with.
+
+The reload is triggered by `SIGHUP` (`api.main`), which the pre-fork parent forwards to every
+worker (`api.serve`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pipelex import log
+from pipelex.cogt.models.model_manager import ModelManager
+from pipelex.cogt.models.model_manager_abstract import ModelManagerAbstract
+from pipelex.runtime_hub import get_sdk_client_manager
+from typing_extensions import override
+
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from pipelex.cogt.model_backends.backend import InferenceBackend
+    from pipelex.cogt.model_backends.gateway_config import GatewayConfig
+    from pipelex.cogt.model_backends.model_spec import InferenceModelSpec
+    from pipelex.cogt.model_backends.model_type import ModelType
+    from pipelex.cogt.models.model_deck import ModelDeck
+    from pipelex.system.pipelex_service.types import RemoteConfigSource
+    from pipelex.tools.secrets.secrets_provider_abstract import SecretsProviderAbstract
+
+_pinned_snapshot_ctxvar: contextvars.ContextVar[ModelManager | None] = contextvars.ContextVar("pipelex_api_inference_snapshot", default=None)
+
+
+@dataclass(frozen=True)
+class _BootInputs:
+    """What the boot passed to `setup` — everything a reload needs besides the files themselves."""
+
+    secrets_provider: SecretsProviderAbstract
+    gateway_config: GatewayConfig | None
+    gateway_config_source: RemoteConfigSource | None
+    needs_inference: bool
+
+
+class ReloadableModelManager(ModelManagerAbstract):
+    """A models manager over a replaceable snapshot of the inference config."""
+
+    def __init__(self) -> None:
+        self._current: ModelManager | None = None
+        self._boot_inputs: _BootInputs | None = None
+        self._reload_lock = threading.Lock()
+
+    def _snapshot(self) -> ModelManager:
+        pinned = _pinned_snapshot_ctxvar.get()
+        if pinned is not None:
+            return pinned
+        if self._current is None:
+            msg = "The inference config is not loaded: the models manager has not been set up"
+            raise RuntimeError(msg)
+        return self._current
+
+    @override
+    def setup(
+        self,
+        *,
+        secrets_provider: SecretsProviderAbstract,
+        gateway_config: GatewayConfig | None,
+        gateway_config_source: RemoteConfigSource | None,
+        needs_inference: bool = True,
+    ) -> None:
+        boot_inputs = _BootInputs(
+            secrets_provider=secrets_provider,
+            gateway_config=gateway_config,
+            gateway_config_source=gateway_config_source,
+            needs_inference=needs_inference,
+        )
+        self._current = _load_snapshot(boot_inputs)
+        self._boot_inputs = boot_inputs
+
+    @override
+    def teardown(self) -> None:
+        if self._current is not None:
+            self._current.teardown()
+        self._current = None
+        self._boot_inputs = None
+
+    @override
+    def validate_model_deck(self) -> None:
+        self._snapshot().validate_model_deck()
+
+    @override
+    def get_inference_model(self, model_handle: str, *, model_type: ModelType) -> InferenceModelSpec:
+        return self._snapshot().get_inference_model(model_handle, model_type=model_type)
+
+    @override
+    def get_model_deck(self) -> ModelDeck:
+        return self._snapshot().get_model_deck()
+
+    @override
+    def get_required_inference_backend(self, backend_name: str) -> InferenceBackend:
+        return self._snapshot().get_required_inference_backend(backend_name)
+
+    def current_snapshot(self) -> ModelManager | None:
+        """The snapshot new requests are pinned to (None before boot, or when another manager was booted)."""
+        return self._current
+
+    def reload(self) -> None:
+        """Re-read the inference config from disk and swap it in; raise (keeping the current one) if it is invalid.
+
+        Blocking file I/O and validation — call it off the event loop (`reload_inference_config`).
+        The snapshot it replaces is not torn down: runs pinned to it still read it, and it is
+        collected once the last of them finishes.
+        """
+        with self._reload_lock:
+            if self._boot_inputs is None:
+                msg = "Cannot reload the inference config before the models manager has been set up"
+                raise RuntimeError(msg)
+            snapshot = _load_snapshot(self._boot_inputs)
+            # The check `Pipelex.make` runs after setup when it needs inference.
+            if self._boot_inputs.needs_inference:
+                snapshot.validate_model_deck()
+            self._current = snapshot
+            _drop_cached_sdk_clients()
+
+
+def _drop_cached_sdk_clients() -> None:
+    """Forget every SDK client pipelex cached per backend, without closing any.
+
+    pipelex's public `SdkClientRegistry.teardown()` closes the clients too, which would break the
+    in-flight calls still holding them, so this replaces the registry's `root` mapping instead —
+    the field that holds the clients as of pipelex 0.50.0 (pinned in `pyproject.toml`).
+    `test_inference_config.py` fails if a pipelex upgrade moves it.
+    """
+    get_sdk_client_manager().sdk_client_registry.root = {}
+
+
+def _load_snapshot(boot_inputs: _BootInputs) -> ModelManager:
+    snapshot = ModelManager()
+    snapshot.setup(
+        secrets_provider=boot_inputs.secrets_provider,
+        gateway_config=boot_inputs.gateway_config,
+        gateway_config_source=boot_inputs.gateway_config_source,
+        needs_inference=boot_inputs.needs_inference,
+    )
+    return snapshot
+
+
+INFERENCE_CONFIG = ReloadableModelManager()
+
+
+@contextmanager
+def pinned_inference_snapshot() -> Generator[None]:
+    """Pin `INFERENCE_CONFIG`'s current snapshot for the `with` block and every task it spawns."""
+    token = _pinned_snapshot_ctxvar.set(INFERENCE_CONFIG.current_snapshot())
+    try:
+        yield
+    finally:
+        _pinned_snapshot_ctxvar.reset(token)
+
+
+async def reload_inference_config() -> bool:
+    """Reload `INFERENCE_CONFIG` off the event loop. Returns whether the new config was swapped in.
+
+    A refused config is logged and counted, never raised: the reload is an operator signal with
+    no caller to answer, and the current config keeps serving.
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(INFERENCE_CONFIG.reload)
+    # An operator-triggered boundary with nobody to raise to: any refusal — a missing file, a TOML
+    # or schema error, a disabled backend a profile needs — must leave the running config in place.
+    except Exception as exc:  # noqa: BLE001
+        METRICS.increment("inference_config_reloads_total", outcome="failed")
+        log.error(f"Inference config reload refused, keeping the current config: {type(exc).__name__}: {exc}")
+        return False
+    METRICS.increment("inference_config_reloads_total", outcome="ok")
+    METRICS.observe("inference_config_reload_seconds", time.perf_counter() - started)
+    log.info("Inference config reloaded")
+    return True
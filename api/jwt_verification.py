@@ -0,0 +1,241 @@
+"""Bearer JWT verification for `AUTH_MODE=jwt`: signing keys, and a cache of verified tokens.
+
+A token is verified against one of two kinds of key, picked by the `alg` in its header:
+
+- **HS256** against `JWT_SECRET_KEY`, a secret shared with the token issuer.
+- **RS256 / ES256** against `JWT_JWKS_URI`, a JSON Web Key Set read from a local file or an
+  http(s) URL. The public keys of an identity provider or gateway verify the tokens it issues
+  without sharing any secret. A token names its key by `kid`. The set is cached for
+  `JWT_JWKS_CACHE_SECONDS`. A `kid` the cached set does not know triggers an early refetch, at most
+  once per `_MIN_REFETCH_SECONDS`, so a key rotated in at the issuer is picked up on its first
+  token. A refetch that fails keeps the cached set.
+
+An algorithm never crosses key kinds: an HS256 token is not checked against a public key, nor an
+RS256 one against the secret.
+
+Clients reuse one token across a whole batch, and each use paid a full signature check.
+`VERIFIED_TOKENS` keeps the claims of every token that verified. It is keyed by the token's
+digest, never the token itself, and an entry is served only until the token's `exp`. It is
+bounded in bytes by `JWT_VERIFY_CACHE_KIB`, and dropped when the auth settings or the key set
+change. The claim checks on `user_id` (`api.security`) still run on every request.
+
+Imported on first use by `api.security`, so a deployment in another mode never loads PyJWT.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+import jwt
+from pipelex import log
+
+from api.limits import JWT_JWKS_CACHE_SECONDS, JWT_VERIFY_CACHE_BYTES
+from api.lru_cache import ByteBudgetLRU
+from api.metrics import METRICS
+
+HMAC_ALGORITHMS = ("HS256",)
+JWKS_ALGORITHMS = ("RS256", "ES256")
+
+# Floor between two fetches of the key set triggered by unknown `kid`s: a flood of tokens naming
+# made-up keys must not turn into a flood of requests to the issuer.
+_MIN_REFETCH_SECONDS = 30.0
+_JWKS_FETCH_TIMEOUT_SECONDS = 5.0
+# Per-entry overhead on top of the token's length: the claims dict, the expiry, the digest key.
+_VERIFIED_TOKEN_OVERHEAD_BYTES = 256
+
+
+class JwtKeySettings(Protocol):
+    """The part of `api.security.AuthSettings` token verification reads."""
+
+    @property
+    def jwt_secret(self) -> str | None: ...
+    @property
+    def jwt_jwks_uri(self) -> str | None: ...
+    @property
+    def jwt_audience(self) -> str | None: ...
+    @property
+    def jwt_issuer(self) -> str | None: ...
+
+
+class JwksUnavailableError(Exception):
+    """Raised when no key set could be loaded from `JWT_JWKS_URI` — not even a cached one."""
+
+
+def _read_jwks_document(uri: str) -> str:
+    """The raw key set at `uri`: fetched for an https URL, read from disk otherwise. Blocking.
+
+    `AuthSettings` refuses any other scheme, so a plain-http key set never gets this far.
+    """
+    if uri.startswith("https://"):
+        with urllib.request.urlopen(uri, timeout=_JWKS_FETCH_TIMEOUT_SECONDS) as response:  # noqa: S310 — the scheme is checked above
+            document: bytes = response.read()
+        return document.decode()
+    return Path(uri.removeprefix("file://")).read_text()
+
+
+class JwksKeySet:
+    """The signing keys published at one `JWT_JWKS_URI`, by `kid`, refetched as described above."""
+
+    def __init__(self, uri: str, *, cache_seconds: float = JWT_JWKS_CACHE_SECONDS) -> None:
+        self.uri = uri
+        self._cache_seconds = cache_seconds
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._loaded = False
+        self._fetched_at = float("-inf")
+        self._fetch_lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """Fetch the key set now, raising if it cannot be read or holds no usable key. Used at boot."""
+        async with self._fetch_lock:
+            await self._fetch()
+
+    async def get_signing_key(self, kid: str | None) -> jwt.PyJWK | None:
+        """The key for `kid` (None: the set's only key), refetching first when the set is stale or lacks it."""
+        if not self._loaded or time.monotonic() - self._fetched_at >= self._cache_seconds:
+            await self._refetch(reason="expired")
+        key = self._lookup(kid)
+        if key is None and time.monotonic() - self._fetched_at >= _MIN_REFETCH_SECONDS:
+            await self._refetch(reason="unknown_kid")
+            key = self._lookup(kid)
+        return key
+
+    def _lookup(self, kid: str | None) -> jwt.PyJWK | None:
+        if kid is not None:
+            return self._keys.get(kid)
+        # A token without `kid` is only unambiguous against a single-key set.
+        return next(iter(self._keys.values())) if len(self._keys) == 1 else None
+
+    async def _refetch(self, *, reason: str) -> None:
+        """Refetch, keeping the cached keys on failure; raise `JwksUnavailableError` if there are none."""
+        fetched_at = self._fetched_at
+        async with self._fetch_lock:
+            # Skipped when another request refetched while this one waited for the lock, and, for a
+            # set never loaded, within `_MIN_REFETCH_SECONDS` of the last failed attempt.
+            due = self._loaded or time.monotonic() - fetched_at >= _MIN_REFETCH_SECONDS
+            if self._fetched_at == fetched_at and due:
+                try:
+                    await self._fetch()
+                except (OSError, ValueError, jwt.PyJWTError) as exc:
+                    self._fetched_at = time.monotonic()
+                    METRICS.increment("jwks_fetches_total", outcome="failed", reason=reason)
+                    log.error(f"Fetching the key set at JWT_JWKS_URI failed, keeping the cached keys: {type(exc).__name__}: {exc}")
+                else:
+                    METRICS.increment("jwks_fetches_total", outcome="ok", reason=reason)
+        if not self._loaded:
+            msg = "The key set at JWT_JWKS_URI could not be loaded"
+            raise JwksUnavailableError(msg)
+
+    async def _fetch(self) -> None:
+        document = await asyncio.to_thread(_read_jwks_document, self.uri)
+        # Only public signing keys: an `oct` (shared-secret) key has no place in a published set.
+        usable = [
+            key for key in jwt.PyJWKSet.from_json(document).keys if key.algorithm_name in JWKS_ALGORITHMS and key.public_key_use in (None, "sig")
+        ]
+        keys = {key.key_id: key for key in usable if key.key_id is not None}
+        if not keys and len(usable) == 1:
+            # A lone key published without a `kid` verifies the tokens that name none.
+            keys = {"": usable[0]}
+        if not keys:
+            msg = f"no {'/'.join(JWKS_ALGORITHMS)} signing key with a `kid` in the key set"
+            raise ValueError(msg)
+        if self._loaded and keys.keys() != self._keys.keys():
+            log.info(f"Key set at JWT_JWKS_URI rotated: kids {sorted(self._keys)} -> {sorted(keys)}")
+            # A token verified by a key that was just withdrawn must not keep passing from the cache.
+            VERIFIED_TOKENS.clear()
+        self._keys = keys
+        self._loaded = True
+        self._fetched_at = time.monotonic()
+
+
+_key_sets: dict[str, JwksKeySet] = {}
+
+
+def get_jwks_key_set(uri: str) -> JwksKeySet:
+    """The process's `JwksKeySet` for `uri`, created on first use."""
+    key_set = _key_sets.get(uri)
+    if key_set is None:
+        key_set = _key_sets[uri] = JwksKeySet(uri)
+    return key_set
+
+
+@dataclass(frozen=True)
+class _VerifiedToken:
+    claims: dict[str, Any]
+    expires_at: float | None
+
+
+class VerifiedTokenCache:
+    """Claims of tokens whose signature and registered claims verified, served until their `exp`."""
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self._entries: ByteBudgetLRU[bytes, _VerifiedToken] = ByteBudgetLRU("jwt", max_bytes=max_bytes)
+        self._source_settings: JwtKeySettings | None = None
+
+    def get(self, token: str, settings: JwtKeySettings) -> dict[str, Any] | None:
+        """The cached claims of `token` under `settings`, or None when it must be verified."""
+        if settings is not self._source_settings:
+            # Rotated secret or key set location: nothing verified under the old settings holds.
+            self._entries.clear()
+            self._source_settings = settings
+            return None
+        entry = self._entries.get(hashlib.sha256(token.encode()).digest())
+        if entry is None or (entry.expires_at is not None and entry.expires_at <= time.time()):
+            return None
+        return entry.claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        expiry = claims.get("exp")
+        expires_at = float(expiry) if isinstance(expiry, int | float) else None
+        self._entries.put(
+            hashlib.sha256(token.encode()).digest(),
+            _VerifiedToken(claims=claims, expires_at=expires_at),
+            size=len(token) + _VERIFIED_TOKEN_OVERHEAD_BYTES,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+VERIFIED_TOKENS = VerifiedTokenCache(max_bytes=JWT_VERIFY_CACHE_BYTES)
+
+
+async def decode_token(token: str, settings: JwtKeySettings) -> dict[str, Any]:
+    """The verified claims of `token`, from the cache or a full signature check.
+
+    Raises `jwt.InvalidTokenError` (or a subclass, e.g. `ExpiredSignatureError`) for a token that
+    does not verify, names an algorithm outside the configured key kinds, or names an unknown
+    key; `JwksUnavailableError` when the key set it needs has never been loaded.
+    """
+    cached = VERIFIED_TOKENS.get(token, settings)
+    if cached is not None:
+        return cached
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    key: str | jwt.PyJWK
+    if algorithm in HMAC_ALGORITHMS and settings.jwt_secret:
+        key = settings.jwt_secret
+    elif algorithm in JWKS_ALGORITHMS and settings.jwt_jwks_uri:
+        kid = header.get("kid")
+        signing_key = await get_jwks_key_set(settings.jwt_jwks_uri).get_signing_key(kid if isinstance(kid, str) else None)
+        if signing_key is None:
+            msg = f"No signing key with kid {kid!r} in the key set"
+            raise jwt.InvalidTokenError(msg)
+        key = signing_key
+    else:
+        msg = f"Algorithm {algorithm!r} is not accepted by this server's key configuration"
+        raise jwt.InvalidAlgorithmError(msg)
+    claims: dict[str, Any] = jwt.decode(  # type: ignore[reportUnknownMemberType]
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=settings.jwt_audience,
+        issuer=settings.jwt_issuer,
+    )
+    VERIFIED_TOKENS.put(token, claims)
+    return claims
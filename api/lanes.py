@@ -0,0 +1,302 @@
+"""Priority lanes — separate admission pools for editor tooling and pipeline runs.
+
+Every route shares one event loop. Without lanes, a handful of multi-minute
+`/execute` runs (each loading a library, each holding the loop for its CPU-bound
+stretches) makes a keystroke-driven `/lint` wait behind them. Lanes split the
+traffic by route group:
+
+- `interactive` — `/lint`, `/format`, `/validate`, `/resolve`, `/build/inputs`: cheap, latency-sensitive.
+  Admitted up to `MAX_INTERACTIVE_CONCURRENCY`, and the CPU-bound `pipelex_tools` calls
+  run on the lane's own `INTERACTIVE_WORKER_THREADS` threads (`run_in_lane`), off the
+  event loop and out of the default thread pool sync routes share.
+- `batch` — `/execute`, `/start`: expensive. Admitted up to `MAX_BATCH_CONCURRENCY`; a
+  request beyond that waits for a batch slot, never for (or in front of) an interactive one.
+- `tools_batch` — `/lint/batch`, `/format/batch`: workspace-sized tool runs, admitted up to
+  `MAX_TOOLS_BATCH_CONCURRENCY`. Their files run on the lane's own `TOOLS_BATCH_WORKER_THREADS`,
+  so a CI sweep occupies neither the threads a keystroke lint needs nor the slots runs wait for.
+  The slot is held until a streamed batch has been written out.
+
+Routes join a lane through a router-level dependency (`interactive_lane` /
+`batch_lane` / `tools_batch_lane`), held around the path operation. Within a lane, waiters are
+admitted by urgency then arrival: a caller may send the RFC 9218 `Priority`
+header (`u=0` most urgent … `u=7` least, default `u=3`) to move ahead of — or
+defer to — its own lane's queue. The hint never crosses lanes.
+
+A lane sheds load rather than queueing it forever: at most `MAX_<LANE>_QUEUED`
+requests wait for a slot, each for at most `<LANE>_QUEUE_TIMEOUT_SECONDS`. A request
+arriving at a full queue, or still waiting at its deadline, is answered
+`503 LaneOverloaded` with a `Retry-After`.
+
+The library loads the lanes exist to keep off the event loop run on the lane's
+threads too: `/resolve`, `/build/inputs` and the in-process `/validate` on the interactive lane,
+an `/execute` run's library on the batch lane (`api.routes.pipelex.pipeline`).
+
+Each lane reports `lane_admitted_total`, `lane_shed_total{reason}`,
+`lane_queue_wait_seconds`, and the `lane_in_flight` / `lane_queued` gauges,
+labelled by lane, in `api.metrics`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from typing import TYPE_CHECKING, Annotated, Any, NoReturn, ParamSpec, TypeVar
+
+from fastapi import Depends, Header
+
+from api.error_types import ErrorType
+from api.errors import raise_service_unavailable
+from api.limits import (
+    BATCH_QUEUE_TIMEOUT_SECONDS,
+    BATCH_WORKER_THREADS,
+    INTERACTIVE_QUEUE_TIMEOUT_SECONDS,
+    INTERACTIVE_WORKER_THREADS,
+    MAX_BATCH_CONCURRENCY,
+    MAX_BATCH_QUEUED,
+    MAX_INTERACTIVE_CONCURRENCY,
+    MAX_INTERACTIVE_QUEUED,
+    MAX_TOOLS_BATCH_CONCURRENCY,
+    MAX_TOOLS_BATCH_QUEUED,
+    TOOLS_BATCH_QUEUE_TIMEOUT_SECONDS,
+    TOOLS_BATCH_WORKER_THREADS,
+)
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable, Coroutine
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+# RFC 9218 urgency: 0 (most urgent) … 7 (least), 3 when absent or unparseable.
+DEFAULT_URGENCY = 3
+_MAX_URGENCY = 7
+
+# The `Retry-After` on a shed request: long enough for a slot to turn over, short enough not to idle.
+_SHED_RETRY_AFTER_SECONDS = 1
+
+
+class Lane(StrEnum):
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+    TOOLS_BATCH = "tools_batch"
+
+
+def parse_urgency(priority_header: str | None) -> int:
+    """Read the urgency (`u=N`) out of an RFC 9218 `Priority` header.
+
+    RFC 9218 tells a server to ignore a member it cannot parse, so a malformed
+    or out-of-range value falls back to the default rather than failing the request.
+    """
+    if not priority_header:
+        return DEFAULT_URGENCY
+    for member in priority_header.split(","):
+        key, _, value = member.strip().partition("=")
+        if key != "u":
+            continue
+        try:
+            urgency = int(value)
+        except ValueError:
+            return DEFAULT_URGENCY
+        return urgency if 0 <= urgency <= _MAX_URGENCY else DEFAULT_URGENCY
+    return DEFAULT_URGENCY
+
+
+class LanePool:
+    """A lane's admission limiter (urgency-ordered, FIFO within an urgency) plus its optional worker threads.
+
+    Single-loop by construction: admission state is plain ints and a heap, touched only from
+    the event loop, so it needs no lock. Each waiter parks on its own future; a released slot
+    is handed directly to the next live waiter, so a newcomer can never barge past the queue.
+    With `max_queued` / `queue_timeout_seconds` set, a waiter beyond the bound, or past the
+    deadline, is shed with a 503 instead of waiting on.
+    """
+
+    def __init__(
+        self,
+        lane: Lane,
+        *,
+        max_concurrency: int,
+        max_queued: int | None = None,
+        queue_timeout_seconds: float | None = None,
+        worker_threads: int | None = None,
+    ) -> None:
+        self.lane = lane
+        self._max_concurrency = max_concurrency
+        self._max_queued = max_queued
+        self._queue_timeout_seconds = queue_timeout_seconds
+        self._in_flight = 0
+        self._queued = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._arrival = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers=worker_threads, thread_name_prefix=f"lane-{lane}") if worker_threads else None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def _publish_levels(self) -> None:
+        METRICS.set_gauge("lane_in_flight", self._in_flight, lane=self.lane)
+        METRICS.set_gauge("lane_queued", self._queued, lane=self.lane)
+
+    def _shed(self, reason: str, message: str) -> NoReturn:
+        METRICS.increment("lane_shed_total", lane=self.lane, reason=reason)
+        self._publish_levels()
+        raise_service_unavailable(message, retry_after_seconds=_SHED_RETRY_AFTER_SECONDS, error_type=ErrorType.LANE_OVERLOADED)
+
+    async def _acquire(self, urgency: int) -> None:
+        if self._in_flight < self._max_concurrency and not self._queued:
+            self._in_flight += 1
+            return
+        if self._max_queued is not None and self._queued >= self._max_queued:
+            self._shed("queue_full", f"The {self.lane} lane is saturated: {self._queued} requests are already waiting for a slot.")
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (urgency, next(self._arrival), waiter))
+        self._queued += 1
+        self._publish_levels()
+        try:
+            async with asyncio.timeout(self._queue_timeout_seconds):
+                await waiter
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot on the deadline itself: keep it.
+                return
+            self._queued -= 1
+            self._shed("queue_timeout", f"No {self.lane} lane slot freed up within {self._queue_timeout_seconds:g}s.")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot in the same tick the caller was cancelled: hand it on.
+                self._release()
+            else:
+                self._queued -= 1
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # The slot transfers to the waiter: `_in_flight` is unchanged.
+                self._queued -= 1
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, *, urgency: int = DEFAULT_URGENCY) -> AsyncGenerator[None]:
+        """Hold one of this lane's slots for the duration of the block."""
+        queued_at = time.monotonic()
+        await self._acquire(urgency)
+        METRICS.increment("lane_admitted_total", lane=self.lane)
+        METRICS.observe("lane_queue_wait_seconds", time.monotonic() - queued_at, lane=self.lane)
+        self._publish_levels()
+        try:
+            yield
+        finally:
+            self._release()
+            self._publish_levels()
+
+    async def run_sync(self, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        """Run a blocking call on this lane's own threads, carrying the request's contextvars."""
+        if self._executor is None:
+            msg = f"Lane '{self.lane}' has no worker threads."
+            raise RuntimeError(msg)
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def run_async(self, work: Callable[[], Coroutine[Any, Any, _T]]) -> _T:
+        """Run `work()` to completion on one of this lane's threads, in a private event loop.
+
+        For a coroutine that blocks between its awaits (a library load inside an async API): the
+        server's loop only awaits the thread. `work` must not touch anything bound to the
+        server's loop — a pooled client, a lock, a future.
+
+        Cancelling the awaiting request does not reach `work`: the thread's loop runs it to
+        completion, so a deadline or a disconnect stops the wait, not a load already in progress.
+        """
+
+        def run_to_completion() -> _T:
+            return asyncio.run(work())
+
+        return await self.run_sync(run_to_completion)
+
+
+LANES: dict[Lane, LanePool] = {
+    Lane.INTERACTIVE: LanePool(
+        Lane.INTERACTIVE,
+        max_concurrency=MAX_INTERACTIVE_CONCURRENCY,
+        max_queued=MAX_INTERACTIVE_QUEUED,
+        queue_timeout_seconds=INTERACTIVE_QUEUE_TIMEOUT_SECONDS,
+        worker_threads=INTERACTIVE_WORKER_THREADS,
+    ),
+    Lane.BATCH: LanePool(
+        Lane.BATCH,
+        max_concurrency=MAX_BATCH_CONCURRENCY,
+        max_queued=MAX_BATCH_QUEUED,
+        queue_timeout_seconds=BATCH_QUEUE_TIMEOUT_SECONDS,
+        worker_threads=BATCH_WORKER_THREADS,
+    ),
+    Lane.TOOLS_BATCH: LanePool(
+        Lane.TOOLS_BATCH,
+        max_concurrency=MAX_TOOLS_BATCH_CONCURRENCY,
+        max_queued=MAX_TOOLS_BATCH_QUEUED,
+        queue_timeout_seconds=TOOLS_BATCH_QUEUE_TIMEOUT_SECONDS,
+        worker_threads=TOOLS_BATCH_WORKER_THREADS,
+    ),
+}
+
+_PriorityHeader = Annotated[
+    str | None,
+    Header(
+        alias="priority",
+        description=(
+            "Optional RFC 9218 priority hint, e.g. `u=1`. Urgency 0 (most urgent) to 7 (least), default 3. Orders this "
+            "request within its own lane's queue only — it never moves a request across lanes."
+        ),
+    ),
+]
+
+
+async def _hold_interactive_slot(priority: _PriorityHeader = None) -> AsyncGenerator[None]:
+    async with LANES[Lane.INTERACTIVE].slot(urgency=parse_urgency(priority)):
+        yield
+
+
+async def _hold_batch_slot(priority: _PriorityHeader = None) -> AsyncGenerator[None]:
+    async with LANES[Lane.BATCH].slot(urgency=parse_urgency(priority)):
+        yield
+
+
+async def _hold_tools_batch_slot(priority: _PriorityHeader = None) -> AsyncGenerator[None]:
+    async with LANES[Lane.TOOLS_BATCH].slot(urgency=parse_urgency(priority)):
+        yield
+
+
+# Router-level dependencies (dependency `scope=` needs FastAPI 0.121, the floor in pyproject.toml).
+# `scope="function"` releases the slot when the path operation returns,
+# not after the response is streamed, so a slow reader does not hold a slot someone else could use.
+interactive_lane = Depends(_hold_interactive_slot, scope="function")
+batch_lane = Depends(_hold_batch_slot, scope="function")
+# The exception: a streamed tool batch runs its files while the response is written, so its slot
+# is held until the response is done (`scope="request"`) — otherwise the lane would bound nothing.
+tools_batch_lane = Depends(_hold_tools_batch_slot, scope="request")
+
+
+async def run_in_lane(lane: Lane, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs) -> _T:
+    """Run a blocking call on `lane`'s worker threads (see `LanePool.run_sync`)."""
+    return await LANES[lane].run_sync(func, *args, **kwargs)
+
+
+async def run_coroutine_in_lane(lane: Lane, work: Callable[[], Coroutine[Any, Any, _T]]) -> _T:
+    """Run `work()` on `lane`'s worker threads, in a private event loop (see `LanePool.run_async`)."""
+    return await LANES[lane].run_async(work)
@@ -17,6 +17,32 @@ DEFAULT_MAX_CALLBACK_URL_LEN = 2048
 DEFAULT_MAX_AGENT_SPEC_KIB = 256  # 256 KiB for JSON concept/pipe specs
 DEFAULT_MAX_BUNDLE_FILES = 128  # entries in a materialized method bundle (.mthds + .py + requirements.txt)
 DEFAULT_MAX_BUNDLE_TOTAL_KIB = 8 * 1024  # 8 MiB decompressed across the whole bundle (zip-bomb guard)
+DEFAULT_MAX_EXECUTE_TIMEOUT_SECONDS = 3600  # ceiling (and default) for a synchronous /execute run
+DEFAULT_MAX_INTERACTIVE_CONCURRENCY = 32  # in-flight editor-tooling requests (lint/format/validate/resolve)
+DEFAULT_MAX_BATCH_CONCURRENCY = 8  # in-flight pipeline runs (execute/start)
+DEFAULT_INTERACTIVE_WORKER_THREADS = 4  # threads dedicated to the interactive lane's CPU-bound tooling calls
+DEFAULT_BATCH_WORKER_THREADS = 4  # threads dedicated to the batch lane's library loads (/execute)
+DEFAULT_MAX_INTERACTIVE_QUEUED = 256  # editor-tooling requests waiting for an interactive slot before new ones are shed
+DEFAULT_MAX_BATCH_QUEUED = 64  # pipeline runs waiting for a batch slot before new ones are shed
+DEFAULT_INTERACTIVE_QUEUE_TIMEOUT_SECONDS = 10  # longest an editor-tooling request waits for a slot
+DEFAULT_BATCH_QUEUE_TIMEOUT_SECONDS = 120  # longest a pipeline run waits for a slot
+DEFAULT_MAX_TOOLS_BATCH_CONCURRENCY = 4  # in-flight /lint/batch and /format/batch requests
+DEFAULT_TOOLS_BATCH_WORKER_THREADS = 4  # threads dedicated to the tools-batch lane's files
+DEFAULT_MAX_TOOLS_BATCH_QUEUED = 32  # tool batches waiting for a slot before new ones are shed
+DEFAULT_TOOLS_BATCH_QUEUE_TIMEOUT_SECONDS = 60  # longest a tool batch waits for a slot
+DEFAULT_MAX_TOOLS_WS_DOCUMENTS = 32  # open documents per `/tools/ws` session
+DEFAULT_TOOLS_WS_DEBOUNCE_MS = 150  # quiet period after an edit before `/tools/ws` re-lints
+DEFAULT_MAX_TOOLS_BATCH_FILES = 256  # files per `/lint/batch` or `/format/batch` request
+DEFAULT_TOOLS_CACHE_MIB = 64  # memoized lint/format results, bounded by serialized size
+DEFAULT_CODEGEN_CACHE_MIB = 64  # memoized /codegen projections (stamped artifacts + lock)
+DEFAULT_JWT_VERIFY_CACHE_KIB = 4096  # claims of verified bearer JWTs, bounded by token size
+DEFAULT_JWT_JWKS_CACHE_SECONDS = 300  # how long a fetched JWKS is used before it is refetched
+DEFAULT_CALLBACK_DNS_CACHE_SECONDS = 60  # how long a callback host's vetted addresses are reused
+DEFAULT_CALLBACK_DNS_TIMEOUT_MS = 2000  # one callback host resolution
+DEFAULT_CALLBACK_DNS_CACHE_KIB = 256  # cached callback host resolutions
+DEFAULT_IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60  # how long a keyed run's response is replayed
+DEFAULT_IDEMPOTENCY_CACHE_MIB = 64  # stored responses of keyed /execute and /start requests
+DEFAULT_ERROR_LOG_QUEUE_RECORDS = 10_000  # error-log records awaiting the JSON sink's writer
 
 
 def _read_positive_int(env_var: str, default: int) -> int:
@@ -48,3 +74,75 @@ MAX_AGENT_SPEC_BYTES = _read_positive_int("MAX_AGENT_SPEC_KIB", DEFAULT_MAX_AGEN
 
 MAX_BUNDLE_FILES = _read_positive_int("MAX_BUNDLE_FILES", DEFAULT_MAX_BUNDLE_FILES)
 MAX_BUNDLE_TOTAL_BYTES = _read_positive_int("MAX_BUNDLE_TOTAL_KIB", DEFAULT_MAX_BUNDLE_TOTAL_KIB) * 1024
+
+# The deadline every `/execute` run is held to. A caller may ask for a tighter one via the
+# `timeout_seconds` extra; a longer ask is capped here, so no synchronous run can pin a worker
+# (and its loaded library) past what the operator allows.
+MAX_EXECUTE_TIMEOUT_SECONDS = _read_positive_int("MAX_EXECUTE_TIMEOUT_SECONDS", DEFAULT_MAX_EXECUTE_TIMEOUT_SECONDS)
+
+# Per-lane concurrency (`api.lanes`). Editor tooling and pipeline runs are admitted through
+# separate pools, so a burst of runs queues behind other runs and never in front of a lint.
+MAX_INTERACTIVE_CONCURRENCY = _read_positive_int("MAX_INTERACTIVE_CONCURRENCY", DEFAULT_MAX_INTERACTIVE_CONCURRENCY)
+MAX_BATCH_CONCURRENCY = _read_positive_int("MAX_BATCH_CONCURRENCY", DEFAULT_MAX_BATCH_CONCURRENCY)
+INTERACTIVE_WORKER_THREADS = _read_positive_int("INTERACTIVE_WORKER_THREADS", DEFAULT_INTERACTIVE_WORKER_THREADS)
+BATCH_WORKER_THREADS = _read_positive_int("BATCH_WORKER_THREADS", DEFAULT_BATCH_WORKER_THREADS)
+# Past these, a lane sheds instead of queueing: a request arriving at a full queue, or still
+# waiting at its deadline, is answered 503 with a `Retry-After`.
+MAX_INTERACTIVE_QUEUED = _read_positive_int("MAX_INTERACTIVE_QUEUED", DEFAULT_MAX_INTERACTIVE_QUEUED)
+MAX_BATCH_QUEUED = _read_positive_int("MAX_BATCH_QUEUED", DEFAULT_MAX_BATCH_QUEUED)
+INTERACTIVE_QUEUE_TIMEOUT_SECONDS = _read_positive_int("INTERACTIVE_QUEUE_TIMEOUT_SECONDS", DEFAULT_INTERACTIVE_QUEUE_TIMEOUT_SECONDS)
+BATCH_QUEUE_TIMEOUT_SECONDS = _read_positive_int("BATCH_QUEUE_TIMEOUT_SECONDS", DEFAULT_BATCH_QUEUE_TIMEOUT_SECONDS)
+# Workspace-sized lint/format batches get a lane of their own: a CI sweep holds neither the
+# batch slots `/execute` runs wait for nor the threads their library loads run on.
+MAX_TOOLS_BATCH_CONCURRENCY = _read_positive_int("MAX_TOOLS_BATCH_CONCURRENCY", DEFAULT_MAX_TOOLS_BATCH_CONCURRENCY)
+TOOLS_BATCH_WORKER_THREADS = _read_positive_int("TOOLS_BATCH_WORKER_THREADS", DEFAULT_TOOLS_BATCH_WORKER_THREADS)
+MAX_TOOLS_BATCH_QUEUED = _read_positive_int("MAX_TOOLS_BATCH_QUEUED", DEFAULT_MAX_TOOLS_BATCH_QUEUED)
+TOOLS_BATCH_QUEUE_TIMEOUT_SECONDS = _read_positive_int("TOOLS_BATCH_QUEUE_TIMEOUT_SECONDS", DEFAULT_TOOLS_BATCH_QUEUE_TIMEOUT_SECONDS)
+
+# `/tools/ws` sessions (`api.routes.tools_ws`). Each open document is held in memory at up to
+# `MAX_MTHDS_FILE_BYTES`, so the per-session document cap bounds a session's footprint.
+MAX_TOOLS_WS_DOCUMENTS = _read_positive_int("MAX_TOOLS_WS_DOCUMENTS", DEFAULT_MAX_TOOLS_WS_DOCUMENTS)
+TOOLS_WS_DEBOUNCE_SECONDS = _read_positive_int("TOOLS_WS_DEBOUNCE_MS", DEFAULT_TOOLS_WS_DEBOUNCE_MS) / 1000
+
+# `/lint/batch` and `/format/batch` (`api.routes.pipelex.tools_batch`). Each file is still bounded by
+# `MAX_MTHDS_FILE_BYTES`; the whole body by `MAX_REQUEST_BODY_BYTES`.
+MAX_TOOLS_BATCH_FILES = _read_positive_int("MAX_TOOLS_BATCH_FILES", DEFAULT_MAX_TOOLS_BATCH_FILES)
+
+# Memoized `pipelex_tools` lint/format results (`api.routes.pipelex.tools.TOOLS_CACHE`), bounded
+# by the summed serialized size of the cached responses.
+TOOLS_CACHE_BYTES = _read_positive_int("TOOLS_CACHE_MIB", DEFAULT_TOOLS_CACHE_MIB) * 1024 * 1024
+
+# Memoized `/codegen` projections (`api.routes.pipelex.codegen.CODEGEN_PROJECTION_CACHE`), bounded
+# by the summed size of the cached stamped artifacts and locks.
+CODEGEN_CACHE_BYTES = _read_positive_int("CODEGEN_CACHE_MIB", DEFAULT_CODEGEN_CACHE_MIB) * 1024 * 1024
+
+# `AUTH_MODE=jwt` (`api.jwt_verification`). Verified tokens are remembered until their `exp`,
+# bounded by the summed token sizes; a JWKS is refetched once it is older than the cache period.
+JWT_VERIFY_CACHE_BYTES = _read_positive_int("JWT_VERIFY_CACHE_KIB", DEFAULT_JWT_VERIFY_CACHE_KIB) * 1024
+JWT_JWKS_CACHE_SECONDS = _read_positive_int("JWT_JWKS_CACHE_SECONDS", DEFAULT_JWT_JWKS_CACHE_SECONDS)
+
+# Callback host resolution (`api.callback_hosts`). `/start` resolves each callback URL's host and
+# refuses one that resolves to a private address; the vetted addresses are cached for
+# `CALLBACK_DNS_CACHE_SECONDS`.
+CALLBACK_DNS_CACHE_SECONDS = _read_positive_int("CALLBACK_DNS_CACHE_SECONDS", DEFAULT_CALLBACK_DNS_CACHE_SECONDS)
+CALLBACK_DNS_TIMEOUT_SECONDS = _read_positive_int("CALLBACK_DNS_TIMEOUT_MS", DEFAULT_CALLBACK_DNS_TIMEOUT_MS) / 1000
+CALLBACK_DNS_CACHE_BYTES = _read_positive_int("CALLBACK_DNS_CACHE_KIB", DEFAULT_CALLBACK_DNS_CACHE_KIB) * 1024
+
+# `Idempotency-Key` on `/execute` and `/start` (`api.idempotency`). The first successful response
+# for a key is replayed to its duplicates for `IDEMPOTENCY_TTL_SECONDS`, bounded by the summed
+# size of the stored bodies.
+IDEMPOTENCY_TTL_SECONDS = _read_positive_int("IDEMPOTENCY_TTL_SECONDS", DEFAULT_IDEMPOTENCY_TTL_SECONDS)
+IDEMPOTENCY_CACHE_BYTES = _read_positive_int("IDEMPOTENCY_CACHE_MIB", DEFAULT_IDEMPOTENCY_CACHE_MIB) * 1024 * 1024
+
+# The JSON error-log sink (`api.log_sink`, `ERROR_LOG_FORMAT=json`). Records wait for the writer
+# thread in a queue of at most `ERROR_LOG_QUEUE_RECORDS`; past that they are dropped and counted.
+ERROR_LOG_QUEUE_RECORDS = _read_positive_int("ERROR_LOG_QUEUE_RECORDS", DEFAULT_ERROR_LOG_QUEUE_RECORDS)
+
+# Pre-fork serving (`api.serve`). Workers are whole processes — each holds its own booted Pipelex
+# and loaded libraries — so size them by cores and memory, not by expected concurrency (the lanes
+# above already bound that per worker). A worker is recycled after `MAX_REQUESTS_PER_WORKER`
+# requests, plus up to `MAX_REQUESTS_JITTER` more so the workers do not all restart together;
+# unset, a worker serves until the server stops.
+WEB_CONCURRENCY = _read_positive_int("WEB_CONCURRENCY", 1)
+MAX_REQUESTS_PER_WORKER: int | None = _read_positive_int("MAX_REQUESTS_PER_WORKER", 0) or None
+MAX_REQUESTS_JITTER = _read_positive_int("MAX_REQUESTS_JITTER", 0)
@@ -0,0 +1,193 @@
+"""The opt-in JSON error-log sink: `emit_error_log` records queued, then written by a background thread.
+
+`emit_error_log` (`api.exception_handlers`) renders its field map to a logfmt line and hands it
+to the synchronous pipelex `log`, on the request's own thread — the event loop, for almost every
+route. That is fine at normal error rates; under an error storm (a provider outage answering 429
+to every run) the escaping, the formatting and the write to the log stream become a share of
+every failing request, and each write blocks the loop for as long as the stream takes.
+`ERROR_LOG_FORMAT=json` moves all of it off the request path:
+
+- **Same fields.** A record is the field map `emit_error_log` was given — `None`-valued fields
+  dropped, as in the logfmt line — plus `timestamp` and `level`, and on `error` records the
+  traceback in `exception`. JSON string escaping is what keeps caller-controlled values (a
+  `detail` with a newline) from forging fields or lines, so `_logfmt_value` is not needed here.
+- **Queued, never blocking.** `emit` captures the record and puts it on a queue; the JSON
+  encoding, the traceback formatting and the write happen on the sink's writer thread, which
+  drains the queue in batches and flushes once per batch.
+- **Bounded.** The queue holds at most `ERROR_LOG_QUEUE_RECORDS`. A record arriving at a full
+  queue is dropped, not waited for: under a storm, losing some log lines is better than the
+  requests that produce them stalling behind the log stream.
+- **Counted.** `error_log_records_total{outcome, level}` in `api.metrics` counts the records
+  `written`, and the ones `dropped` at a full queue, lost to a failing stream, or that could not
+  be encoded (a field map with a non-string key, a value whose `str()` raises). A record that
+  fails to encode is dropped on its own; the rest of its batch is written, and the writer thread
+  keeps running.
+
+The sink writes to `stderr`, where the pipelex `log` writes by default. It is started and
+stopped by the app's lifespan (`api.main`); while it is not running, `emit_error_log` keeps
+the logfmt line. The sampled access log (`api.access_log`) takes the same path, at `info`. The
+format is resolved once at startup, and an unrecognized value fails the boot, as for
+`ERROR_DISCLOSURE`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import queue
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, Literal, get_args
+
+from pipelex.system.environment import get_optional_env
+
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from typing import TextIO
+
+ERROR_LOG_FORMAT_ENV_VAR = "ERROR_LOG_FORMAT"
+
+LogLevel = Literal["error", "warning", "info"]
+
+# Records the writer encodes and writes between two flushes of the stream.
+_MAX_BATCH_RECORDS = 256
+
+
+class ErrorLogFormat(StrEnum):
+    LOGFMT = "logfmt"
+    JSON = "json"
+
+
+class InvalidErrorLogFormatError(ValueError):
+    """Raised at startup when `ERROR_LOG_FORMAT` holds an unrecognized value."""
+
+
+def resolve_error_log_format() -> ErrorLogFormat:
+    """Resolve `ERROR_LOG_FORMAT` to an `ErrorLogFormat`.
+
+    Returns `ErrorLogFormat.LOGFMT` when the variable is unset or blank. Raises
+    `InvalidErrorLogFormatError` for any value other than `logfmt` or `json` (matched
+    case-insensitively, surrounding whitespace ignored).
+    """
+    raw = get_optional_env(ERROR_LOG_FORMAT_ENV_VAR)
+    normalized = (raw or "").strip().lower()
+    if not normalized:
+        return ErrorLogFormat.LOGFMT
+    try:
+        return ErrorLogFormat(normalized)
+    except ValueError as exc:
+        valid = ", ".join(f"'{log_format}'" for log_format in ErrorLogFormat)
+        msg = f"{ERROR_LOG_FORMAT_ENV_VAR}={raw!r} is not a valid error log format. Valid values: {valid}."
+        raise InvalidErrorLogFormatError(msg) from exc
+
+
+@dataclass(frozen=True)
+class _Record:
+    logged_at: float
+    level: LogLevel
+    fields: dict[str, Any]
+    exception: BaseException | None
+
+    def json_line(self) -> str:
+        document: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(self.logged_at, tz=UTC).isoformat(timespec="milliseconds"),
+            "level": self.level,
+        }
+        document.update((key, value) for key, value in self.fields.items() if value is not None)
+        if self.exception is not None:
+            document["exception"] = "".join(traceback.format_exception(self.exception))
+        # `default=str`: a field value JSON has no type for (a `Path`, a `UUID`) is logged as its text.
+        return json.dumps(document, default=str) + "\n"
+
+
+class JsonLogSink:
+    """Error-log records as JSON lines, queued by `emit` and written by a background thread."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self._stream = stream
+        self._records: queue.Queue[_Record | None] | None = None
+        self._writer: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._writer is not None
+
+    def start(self, *, max_records: int) -> None:
+        """Start the writer thread, behind a queue of at most `max_records` records."""
+        if self._writer is not None:
+            return
+        records: queue.Queue[_Record | None] = queue.Queue(maxsize=max_records)
+        self._records = records
+        self._writer = threading.Thread(target=self._write, args=(records,), name="json-log-sink", daemon=True)
+        self._writer.start()
+
+    def emit(self, fields: dict[str, Any], *, level: LogLevel) -> None:
+        """Queue one record; dropped, and counted, when the queue is full or the sink is stopped.
+
+        An `error` record carries the exception being handled, formatted on the writer thread.
+        """
+        record = _Record(logged_at=time.time(), level=level, fields=fields, exception=sys.exception() if level == "error" else None)
+        records = self._records
+        if records is None:
+            METRICS.increment("error_log_records_total", outcome="dropped", level=level)
+            return
+        try:
+            records.put_nowait(record)
+        except queue.Full:
+            METRICS.increment("error_log_records_total", outcome="dropped", level=level)
+
+    def close(self, timeout_seconds: float = 5.0) -> None:
+        """Write out the queued records, then stop the writer thread (waiting up to `timeout_seconds`)."""
+        records, writer = self._records, self._writer
+        if records is None or writer is None:
+            return
+        self._records = self._writer = None
+        with contextlib.suppress(queue.Full):
+            records.put(None, timeout=timeout_seconds)
+        writer.join(timeout_seconds)
+
+    def _write(self, records: queue.Queue[_Record | None]) -> None:
+        stream = self._stream or sys.stderr
+        running = True
+        while running:
+            batch = [records.get()]
+            with contextlib.suppress(queue.Empty):
+                while len(batch) < _MAX_BATCH_RECORDS:
+                    batch.append(records.get_nowait())
+            running = all(record is not None for record in batch)
+            encoded: list[_Record] = []
+            lines: list[str] = []
+            for record in batch:
+                if record is None:
+                    continue
+                try:
+                    lines.append(record.json_line())
+                except Exception:  # noqa: BLE001 — one unencodable record is dropped, never the writer thread
+                    self._count([record], outcome="dropped")
+                else:
+                    encoded.append(record)
+            if not encoded:
+                continue
+            try:
+                stream.write("".join(lines))
+                stream.flush()
+            except Exception:  # noqa: BLE001 — the stream is gone (a closed pipe, a closed file): these records are lost, not retried
+                self._count(encoded, outcome="dropped")
+            else:
+                self._count(encoded, outcome="written")
+
+    @staticmethod
+    def _count(records: list[_Record], *, outcome: str) -> None:
+        for level in get_args(LogLevel):
+            amount = sum(1 for record in records if record.level == level)
+            if amount:
+                METRICS.increment("error_log_records_total", amount, outcome=outcome, level=level)
+
+
+ERROR_LOG_SINK = JsonLogSink()
@@ -0,0 +1,189 @@
+"""A byte-budgeted, in-process LRU cache for deterministic results.
+
+Some of what the API computes is a pure function of its input — a lint
+verdict of `(content, source, engine version)`, a formatted file of
+`(content, options, engine version)` — and the same input arrives again and
+again (an editor re-sending an unchanged file, CI re-linting a workspace).
+`ByteBudgetLRU` remembers such results up to a budget in *bytes*, not
+entries, so a handful of megabyte-sized results cannot crowd the process the
+way an entry-count bound would let them.
+
+The caller owns the key (a digest of everything the result depends on,
+engine version included, so an upgrade never serves a stale verdict) and the
+size estimate. Every cache reports `cache_hits_total`, `cache_misses_total`,
+`cache_evictions_total`, and the `cache_bytes` / `cache_entries` gauges,
+labelled by cache name, in `api.metrics`.
+
+Thread-safe: lookups happen on the event loop and stores may come from
+worker threads, so every operation takes one short lock.
+
+Some results are also expensive to *compute* and asked for by several
+requests at once. `SingleFlight` runs one computation per key at a time and
+hands its value to the callers that arrived meanwhile; `SingleFlightCache`
+puts it in front of a `ByteBudgetLRU`, so a shared value is also kept for a
+TTL. Both run on the event loop. The computation runs in the first caller's
+task: if it raises, is cancelled, or produces a value the caller chose not to
+share, the waiting callers go round and one of them computes again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Generic, Literal, TypeVar
+
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+# How a `SingleFlight` / `SingleFlightCache` caller got its value: from the cache, from another
+# caller's computation, or from its own.
+FlightOutcome = Literal["cached", "coalesced", "computed"]
+
+
+class ByteBudgetLRU(Generic[_K, _V]):
+    """Least-recently-used eviction once the summed entry sizes exceed `max_bytes`."""
+
+    def __init__(self, name: str, *, max_bytes: int) -> None:
+        self.name = name
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[_K, tuple[_V, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _publish_levels(self) -> None:
+        METRICS.set_gauge("cache_bytes", self._total_bytes, cache=self.name)
+        METRICS.set_gauge("cache_entries", len(self._entries), cache=self.name)
+
+    def get(self, key: _K) -> _V | None:
+        """The cached value for `key` (refreshing its recency), or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        METRICS.increment("cache_hits_total" if entry is not None else "cache_misses_total", cache=self.name)
+        return entry[0] if entry is not None else None
+
+    def put(self, key: _K, value: _V, *, size: int) -> None:
+        """Store `value` as `size` bytes, evicting the least recently used entries to stay in budget.
+
+        A value larger than the whole budget is not stored — it would evict everything and then itself.
+        """
+        if size > self._max_bytes:
+            return
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                evicted += 1
+            self._publish_levels()
+        if evicted:
+            METRICS.increment("cache_evictions_total", evicted, cache=self.name)
+
+    def clear(self) -> None:
+        """Drop every entry (an invalidation, or a test reset)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._publish_levels()
+
+
+def _always(_value: object) -> bool:
+    return True
+
+
+class SingleFlight(Generic[_K, _V]):
+    """One computation per key at a time, its value shared with the callers that wait for it."""
+
+    def __init__(self) -> None:
+        # Resolved with the value to share, or None when there is none (failed, cancelled, or not shared).
+        self._in_flight: dict[_K, asyncio.Future[_V | None]] = {}
+
+    async def run(self, key: _K, compute: Callable[[], Awaitable[_V]], *, share: Callable[[_V], bool] = _always) -> tuple[_V, FlightOutcome]:
+        """`compute()`'s value, or the shared one of a computation of `key` already in flight."""
+        while True:
+            flight = self._in_flight.get(key)
+            if flight is None:
+                return await self._compute(key, compute, share), "computed"
+            # Shielded: this caller giving up must not cancel the computation the others wait on.
+            shared = await asyncio.shield(flight)
+            if shared is not None:
+                return shared, "coalesced"
+            # Nothing to share: go round, and compute.
+
+    async def _compute(self, key: _K, compute: Callable[[], Awaitable[_V]], share: Callable[[_V], bool]) -> _V:
+        flight: asyncio.Future[_V | None] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = flight
+        shared: _V | None = None
+        try:
+            value = await compute()
+            if share(value):
+                shared = value
+            return value
+        finally:
+            del self._in_flight[key]
+            flight.set_result(shared)
+
+
+class SingleFlightCache(Generic[_K, _V]):
+    """`SingleFlight` in front of a `ByteBudgetLRU`: a shared value is also kept for `ttl_seconds`."""
+
+    def __init__(self, name: str, *, ttl_seconds: float, max_bytes: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._entries: ByteBudgetLRU[_K, tuple[float, _V]] = ByteBudgetLRU(name, max_bytes=max_bytes)
+        self._flights: SingleFlight[_K, _V] = SingleFlight()
+
+    def cached(self, key: _K) -> _V | None:
+        """The unexpired value kept for `key`, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def run(
+        self,
+        key: _K,
+        compute: Callable[[], Awaitable[_V]],
+        *,
+        size: Callable[[_V], int | None],
+        share: Callable[[_V], bool] = _always,
+    ) -> tuple[_V, FlightOutcome]:
+        """The kept value of `key`, or `SingleFlight.run`'s; a shared value of `size` bytes is kept.
+
+        A value `size` returns None for is shared with the callers waiting on it, but not kept.
+        """
+        cached = self.cached(key)
+        if cached is not None:
+            return cached, "cached"
+
+        async def compute_and_keep() -> _V:
+            value = await compute()
+            nbytes = size(value) if share(value) else None
+            if nbytes is not None:
+                self._entries.put(key, (time.monotonic() + self._ttl_seconds, value), size=nbytes)
+            return value
+
+        return await self._flights.run(key, compute_and_keep, share=share)
+
+    def clear(self) -> None:
+        """Drop every kept value (an invalidation, or a test reset)."""
+        self._entries.clear()
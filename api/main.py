@@ -6,14 +6,18 @@ therefore no longer need to catch and shape errors themselves — anything
 they raise lands in the right handler by exception class.
 """
 
+import asyncio
+import signal
+import threading
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as package_version
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends
 from fastapi.middleware.cors import CORSMiddleware
 from mthds.protocol.protocol import PROTOCOL_VERSION
+from pipelex import log
 from pipelex.interpreter_plugins.builtins import BUILTIN_PLUGINS, CORE_UNCONDITIONAL_PLUGIN_NAMES, ENTRY_POINT_GROUPS
 from pipelex.pipelex import Pipelex
 from pipelex.plugins.discovery import build_registrar
@@ -25,19 +29,27 @@ from pipelex.system.runtime import IntegrationMode
 from pydantic import BaseModel, Field
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from api.access_log import AccessLogMiddleware, resolve_access_log_sampling
 from api.api_config import get_api_config, resolve_boot_orchestrator
+from api.completion_signature import COMPLETION_SIGNER
 from api.disclosure import resolve_disclosure_mode
 from api.exception_handlers import register_exception_handlers
-from api.middleware import RequestIdMiddleware, request_body_size_middleware
+from api.inference_config import INFERENCE_CONFIG, reload_inference_config
+from api.limits import ERROR_LOG_QUEUE_RECORDS
+from api.log_sink import ERROR_LOG_SINK, ErrorLogFormat, resolve_error_log_format
+from api.middleware import InferenceSnapshotMiddleware, RequestIdMiddleware, request_body_size_middleware
 from api.openapi_schema import PipelexFastAPI
 from api.routes import router as api_router
 from api.routes.health import router as health_router
+from api.routes.pipelex.agent.models import MODEL_DECK_CACHE
+from api.routes.tools_ws import router as tools_ws_router
 from api.routes.version import router as version_router
-from api.security import get_auth_dependency
+from api.security import AUTH_CONFIG, InvalidAuthConfigError, get_auth_dependency, load_jwt_key_set
+from api.warmup import warm_up
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
+async def lifespan(app: PipelexFastAPI) -> AsyncGenerator[None]:
     # Resolve the deployment's orchestration mode BEFORE booting, so the process can boot
     # under the matching orchestrator. `orchestration_mode` selects the dispatch arm; a
     # non-`direct` (async/boot) orchestrator — e.g. "temporal" — must additionally claim the
@@ -55,11 +67,63 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
     # only needs `runtime_manager.environment` (from PIPELEX_ENV), which resolves without a
     # live singleton. get_api_config() is @cache'd, so the warm here is reused everywhere.
     boot_orchestrator = resolve_boot_orchestrator(get_api_config())
-    Pipelex.make(integration_mode=IntegrationMode.FASTAPI, boot_orchestrator=boot_orchestrator)
+    # Error-log records are written by the JSON sink's thread from here on, when it is selected (`api.log_sink`).
+    if ERROR_LOG_FORMAT is ErrorLogFormat.JSON:
+        ERROR_LOG_SINK.start(max_records=ERROR_LOG_QUEUE_RECORDS)
+    # The completion callback secret, read once rather than per signed callback (`api.completion_signature`).
+    COMPLETION_SIGNER.load()
+    # A `JWT_JWKS_URI` key set that cannot be loaded fails the boot, as a missing secret does.
+    await load_jwt_key_set()
+    # `INFERENCE_CONFIG` holds the inference config as a snapshot a `SIGHUP` can replace (`api.inference_config`).
+    Pipelex.make(integration_mode=IntegrationMode.FASTAPI, boot_orchestrator=boot_orchestrator, models_manager=INFERENCE_CONFIG)
+    # Before the first request, not on it: the OpenAPI bytes and every route's validators (`api.warmup`),
+    # and the encoded `GET /models` answers the SDKs fetch on every session start.
+    warm_up(app)
+    await MODEL_DECK_CACHE.prime()
+    reloads_on_sighup = _install_sighup_reload()
     try:
         yield
     finally:
+        if reloads_on_sighup:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
         Pipelex.teardown_if_needed()
+        # Last: whatever the shutdown logged is written out before the writer stops.
+        await asyncio.to_thread(ERROR_LOG_SINK.close)
+
+
+# Strong references to in-flight reloads: the loop keeps only weak ones to the tasks it runs.
+_reload_tasks: set[asyncio.Task[None]] = set()
+
+
+async def _reload_on_sighup() -> None:
+    try:
+        # Re-reads `API_KEYS_FILE`: keys added, revoked or re-tiered take effect without a restart.
+        await asyncio.to_thread(AUTH_CONFIG.reload)
+    except InvalidAuthConfigError as exc:
+        log.error(f"Auth settings reload refused, keeping the current settings: {exc}")
+    # Re-reads the completion callback secret, so a rotation takes effect without a restart.
+    COMPLETION_SIGNER.load()
+    if await reload_inference_config():
+        MODEL_DECK_CACHE.invalidate()
+        await MODEL_DECK_CACHE.prime()
+
+
+def _schedule_sighup_reload() -> None:
+    task = asyncio.get_running_loop().create_task(_reload_on_sighup())
+    _reload_tasks.add(task)
+    task.add_done_callback(_reload_tasks.discard)
+
+
+def _install_sighup_reload() -> bool:
+    """Reload the auth settings, the callback secrets and the inference config on `SIGHUP`. Returns whether the handler was installed.
+
+    Only the main thread of a process can own a signal: under a server it is, while an in-process
+    lifespan (a test client's) runs on a worker thread and goes without.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _schedule_sighup_reload)
+    return True
 
 
 def _resolve_cors_origins() -> tuple[list[str], bool]:
@@ -87,6 +151,17 @@ def _resolve_cors_origins() -> tuple[list[str], bool]:
 # the handlers without inheriting the env-validation crash).
 ERROR_DISCLOSURE_MODE = resolve_disclosure_mode()
 
+# Same posture for ERROR_LOG_FORMAT: an unrecognized value fails the boot. The JSON sink it
+# selects is started by `lifespan`.
+ERROR_LOG_FORMAT = resolve_error_log_format()
+
+# And for the access log's sample rates (`api.access_log`): a malformed rate fails the boot.
+ACCESS_LOG_SAMPLING = resolve_access_log_sampling()
+
+# Same posture for the auth env vars: resolved once into the `AuthSettings` every verifier reads,
+# so an unknown AUTH_MODE or a mode missing its secret fails the boot instead of each request.
+AUTH_CONFIG.load()
+
 
 def _resolve_http_error_mappers() -> dict[type[Exception], HttpErrorMapperFn]:
     """Resolve the orchestrator plugins' HTTP-error mappers for this deployment.
@@ -159,10 +234,14 @@ fastapi_app = PipelexFastAPI(
     license_info={"name": "MIT", "identifier": "MIT"},
 )
 
+# Innermost: every request — and any task its route spawns — is pinned to the inference config
+# current when it arrived, so a `SIGHUP` reload never changes a run's models mid-flight.
+fastapi_app.add_middleware(InferenceSnapshotMiddleware)
+
 # Order matters: Starlette's `add_middleware` PREPENDS (see
 # `user_middleware.insert(0, ...)` in `starlette.applications`), so the LAST
 # `add_middleware` call becomes the OUTERMOST wrapper. Body-size is registered
-# first so CORS ends up wrapping it: a 413 short-circuit from the body-size
+# before CORS so CORS ends up wrapping it: a 413 short-circuit from the body-size
 # middleware still passes back through CORSMiddleware on the way out, so a
 # cross-origin browser POST sees the RFC 7807 413 with the
 # `Access-Control-Allow-Origin` header it needs — not a generic CORS error
@@ -192,6 +271,11 @@ fastapi_app.include_router(version_router, prefix="/v1")
 auth_dependency = get_auth_dependency()
 fastapi_app.include_router(api_router, prefix="/v1", dependencies=[Depends(auth_dependency)])
 
+# `WS /v1/tools/ws` is NOT public: it sits outside `api_router` only because router-level
+# dependencies (and `HTTPBearer`) are `Request`-typed and never run for a WebSocket. The
+# session authenticates its own handshake against the same AUTH_MODE (`authenticate_connection`).
+fastapi_app.include_router(tools_ws_router, prefix="/v1")
+
 
 class ServiceIdentity(BaseModel):
     """Body of `GET /` — the service identity banner."""
@@ -218,4 +302,6 @@ register_exception_handlers(fastapi_app, disclosure_mode=ERROR_DISCLOSURE_MODE,
 # This is what makes it genuinely outermost: the request-id contextvars are
 # bound, and `X-Request-ID` is echoed, on every response — the catch-all 500
 # included. `app` is the ASGI entrypoint (uvicorn loads `api.main:app`).
-app = RequestIdMiddleware(fastapi_app)
+# The access log sits just inside it, for the same reason: it measures the
+# catch-all 500 too, and its lines carry the bound request id.
+app = RequestIdMiddleware(AccessLogMiddleware(fastapi_app, sampling=ACCESS_LOG_SAMPLING))
@@ -0,0 +1,105 @@
+"""In-process operational metrics — counters, latency summaries, and gauges.
+
+The API has no metrics backend dependency: a deployment that wants Prometheus,
+StatsD, or OTel scrapes `GET /v1/metrics` (or calls `METRICS.snapshot()`) and
+forwards the numbers itself. What lives here is deliberately the minimum an
+operator needs to see what the server is doing — how often a thing happened
+(`increment`), how long it took (`observe`), and how much of it is going on
+right now (`set_gauge`) — keyed by a metric name plus a small set of
+low-cardinality labels.
+
+Label values must be bounded sets (a route group, a cancellation reason, a
+cache name) — never a user id, a pipe code, or a run id, which would grow the
+registry without bound. Correlation by caller or run is the logs' job, not the
+metrics'.
+
+Thread-safe: the counters are touched from the event loop and from worker
+threads (`anyio.to_thread`), so every mutation takes one short lock.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+
+def _metric_key(name: str, labels: dict[str, str]) -> str:
+    """Render `name{label="value",…}` with labels in sorted order, so the key is stable."""
+    if not labels:
+        return name
+    rendered = ",".join(f'{label}="{value}"' for label, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+@dataclass
+class _Summary:
+    """Running count / sum / max of one observed quantity (a latency, a size)."""
+
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def as_dict(self) -> dict[str, float]:
+        return {"count": self.count, "sum": self.total, "max": self.maximum}
+
+
+class MetricsRegistry:
+    """A process-local registry of named counters, summaries, and gauges."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._summaries: dict[str, _Summary] = {}
+        self._gauges: dict[str, float] = {}
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        """Add `amount` to the counter `name` for this label set."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record one observation of `value` (seconds, bytes, …) into the summary `name`."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = _Summary()
+            summary.observe(value)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set the gauge `name` to its current level (an in-flight count, a queue depth, a cache size)."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def counter_value(self, name: str, **labels: str) -> int:
+        """Current value of one counter (0 when it never fired)."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def snapshot(self) -> dict[str, Any]:
+        """A point-in-time copy of every metric, safe to serialize."""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "summaries": {key: summary.as_dict() for key, summary in sorted(self._summaries.items())},
+                "gauges": dict(sorted(self._gauges.items())),
+            }
+
+    def reset(self) -> None:
+        """Drop every metric. For tests; a running server never resets."""
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+            self._gauges.clear()
+
+
+METRICS = MetricsRegistry()
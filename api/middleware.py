@@ -11,6 +11,7 @@ from starlette.datastructures import MutableHeaders
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api.error_types import ErrorType
+from api.inference_config import pinned_inference_snapshot
 from api.limits import MAX_REQUEST_BODY_BYTES, MAX_REQUEST_BODY_MIB
 from api.logging_context import bound_request_context, get_request_id, get_route_path
 from api.problem_document import PROBLEM_JSON_MEDIA_TYPE, build_problem_document_from_api_error
@@ -183,3 +184,22 @@ class RequestIdMiddleware:
 
         with bound_request_context(request_id=request_id, route_path=scope.get("path", "")):
             await self.app(scope, receive, send_with_request_id)
+
+
+class InferenceSnapshotMiddleware:
+    """Pure-ASGI middleware that pins each HTTP request to the inference config current at its arrival.
+
+    See `api.inference_config`: a reload swaps the config for requests that arrive *after* it,
+    while a run already under way — and any background task it spawned — keeps the snapshot it
+    was pinned to.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with pinned_inference_snapshot():
+            await self.app(scope, receive, send)
@@ -0,0 +1,22 @@
+"""Request-header negotiation: alternative response encodings and conditional requests.
+
+A route's JSON body stays the default and the documented contract; a caller opts
+into an alternative (`application/x-ndjson` streaming on the batch tools,
+`application/zip` on `/codegen`) by naming its media type in `Accept`. A route
+that serves an `ETag` (`/models`) answers a matching `If-None-Match` with a 304.
+"""
+
+
+def accepts_media_type(accept: str | None, media_type: str) -> bool:
+    """Whether the `Accept` header names `media_type` (parameters and q-values are not weighed)."""
+    if not accept:
+        return False
+    return any(media_range.split(";", 1)[0].strip().lower() == media_type for media_range in accept.split(","))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether `If-None-Match` names `etag` or is `*` (the weak comparison RFC 9110 prescribes for it)."""
+    if not if_none_match:
+        return False
+    bare_etag = etag.removeprefix("W/")
+    return any(candidate == "*" or candidate.removeprefix("W/") == bare_etag for candidate in (part.strip() for part in if_none_match.split(",")))
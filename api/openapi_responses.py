@@ -101,6 +101,21 @@ def _problem(description: str, *, headers: dict[str, Any] | None = None) -> dict
     return response
 
 
+# The `Idempotency-Key` request header of `/execute` and `/start` (`api.idempotency`). Those
+# routes read their body through the raw `Request`, so the header is declared here, not inferred.
+IDEMPOTENCY_KEY_PARAMETER: dict[str, Any] = {
+    "name": "Idempotency-Key",
+    "in": "header",
+    "required": False,
+    "description": (
+        "Makes a retry safe: the first successful response for this key is replayed (with `Idempotent-Replayed: true`) "
+        "to a later request with the same key and body, and a duplicate sent while the first runs waits for it. "
+        "Scoped to the caller and route. Reused with a different body: 422 `IdempotencyKeyMismatch`."
+    ),
+    "schema": {"type": "string", "minLength": 1, "maxLength": 255},
+}
+
+
 PROBLEM_400_START_REQUIRES_ASYNC: dict[str, Any] = _problem(
     "`StartRequiresAsyncOrchestration` — this deployment's orchestrator is blocking-only and cannot honor "
     "fire-and-forget delivery. Use `POST /execute` instead.",
@@ -136,11 +151,27 @@ PROBLEM_422: dict[str, Any] = _problem(
     "verdict, not a 422 — see each route's response contract.",
 )
 
+_RATE_LIMITED_DESCRIPTION = (
+    "`RateLimited` — the caller's registered API key (`API_KEYS_FILE`) exceeded its quota tier's request rate. "
+    "Only reachable with a key that has a tier."
+)
+
+PROBLEM_429_RATE_LIMITED: dict[str, Any] = _problem(
+    _RATE_LIMITED_DESCRIPTION,
+    headers={
+        "Retry-After": {
+            "description": "Seconds until the key's quota admits another request.",
+            "schema": {"type": "integer"},
+        }
+    },
+)
+
 PROBLEM_429: dict[str, Any] = _problem(
-    "An upstream inference provider rate-limited the run. Passed through from the provider; `Retry-After` is set when the provider supplied a hint.",
+    "An upstream inference provider rate-limited the run. Passed through from the provider; `Retry-After` is set when the provider supplied a hint. "
+    f"Or {_RATE_LIMITED_DESCRIPTION}",
     headers={
         "Retry-After": {
-            "description": "Seconds to wait before retrying, when the upstream provider supplied a hint.",
+            "description": "Seconds to wait before retrying: the key's quota refill, or the upstream provider's hint when it supplied one.",
             "schema": {"type": "integer"},
         }
     },
@@ -161,14 +192,44 @@ PROBLEM_501_METHOD_REF: dict[str, Any] = _problem(
     "but no server-side method registry resolves yet. Submit inline `files[]` instead.",
 )
 
+PROBLEM_503_LANE_OVERLOADED: dict[str, Any] = _problem(
+    "`LaneOverloaded` — the route's priority lane shed the request: its queue was full, or no slot freed up before the "
+    "lane's queue deadline. The request was fine; retry it after `Retry-After`.",
+    headers={
+        "Retry-After": {
+            "description": "Seconds to wait before retrying.",
+            "schema": {"type": "integer"},
+        }
+    },
+)
+
+PROBLEM_503_START: dict[str, Any] = _problem(
+    "`LaneOverloaded` — the batch lane shed the request: its queue was full, or no slot freed up before the lane's "
+    "queue deadline. `CallbackHostUnresolved` — a callback URL's host could not be resolved, or its lookup timed out. "
+    "Nothing was started; retry it after `Retry-After`.",
+    headers={
+        "Retry-After": {
+            "description": "Seconds to wait before retrying.",
+            "schema": {"type": "integer"},
+        }
+    },
+)
+
+PROBLEM_504_RUN_DEADLINE: dict[str, Any] = _problem(
+    "`RunDeadlineExceeded` — the run did not finish within its deadline (`timeout_seconds`, capped by the deployment's "
+    "`MAX_EXECUTE_TIMEOUT_SECONDS`) and was cancelled.",
+)
+
 
 # Attached to the composite `/v1` router (`api.routes`), so every auth-wrapped operation documents
-# the failures any of them can produce: the router-level auth check (401), the body-size middleware
-# (413), request-shape and input-domain rejections (422), and the server-fault floor (500). Declaring
+# the failures any of them can produce: the router-level auth check (401) and its per-key quota
+# (429), the body-size middleware (413), request-shape and input-domain rejections (422), and the
+# server-fault floor (500). Declaring
 # the 422 here is also what suppresses FastAPI's automatic `HTTPValidationError` response.
 COMMON_PROBLEM_RESPONSES: dict[int | str, dict[str, Any]] = {
     401: PROBLEM_401,
     413: PROBLEM_413,
     422: PROBLEM_422,
+    429: PROBLEM_429_RATE_LIMITED,
     500: PROBLEM_500,
 }
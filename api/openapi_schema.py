@@ -20,11 +20,23 @@ one that renders the error media type the way the real server does — without d
 `api.main`'s startup chain (`Pipelex.make`, `get_auth_dependency`, the `ERROR_DISCLOSURE`
 fail-fast), so a misconfigured env var cannot crash collection of every module that needs the
 app class.
+
+The schema never changes after the routes are wired, so `GET /openapi.json` is served from
+bytes rendered once (`PipelexFastAPI.openapi_bytes`) rather than re-encoding the dict on every
+request — and `api.warmup` renders them at boot, so not even the first request builds the schema.
+The request bodies of routes that parse their raw `Request` are documented the same way: declared
+with `raw_request_body_extra`, their JSON schemas are built with the document rather than when the
+route module is imported.
 """
 
+import json
 from typing import Any
 
 from fastapi import FastAPI
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
 from typing_extensions import override
 
 from api.problem_document import PROBLEM_JSON_MEDIA_TYPE
@@ -35,6 +47,30 @@ from api.problem_document import PROBLEM_JSON_MEDIA_TYPE
 _OPENAPI_OPERATION_KEYS = frozenset({"get", "put", "post", "delete", "options", "head", "patch", "trace"})
 
 
+# The `openapi_extra` dicts of routes whose JSON body is read from the raw `Request`, each with the
+# model documenting it. FastAPI keeps a route's `openapi_extra` by reference (also through
+# `include_router`), so filling these in before the first schema build reaches every route.
+_RAW_REQUEST_BODIES: list[tuple[dict[str, Any], type[BaseModel]]] = []
+
+
+def raw_request_body_extra(model: type[BaseModel], openapi_extra: dict[str, Any]) -> dict[str, Any]:
+    """`openapi_extra` for a route that parses its raw `Request`, documenting `model` as its JSON body.
+
+    FastAPI cannot infer a body parameter it never binds, so the route documents it explicitly. The
+    `requestBody` is added by `PipelexFastAPI.openapi()`: `model_json_schema()` walks the whole
+    model, and doing that in the route decorator would put it on every import of the route module.
+    """
+    openapi_extra = dict(openapi_extra)
+    _RAW_REQUEST_BODIES.append((openapi_extra, model))
+    return openapi_extra
+
+
+def _document_raw_request_bodies() -> None:
+    for openapi_extra, model in _RAW_REQUEST_BODIES:
+        if "requestBody" not in openapi_extra:
+            openapi_extra["requestBody"] = {"required": True, "content": {"application/json": {"schema": model.model_json_schema()}}}
+
+
 def _is_error_status(status_code: str) -> bool:
     """Whether an OpenAPI response key denotes a 4xx/5xx status.
 
@@ -65,12 +101,22 @@ def use_problem_json_media_type(schema: dict[str, Any]) -> None:
                     content[PROBLEM_JSON_MEDIA_TYPE] = json_content
 
 
+def _render_json(schema: dict[str, Any]) -> bytes:
+    """The exact bytes `JSONResponse` would render — a cached document must not differ from a fresh one."""
+    return json.dumps(schema, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
 class PipelexFastAPI(FastAPI):
-    """The app class. Stock FastAPI, extended only to publish errors as `application/problem+json`."""
+    """The app class. Stock FastAPI, extended to publish errors as `application/problem+json` and to
+    serve its OpenAPI document from prebuilt bytes.
+    """
+
+    _openapi_bytes: bytes | None = None
 
     @override
     def openapi(self) -> dict[str, Any]:
-        """The OpenAPI schema, with every documented 4xx/5xx moved onto `application/problem+json`.
+        """The OpenAPI schema, with raw request bodies documented and every 4xx/5xx moved onto
+        `application/problem+json`.
 
         The early return keeps the rewrite a one-shot: the base builds the schema and caches it on
         `self.openapi_schema`, returning that same dict, so mutating it in place fixes up the cached
@@ -78,6 +124,37 @@ class PipelexFastAPI(FastAPI):
         """
         if self.openapi_schema is not None:
             return self.openapi_schema
+        _document_raw_request_bodies()
         schema = super().openapi()
         use_problem_json_media_type(schema)
         return schema
+
+    def openapi_bytes(self) -> bytes:
+        """The OpenAPI document as JSON bytes, rendered once and reused by every `GET /openapi.json`."""
+        if self._openapi_bytes is None:
+            self._openapi_bytes = _render_json(self.openapi())
+        return self._openapi_bytes
+
+    @override
+    def setup(self) -> None:
+        """Stock FastAPI setup, with the `openapi_url` route swapped for one serving `openapi_bytes()`.
+
+        The stock route calls `openapi()` and re-encodes the whole dict on every request. Behind a
+        `root_path` that is not yet among the document's `servers`, the stock route adds it per
+        request; that variant is rare and request-dependent, so it is still rendered per request.
+        """
+        super().setup()
+        if not self.openapi_url:
+            return
+        openapi_url = self.openapi_url
+        self.router.routes[:] = [route for route in self.router.routes if not (isinstance(route, Route) and route.path == openapi_url)]
+
+        async def serve_openapi(request: Request) -> Response:
+            root_path = request.scope.get("root_path", "").rstrip("/")
+            if root_path and self.root_path_in_servers:
+                schema = self.openapi()
+                if root_path not in {server.get("url") for server in schema.get("servers", [])}:
+                    return JSONResponse({**schema, "servers": [{"url": root_path}, *schema.get("servers", [])]})
+            return Response(self.openapi_bytes(), media_type="application/json")
+
+        self.add_route(openapi_url, serve_openapi, include_in_schema=False)
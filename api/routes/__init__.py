@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from api.openapi_responses import COMMON_PROBLEM_RESPONSES
 
+from .metrics import router as metrics_router
 from .pipelex import router as pipelex_router
 
 # NOTE: the version router is NOT composed here — `GET /version` is always
@@ -21,3 +22,4 @@ from .pipelex import router as pipelex_router
 router = APIRouter(responses=COMMON_PROBLEM_RESPONSES)
 
 router.include_router(pipelex_router)
+router.include_router(metrics_router)
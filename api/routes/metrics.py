@@ -0,0 +1,40 @@
+"""`GET /metrics` — a point-in-time snapshot of the in-process operational metrics.
+
+Composed into the auth-wrapped `/v1` router: the counters name route groups and
+outcomes, not callers, but they still describe the deployment's traffic, so they
+sit behind the same credential as every other `/v1` route. See `api.metrics` for
+what is recorded and why label values stay low-cardinality.
+"""
+
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+
+from api.metrics import METRICS
+
+router = APIRouter(tags=["operations"])
+
+
+class MetricSummary(BaseModel):
+    """Running aggregate of one observed quantity."""
+
+    count: int = Field(..., description="Number of observations.")
+    sum: float = Field(..., description="Sum of every observation (seconds for latencies, bytes for sizes).")
+    max: float = Field(..., description="Largest single observation.")
+
+
+class MetricsSnapshot(BaseModel):
+    """Body of `GET /metrics`."""
+
+    counters: dict[str, int] = Field(..., description='Monotonic counters keyed by `name{label="value",…}`.')
+    summaries: dict[str, MetricSummary] = Field(..., description='Count / sum / max aggregates keyed by `name{label="value",…}`.')
+    gauges: dict[str, float] = Field(..., description='Current levels (in-flight, queued, cached) keyed by `name{label="value",…}`.')
+
+
+@router.get("/metrics", summary="Operational metrics snapshot")
+async def get_metrics() -> MetricsSnapshot:
+    """Return every counter, summary, and gauge this process has recorded since boot.
+
+    Process-local: behind a multi-worker server each worker answers with its
+    own numbers, so a scraper aggregates across workers itself.
+    """
+    return MetricsSnapshot.model_validate(METRICS.snapshot())
@@ -6,6 +6,7 @@ from .codegen import router as codegen_router
 from .pipeline import router as pipeline_router
 from .resolve import router as resolve_router
 from .tools import router as tools_router
+from .tools_batch import router as tools_batch_router
 from .validate import router as validate_router
 
 router = APIRouter()
@@ -16,4 +17,5 @@ router.include_router(validate_router)
 router.include_router(resolve_router)
 router.include_router(codegen_router)
 router.include_router(tools_router)
+router.include_router(tools_batch_router)
 router.include_router(agent_router)
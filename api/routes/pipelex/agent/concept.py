@@ -4,7 +4,6 @@ import json
 from typing import Any
 
 from fastapi import APIRouter
-from pipelex.builder.operations.concept_ops import concept_spec_to_toml, parse_concept_spec
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
 from api.errors import raise_validation_error
@@ -48,6 +47,9 @@ async def build_concept(request_data: BuildConceptRequest) -> BuildConceptRespon
     catch would mask both. The fix is upstream shape validation in
     `parse_concept_spec`.
     """
+    # Deferred: the builder operations are only ever needed here, and they are not cheap to import.
+    from pipelex.builder.operations.concept_ops import concept_spec_to_toml, parse_concept_spec  # noqa: PLC0415
+
     try:
         concept_spec = parse_concept_spec(request_data.spec)
         toml_content = concept_spec_to_toml(concept_spec)
@@ -1,26 +1,99 @@
 """Models endpoint — the MTHDS Protocol model deck this runner routes to."""
 
-from typing import Annotated
+import hashlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, Query, Request
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import JSONResponse
 from mthds.protocol.models import ModelCategory
 from pipelex.pipeline.runner import PipelexModelDeck
+from pipelex.runtime_hub import get_model_deck
 
 from api.error_types import ErrorType
 from api.errors import raise_validation_error
+from api.metrics import METRICS
+from api.negotiation import etag_matches
 from api.routes.pipelex.pipeline import ApiRunner
 
+if TYPE_CHECKING:
+    from pipelex.cogt.models.model_deck import ModelDeck
+
 router = APIRouter(tags=["agent"])
 
+# Revalidate on every use: the deck is stable for a process's life but changes on a config reload,
+# and a matching `ETag` costs the caller a 304 with no body.
+_MODELS_CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class EncodedModelDeck:
+    """One `GET /models` answer, ready to send: the JSON body and its strong `ETag`."""
+
+    body: bytes
+    etag: str
+
+
+class ModelDeckCache:
+    """The encoded `GET /models` answer per category filter, built once per model deck.
+
+    The deck is fixed when `Pipelex.make` builds the models manager, so every answer is a pure
+    function of it and the `type` filter. Each answer is kept here as encoded bytes, tied to the
+    deck object it was projected from. A different deck behind `get_model_deck()` — after a
+    teardown and re-make, or a config reload — drops them all on the next request. `invalidate`
+    drops them explicitly.
+    """
+
+    def __init__(self) -> None:
+        self._source_deck: ModelDeck | None = None
+        self._encoded: dict[ModelCategory | None, EncodedModelDeck] = {}
+
+    async def get(self, category: ModelCategory | None) -> EncodedModelDeck:
+        """The encoded answer for `category` (None: unfiltered), projecting it on a miss."""
+        current_deck = get_model_deck()
+        if current_deck is not self._source_deck:
+            self._encoded = {}
+            self._source_deck = current_deck
+        encoded = self._encoded.get(category)
+        METRICS.increment("cache_hits_total" if encoded is not None else "cache_misses_total", cache="models")
+        if encoded is None:
+            deck = await ApiRunner().models(category=category)
+            # The bytes `JSONResponse` renders for the same model, so a cached answer equals a fresh one.
+            body = bytes(JSONResponse(content=deck.model_dump(mode="json")).body)
+            encoded = EncodedModelDeck(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+            self._encoded[category] = encoded
+        return encoded
+
+    async def prime(self) -> None:
+        """Encode the unfiltered deck and every category's, so no request pays the projection."""
+        for category in (None, *ModelCategory):
+            await self.get(category)
+
+    def invalidate(self) -> None:
+        """Drop every encoded answer; the next request re-projects from the current deck."""
+        self._source_deck = None
+        self._encoded = {}
 
-@router.get("/models", openapi_extra={"x-mthds-protocol": True})
+
+MODEL_DECK_CACHE = ModelDeckCache()
+
+
+@router.get(
+    "/models",
+    response_model=PipelexModelDeck,
+    openapi_extra={"x-mthds-protocol": True},
+    responses={
+        200: {"headers": {"ETag": {"description": "Strong validator of this deck; send it back as `If-None-Match`.", "schema": {"type": "string"}}}},
+        304: {"description": "The deck is unchanged since the `ETag` sent in `If-None-Match`; no body."},
+    },
+)
 async def get_models(
     request: Request,
     model_type: Annotated[
         str | None,
         Query(alias="type", description="Filter by model category: llm, extract, img_gen, search. Single value (protocol arity)."),
     ] = None,
-) -> PipelexModelDeck:
+) -> Response:
     """List the model deck this runner can route to (MTHDS Protocol `GET /models`).
 
     Answers the protocol `ModelDeck` as produced by `PipelexMTHDSProtocol.models` —
@@ -29,6 +102,10 @@ async def get_models(
     param is a SINGLE protocol `ModelCategory` value: repeated `?type=` values
     (arity, `ValidationError`) and unknown categories (`InvalidModelCategory`) are
     both 422s (RFC 7807).
+
+    The deck only changes when the inference config does, so each answer is encoded
+    once (primed at boot) and served with an `ETag`. A caller that sends it back as
+    `If-None-Match` gets a bodiless 304 while the deck is unchanged.
     """
     # Protocol arity: `type` is a plain single-value enum. FastAPI silently keeps one of
     # several repeated scalar query params, so the multi-value rejection must be explicit.
@@ -46,4 +123,8 @@ async def get_models(
                 message=f"Invalid model category. Valid values: {valid}",
                 error_type=ErrorType.INVALID_MODEL_CATEGORY,
             )
-    return await ApiRunner().models(category=category)
+    encoded = await MODEL_DECK_CACHE.get(category)
+    headers = {"ETag": encoded.etag, "Cache-Control": _MODELS_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), encoded.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=encoded.body, media_type="application/json", headers=headers)
@@ -4,7 +4,6 @@ import json
 from typing import Any
 
 from fastapi import APIRouter
-from pipelex.builder.operations.pipe_ops import parse_pipe_spec, pipe_spec_to_toml
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
 from api.errors import raise_validation_error
@@ -44,6 +43,9 @@ async def build_pipe_spec(request_data: BuildPipeSpecRequest) -> BuildPipeSpecRe
     exactly one site). Pipelex domain failures propagate untouched to the
     global `PipelexError` handler in `api.exception_handlers`.
     """
+    # Deferred: the builder operations are only ever needed here, and they are not cheap to import.
+    from pipelex.builder.operations.pipe_ops import parse_pipe_spec, pipe_spec_to_toml  # noqa: PLC0415
+
     try:
         pipe_spec = parse_pipe_spec(request_data.spec, pipe_type=request_data.pipe_type)
         toml_content = pipe_spec_to_toml(pipe_spec)
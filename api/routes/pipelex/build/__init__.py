@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from .all import router as all_router
 from .inputs import router as inputs_router
 from .output import router as output_router
 from .runner import router as runner_router
@@ -9,3 +10,4 @@ router = APIRouter()
 router.include_router(inputs_router)
 router.include_router(output_router)
 router.include_router(runner_router)
+router.include_router(all_router)
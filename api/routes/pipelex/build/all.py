@@ -0,0 +1,122 @@
+from typing import Annotated, Literal, Union
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from pipelex.core.concepts.concept_representation_generator import ConceptRepresentationFormat
+from pipelex.pipe_machinery.rendering.input_renderer import InputsTemplateFormat
+from pipelex.pipeline.exceptions import ValidateBundleError
+from pydantic import BaseModel, Field
+
+from api.openapi_responses import PROBLEM_501_METHOD_REF
+from api.routes.pipelex.build.inputs import BuildInputsValidReport, render_inputs_report
+from api.routes.pipelex.build.output import BuildOutputValidReport, render_output_report
+from api.routes.pipelex.build.runner import BuildRunnerValidReport, render_runner_report, sweep_requested_closure, swept_crate
+from api.routes.pipelex.crate_ops import (
+    CrateInvalidReport,
+    invalid_crate_report_response,
+    resolve_requested_pipe,
+    teardown_current_library,
+)
+from api.schemas.models import ALLOW_SIGNATURES_DESCRIPTION, MthdsPipeRequest
+
+router = APIRouter(tags=["build"])
+
+
+class BuildAllRequest(MthdsPipeRequest):
+    """The deploy-bundle request: the shared closure + pipe selectors, plus every sibling route's axes.
+
+    The axes keep their sibling defaults, renamed where two routes would otherwise share `format`.
+    """
+
+    inputs_format: InputsTemplateFormat = Field(
+        default=InputsTemplateFormat.JSON,
+        description="Inputs template encoding, as `format` on `POST /build/inputs`.",
+    )
+    explicit: bool = Field(
+        default=False,
+        description="Emit the ceremonial `{concept, content}` envelope for every input, as on `POST /build/inputs`.",
+    )
+    output_format: ConceptRepresentationFormat = Field(
+        default=ConceptRepresentationFormat.SCHEMA,
+        description="Output representation to render, as `format` on `POST /build/output`.",
+    )
+    allow_signatures: bool = Field(default=False, description=ALLOW_SIGNATURES_DESCRIPTION)
+
+
+class BuildAllValidReport(BaseModel):
+    """The 200 **valid** arm: the three per-pipe projections, each exactly its sibling route's valid arm."""
+
+    is_valid: Literal[True] = True
+    pipe_ref: str = Field(..., description="The qualified pipe every projection was generated for — the resolved selector.")
+    requested_pipe_ref: str | None = Field(
+        default=None,
+        description="The `pipe_ref` as submitted. Absent when it was omitted and defaulted to the closure's `main_pipe`.",
+    )
+    inputs: BuildInputsValidReport = Field(..., description="What `POST /build/inputs` returns for the same request.")
+    output: BuildOutputValidReport = Field(..., description="What `POST /build/output` returns for the same request.")
+    runner: BuildRunnerValidReport = Field(..., description="What `POST /build/runner` returns for the same request.")
+    message: str = Field(default="Build bundle generated successfully", description="Status message")
+
+
+# Discriminated 200 response union: the `/validate` discipline — the verdict rides `is_valid`, never
+# the HTTP status.
+BuildAllResponse = Annotated[Union[BuildAllValidReport, CrateInvalidReport], Field(discriminator="is_valid")]
+
+
+@router.post(
+    "/build/all",
+    response_model=BuildAllResponse,
+    # On top of the composite router's shared 401/413/422/500: the `method_ref` closure selector the
+    # envelope accepts but no server-side method registry resolves yet (shared with /resolve, /codegen).
+    responses={501: PROBLEM_501_METHOD_REF},
+)
+async def build_all(request_data: BuildAllRequest) -> JSONResponse:
+    """Generate the inputs template, output representation and runner script for a pipe in one pass.
+
+    A deploy flow wants all three `/build/*` projections of the same pipe. Asked separately, that is
+    three closure loads plus `/build/runner`'s dry-run sweep. Here the closure is loaded and swept
+    **once**, through the same `validate_bundle` call `/build/runner` makes, and all three projections
+    are rendered from the library it leaves current — then torn down once.
+
+    The verdict is therefore `/build/runner`'s: the sweep runs (scoped to the requested or pre-scanned
+    `main_pipe`, the whole closure only when that pre-scan is ambiguous), so a closure the static siblings would accept can still
+    be an invalid verdict here when its pipe fails to dry-run. Each section of the valid arm is
+    byte-for-byte what its sibling route returns for the same pipe and axes.
+
+    Response contract (the `/validate` discipline): an invalid closure — including a failed dry-run of
+    the requested pipe — is a **200** `is_valid: false`. Non-2xx is reserved for no-verdict conditions,
+    the union of the siblings': a request-shape 422 (an unknown or undefaultable pipe ref, a requested
+    pipe SKIPPED for absent cross-package dependencies, a `native.Anything` output with no determinable
+    shape), a 501 for `method_ref`, auth, server fault — RFC 7807 via the global handlers.
+    """
+    try:
+        # If this raises, validate_bundle has already torn down its own library — nothing to clean up here.
+        validate_result = await sweep_requested_closure(request_data, allow_signatures=request_data.allow_signatures)
+    except ValidateBundleError as validate_error:
+        return invalid_crate_report_response(validate_error.to_error_report())
+
+    try:
+        normalized_crate = swept_crate()
+        requested_pipe = resolve_requested_pipe(normalized_crate, pipe_ref=request_data.pipe_ref)
+        report = BuildAllValidReport(
+            pipe_ref=requested_pipe.ref,
+            requested_pipe_ref=request_data.pipe_ref,
+            runner=render_runner_report(
+                normalized_crate,
+                requested_pipe,
+                validate_result=validate_result,
+                requested_pipe_ref=request_data.pipe_ref,
+            ),
+            inputs=render_inputs_report(
+                requested_pipe,
+                requested_pipe_ref=request_data.pipe_ref,
+                template_format=request_data.inputs_format,
+                explicit=request_data.explicit,
+            ),
+            output=render_output_report(requested_pipe, requested_pipe_ref=request_data.pipe_ref, output_format=request_data.output_format),
+        )
+        # exclude_none drops each section's unselected format field (and an absent `requested_pipe_ref`),
+        # exactly as the sibling routes do.
+        return JSONResponse(content=report.model_dump(mode="json", by_alias=True, exclude_none=True))
+    finally:
+        teardown_current_library()
@@ -2,13 +2,15 @@ import json
 from typing import Annotated, Any, Literal, Self, Union
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pipelex.core.pipes.inputs.exceptions import NoInputsRequiredError
 from pipelex.pipe_machinery.rendering.input_renderer import InputsTemplateFormat, render_inputs, render_inputs_toml
 from pipelex.pipeline.exceptions import ValidateBundleError
 from pydantic import BaseModel, Field, model_validator
 
-from api.openapi_responses import PROBLEM_501_METHOD_REF
+from api.coalescing import COALESCER
+from api.lanes import Lane, interactive_lane, run_in_lane
+from api.openapi_responses import PROBLEM_501_METHOD_REF, PROBLEM_503_LANE_OVERLOADED
 from api.routes.pipelex.crate_ops import (
     CrateInvalidReport,
     RequestedPipe,
@@ -19,7 +21,7 @@ from api.routes.pipelex.crate_ops import (
 )
 from api.schemas.models import MthdsPipeRequest
 
-router = APIRouter(tags=["build"])
+router = APIRouter(tags=["build"], dependencies=[interactive_lane], responses={503: PROBLEM_503_LANE_OVERLOADED})
 
 INPUTS_GENERATED_MESSAGE = "Inputs template generated successfully"
 NO_INPUTS_MESSAGE = "This pipe declares no inputs — the template is empty."
@@ -98,9 +100,17 @@ class BuildInputsValidReport(BaseModel):
 BuildInputsResponse = Annotated[Union[BuildInputsValidReport, CrateInvalidReport], Field(discriminator="is_valid")]
 
 
-def _render_report(*, requested: BuildInputsRequest, requested_pipe: RequestedPipe) -> BuildInputsValidReport:
+def render_inputs_report(
+    requested_pipe: RequestedPipe,
+    *,
+    requested_pipe_ref: str | None,
+    template_format: InputsTemplateFormat,
+    explicit: bool,
+) -> BuildInputsValidReport:
     """Render the requested pipe's declared inputs into the valid arm, on the `format` axis.
 
+    Shared with `/build/all`, which renders the same arm from the library its one sweep left current.
+
     A pipe with no inputs raises `NoInputsRequiredError` out of the engine renderers. That is not a
     failure — it is the honest answer "run this with nothing" — so it lands on the valid arm as an
     empty template, mirroring the CLI's exit-0.
@@ -108,24 +118,24 @@ def _render_report(*, requested: BuildInputsRequest, requested_pipe: RequestedPi
     inputs: dict[str, Any] | None = None
     inputs_toml: str | None = None
     message: str = INPUTS_GENERATED_MESSAGE
-    match requested.format:
+    match template_format:
         case InputsTemplateFormat.JSON:
             try:
-                inputs = json.loads(render_inputs(requested_pipe.pipe, explicit=requested.explicit))
+                inputs = json.loads(render_inputs(requested_pipe.pipe, explicit=explicit))
             except NoInputsRequiredError:
                 inputs = {}
                 message = NO_INPUTS_MESSAGE
         case InputsTemplateFormat.TOML:
             try:
-                inputs_toml = render_inputs_toml(requested_pipe.pipe, explicit=requested.explicit)
+                inputs_toml = render_inputs_toml(requested_pipe.pipe, explicit=explicit)
             except NoInputsRequiredError:
                 inputs_toml = ""
                 message = NO_INPUTS_MESSAGE
     return BuildInputsValidReport(
         pipe_ref=requested_pipe.ref,
-        requested_pipe_ref=requested.pipe_ref,
-        format=requested.format,
-        explicit=requested.explicit,
+        requested_pipe_ref=requested_pipe_ref,
+        format=template_format,
+        explicit=explicit,
         inputs=inputs,
         inputs_toml=inputs_toml,
         message=message,
@@ -139,7 +149,7 @@ def _render_report(*, requested: BuildInputsRequest, requested_pipe: RequestedPi
     # envelope accepts but no server-side method registry resolves yet (shared with /resolve, /codegen).
     responses={501: PROBLEM_501_METHOD_REF},
 )
-async def build_inputs(request_data: BuildInputsRequest) -> JSONResponse:
+async def build_inputs(request_data: BuildInputsRequest) -> Response:
     """Generate an example inputs template for a pipe (the inputs projection, per pipe).
 
     Rides the **same static core** as `POST /resolve` and `POST /codegen`: the closure is resolved to
@@ -164,14 +174,31 @@ async def build_inputs(request_data: BuildInputsRequest) -> JSONResponse:
     - **No verdict (non-2xx):** an unknown pipe ref, an omitted `pipe_ref` on a closure with no (or
       several) `main_pipe`, or a malformed closure selector is a request-shape 422 problem+json;
       `method_ref` is a 501 until server-side method-registry resolution exists.
+
+    Identical requests in flight together are answered from one template (`api.coalescing`).
     """
+    return await COALESCER.run("build_inputs", request_data, lambda: _build_inputs(request_data))
+
+
+async def _build_inputs(request_data: BuildInputsRequest) -> JSONResponse:
+    # Loading the closure is CPU-bound and synchronous: it runs, teardown included, on the
+    # interactive lane's threads, so the event loop keeps serving while it does.
+    return await run_in_lane(Lane.INTERACTIVE, _build_inputs_in_lane, request_data)
+
+
+def _build_inputs_in_lane(request_data: BuildInputsRequest) -> JSONResponse:
     try:
         crate = resolve_requested_crate(request_data)
     except ValidateBundleError as validate_error:
         return invalid_crate_report_response(validate_error.to_error_report())
     try:
         requested_pipe = resolve_requested_pipe(crate, pipe_ref=request_data.pipe_ref)
-        report = _render_report(requested=request_data, requested_pipe=requested_pipe)
+        report = render_inputs_report(
+            requested_pipe,
+            requested_pipe_ref=request_data.pipe_ref,
+            template_format=request_data.format,
+            explicit=request_data.explicit,
+        )
         # exclude_none drops the template field the `format` did not select (and an absent
         # `requested_pipe_ref`), so exactly the fields the caller's own request implies are present.
         return JSONResponse(content=report.model_dump(mode="json", by_alias=True, exclude_none=True))
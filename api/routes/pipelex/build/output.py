@@ -81,8 +81,13 @@ class BuildOutputValidReport(BaseModel):
 BuildOutputResponse = Annotated[Union[BuildOutputValidReport, CrateInvalidReport], Field(discriminator="is_valid")]
 
 
-def _render_report(*, requested: BuildOutputRequest, requested_pipe: RequestedPipe) -> BuildOutputValidReport:
-    """Render the requested pipe's declared output into the valid arm, on the `format` axis.
+def render_output_report(
+    requested_pipe: RequestedPipe,
+    *,
+    requested_pipe_ref: str | None,
+    output_format: ConceptRepresentationFormat,
+) -> BuildOutputValidReport:
+    """Render the requested pipe's declared output into the valid arm, on the `format` axis (shared with `/build/all`).
 
     `render_output` raises a bare `ValueError` (documented in its docstring) when the pipe's output is
     `native.Anything` and no concrete option can be determined — a fact about the *requested pipe*,
@@ -91,18 +96,18 @@ def _render_report(*, requested: BuildOutputRequest, requested_pipe: RequestedPi
     output: dict[str, Any] | None = None
     output_python: str | None = None
     try:
-        rendered = render_output(requested_pipe.pipe, output_format=requested.format)
+        rendered = render_output(requested_pipe.pipe, output_format=output_format)
     except ValueError as exc:
         raise_validation_error(f"Cannot render the output representation of pipe '{requested_pipe.ref}': {exc}")
-    match requested.format:
+    match output_format:
         case ConceptRepresentationFormat.SCHEMA | ConceptRepresentationFormat.JSON:
             output = json.loads(rendered)
         case ConceptRepresentationFormat.PYTHON:
             output_python = rendered
     return BuildOutputValidReport(
         pipe_ref=requested_pipe.ref,
-        requested_pipe_ref=requested.pipe_ref,
-        format=requested.format,
+        requested_pipe_ref=requested_pipe_ref,
+        format=output_format,
         output=output,
         output_python=output_python,
     )
@@ -142,7 +147,7 @@ async def build_output(request_data: BuildOutputRequest) -> JSONResponse:
         return invalid_crate_report_response(validate_error.to_error_report())
     try:
         requested_pipe = resolve_requested_pipe(crate, pipe_ref=request_data.pipe_ref)
-        report = _render_report(requested=request_data, requested_pipe=requested_pipe)
+        report = render_output_report(requested_pipe, requested_pipe_ref=request_data.pipe_ref, output_format=request_data.format)
         # exclude_none drops the representation field the `format` did not select (and an absent
         # `requested_pipe_ref`), so exactly the fields the caller's own request implies are present.
         return JSONResponse(content=report.model_dump(mode="json", by_alias=True, exclude_none=True))
@@ -14,26 +14,30 @@ from pipelex.codegen.resolved_concepts import resolve_concepts_from_crate
 from pipelex.core.pipes.variable_multiplicity import parse_concept_with_multiplicity
 from pipelex.interpreter_hub import get_current_library_id_or_none, get_library_manager
 from pipelex.libraries.crate_normalization import normalize_crate
+from pipelex.libraries.library_crate import LibraryCrate
 from pipelex.libraries.pipe.exceptions import PipeNotFoundError
 from pipelex.mthds_parsing.pipelex_bundle_blueprint import PipelexBundleBlueprint
 from pipelex.pipeline.bundle_validator import DryRunOutput, DryRunStatus
 from pipelex.pipeline.exceptions import ValidateBundleError
-from pipelex.pipeline.validate_bundle import validate_bundle
+from pipelex.pipeline.validate_bundle import ValidateBundleResult, validate_bundle
 from pipelex.tools.misc.package_utils import get_package_version
 from pipelex.tools.typing.pydantic_utils import empty_list_factory_of
 from pydantic import BaseModel, Field
 
 from api.errors import raise_validation_error
+from api.metrics import METRICS
 from api.openapi_responses import PROBLEM_501_METHOD_REF
 from api.routes.pipelex.crate_ops import (
     CrateInvalidReport,
     GeneratedArtifact,
+    RequestedPipe,
     invalid_crate_report_response,
+    prescan_main_pipe_ref,
     resolve_requested_pipe,
     selected_files,
     teardown_current_library,
 )
-from api.schemas.models import ALLOW_SIGNATURES_DESCRIPTION, MthdsPipeRequest
+from api.schemas.models import ALLOW_SIGNATURES_DESCRIPTION, MthdsFileItem, MthdsPipeRequest
 
 router = APIRouter(tags=["build"])
 
@@ -123,6 +127,100 @@ def _output_is_list(blueprints: list[PipelexBundleBlueprint], *, pipe_ref: str)
     return False
 
 
+async def _validate_files(files: list[MthdsFileItem], *, allow_signatures: bool, scope: str | None) -> ValidateBundleResult:
+    METRICS.increment("build_sweep_total", scope="pipe" if scope else "closure")
+    return await validate_bundle(
+        mthds_contents=[item.content for item in files],
+        mthds_sources=[item.source for item in files],
+        allow_signatures=allow_signatures,
+        dry_run_pipe_codes=[scope] if scope else None,
+    )
+
+
+async def sweep_requested_closure(request_data: MthdsPipeRequest, *, allow_signatures: bool) -> ValidateBundleResult:
+    """Open one library, load the closure and run the dry-run sweep scoped to the requested pipe.
+
+    With `pipe_ref` omitted, the pipe the route will default to is pre-scanned off the files' headers
+    (`prescan_main_pipe_ref`), so the sweep is scoped to it too; only a closure whose `main_pipe` the
+    pre-scan cannot pin down (none, several, an unparseable header) is swept whole.
+
+    On success `validate_bundle` leaves its library loaded + current, and the caller owns its teardown;
+    on an invalid closure it raises `ValidateBundleError` (the caller's invalid arm) having already torn
+    its library down. Shared by `/build/runner` and `/build/all`.
+    """
+    files = selected_files(request_data)
+    if request_data.pipe_ref is None:
+        prescanned_ref = prescan_main_pipe_ref(files)
+        if prescanned_ref is not None:
+            try:
+                return await _validate_files(files, allow_signatures=allow_signatures, scope=prescanned_ref)
+            except PipeNotFoundError:
+                # The declared `main_pipe` names no loaded pipe. Not the caller's selector, so not theirs
+                # to be told about here: sweep the whole closure and let the default resolution answer,
+                # exactly as it did before the pre-scan existed.
+                pass
+        return await _validate_files(files, allow_signatures=allow_signatures, scope=None)
+    try:
+        return await _validate_files(files, allow_signatures=allow_signatures, scope=request_data.pipe_ref)
+    except PipeNotFoundError as exc:
+        # The engine deliberately lets this one through untranslated (see `translate_to_validate_bundle_error`)
+        # so the caller can own it: a pipe ref naming nothing in the closure is a request-shape 422, not an
+        # invalid-closure verdict — nothing about the closure is wrong. Matches `resolve_requested_pipe`.
+        raise_validation_error(f"Pipe '{request_data.pipe_ref}' not found in the submitted closure: {exc}")
+
+
+def swept_crate() -> LibraryCrate:
+    """The normalized crate of the library a successful `sweep_requested_closure` left current."""
+    library_id = get_current_library_id_or_none()
+    crate = get_library_manager().get_crate(library_id) if library_id else None
+    if crate is None:
+        # Unreachable after a successful in-memory validate (the blueprints were accumulated),
+        # so a None crate is an internal invariant break — a server fault (5xx), never a
+        # caller-facing verdict (mirrors resolve_crate_from_contents's identical guard).
+        msg = "library crate unavailable after a successful bundle load"
+        raise PipelexUnexpectedError(msg)
+    return normalize_crate(crate, mthds_version=MTHDS_STANDARD_VERSION)
+
+
+def render_runner_report(
+    normalized_crate: LibraryCrate,
+    requested_pipe: RequestedPipe,
+    *,
+    validate_result: ValidateBundleResult,
+    requested_pipe_ref: str | None,
+) -> BuildRunnerValidReport:
+    """Emit the stamped `python-structures` projection and the runner script spelled with its class names."""
+    # The sweep tolerates a cross-package unresolved dependency by recording the pipe SKIPPED
+    # instead of failing. Don't hand back runner code for the *requested* pipe in that state.
+    _reject_if_requested_pipe_skipped(validate_result.dry_run_result, pipe_ref=requested_pipe.ref)
+
+    emitted = emit_types(normalized_crate, target=CodegenTarget.PYTHON_STRUCTURES)
+    projection = build_stamped_projection(
+        emitted,
+        crate_fingerprint=normalized_crate.fingerprint,
+        engine_version=get_package_version(),
+        kind=CodegenKind.TYPES,
+        target=CodegenTarget.PYTHON_STRUCTURES,
+    )
+    class_name_overrides = runtime_to_emitted_class_names(resolve_concepts_from_crate(normalized_crate))
+
+    python_code = generate_runner_code(
+        pipe=requested_pipe.pipe,
+        output_multiplicity=_output_is_list(validate_result.blueprints, pipe_ref=requested_pipe.ref),
+        class_name_overrides=class_name_overrides,
+    )
+
+    return BuildRunnerValidReport(
+        pipe_ref=requested_pipe.ref,
+        requested_pipe_ref=requested_pipe_ref,
+        python_code=python_code,
+        structures=RunnerStructures(
+            artifacts=[GeneratedArtifact(path=stamped.filename, content=stamped.content) for stamped in projection.files],
+            lock=projection.lock_content,
+        ),
+    )
+
+
 @router.post(
     "/build/runner",
     response_model=BuildRunnerResponse,
@@ -142,9 +240,9 @@ async def build_runner(request_data: BuildRunnerRequest) -> JSONResponse:
     **emitted** class names — the same flow as a local `pipelex build runner`.
 
     The sweep is scoped to the requested pipe, so unrelated broken siblings do not block a good pipe.
-    When `pipe_ref` is omitted the scope cannot be known before the closure loads, so the whole closure
-    is swept and the pipe then defaults to its `main_pipe` — a stricter verdict, and the honest one for
-    a caller who did not say which pipe they meant.
+    When `pipe_ref` is omitted the scope is the closure's `main_pipe`, pre-scanned off the files'
+    headers before anything loads; only when that pre-scan is ambiguous is the whole closure swept (the
+    pipe then defaults as usual, or the omission is a 422).
 
     Response contract (the `/validate` discipline): an invalid closure — including a failed dry-run of
     the requested pipe — is a produced verdict: a **200** `is_valid: false` with the structured
@@ -153,66 +251,21 @@ async def build_runner(request_data: BuildRunnerRequest) -> JSONResponse:
     requested pipe whose cross-package dependencies are absent from the request), a 501 for
     `method_ref`, auth, server fault — RFC 7807 via the global handlers.
     """
-    library_manager = get_library_manager()
-    files = selected_files(request_data)
-
     try:
         # If this raises, validate_bundle has already torn down its own library — nothing to clean up here.
-        validate_result = await validate_bundle(
-            mthds_contents=[item.content for item in files],
-            mthds_sources=[item.source for item in files],
-            allow_signatures=request_data.allow_signatures,
-            dry_run_pipe_codes=[request_data.pipe_ref] if request_data.pipe_ref else None,
-        )
+        validate_result = await sweep_requested_closure(request_data, allow_signatures=request_data.allow_signatures)
     except ValidateBundleError as validate_error:
         return invalid_crate_report_response(validate_error.to_error_report())
-    except PipeNotFoundError as exc:
-        # The engine deliberately lets this one through untranslated (see `translate_to_validate_bundle_error`)
-        # so the caller can own it: a pipe ref naming nothing in the closure is a request-shape 422, not an
-        # invalid-closure verdict — nothing about the closure is wrong. Matches `resolve_requested_pipe`.
-        raise_validation_error(f"Pipe '{request_data.pipe_ref}' not found in the submitted closure: {exc}")
 
     # Success: validate_bundle left its library loaded + current. Build everything from it, then own its teardown.
-    library_id = get_current_library_id_or_none()
     try:
-        crate = library_manager.get_crate(library_id) if library_id else None
-        if crate is None:
-            # Unreachable after a successful in-memory validate (the blueprints were accumulated),
-            # so a None crate is an internal invariant break — a server fault (5xx), never a
-            # caller-facing verdict (mirrors resolve_crate_from_contents's identical guard).
-            msg = "library crate unavailable after a successful bundle load"
-            raise PipelexUnexpectedError(msg)
-        normalized_crate = normalize_crate(crate, mthds_version=MTHDS_STANDARD_VERSION)
+        normalized_crate = swept_crate()
         requested_pipe = resolve_requested_pipe(normalized_crate, pipe_ref=request_data.pipe_ref)
-
-        # The sweep tolerates a cross-package unresolved dependency by recording the pipe SKIPPED
-        # instead of failing. Don't hand back runner code for the *requested* pipe in that state.
-        _reject_if_requested_pipe_skipped(validate_result.dry_run_result, pipe_ref=requested_pipe.ref)
-
-        emitted = emit_types(normalized_crate, target=CodegenTarget.PYTHON_STRUCTURES)
-        projection = build_stamped_projection(
-            emitted,
-            crate_fingerprint=normalized_crate.fingerprint,
-            engine_version=get_package_version(),
-            kind=CodegenKind.TYPES,
-            target=CodegenTarget.PYTHON_STRUCTURES,
-        )
-        class_name_overrides = runtime_to_emitted_class_names(resolve_concepts_from_crate(normalized_crate))
-
-        python_code = generate_runner_code(
-            pipe=requested_pipe.pipe,
-            output_multiplicity=_output_is_list(validate_result.blueprints, pipe_ref=requested_pipe.ref),
-            class_name_overrides=class_name_overrides,
-        )
-
-        report = BuildRunnerValidReport(
-            pipe_ref=requested_pipe.ref,
+        report = render_runner_report(
+            normalized_crate,
+            requested_pipe,
+            validate_result=validate_result,
             requested_pipe_ref=request_data.pipe_ref,
-            python_code=python_code,
-            structures=RunnerStructures(
-                artifacts=[GeneratedArtifact(path=stamped.filename, content=stamped.content) for stamped in projection.files],
-                lock=projection.lock_content,
-            ),
         )
         return JSONResponse(content=report.model_dump(mode="json", by_alias=True, exclude_none=True))
     finally:
@@ -1,17 +1,23 @@
+import asyncio
 from enum import StrEnum
 from typing import Annotated, Literal, Self, Union
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pipelex.codegen.emission import build_stamped_projection
 from pipelex.codegen.emitters.target import CodegenKind, CodegenTarget
 from pipelex.codegen.emitters.types_emitter import emit_types
 from pipelex.codegen.lock import CODEGEN_LOCK_FILENAME
+from pipelex.libraries.library_crate import LibraryCrate
 from pipelex.pipeline.exceptions import ValidateBundleError
 from pipelex.tools.misc.package_utils import get_package_version
 from pipelex.tools.typing.pydantic_utils import empty_list_factory_of
 from pydantic import BaseModel, Field, model_validator
 
+from api.deterministic_zip import ZIP_MEDIA_TYPE, iter_deterministic_zip
+from api.limits import CODEGEN_CACHE_BYTES
+from api.lru_cache import ByteBudgetLRU
+from api.negotiation import accepts_media_type
 from api.openapi_responses import PROBLEM_501_METHOD_REF
 from api.routes.pipelex.crate_ops import (
     CrateInvalidReport,
@@ -51,11 +57,20 @@ class CodegenRequest(MthdsFilesRequest):
     """The codegen request: the shared closure selector plus the two explicit projection axes."""
 
     kind: CodegenRouteKind = Field(..., description="What to project. `types` projects the crate's concept set into typed models.")
-    target: CodegenTarget = Field(
-        ...,
+    target: CodegenTarget | None = Field(
+        default=None,
         description=(
             "For whom: `ts-zod` (zod schemas + inferred types), `python-pydantic` (self-contained BaseModels), or "
-            "`python-structures` (runtime StructuredContent classes, for a Pipelex host)."
+            "`python-structures` (runtime StructuredContent classes, for a Pipelex host). Exactly one of `target` / `targets`."
+        ),
+    )
+    targets: list[CodegenTarget] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=len(CodegenTarget),
+        description=(
+            "Several targets projected from ONE resolution of the closure, returned as one `projections[]` entry per "
+            "target, in request order. Exactly one of `target` / `targets`; duplicates are rejected."
         ),
     )
     pipe_ref: str | None = Field(
@@ -64,6 +79,23 @@ class CodegenRequest(MthdsFilesRequest):
         description="Pipe selector for per-pipe projection kinds. Not accepted for `types` (a concept-set-wide projection).",
     )
 
+    @model_validator(mode="after")
+    def _exactly_one_target_selector(self) -> Self:
+        if (self.target is None) == (self.targets is None):
+            msg = "Provide exactly one of 'target' or 'targets'"
+            raise ValueError(msg)
+        if self.targets is not None and len(set(self.targets)) != len(self.targets):
+            msg = "'targets' must not repeat a target"
+            raise ValueError(msg)
+        return self
+
+    @property
+    def requested_targets(self) -> list[CodegenTarget]:
+        """The targets to project, in request order — `[target]` for a single-target request."""
+        if self.targets is not None:
+            return self.targets
+        return [self.target] if self.target is not None else []
+
     @model_validator(mode="after")
     def _pipe_ref_only_for_per_pipe_kinds(self) -> Self:
         # `types` is concept-set-wide: silently ignoring a pipe_ref would mislead the caller into
@@ -78,17 +110,33 @@ class CodegenRequest(MthdsFilesRequest):
         return self
 
 
+class CodegenProjection(BaseModel):
+    """One target's stamped artifact set plus its lock — an entry of the valid arm's `projections[]`."""
+
+    target: CodegenTarget = Field(..., description="The projection target.")
+    artifacts: list[GeneratedArtifact] = Field(
+        default_factory=empty_list_factory_of(GeneratedArtifact),
+        description="The stamped generated files.",
+    )
+    lock: str = Field(..., description=f"The `{CODEGEN_LOCK_FILENAME}` content (TOML) tracking this target's artifact set.")
+    lock_filename: str = Field(default=CODEGEN_LOCK_FILENAME, description="Filename the lock content must be written as.")
+
+
 class CodegenValidReport(BaseModel):
     """The 200 **valid** arm: the stamped artifact set plus its lock.
 
     A client that writes each artifact and the lock verbatim reproduces a local
     `pipelex codegen types` run byte-for-byte — the same stamps, the same `codegen.lock` — so the
     offline `codegen check` passes on the written tree exactly as it would locally.
+
+    `projections[]` holds one entry per requested target, in request order. The top-level
+    `target` / `artifacts` / `lock` mirror the FIRST projection — for a single-target request, the
+    only one — so a single-target client reads the report exactly as before.
     """
 
     is_valid: Literal[True] = True
     kind: CodegenRouteKind = Field(..., description="The projected kind (echo of the request).")
-    target: CodegenTarget = Field(..., description="The projection target (echo of the request).")
+    target: CodegenTarget = Field(..., description="The projection target (the first one, for a multi-target request).")
     crate_fingerprint: str = Field(..., description="Fingerprint of the normalized crate the artifacts were generated from.")
     engine_version: str = Field(..., description="The pipelex engine version that generated the artifacts.")
     artifacts: list[GeneratedArtifact] = Field(
@@ -99,24 +147,102 @@ class CodegenValidReport(BaseModel):
         ..., description=f"The `{CODEGEN_LOCK_FILENAME}` content (TOML) tracking the artifact set — write verbatim beside the artifacts."
     )
     lock_filename: str = Field(default=CODEGEN_LOCK_FILENAME, description="Filename the lock content must be written as.")
+    projections: list[CodegenProjection] = Field(
+        default_factory=empty_list_factory_of(CodegenProjection),
+        description="One stamped artifact set + lock per requested target, in request order.",
+    )
     message: str = Field(default="Codegen artifacts generated successfully", description="Status message")
 
 
+# A stamped projection is fully determined by (crate fingerprint, kind, target, engine version): the
+# emitters read nothing but the normalized crate, and the stamps carry exactly those four. Keyed on
+# the fingerprint rather than the request, so different closures that normalize to the same crate —
+# reordered files, renamed sources — share a hit, and a re-run of unchanged concepts skips emission.
+CODEGEN_PROJECTION_CACHE: ByteBudgetLRU[tuple[str, CodegenRouteKind, CodegenTarget, str], CodegenProjection] = ByteBudgetLRU(
+    "codegen_projections", max_bytes=CODEGEN_CACHE_BYTES
+)
+
+
+def _projection_size(projection: CodegenProjection) -> int:
+    return len(projection.lock) + sum(len(artifact.path) + len(artifact.content) for artifact in projection.artifacts)
+
+
+def _project(crate: LibraryCrate, kind: CodegenRouteKind, target: CodegenTarget, engine_version: str) -> CodegenProjection:
+    """Emit and stamp one target's projection of `crate` — a pure function of the crate, kind, target and engine."""
+    emitted = emit_types(crate, target=target)
+    projection = build_stamped_projection(
+        emitted,
+        crate_fingerprint=crate.fingerprint,
+        engine_version=engine_version,
+        kind=kind.engine_kind,
+        target=target,
+    )
+    return CodegenProjection(
+        target=target,
+        artifacts=[GeneratedArtifact(path=stamped.filename, content=stamped.content) for stamped in projection.files],
+        lock=projection.lock_content,
+    )
+
+
+async def _project_targets(crate: LibraryCrate, kind: CodegenRouteKind, targets: list[CodegenTarget]) -> list[CodegenProjection]:
+    """Project every target off the one resolved crate, in request order.
+
+    Targets already in `CODEGEN_PROJECTION_CACHE` are answered from it; the rest are emitted
+    concurrently on worker threads and stored. Every emission is awaited before the first failure
+    is re-raised, so no worker thread is still reading the crate when the caller's `finally` tears
+    its library down.
+    """
+    engine_version = get_package_version()
+    keys = [(crate.fingerprint, kind, target, engine_version) for target in targets]
+    cached = [CODEGEN_PROJECTION_CACHE.get(key) for key in keys]
+    misses = [key for key, projection in zip(keys, cached, strict=True) if projection is None]
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(_project, crate, kind, target, engine_version) for _, _, target, _ in misses),
+        return_exceptions=True,
+    )
+    emitted: dict[CodegenTarget, CodegenProjection] = {}
+    for key, outcome in zip(misses, outcomes, strict=True):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        CODEGEN_PROJECTION_CACHE.put(key, outcome, size=_projection_size(outcome))
+        emitted[key[2]] = outcome
+    return [projection if projection is not None else emitted[target] for target, projection in zip(targets, cached, strict=True)]
+
+
 # Discriminated 200 response union: the `/validate` discipline (see `POST /resolve`).
 CodegenResponse = Annotated[Union[CodegenValidReport, CrateInvalidReport], Field(discriminator="is_valid")]
 
 
+def _zip_entries(projections: list[CodegenProjection], *, per_target_directories: bool) -> list[tuple[str, str]]:
+    """The archive layout: each projection's artifacts then its lock — under `<target>/` for a multi-target request."""
+    entries: list[tuple[str, str]] = []
+    for projection in projections:
+        prefix = f"{projection.target}/" if per_target_directories else ""
+        entries += [(f"{prefix}{artifact.path}", artifact.content) for artifact in projection.artifacts]
+        entries.append((f"{prefix}{projection.lock_filename}", projection.lock))
+    return entries
+
+
 @router.post(
     "/codegen",
     response_model=CodegenResponse,
-    # On top of the composite router's shared 401/413/422/500: the `method_ref` closure selector
-    # the envelope accepts but no server-side method registry resolves yet (shared with `/resolve`).
-    responses={501: PROBLEM_501_METHOD_REF},
+    responses={
+        200: {
+            "description": (
+                f"The verdict report — or, with `Accept: {ZIP_MEDIA_TYPE}` and a valid verdict, a deterministic zip of the "
+                "stamped artifacts and `codegen.lock` (one `<target>/` directory per target when `targets` is used)."
+            ),
+            "content": {ZIP_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}},
+        },
+        # On top of the composite router's shared 401/413/422/500: the `method_ref` closure selector
+        # the envelope accepts but no server-side method registry resolves yet (shared with `/resolve`).
+        501: PROBLEM_501_METHOD_REF,
+    },
     # NOT tagged `x-mthds-protocol` — a Pipelex API extension, like `/resolve`. The MTHDS standard
     # specifies the crate this reads (the Library Crate Format); it specifies no type projection, so
     # every `target` here — `ts-zod` and `python-pydantic` no less than `python-structures` — is ours.
 )
-async def codegen_mthds(request_data: CodegenRequest) -> JSONResponse:
+async def codegen_mthds(request: Request, request_data: CodegenRequest) -> JSONResponse | StreamingResponse:
     """Generate typed artifacts from a library closure (Pipelex API extension).
 
     Resolves the closure to its normalized crate (exactly like `POST /resolve`), then projects it
@@ -127,7 +253,12 @@ async def codegen_mthds(request_data: CodegenRequest) -> JSONResponse:
 
     Response contract (the `/validate` discipline):
 
-    - **Valid verdict (200, `is_valid: true`):** the artifacts + lock on the valid arm.
+    - **Valid verdict (200, `is_valid: true`):** the artifacts + lock on the valid arm, one
+      `projections[]` entry per target. `targets` projects several targets from ONE resolution;
+      emission runs on worker threads, one per target, off the event loop. With
+      `Accept: application/zip` the valid verdict is instead a deterministic zip of the same
+      files, streamed entry by entry — no JSON escaping, no whole-response assembly. An invalid
+      verdict stays the JSON report whatever the `Accept`.
     - **Invalid verdict (200, `is_valid: false`):** the library could not be parsed, loaded, or
       validated — `validation_errors[]` from pipelex's one shared builder; no artifacts exist.
     - **No verdict (non-2xx):** an unknown projection `kind`/`target`, a `pipe_ref` on a
@@ -140,21 +271,23 @@ async def codegen_mthds(request_data: CodegenRequest) -> JSONResponse:
     except ValidateBundleError as validate_error:
         return invalid_crate_report_response(validate_error.to_error_report())
     try:
-        emitted = emit_types(crate, target=request_data.target)
-        projection = build_stamped_projection(
-            emitted,
-            crate_fingerprint=crate.fingerprint,
-            engine_version=get_package_version(),
-            kind=request_data.kind.engine_kind,
-            target=request_data.target,
-        )
+        projections = await _project_targets(crate, request_data.kind, request_data.requested_targets)
+        if accepts_media_type(request.headers.get("accept"), ZIP_MEDIA_TYPE):
+            entries = _zip_entries(projections, per_target_directories=request_data.targets is not None)
+            return StreamingResponse(
+                iter_deterministic_zip(entries),
+                media_type=ZIP_MEDIA_TYPE,
+                headers={"Content-Disposition": f'attachment; filename="codegen-{request_data.kind}.zip"'},
+            )
+        first = projections[0]
         report = CodegenValidReport(
             kind=request_data.kind,
-            target=request_data.target,
+            target=first.target,
             crate_fingerprint=crate.fingerprint,
             engine_version=get_package_version(),
-            artifacts=[GeneratedArtifact(path=stamped.filename, content=stamped.content) for stamped in projection.files],
-            lock=projection.lock_content,
+            artifacts=first.artifacts,
+            lock=first.lock,
+            projections=projections,
         )
         return JSONResponse(content=report.model_dump(mode="json", by_alias=True))
     finally:
@@ -11,9 +11,12 @@ The invalid arm here is the *crate* verdict: it deliberately omits `/validate`'s
 `pipelex resolve`), so runnability is not part of its vocabulary. The per-pipe projections
 (`/build/{inputs,output}`) ride that same static core: a template is a read of the pipe's *declared*
 IO, so a valid verdict there says the closure is structurally sound, never that the pipe runs.
-`/build/runner` is the exception — it needs the dry-run sweep, so it keeps `validate_bundle`.
+`/build/runner` is the exception — it needs the dry-run sweep, so it keeps `validate_bundle` (and,
+to scope that sweep before anything loads, `prescan_main_pipe_ref`).
 """
 
+import re
+import tomllib
 from typing import Literal, NamedTuple
 
 from fastapi.responses import JSONResponse
@@ -155,6 +158,37 @@ def _default_main_pipe_ref(crate: LibraryCrate) -> str:
     return candidates[0]
 
 
+_TABLE_HEADER_LINE = re.compile(r"^\s*\[", re.MULTILINE)
+
+
+def prescan_main_pipe_ref(files: list[MthdsFileItem]) -> str | None:
+    """The closure's single `main_pipe` (qualified), read off the files' headers **before** any load.
+
+    A header-level parse: only each file's top-level keys (the text before its first `[table]`) are
+    decoded, so a large closure costs a few lines of TOML per file rather than a load. It answers the
+    same question `_default_main_pipe_ref` answers after the load, so `/build/runner` can scope its
+    dry-run sweep to the pipe the default will pick.
+
+    Returns None whenever the pre-scan cannot be sure — no `main_pipe`, several, a header that does not
+    parse on its own, a `main_pipe` with no `domain` — and the caller falls back to sweeping everything.
+    """
+    candidates: set[str] = set()
+    for item in files:
+        header_match = _TABLE_HEADER_LINE.search(item.content)
+        header = item.content[: header_match.start()] if header_match else item.content
+        try:
+            top_level = tomllib.loads(header)
+        except tomllib.TOMLDecodeError:
+            return None
+        domain_code, main_pipe = top_level.get("domain"), top_level.get("main_pipe")
+        if main_pipe is None:
+            continue
+        if not isinstance(domain_code, str) or not isinstance(main_pipe, str):
+            return None
+        candidates.add(f"{domain_code}.{main_pipe}")
+    return candidates.pop() if len(candidates) == 1 else None
+
+
 def teardown_current_library() -> None:
     """Tear down the library `resolve_requested_crate` left loaded + current (success-path cleanup)."""
     library_id = get_current_library_id_or_none()
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
-import hashlib
-import hmac
-from contextlib import contextmanager
+import asyncio
+from contextlib import contextmanager, suppress
 from pathlib import Path, PurePosixPath
 from typing import TYPE_CHECKING, Annotated, Any, cast
+from urllib.parse import urlsplit
 
+import httpcore
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from kajson import kajson
 from kajson.exceptions import KajsonDecoderError
 from mthds.protocol.exceptions import PipelineRequestError
 from pipelex.config import get_config, is_pipe_func_sandbox_hosted
 from pipelex.core.pipes.pipe_output import PipeOutput
+from pipelex.interpreter_hub import get_library_manager
+from pipelex.libraries.exceptions import LibraryError
 from pipelex.pipe_run.delivery_assignment import DeliveryAssignment, StorageTarget, WebhookTarget
 from pipelex.pipe_run.pipe_run_protocol import PipeRunProtocol
+from pipelex.pipeline.direct_bundle_validator import DirectBundleValidator
+from pipelex.pipeline.exceptions import PipeExecutionError
+from pipelex.pipeline.execution_seams import acquire_library
 from pipelex.pipeline.pipeline_response import PipelexRunResultExecute, PipelexRunResultStart, RunState
 from pipelex.pipeline.pipeline_run_setup import pipeline_run_setup
 from pipelex.pipeline.runner import PipelexMTHDSProtocol
@@ -22,28 +28,39 @@ from pipelex.reporting.usage_records import apply_tokens_usage_wire_shape
 from pipelex.runtime_bridge.exceptions import MissingBundleValidatorError, MissingOrchestratorError
 from pipelex.runtime_bridge.primitives.hydration import hydrate_working_memory
 from pipelex.runtime_hub import get_bundle_validator_registry, get_orchestrator_registry
-from pipelex.system.environment import get_required_env
+from pipelex.tools.network.exceptions import SsrfBlockedError
 from pydantic import ValidationError
 from typing_extensions import override
 
 from api.api_config import get_api_config, resolve_orchestration_mode
 from api.bundle import ParsedBundle, materialize_parsed, parse_bundle
+from api.callback_hosts import CALLBACK_HOST_RESOLVER
+from api.cancellation import run_cancellable
+from api.completion_signature import COMPLETION_SIGNER
 from api.error_types import ErrorType
-from api.errors import raise_bad_request, raise_forbidden, raise_validation_error
+from api.errors import raise_bad_request, raise_forbidden, raise_service_unavailable, raise_validation_error
+from api.idempotency import IDEMPOTENT_RUNS
+from api.lanes import Lane, batch_lane, run_coroutine_in_lane, run_in_lane
+from api.limits import MAX_EXECUTE_TIMEOUT_SECONDS
 from api.logging_context import get_request_id
 from api.openapi_responses import (
+    IDEMPOTENCY_KEY_PARAMETER,
     PROBLEM_400_START_REQUIRES_ASYNC,
     PROBLEM_403_ORCHESTRATION_MODE,
     PROBLEM_409_DUPLICATE_RUN,
     PROBLEM_429,
     PROBLEM_501_ASYNC_NOT_ENABLED,
+    PROBLEM_503_LANE_OVERLOADED,
+    PROBLEM_503_START,
+    PROBLEM_504_RUN_DEADLINE,
 )
+from api.openapi_schema import raw_request_body_extra
 from api.routes.pipelex.utils import get_current_iso_timestamp
 from api.schemas.models import PipelexApiExecuteRequest, PipelexApiExecuteResponse, PipelexApiStartRequest, PipelineApiExtras, RunRequest
 from api.security import SINGLE_TENANT_USER_ID
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Coroutine, Generator
 
     from mthds.protocol.pipe_output import VariableMultiplicity
     from mthds.protocol.pipeline_inputs import PipelineInputs
@@ -52,13 +69,14 @@ if TYPE_CHECKING:
     from pipelex.core.memory.working_memory import WorkingMemory
     from pipelex.pipe_run.pipe_job import PipeJob
     from pipelex.pipeline.validation_report import PipelexValidationReport
+    from pipelex.plugins.bundle_validator_registry import BundleValidationVerdict
     from pipelex.plugins.orchestrator_registry import OrchestratorProtocol
     from pipelex.runtime_bridge.payloads import PipelexPipeRunOutput
 
     from api.security import RequestUser
 
 
-router = APIRouter(tags=["run"])
+router = APIRouter(tags=["run"], dependencies=[batch_lane], responses={503: PROBLEM_503_LANE_OVERLOADED})
 
 
 def _get_user_id(request: Request) -> str:
@@ -106,21 +124,6 @@ def _resolve_storage_scope(request: Request, *, requested: str | None) -> str:
     return requested or _get_user_id(request)
 
 
-def _completion_signature(pipeline_run_id: str) -> str:
-    """Compute the HMAC-SHA256 signature for an async completion callback.
-
-    The signer (this server) and the verifier (your callback receiver) must
-    share the same `COMPLETION_CALLBACK_SECRET`. The signature is per-run and
-    the secret never travels — only the one-way hash does.
-    """
-    secret = get_required_env("COMPLETION_CALLBACK_SECRET")
-    return hmac.new(
-        secret.encode("utf-8"),
-        pipeline_run_id.encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
-
-
 def _pipe_output_from_run_output(run_output: PipelexPipeRunOutput) -> PipeOutput:
     """Rehydrate an orchestrator's JSON-safe `PipelexPipeRunOutput` into a typed `PipeOutput`.
 
@@ -228,6 +231,12 @@ class ApiRunner(PipelexMTHDSProtocol):
         cleanup, telemetry, error mapping); only the dispatch backend and the output rehydration
         (`_OrchestratorPipeRun`) change. `requested_orchestration_mode` is the optional per-request
         backend override (`PipelineApiExtras.orchestration_mode`).
+
+        Cancellation (a deadline or a disconnect, `api.cancellation`) interrupts the run at its
+        next await, but not the library load: that runs on a batch lane thread, which cannot be
+        interrupted. A run cancelled while its library loads stops waiting at once; the load runs
+        to completion on its thread, still holding its lane thread, and the library is then torn
+        down (`_teardown_abandoned_library`).
         """
         # Resolve the effective orchestration mode FIRST — a per-request override the deployment
         # policy forbids is refused (403) here, before any library load / run registration. Mirrors start().
@@ -241,16 +250,52 @@ class ApiRunner(PipelexMTHDSProtocol):
         # ApiRunner is constructed per request, so mutating _pipe_run here is request-scoped.
         # `/execute` is synchronous, so it drives the orchestrator's BLOCKING `execute` arm.
         self._pipe_run = _OrchestratorPipeRun(orchestrator=orchestrator)
-        return await super().execute(
-            pipe_code=pipe_code,
-            mthds_contents=mthds_contents,
-            inputs=inputs,
-            output_name=output_name,
-            output_multiplicity=output_multiplicity,
-            dynamic_output_concept_ref=dynamic_output_concept_ref,
-            extra=extra,
-            delivery_assignment=delivery_assignment,
+
+        # Load the library on the batch lane's threads: parsing and loading a bundle is synchronous,
+        # and inside the base setup it would hold the event loop for its whole duration. The base
+        # execute then adopts the loaded library by id (loading nothing more) and tears it down.
+        library_id, qualified_main_pipe = await self._load_library_in_lane(mthds_contents=mthds_contents)
+        try:
+            if mthds_contents and not pipe_code:
+                if not qualified_main_pipe:
+                    msg = "No pipe_code provided and no main_pipe found in any of the MTHDS contents."
+                    raise PipeExecutionError(message=msg)
+                pipe_code = qualified_main_pipe
+            # An explicit empty `library_dirs` loads nothing: the library is already loaded.
+            self.library_id, self.library_dirs, self.bundle_uris = library_id, list[str](), None
+            return await super().execute(
+                pipe_code=pipe_code,
+                inputs=inputs,
+                output_name=output_name,
+                output_multiplicity=output_multiplicity,
+                dynamic_output_concept_ref=dynamic_output_concept_ref,
+                extra=extra,
+                delivery_assignment=delivery_assignment,
+            )
+        finally:
+            # The base execute tears the library down once its setup has adopted it; this covers a
+            # failure before that point.
+            with suppress(LibraryError):
+                get_library_manager().teardown(library_id=library_id)
+
+    async def _load_library_in_lane(self, *, mthds_contents: list[str] | None) -> tuple[str, str | None]:
+        """Open and load this run's library on a batch lane thread; returns its id and qualified `main_pipe`."""
+        load = asyncio.ensure_future(
+            run_in_lane(
+                Lane.BATCH,
+                acquire_library,
+                library_id="",
+                library_dirs=self.library_dirs,
+                mthds_contents=mthds_contents,
+                bundle_uris=self.bundle_uris,
+            )
         )
+        try:
+            return await asyncio.shield(load)
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted: the library it finishes loading is torn down then.
+            load.add_done_callback(_teardown_abandoned_library)
+            raise
 
     @override
     async def start(
@@ -340,6 +385,7 @@ class ApiRunner(PipelexMTHDSProtocol):
             request_id=request_id,
         )
 
+        signature_headers = COMPLETION_SIGNER.headers(resolved_pipeline_run_id) if callback_urls else {}
         delivery_assignment = DeliveryAssignment(
             # NO `key_prefix` — the runtime owns the `results/` leaf.
             #
@@ -357,15 +403,8 @@ class ApiRunner(PipelexMTHDSProtocol):
             # plus the transitional `status` alias) are written per delivery by
             # pipelex's DeliveryExecutor — they are reserved keys on
             # WebhookTarget.payload, so nothing is injected here.
-            webhooks=[
-                WebhookTarget(
-                    url=url,
-                    headers={"X-Completion-Signature": _completion_signature(resolved_pipeline_run_id)},
-                )
-                for url in callback_urls
-            ]
-            if callback_urls
-            else [],
+            # Signed once for the run: the signature depends only on `pipeline_run_id` (`api.completion_signature`).
+            webhooks=[WebhookTarget(url=url, headers=signature_headers) for url in callback_urls] if callback_urls else [],
         )
 
         # Dispatch the locally-built job through the resolved mode's orchestrator (looked up and
@@ -421,12 +460,22 @@ class ApiRunner(PipelexMTHDSProtocol):
         if validator is None:
             raise MissingBundleValidatorError(mode=orchestration_mode)
         library_dirs = [Path(library_dir) for library_dir in self.library_dirs] if self.library_dirs else None
-        verdict = await validator.validate_bundles(
-            mthds_contents=mthds_contents,
-            mthds_sources=mthds_sources,
-            allow_signatures=allow_signatures,
-            library_dirs=library_dirs,
-        )
+
+        def validate() -> Coroutine[Any, Any, BundleValidationVerdict]:
+            return validator.validate_bundles(
+                mthds_contents=mthds_contents,
+                mthds_sources=mthds_sources,
+                allow_signatures=allow_signatures,
+                library_dirs=library_dirs,
+            )
+
+        if isinstance(validator, DirectBundleValidator):
+            # The in-process validator loads and dry-runs the library between its awaits: it runs on
+            # the interactive lane's threads, in a loop of its own, so the server's loop is never held.
+            # A dispatched validator only awaits its worker, on clients bound to the server's loop.
+            verdict = await run_coroutine_in_lane(Lane.INTERACTIVE, validate)
+        else:
+            verdict = await validate()
         # The core seam types its valid arm at the protocol-level ValidationReport (a leaf type)
         # to stay import-acyclic in core; every registered validator in fact produces the canonical
         # PipelexValidationReport. Recover the precise type here — the single narrowing point — so
@@ -434,6 +483,14 @@ class ApiRunner(PipelexMTHDSProtocol):
         return cast("PipelexValidationReport | ErrorReport", verdict)
 
 
+def _teardown_abandoned_library(load: asyncio.Future[tuple[str, str | None]]) -> None:
+    if load.cancelled() or load.exception() is not None:
+        return
+    library_id, _ = load.result()
+    with suppress(LibraryError):
+        get_library_manager().teardown(library_id=library_id)
+
+
 def _decode_body(body: bytes) -> dict[str, Any]:
     """kajson-decode the body and confirm it's a dict. Raises 422 if not.
 
@@ -476,7 +533,11 @@ def _decode_body(body: bytes) -> dict[str, Any]:
 
 
 def _validate_extras(request_data: dict[str, Any]) -> PipelineApiExtras:
-    """Validate API-server-only fields (pipeline_run_id, callback_urls, orchestration_mode, storage_scope)."""
+    """Validate API-server-only fields (pipeline_run_id, callback_urls, orchestration_mode, storage_scope, timeout_seconds).
+
+    A failure confined to `callback_urls` keeps its finer `InvalidCallbackUrls` classification;
+    any other field failing is a plain `ValidationError`.
+    """
     try:
         return PipelineApiExtras.model_validate(
             {
@@ -488,15 +549,48 @@ def _validate_extras(request_data: dict[str, Any]) -> PipelineApiExtras:
                 # error: the run falls back to the caller's own id and writes to
                 # the wrong prefix while reporting success.
                 "storage_scope": request_data.get("storage_scope"),
+                "timeout_seconds": request_data.get("timeout_seconds"),
             }
         )
     except ValidationError as exc:
+        only_callback_urls = all(error["loc"][:1] == ("callback_urls",) for error in exc.errors())
         raise_validation_error(
             message=str(exc),
-            error_type=ErrorType.INVALID_CALLBACK_URLS,
+            error_type=ErrorType.INVALID_CALLBACK_URLS if only_callback_urls else ErrorType.VALIDATION_ERROR,
         )
 
 
+# A failed lookup is not cached (`api.callback_hosts`), so a retry resolves afresh.
+_CALLBACK_HOST_RETRY_AFTER_SECONDS = 1
+
+
+async def _vet_callback_hosts(callback_urls: list[str] | None) -> None:
+    """Refuse callback URLs whose host resolves to a private address, or does not resolve.
+
+    `PipelineApiExtras` only sees the host as written; this resolves it (`CALLBACK_HOST_RESOLVER`,
+    off the event loop and cached), so a public name pointing at an internal address is a 422
+    `InvalidCallbackUrls` at `/start`, not a dead letter after the run. A lookup that fails or
+    times out is a 503 `CallbackHostUnresolved`: the resolver failed, not the caller, so the
+    request may be retried as is.
+    """
+    for url in callback_urls or []:
+        parsed = urlsplit(url)
+        host = parsed.hostname or ""
+        try:
+            await CALLBACK_HOST_RESOLVER.resolve(host, parsed.port or (443 if parsed.scheme == "https" else 80))
+        except SsrfBlockedError:
+            raise_validation_error(
+                message=f"callback URL host {host!r} is not allowed (it resolves to a private/loopback/metadata address)",
+                error_type=ErrorType.INVALID_CALLBACK_URLS,
+            )
+        except (httpcore.ConnectError, httpcore.ConnectTimeout):
+            raise_service_unavailable(
+                message=f"callback URL host {host!r} could not be resolved",
+                retry_after_seconds=_CALLBACK_HOST_RETRY_AFTER_SECONDS,
+                error_type=ErrorType.CALLBACK_HOST_UNRESOLVED,
+            )
+
+
 # Per-field bound applied at the request.state binding site so an oversized
 # caller-supplied `pipe_code` cannot blow up downstream log-line size.
 # `RunRequest.pipe_code` carries no Pydantic `max_length`; this is the
@@ -531,7 +625,7 @@ async def _parse_request(request: Request) -> tuple[RunRequest, PipelineApiExtra
          decoded via `kajson` so structured inputs survive without re-parsing.
       2. `PipelineApiExtras` (pipeline_run_id, callback_urls) validated by
          Pydantic — callback_urls are checked for scheme + private/loopback
-         hosts to harden against SSRF.
+         hosts to harden against SSRF (`start` then resolves the hosts too).
 
     Body size is capped upstream by `request_body_size_middleware`.
     """
@@ -621,8 +715,9 @@ def _bundle_run_source(run_request: RunRequest) -> Generator[tuple[list[str] | N
     # `/execute` is the only route that runs inference, so it is the only one that can be
     # rate-limited upstream. NO 409: unlike `/start`, `/execute` takes no client-supplied
     # `pipeline_run_id` (the base runner generates one per call), so a caller cannot collide
-    # with an in-flight run.
-    responses={403: PROBLEM_403_ORCHESTRATION_MODE, 429: PROBLEM_429},
+    # with an in-flight run. 504: the run outlived its deadline and was cancelled. (The 499 a
+    # client disconnect produces is not documented — the caller is gone and never sees it.)
+    responses={403: PROBLEM_403_ORCHESTRATION_MODE, 429: PROBLEM_429, 504: PROBLEM_504_RUN_DEADLINE},
     # Documented body = the protocol's RunRequest plus THIS server's own
     # `orchestration_mode` extension (the route honors a per-request override). The
     # body is read through the raw Request (kajson decoding — see
@@ -630,15 +725,12 @@ def _bundle_run_source(run_request: RunRequest) -> Generator[tuple[list[str] | N
     # document it explicitly so the committed OpenAPI artifact (and protocol
     # conformance tooling) publishes the request schema. `responses=` and
     # `openapi_extra` touch different members of the operation object, so both land.
-    openapi_extra={
-        "x-mthds-protocol": True,
-        "requestBody": {
-            "required": True,
-            "content": {"application/json": {"schema": PipelexApiExecuteRequest.model_json_schema()}},
-        },
-    },
+    openapi_extra=raw_request_body_extra(
+        PipelexApiExecuteRequest,
+        {"x-mthds-protocol": True, "parameters": [IDEMPOTENCY_KEY_PARAMETER]},
+    ),
 )
-async def execute(request: Request) -> JSONResponse:
+async def execute(request: Request) -> Response:
     """Execute a method synchronously and return its full output (MTHDS Protocol `POST /execute`).
 
     The backend is selected by the resolved `orchestration_mode` (deployment default + optional
@@ -647,22 +739,39 @@ async def execute(request: Request) -> JSONResponse:
     regardless of backend (wait-semantics is endpoint-set, never requestable). Pipelex domain
     failures propagate untouched: the global `PipelexError` handler in `api.exception_handlers`
     turns them into an RFC 7807 problem response.
+
+    The run is held to a deadline — the caller's `timeout_seconds` extra, capped by
+    `MAX_EXECUTE_TIMEOUT_SECONDS` — and cancelled early if the caller disconnects
+    (`api.cancellation.run_cancellable`). The cancellation unwinds inside the bundle context, so
+    the run's library and materialized bundle dir are released before the 504 / 499 is raised.
+
+    With an `Idempotency-Key` header, a retry of a run that succeeded replays its response instead
+    of running it again, and a duplicate sent while it runs waits for it (`api.idempotency`).
     """
+    return await IDEMPOTENT_RUNS.run(request, owner=_get_user_id(request), compute=lambda: _execute(request))
+
+
+async def _execute(request: Request) -> JSONResponse:
     run_request, extras = await _parse_request(request)
+    timeout_seconds = min(extras.timeout_seconds or MAX_EXECUTE_TIMEOUT_SECONDS, MAX_EXECUTE_TIMEOUT_SECONDS)
     with _bundle_run_source(run_request) as (mthds_contents, library_dirs):
         runner = ApiRunner(
             user_id=_get_user_id(request),
             storage_scope=_resolve_storage_scope(request, requested=extras.storage_scope),
             library_dirs=library_dirs,
         )
-        response = await runner.execute(
-            pipe_code=run_request.pipe_code,
-            mthds_contents=mthds_contents,
-            inputs=run_request.inputs,
-            output_name=run_request.output_name,
-            output_multiplicity=run_request.output_multiplicity,
-            dynamic_output_concept_ref=run_request.dynamic_output_concept_ref,
-            requested_orchestration_mode=extras.orchestration_mode,
+        response = await run_cancellable(
+            request,
+            runner.execute(
+                pipe_code=run_request.pipe_code,
+                mthds_contents=mthds_contents,
+                inputs=run_request.inputs,
+                output_name=run_request.output_name,
+                output_multiplicity=run_request.output_multiplicity,
+                dynamic_output_concept_ref=run_request.dynamic_output_concept_ref,
+                requested_orchestration_mode=extras.orchestration_mode,
+            ),
+            timeout_seconds=timeout_seconds,
         )
     # The response dump carries the full internal usage models on
     # `pipe_output.tokens_usages`; the client boundary gets the trimmed
@@ -684,29 +793,28 @@ async def execute(request: Request) -> JSONResponse:
     #   403 — a per-request `orchestration_mode` override the deployment forbids.
     #   409 — the submitted `pipeline_run_id` is still registered for an in-flight run.
     #   501 — an async-capable deployment whose async execution is not enabled.
+    #   503 — on top of the lane's shedding, a callback host whose lookup failed.
     responses={
         400: PROBLEM_400_START_REQUIRES_ASYNC,
         403: PROBLEM_403_ORCHESTRATION_MODE,
         409: PROBLEM_409_DUPLICATE_RUN,
         501: PROBLEM_501_ASYNC_NOT_ENABLED,
+        503: PROBLEM_503_START,
     },
     # Documented body = the protocol's StartRequest plus THIS server's own
     # extensions (callback_urls) — the protocol model no longer advertises
     # implementation extensions, so the server documents what it implements.
     # Raw-Request parsing prevents FastAPI from inferring it — see the
     # /execute note.
-    openapi_extra={
-        "x-mthds-protocol": True,
-        "requestBody": {
-            "required": True,
-            "content": {"application/json": {"schema": PipelexApiStartRequest.model_json_schema()}},
-        },
-    },
+    openapi_extra=raw_request_body_extra(
+        PipelexApiStartRequest,
+        {"x-mthds-protocol": True, "parameters": [IDEMPOTENCY_KEY_PARAMETER]},
+    ),
 )
 async def start(
     request: Request,
     parsed: Annotated[tuple[RunRequest, PipelineApiExtras], Depends(_parse_request)],
-) -> PipelexRunResultStart:
+) -> Response:
     """Start a method run and return its pipeline_run_id with a 202 ack (MTHDS Protocol `POST /start`).
 
     Answers `202 Accepted` with a `StartAck`. A client-supplied `pipeline_run_id` is
@@ -723,8 +831,26 @@ async def start(
     the in-process orchestrator is blocking-only, so `/start` is HONEST: it refuses with a `400`
     (`StartRequiresAsyncOrchestration`) — use `/execute` — rather than silently blocking and acking.
     The completion callback (`callback_urls` / storage delivery) fires on the async path.
+    The `/execute`-only `timeout_seconds` extra is refused with a 422 rather than ignored.
+
+    With an `Idempotency-Key` header, a retry of a start that was acked replays its `StartAck`
+    instead of starting another run (`api.idempotency`).
     """
     run_request, extras = parsed
+    if extras.timeout_seconds is not None:
+        # The deadline is an `/execute` extra: a started run holds no request open to time out,
+        # so accepting it here would promise a deadline nothing enforces.
+        raise_validation_error(message="timeout_seconds is only honored by /execute: a /start run is asynchronous and has no request deadline.")
+
+    async def start_run() -> JSONResponse:
+        ack = await _start(request, run_request, extras)
+        return JSONResponse(status_code=202, content=ack.model_dump(mode="json", by_alias=True))
+
+    return await IDEMPOTENT_RUNS.run(request, owner=_get_user_id(request), compute=start_run)
+
+
+async def _start(request: Request, run_request: RunRequest, extras: PipelineApiExtras) -> PipelexRunResultStart:
+    await _vet_callback_hosts(extras.callback_urls)
     # The bundle is materialized only for the synchronous setup phase: `start` builds the PipeJob
     # (crate carrying the captured `python_sources`) before it enqueues, so the temp dir is no
     # longer needed once `start` returns — cleanup on context exit is safe for the async path.
@@ -2,12 +2,14 @@ import json
 from typing import Annotated, Any, Literal, Union
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pipelex.codegen.crate_encoding import encode_crate_json
 from pipelex.pipeline.exceptions import ValidateBundleError
 from pydantic import BaseModel, Field
 
-from api.openapi_responses import PROBLEM_501_METHOD_REF
+from api.coalescing import COALESCER
+from api.lanes import Lane, interactive_lane, run_in_lane
+from api.openapi_responses import PROBLEM_501_METHOD_REF, PROBLEM_503_LANE_OVERLOADED
 from api.routes.pipelex.crate_ops import (
     CrateInvalidReport,
     invalid_crate_report_response,
@@ -16,7 +18,7 @@ from api.routes.pipelex.crate_ops import (
 )
 from api.schemas.models import MthdsFilesRequest
 
-router = APIRouter(tags=["resolve"])
+router = APIRouter(tags=["resolve"], dependencies=[interactive_lane], responses={503: PROBLEM_503_LANE_OVERLOADED})
 
 
 class ResolveValidReport(BaseModel):
@@ -49,7 +51,7 @@ ResolveResponse = Annotated[Union[ResolveValidReport, CrateInvalidReport], Field
     # emits — the normalized library crate — IS standard-owned (the MTHDS Library Crate Format), so
     # its wire fields stay brand-neutral; the route that serves it over HTTP is ours.
 )
-async def resolve_mthds(request_data: MthdsFilesRequest) -> JSONResponse:
+async def resolve_mthds(request_data: MthdsFilesRequest) -> Response:
     """Resolve a library closure into its normalized crate (Pipelex API extension).
 
     Resolution is a first-class language operation alongside validation: assemble the closure from
@@ -67,7 +69,19 @@ async def resolve_mthds(request_data: MthdsFilesRequest) -> JSONResponse:
       over-limit file) is a request-shape 422; `method_ref` is a 501 until server-side method
       registry resolution exists; auth is 401/403; server fault is 5xx. All RFC 7807
       `application/problem+json` via the global handlers.
+
+    Identical requests in flight together are answered from one resolution (`api.coalescing`).
     """
+    return await COALESCER.run("resolve", request_data, lambda: _resolve(request_data))
+
+
+async def _resolve(request_data: MthdsFilesRequest) -> JSONResponse:
+    # Loading the closure is CPU-bound and synchronous: it runs, teardown included, on the
+    # interactive lane's threads, so the event loop keeps serving while it does.
+    return await run_in_lane(Lane.INTERACTIVE, _resolve_in_lane, request_data)
+
+
+def _resolve_in_lane(request_data: MthdsFilesRequest) -> JSONResponse:
     try:
         crate = resolve_requested_crate(request_data)
     except ValidateBundleError as validate_error:
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
 from typing import Any, Literal
 
 import pipelex_tools
@@ -7,9 +11,12 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field, field_validator
 
 from api.errors import raise_validation_error
-from api.limits import MAX_MTHDS_FILE_BYTES
+from api.lanes import Lane, interactive_lane, run_in_lane
+from api.limits import MAX_MTHDS_FILE_BYTES, TOOLS_CACHE_BYTES
+from api.lru_cache import ByteBudgetLRU
+from api.openapi_responses import PROBLEM_503_LANE_OVERLOADED
 
-router = APIRouter(tags=["tools"])
+router = APIRouter(tags=["tools"], dependencies=[interactive_lane], responses={503: PROBLEM_503_LANE_OVERLOADED})
 
 
 class MthdsToolRequest(BaseModel):
@@ -85,15 +92,76 @@ class FormatResponse(BaseModel):
     diagnostics: list[Diagnostic]
 
 
+def _engine_version() -> str:
+    """The installed `pipelex-tools-py` version — part of every cache key, so an upgrade never serves a stale verdict."""
+    try:
+        return package_version("pipelex-tools-py")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+TOOLS_ENGINE_VERSION = _engine_version()
+
+# `lint_mthds` / `format_mthds` are pure functions of (content, source | options, engine version),
+# and editors and CI re-send unchanged files constantly. One byte-budgeted LRU serves both
+# operations; a hit answers from the event loop without a thread hop.
+TOOLS_CACHE: ByteBudgetLRU[bytes, LintResponse | FormatResponse] = ByteBudgetLRU("tools", max_bytes=TOOLS_CACHE_BYTES)
+
+
+def _cache_key(operation: str, content: str, discriminator: Any) -> bytes:
+    """A 128-bit BLAKE2b digest of the operation, engine version, canonical source/options, and content."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (operation, TOOLS_ENGINE_VERSION, json.dumps(discriminator, sort_keys=True, separators=(",", ":"))):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(content.encode("utf-8"))
+    return digest.digest()
+
+
+async def run_lint(lane: Lane, content: str, *, source: str | None = None) -> LintResponse:
+    """Lint `content` on `lane`'s threads, answering from `TOOLS_CACHE` when the same input was seen before."""
+    key = _cache_key("lint", content, source)
+    cached = TOOLS_CACHE.get(key)
+    if isinstance(cached, LintResponse):
+        return cached
+    response = LintResponse.model_validate(await run_in_lane(lane, pipelex_tools.lint_mthds, content, source=source))
+    TOOLS_CACHE.put(key, response, size=len(response.model_dump_json()))
+    return response
+
+
+async def run_format(lane: Lane, content: str, *, options: dict[str, Any] | None = None) -> FormatResponse:
+    """Format `content` on `lane`'s threads, answering from `TOOLS_CACHE` when the same input was seen before.
+
+    Raises the engine's `ValueError` for malformed options; a failure is never cached.
+    """
+    key = _cache_key("format", content, options)
+    cached = TOOLS_CACHE.get(key)
+    if isinstance(cached, FormatResponse):
+        return cached
+    response = FormatResponse.model_validate(await run_in_lane(lane, pipelex_tools.format_mthds, content, options=options))
+    TOOLS_CACHE.put(key, response, size=len(response.model_dump_json()))
+    return response
+
+
+def validate_format_options(options: dict[str, Any]) -> None:
+    """Raise the engine's `ValueError` if `options` is malformed, without formatting or caching anything.
+
+    The engine checks options before it reads the content, so formatting an empty text is the
+    check: it is answered in microseconds, on the calling thread.
+    """
+    pipelex_tools.format_mthds("", options=options)
+
+
 @router.post("/lint", response_model=LintResponse)
 async def lint_mthds(request_data: LintRequest) -> LintResponse:
     """Lint one .mthds file with the embedded MTHDS schema.
 
     Malformed .mthds content is a produced diagnostic verdict and returns 200.
     Request-shape problems remain RFC 7807 422 responses through the global handlers.
+    The linter runs on the interactive lane's own threads, off the event loop;
+    an unchanged file is answered from the result cache.
     """
-    result = pipelex_tools.lint_mthds(request_data.content, source=request_data.source)
-    return LintResponse.model_validate(result)
+    return await run_lint(Lane.INTERACTIVE, request_data.content, source=request_data.source)
 
 
 @router.post("/format", response_model=FormatResponse)
@@ -102,9 +170,10 @@ async def format_mthds(request_data: FormatRequest) -> FormatResponse:
 
     Syntax errors return 200 with diagnostics and unchanged content. Malformed
     formatter options are caller input errors and return RFC 7807 422.
+    The formatter runs on the interactive lane's own threads, off the event loop;
+    an unchanged file is answered from the result cache.
     """
     try:
-        result = pipelex_tools.format_mthds(request_data.content, options=request_data.options)
+        return await run_format(Lane.INTERACTIVE, request_data.content, options=request_data.options)
     except ValueError as exc:
         raise_validation_error(str(exc))
-    return FormatResponse.model_validate(result)
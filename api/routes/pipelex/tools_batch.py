@@ -0,0 +1,168 @@
+"""`POST /lint/batch` and `POST /format/batch` — workspace-sized runs of the MTHDS editor tools.
+
+A repository-wide lint through `POST /lint` is one HTTP round-trip per file. These routes take
+up to `MAX_TOOLS_BATCH_FILES` files in one body, run them in parallel on the tools-batch lane's
+worker threads (`api.lanes`), and answer with one result per file, in input order. Files share the
+single-file routes' result cache, so an unchanged file costs a digest, not an engine call.
+
+Joined to a `tools_batch` lane of their own: a CI sweep of hundreds of files is exactly the
+traffic a keystroke-driven `/lint` must not queue behind, and it must not hold the slots or
+threads `/execute` runs wait for either.
+
+A caller that sends `Accept: application/x-ndjson` gets the results streamed instead — one JSON
+object per line, still in input order, each written as soon as it and every file before it is
+done — so a large batch neither buffers whole on the server nor makes the client wait for the
+slowest file to see the first verdict. The lane slot is held until the stream is written out,
+and files are started as the stream advances, at most `_STREAM_AHEAD` files ahead of the one
+being written: a streamed batch is bounded by its lane like a buffered one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+from collections import deque
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from api.errors import raise_validation_error
+from api.lanes import Lane, tools_batch_lane
+from api.limits import MAX_TOOLS_BATCH_FILES
+from api.negotiation import accepts_media_type
+from api.openapi_responses import PROBLEM_503_LANE_OVERLOADED
+from api.routes.pipelex.tools import FormatResponse, LintResponse, MthdsToolRequest, run_format, run_lint, validate_format_options
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable, Coroutine, Sequence
+
+router = APIRouter(tags=["tools"], dependencies=[tools_batch_lane], responses={503: PROBLEM_503_LANE_OVERLOADED})
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_BatchResult = TypeVar("_BatchResult", bound=BaseModel)
+
+# Files a stream runs ahead of the one it is writing: enough to keep the lane's threads busy.
+_STREAM_AHEAD = 8
+
+_NDJSON_RESPONSE: dict[int | str, dict[str, Any]] = {
+    200: {
+        "description": f"One result per file, in input order: a JSON body, or one result object per line with `Accept: {NDJSON_MEDIA_TYPE}`.",
+        "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+    },
+}
+
+
+class BatchFile(MthdsToolRequest):
+    """One file of a `/lint/batch` or `/format/batch` request."""
+
+    source: str | None = Field(default=None, description="Optional logical filename, echoed on this file's result.")
+
+
+class LintBatchRequest(BaseModel):
+    """Body of `POST /lint/batch`."""
+
+    files: list[BatchFile] = Field(..., min_length=1, max_length=MAX_TOOLS_BATCH_FILES, description="The files to lint.")
+
+
+class FormatBatchRequest(BaseModel):
+    """Body of `POST /format/batch`."""
+
+    files: list[BatchFile] = Field(..., min_length=1, max_length=MAX_TOOLS_BATCH_FILES, description="The files to format.")
+    options: dict[str, Any] | None = Field(
+        default=None,
+        description="Formatter options applied to every file, as on `POST /format`. Malformed option values return a 422 problem response.",
+    )
+
+
+class LintBatchResult(LintResponse):
+    """One file's `/lint` verdict, tagged with its position in the request."""
+
+    index: int = Field(..., description="Position of the file in the request's `files`.")
+    source: str | None = Field(default=None, description="The file's `source`, echoed.")
+
+
+class FormatBatchResult(FormatResponse):
+    """One file's `/format` result, tagged with its position in the request."""
+
+    index: int = Field(..., description="Position of the file in the request's `files`.")
+    source: str | None = Field(default=None, description="The file's `source`, echoed.")
+
+
+class LintBatchResponse(BaseModel):
+    """Response body of `POST /lint/batch`."""
+
+    results: list[LintBatchResult] = Field(..., description="One result per file, in input order.")
+
+
+class FormatBatchResponse(BaseModel):
+    """Response body of `POST /format/batch`."""
+
+    results: list[FormatBatchResult] = Field(..., description="One result per file, in input order.")
+
+
+async def _lint_file(index: int, file: BatchFile) -> LintBatchResult:
+    lint = await run_lint(Lane.TOOLS_BATCH, file.content, source=file.source)
+    return LintBatchResult(**dict(lint), index=index, source=file.source)
+
+
+async def _format_file(index: int, file: BatchFile, options: dict[str, Any] | None) -> FormatBatchResult:
+    formatted = await run_format(Lane.TOOLS_BATCH, file.content, options=options)
+    return FormatBatchResult(**dict(formatted), index=index, source=file.source)
+
+
+async def _stream_in_order(work: Sequence[Callable[[], Coroutine[Any, Any, _BatchResult]]]) -> AsyncGenerator[bytes]:
+    """Yield each file's result as an NDJSON line, in input order; cancel what is left if the client goes away.
+
+    A file is started only once the stream is within `_STREAM_AHEAD` files of it, so nothing runs
+    before the stream does and nothing is left running after it.
+    """
+    pending: deque[asyncio.Task[_BatchResult]] = deque()
+    upcoming = iter(work)
+    try:
+        while True:
+            for start in itertools.islice(upcoming, _STREAM_AHEAD - len(pending)):
+                pending.append(asyncio.create_task(start()))
+            if not pending:
+                return
+            result = await pending.popleft()
+            yield result.model_dump_json().encode() + b"\n"
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@router.post("/lint/batch", response_model=LintBatchResponse, responses=_NDJSON_RESPONSE)
+async def lint_mthds_batch(request: Request, request_data: LintBatchRequest) -> LintBatchResponse | StreamingResponse:
+    """Lint many .mthds files in parallel; one `/lint` verdict per file, in input order.
+
+    Malformed content is a per-file diagnostic verdict, never a failure of the batch.
+    """
+    if accepts_media_type(request.headers.get("accept"), NDJSON_MEDIA_TYPE):
+        work = [functools.partial(_lint_file, index, file) for index, file in enumerate(request_data.files)]
+        return StreamingResponse(_stream_in_order(work), media_type=NDJSON_MEDIA_TYPE)
+    results = await asyncio.gather(*(_lint_file(index, file) for index, file in enumerate(request_data.files)))
+    return LintBatchResponse(results=list(results))
+
+
+@router.post("/format/batch", response_model=FormatBatchResponse, responses=_NDJSON_RESPONSE)
+async def format_mthds_batch(request: Request, request_data: FormatBatchRequest) -> FormatBatchResponse | StreamingResponse:
+    """Format many .mthds files in parallel with one set of options; one `/format` result per file, in input order.
+
+    The options are checked once, up front — malformed options are a 422 for the whole batch,
+    before any file is formatted (and before a stream has committed to a 200).
+    """
+    options = request_data.options
+    if options is not None:
+        try:
+            validate_format_options(options)
+        except ValueError as exc:
+            raise_validation_error(str(exc))
+    if accepts_media_type(request.headers.get("accept"), NDJSON_MEDIA_TYPE):
+        work = [functools.partial(_format_file, index, file, options) for index, file in enumerate(request_data.files)]
+        return StreamingResponse(_stream_in_order(work), media_type=NDJSON_MEDIA_TYPE)
+    results = await asyncio.gather(*(_format_file(index, file, options) for index, file in enumerate(request_data.files)))
+    return FormatBatchResponse(results=list(results))
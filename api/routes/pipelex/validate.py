@@ -2,19 +2,21 @@ from enum import StrEnum
 from typing import Annotated, Literal, Self, Union
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pipelex.base_exceptions import ErrorReport, ValidationErrorItem
 from pipelex.pipeline.validation_render import format_validate_markdown, render_invalid_validation_markdown
 from pipelex.pipeline.validation_report import PipelexValidationReport
 from pipelex.tools.typing.pydantic_utils import empty_list_factory_of
 from pydantic import BaseModel, Field, model_validator
 
+from api.coalescing import COALESCER
 from api.exception_handlers import problem_response_from_error_report
-from api.openapi_responses import PROBLEM_403_ORCHESTRATION_MODE
+from api.lanes import interactive_lane
+from api.openapi_responses import PROBLEM_403_ORCHESTRATION_MODE, PROBLEM_503_LANE_OVERLOADED
 from api.routes.pipelex.pipeline import ApiRunner
 from api.schemas.models import MthdsContentsRequest
 
-router = APIRouter(tags=["validate"])
+router = APIRouter(tags=["validate"], dependencies=[interactive_lane], responses={503: PROBLEM_503_LANE_OVERLOADED})
 
 
 class RenderFormat(StrEnum):
@@ -159,7 +161,7 @@ ValidationResponse = Annotated[Union[ValidReport, InvalidReport], Field(discrimi
     responses={403: PROBLEM_403_ORCHESTRATION_MODE},
     openapi_extra={"x-mthds-protocol": True},
 )
-async def validate_mthds(request: Request, request_data: ValidateRequest) -> JSONResponse:
+async def validate_mthds(request: Request, request_data: ValidateRequest) -> Response:
     """Validate MTHDS content by parsing, loading, and dry-running pipes (MTHDS Protocol `POST /validate`).
 
     `/validate` is a **diagnostic endpoint**: any verdict the validator can produce — valid,
@@ -187,7 +189,13 @@ async def validate_mthds(request: Request, request_data: ValidateRequest) -> JSO
       programmer error or a genuine orchestrator fault is a **5xx**; auth is **401/403**. All are
       RFC 7807 `application/problem+json` rendered by the global handler in
       `api.exception_handlers` — routes never shape them.
+
+    Identical requests in flight together are answered from one validation (`api.coalescing`).
     """
+    return await COALESCER.run("validate", request_data, lambda: _validate(request, request_data))
+
+
+async def _validate(request: Request, request_data: ValidateRequest) -> JSONResponse:
     # Opt-in presentation formats (D-D): resolved once, threaded into both 200 arms. Empty by
     # default → no `rendered_*` field, response byte-identical to the no-`render` request.
     requested_formats = _resolve_render_formats(request_data.render)
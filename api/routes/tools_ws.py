@@ -0,0 +1,352 @@
+"""`WS /tools/ws` — a persistent, LSP-style editor session for `/lint` and `/format`.
+
+The one-shot `POST /lint` / `POST /format` make an editor pay a full HTTP
+round-trip, auth, and body validation on every keystroke, resending the whole
+file each time. A session instead authenticates ONCE at the handshake, keeps
+each open document server-side, and takes incremental edits:
+
+Client → server (JSON text frames, discriminated on `type`):
+
+- `open`   — `{uri, text, version}`: start tracking a document. Re-opening a tracked `uri` replaces it.
+- `change` — `{uri, version, changes: [{start_offset?, end_offset?, text}]}`: apply edits in order.
+  Offsets are UTF-8 byte offsets into the current text — the same unit as a diagnostic's
+  `range.start_offset` / `end_offset`; an edit without offsets replaces the whole text.
+  `version` must increase.
+- `format` — `{id, uri, options?}`: format the document's current text.
+- `cancel` — `{id}`: cancel a pending `format`.
+- `close`  — `{uri}`: stop tracking a document.
+
+Server → client:
+
+- `diagnostics`   — `{uri, version, diagnostics}`, pushed after `open` / `change` once the document has
+  been quiet for `TOOLS_WS_DEBOUNCE_MS`. A lint superseded by a newer edit is cancelled, never sent.
+- `format_result` — `{id, uri, version, formatted, changed, diagnostics}`.
+- `cancelled`     — `{id}`: a `format` was cancelled — by `cancel`, or superseded by a newer edit,
+  `format`, re-`open` or `close` of the same document.
+- `error`         — `{id?, error_type, message}`: a message the session could not act on, or a lint/format
+  that failed (a shed lane's `LaneOverloaded`, an unexpected `InternalServerError`). The session stays open.
+
+Frames are JSON text: a binary frame closes the session with 1003 (unsupported data).
+
+Every lint/format is admitted through the interactive lane and runs on its threads
+(`api.lanes`), exactly like the one-shot routes.
+
+Mounted by `api.main` OUTSIDE the composite `/v1` router: router-level auth dependencies are
+`Request`-typed and do not run for a WebSocket, so the handshake authenticates itself through
+`api.security.authenticate_connection`. A failed handshake is answered with the usual RFC 7807
+problem document where the server supports WebSocket denial responses, and a 1008 close otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from typing import TYPE_CHECKING, Annotated, Any, Literal
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from api.error_types import ErrorType
+from api.errors import ApiError
+from api.exception_handlers import emit_error_log
+from api.lanes import LANES, Lane
+from api.limits import MAX_MTHDS_FILE_BYTES, MAX_TOOLS_WS_DOCUMENTS, TOOLS_WS_DEBOUNCE_SECONDS
+from api.logging_context import get_request_id
+from api.metrics import METRICS
+from api.problem_document import PROBLEM_JSON_MEDIA_TYPE
+from api.routes.pipelex.tools import run_format, run_lint
+from api.security import authenticate_connection
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
+router = APIRouter(tags=["tools"])
+
+_WEBSOCKET_DENIAL_EXTENSION = "websocket.http.response"
+# RFC 6455 "policy violation" — the close code for a refused handshake when no denial response is possible.
+_POLICY_VIOLATION_CLOSE_CODE = 1008
+# RFC 6455 "unsupported data" — the close code for a binary frame.
+_UNSUPPORTED_DATA_CLOSE_CODE = 1003
+_MAX_URI_LEN = 1024
+_MAX_REQUEST_ID_LEN = 128
+_MAX_EDITS_PER_CHANGE = 1024
+
+
+class TextEdit(BaseModel):
+    """One edit: replace bytes `[start_offset, end_offset)` of the UTF-8 text, or the whole text when both are omitted."""
+
+    start_offset: int | None = Field(default=None, ge=0)
+    end_offset: int | None = Field(default=None, ge=0)
+    text: str
+
+
+class OpenMessage(BaseModel):
+    type: Literal["open"]
+    uri: str = Field(..., min_length=1, max_length=_MAX_URI_LEN)
+    text: str
+    version: int = 0
+
+
+class ChangeMessage(BaseModel):
+    type: Literal["change"]
+    uri: str = Field(..., min_length=1, max_length=_MAX_URI_LEN)
+    version: int
+    changes: list[TextEdit] = Field(..., min_length=1, max_length=_MAX_EDITS_PER_CHANGE)
+
+
+class FormatMessage(BaseModel):
+    type: Literal["format"]
+    id: str = Field(..., min_length=1, max_length=_MAX_REQUEST_ID_LEN)
+    uri: str = Field(..., min_length=1, max_length=_MAX_URI_LEN)
+    options: dict[str, Any] | None = None
+
+
+class CancelMessage(BaseModel):
+    type: Literal["cancel"]
+    id: str = Field(..., min_length=1, max_length=_MAX_REQUEST_ID_LEN)
+
+
+class CloseMessage(BaseModel):
+    type: Literal["close"]
+    uri: str = Field(..., min_length=1, max_length=_MAX_URI_LEN)
+
+
+ToolsClientMessage = Annotated[
+    OpenMessage | ChangeMessage | FormatMessage | CancelMessage | CloseMessage,
+    Field(discriminator="type"),
+]
+_CLIENT_MESSAGE_ADAPTER: TypeAdapter[ToolsClientMessage] = TypeAdapter(ToolsClientMessage)
+
+
+class _SessionError(Exception):
+    """A client message the session cannot act on — answered with an `error` frame, never a disconnect."""
+
+    def __init__(self, error_type: ErrorType, message: str) -> None:
+        self.error_type = error_type
+        super().__init__(message)
+
+
+def _ensure_within_file_limit(text: str) -> None:
+    # Same bound, and same `ValidationError` verdict, as the one-shot routes' `content` validator.
+    if len(text.encode("utf-8")) > MAX_MTHDS_FILE_BYTES:
+        raise _SessionError(ErrorType.VALIDATION_ERROR, f"MTHDS file exceeds {MAX_MTHDS_FILE_BYTES // 1024} KiB limit")
+
+
+def apply_text_edits(text: str, edits: list[TextEdit]) -> str:
+    """Apply `edits` in order, each against the result of the previous one (LSP semantics)."""
+    for edit in edits:
+        if edit.start_offset is None and edit.end_offset is None:
+            text = edit.text
+            continue
+        encoded = text.encode("utf-8")
+        start = edit.start_offset if edit.start_offset is not None else 0
+        end = edit.end_offset if edit.end_offset is not None else len(encoded)
+        if not start <= end <= len(encoded):
+            raise _SessionError(ErrorType.VALIDATION_ERROR, f"Edit range [{start}, {end}) is outside the document ({len(encoded)} bytes)")
+        try:
+            text = (encoded[:start] + edit.text.encode("utf-8") + encoded[end:]).decode("utf-8")
+        except UnicodeDecodeError:
+            raise _SessionError(ErrorType.VALIDATION_ERROR, f"Edit range [{start}, {end}) splits a UTF-8 character") from None
+    return text
+
+
+class _Document:
+    def __init__(self, *, text: str, version: int) -> None:
+        self.text = text
+        self.version = version
+        self.lint_task: asyncio.Task[None] | None = None
+
+
+class ToolsSession:
+    """The per-connection state of one `/tools/ws` session: open documents and in-flight work."""
+
+    def __init__(self, websocket: WebSocket, *, debounce_seconds: float | None = None) -> None:
+        self._websocket = websocket
+        self._debounce_seconds = TOOLS_WS_DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds
+        self._documents: dict[str, _Document] = {}
+        # Pending formats by request id, and the uri each one formats (for supersession).
+        self._formats: dict[str, tuple[str, asyncio.Task[None]]] = {}
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, payload: dict[str, Any]) -> None:
+        # Lint and format tasks answer concurrently; one frame at a time on the socket.
+        async with self._send_lock:
+            await self._websocket.send_json(payload)
+
+    async def dispatch(self, raw: str) -> None:
+        """Handle one client frame, answering any failure with an `error` frame."""
+        request_id: str | None = None
+        try:
+            try:
+                decoded = json.loads(raw)
+            except ValueError as exc:
+                raise _SessionError(ErrorType.INVALID_JSON, f"Message is not valid JSON: {exc!s}") from exc
+            if isinstance(decoded, dict):
+                candidate = decoded.get("id")  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                request_id = candidate if isinstance(candidate, str) else None
+            try:
+                message = _CLIENT_MESSAGE_ADAPTER.validate_python(decoded)
+            except ValidationError as exc:
+                raise _SessionError(ErrorType.VALIDATION_ERROR, str(exc)) from exc
+            METRICS.increment("tools_ws_messages_total", type=message.type)
+            await self._handle(message)
+        except _SessionError as exc:
+            await self.send({"type": "error", "id": request_id, "error_type": exc.error_type, "message": str(exc)})
+
+    async def _handle(self, message: ToolsClientMessage) -> None:
+        match message:
+            case OpenMessage():
+                if message.uri not in self._documents and len(self._documents) >= MAX_TOOLS_WS_DOCUMENTS:
+                    raise _SessionError(ErrorType.VALIDATION_ERROR, f"A session may hold at most {MAX_TOOLS_WS_DOCUMENTS} open documents")
+                _ensure_within_file_limit(message.text)
+                # Re-opening replaces the document: everything pending for the old content goes, as on `close`.
+                await self._cancel_formats_of(message.uri)
+                self._close_document(message.uri)
+                self._documents[message.uri] = _Document(text=message.text, version=message.version)
+                self._schedule_lint(message.uri)
+            case ChangeMessage():
+                document = self._document(message.uri)
+                if message.version <= document.version:
+                    msg = f"Change version {message.version} must be greater than the document's version {document.version}"
+                    raise _SessionError(ErrorType.VALIDATION_ERROR, msg)
+                text = apply_text_edits(document.text, message.changes)
+                _ensure_within_file_limit(text)
+                document.text = text
+                document.version = message.version
+                await self._cancel_formats_of(message.uri)
+                self._schedule_lint(message.uri)
+            case FormatMessage():
+                document = self._document(message.uri)
+                await self._cancel_formats_of(message.uri)
+                await self._cancel_format(message.id)
+                self._formats[message.id] = (
+                    message.uri,
+                    self._spawn(self._format(message.id, message.uri, document.text, document.version, message.options), request_id=message.id),
+                )
+            case CancelMessage():
+                await self._cancel_format(message.id)
+            case CloseMessage():
+                self._document(message.uri)
+                await self._cancel_formats_of(message.uri)
+                self._close_document(message.uri)
+
+    def _document(self, uri: str) -> _Document:
+        document = self._documents.get(uri)
+        if document is None:
+            raise _SessionError(ErrorType.UNKNOWN_DOCUMENT, f"Document {uri!r} is not open in this session")
+        return document
+
+    def _spawn(self, work: Coroutine[Any, Any, None], *, request_id: str | None = None) -> asyncio.Task[None]:
+        return asyncio.get_running_loop().create_task(self._reporting_failures(work, request_id=request_id))
+
+    async def _reporting_failures(self, work: Coroutine[Any, Any, None], *, request_id: str | None) -> None:
+        # A lint or format runs in its own task, which nobody awaits: its failure is answered here,
+        # as an `error` frame, instead of dying unretrieved with the client left waiting.
+        try:
+            await work
+        except ApiError as exc:
+            await self._send_failure(request_id, exc.document["error_type"], str(exc))
+        except Exception:  # noqa: BLE001 — any other failure is answered and logged, never left unretrieved
+            emit_error_log(fields={"event": "tools_ws_task_failed", "request_id": get_request_id(), "message_id": request_id}, as_error=True)
+            await self._send_failure(request_id, ErrorType.INTERNAL_SERVER_ERROR, "The request failed on the server.")
+
+    async def _send_failure(self, request_id: str | None, error_type: str, message: str) -> None:
+        # The socket may be what failed: there is then nobody left to tell.
+        with contextlib.suppress(WebSocketDisconnect, RuntimeError):
+            await self.send({"type": "error", "id": request_id, "error_type": error_type, "message": message})
+
+    def _schedule_lint(self, uri: str) -> None:
+        document = self._documents[uri]
+        if document.lint_task is not None and not document.lint_task.done():
+            document.lint_task.cancel()
+            METRICS.increment("tools_ws_superseded_total", operation="lint")
+        document.lint_task = self._spawn(self._lint(uri, document.text, document.version))
+
+    async def _lint(self, uri: str, text: str, version: int) -> None:
+        # Debounce: a newer edit cancels this task during the sleep, so a burst of keystrokes lints once.
+        await asyncio.sleep(self._debounce_seconds)
+        async with LANES[Lane.INTERACTIVE].slot():
+            lint = await run_lint(Lane.INTERACTIVE, text, source=uri)
+        await self.send({"type": "diagnostics", "uri": uri, "version": version, **lint.model_dump(mode="json")})
+
+    async def _format(self, request_id: str, uri: str, text: str, version: int, options: dict[str, Any] | None) -> None:
+        try:
+            async with LANES[Lane.INTERACTIVE].slot():
+                formatted = await run_format(Lane.INTERACTIVE, text, options=options)
+        except ValueError as exc:
+            await self.send({"type": "error", "id": request_id, "error_type": ErrorType.VALIDATION_ERROR, "message": str(exc)})
+            return
+        finally:
+            # A newer `format` reusing this id may already own the entry: only this task's own is removed.
+            pending = self._formats.get(request_id)
+            if pending is not None and pending[1] is asyncio.current_task():
+                del self._formats[request_id]
+        await self.send({"type": "format_result", "id": request_id, "uri": uri, "version": version, **formatted.model_dump(mode="json")})
+
+    async def _cancel_format(self, request_id: str) -> None:
+        pending = self._formats.pop(request_id, None)
+        if pending is None:
+            return
+        _, task = pending
+        task.cancel()
+        METRICS.increment("tools_ws_superseded_total", operation="format")
+        await self.send({"type": "cancelled", "id": request_id})
+
+    async def _cancel_formats_of(self, uri: str) -> None:
+        for request_id in [request_id for request_id, (format_uri, _) in self._formats.items() if format_uri == uri]:
+            await self._cancel_format(request_id)
+
+    def _close_document(self, uri: str) -> None:
+        document = self._documents.pop(uri, None)
+        if document is not None and document.lint_task is not None:
+            document.lint_task.cancel()
+
+    async def aclose(self) -> None:
+        """Cancel every in-flight lint and format; called once the socket is gone."""
+        tasks = [task for _, task in self._formats.values()]
+        tasks += [document.lint_task for document in self._documents.values() if document.lint_task is not None]
+        self._formats.clear()
+        self._documents.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+
+
+async def _deny_handshake(websocket: WebSocket, error: ApiError) -> None:
+    """Refuse the handshake with the RFC 7807 problem document, or a 1008 close where denial responses are unsupported."""
+    if _WEBSOCKET_DENIAL_EXTENSION in websocket.scope.get("extensions", {}):
+        response = JSONResponse(status_code=error.status_code, content=error.document, media_type=PROBLEM_JSON_MEDIA_TYPE, headers=error.headers)
+        await websocket.send_denial_response(response)
+        return
+    await websocket.close(code=_POLICY_VIOLATION_CLOSE_CODE, reason=str(error)[:120])
+
+
+@router.websocket("/tools/ws")
+async def tools_session(websocket: WebSocket) -> None:
+    """Run one editor session: authenticate once, then serve lint/format over incremental document state."""
+    try:
+        await authenticate_connection(websocket)
+    except ApiError as exc:
+        await _deny_handshake(websocket, exc)
+        return
+    await websocket.accept()
+    session = ToolsSession(websocket)
+    METRICS.increment("tools_ws_sessions_total")
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            text = message.get("text")
+            if text is None:
+                await websocket.close(code=_UNSUPPORTED_DATA_CLOSE_CODE, reason="Send JSON text frames, not binary frames")
+                break
+            await session.dispatch(text)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.aclose()
@@ -169,6 +169,13 @@ _ORCHESTRATION_MODE_DESCRIPTION = (
     "the deployment default is refused with a 403. Omit it to use the deployment default."
 )
 
+_TIMEOUT_SECONDS_DESCRIPTION = (
+    "PIPELEX-API EXTENSION (not part of the MTHDS Protocol) — the deadline for this synchronous run, in seconds. "
+    "A run still going at its deadline is cancelled and answered with a 504 `RunDeadlineExceeded`. Capped by the "
+    "deployment's `MAX_EXECUTE_TIMEOUT_SECONDS` (a longer ask gets the cap, which is also the default when omitted). "
+    "Independently of any deadline, a caller that disconnects mid-run has its run cancelled."
+)
+
 
 _ALLOWED_CALLBACK_SCHEMES = frozenset({"http", "https"})
 
@@ -178,8 +185,9 @@ def _is_disallowed_host(host: str) -> bool:
 
     Used to harden /start callback_urls against SSRF — a malicious
     client could otherwise aim webhooks at internal services or cloud metadata
-    endpoints (e.g. 169.254.169.254). Best-effort: hostnames that resolve to
-    private addresses at fire time aren't blocked here, only literal IPs.
+    endpoints (e.g. 169.254.169.254). Only the host as written — literal IPs
+    and internal names; `/start` then resolves each hostname and refuses one
+    that resolves to a private address (`api.callback_hosts`).
     """
     if not host:
         return True
@@ -193,12 +201,14 @@ def _is_disallowed_host(host: str) -> bool:
 
 
 class PipelineApiExtras(BaseModel):
-    """Validates the API-server-only fields on `/start` requests.
+    """Validates the API-server-only fields on `/start` and `/execute` requests.
 
     `pipeline_run_id` is the protocol's optional start arg; `callback_urls` is
     THIS server's extension (the MTHDS Protocol defines no completion channel —
     extension args are defined and handled by the implementation that owns
     them). The upstream protocol models don't know about `callback_urls`.
+    `timeout_seconds` is parsed for both routes but honored only by `/execute`;
+    `/start` refuses it (see the route).
     """
 
     model_config = ConfigDict(extra="ignore")
@@ -207,6 +217,7 @@ class PipelineApiExtras(BaseModel):
     callback_urls: list[str] | None = Field(default=None, max_length=MAX_CALLBACK_URLS)
     orchestration_mode: str | None = Field(default=None, description=_ORCHESTRATION_MODE_DESCRIPTION)
     storage_scope: str | None = Field(default=None, description=_STORAGE_SCOPE_DESCRIPTION)
+    timeout_seconds: float | None = Field(default=None, gt=0, description=_TIMEOUT_SECONDS_DESCRIPTION)
 
     @field_validator("storage_scope")
     @classmethod
@@ -267,15 +278,17 @@ class PipelexApiStartRequest(StartRequest):
 
 
 class PipelexApiExecuteRequest(RunRequest):
-    """Documented body of `POST /execute` — the protocol's `RunRequest` plus THIS server's `orchestration_mode` extension.
+    """Documented body of `POST /execute` — the protocol's `RunRequest` plus THIS server's extensions.
 
     Used only to publish the OpenAPI request schema: `/execute` reads the body through the raw
     `Request` (kajson decoding), so FastAPI cannot infer the body type; this model documents the
-    per-request `orchestration_mode` override the route actually honors (parsed by `PipelineApiExtras`).
+    per-request `orchestration_mode` override and `timeout_seconds` deadline the route actually
+    honors (parsed by `PipelineApiExtras`).
     """
 
     orchestration_mode: str | None = Field(default=None, description=_ORCHESTRATION_MODE_DESCRIPTION)
     storage_scope: str | None = Field(default=None, description=_STORAGE_SCOPE_DESCRIPTION)
+    timeout_seconds: float | None = Field(default=None, gt=0, description=_TIMEOUT_SECONDS_DESCRIPTION)
 
 
 class PipeOutputWire(PipeOutput):
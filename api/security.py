@@ -2,24 +2,33 @@
 
 User identity is extracted during auth and stored on request.state.user as a RequestUser.
 Route handlers access it via the get_request_user dependency.
+
+The auth env vars are resolved once, at app startup (`api.main`), into an `AuthSettings` the
+verifiers read on every request. An unknown `AUTH_MODE`, or a mode without its secret, fails the
+app at boot rather than on the first request. `AUTH_CONFIG.reload` swaps in new settings, for
+secret rotation without a restart.
 """
 
+import hmac
 import re
+from dataclasses import dataclass
 from enum import StrEnum
+from pathlib import Path
 from typing import Annotated, Any
+from urllib.parse import urlsplit
 
-import jwt
 from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.security.utils import get_authorization_scheme_param
 from pipelex import log
 from pipelex.system.environment import get_optional_env
 from pydantic import BaseModel, Field
+from starlette.requests import HTTPConnection
 
+from api.api_keys import API_KEY_QUOTAS, ApiKeyRegistry, InvalidApiKeyRegistryError
 from api.error_types import ErrorType
-from api.errors import raise_bad_request, raise_internal_server_error, raise_unauthenticated
-
-# JWT Configuration (only used when AUTH_MODE=jwt)
-JWT_ALGORITHM = "HS256"
+from api.errors import raise_bad_request, raise_internal_server_error, raise_too_many_requests, raise_unauthenticated
+from api.metrics import METRICS
 
 # A caller's `user_id` is the first path segment of every `pipelex-storage://`
 # URI and S3 key (`<user_id>/...`). The runner treats it as an OPAQUE id and
@@ -78,6 +87,147 @@ class AuthMode(StrEnum):
     API_KEY = "api_key"
 
 
+AUTH_MODE_ENV_VAR = "AUTH_MODE"
+JWT_SECRET_KEY_ENV_VAR = "JWT_SECRET_KEY"
+JWT_JWKS_URI_ENV_VAR = "JWT_JWKS_URI"
+JWT_AUDIENCE_ENV_VAR = "JWT_AUDIENCE"
+JWT_ISSUER_ENV_VAR = "JWT_ISSUER"
+API_KEY_ENV_VAR = "API_KEY"
+API_KEYS_FILE_ENV_VAR = "API_KEYS_FILE"
+TRUST_FORWARDED_IDENTITY_HEADERS_ENV_VAR = "TRUST_FORWARDED_IDENTITY_HEADERS"
+
+# `JWT_JWKS_URI` schemes: an https URL, a `file://` URL, or a bare path (no scheme).
+_JWKS_URI_SCHEMES = frozenset({"https", "file", ""})
+
+
+class InvalidAuthConfigError(ValueError):
+    """Raised at startup (or by a reload) when the auth env vars do not form a usable configuration."""
+
+
+@dataclass(frozen=True)
+class AuthSettings:
+    """The resolved auth configuration: the mode, its keys, and the forwarded-identity opt-in.
+
+    A mode without a key is refused here, so an `AuthSettings` for `jwt` always carries a secret or
+    a key set (`api.jwt_verification`), and one for `api_key` the shared key or a key registry
+    (`api.api_keys`) whose every `user_id` is usable as a storage namespace.
+    """
+
+    mode: AuthMode = AuthMode.NONE
+    jwt_secret: str | None = None
+    jwt_jwks_uri: str | None = None
+    jwt_audience: str | None = None
+    jwt_issuer: str | None = None
+    api_key: str | None = None
+    api_key_registry: ApiKeyRegistry | None = None
+    trust_forwarded_identity_headers: bool = False
+
+    def __post_init__(self) -> None:
+        if self.mode is AuthMode.JWT and not self.jwt_secret and not self.jwt_jwks_uri:
+            msg = f"{AUTH_MODE_ENV_VAR}=jwt requires {JWT_SECRET_KEY_ENV_VAR} or {JWT_JWKS_URI_ENV_VAR} to be set"
+            raise InvalidAuthConfigError(msg)
+        if self.jwt_jwks_uri and urlsplit(self.jwt_jwks_uri).scheme not in _JWKS_URI_SCHEMES:
+            # The key set decides which tokens verify: fetched over plain http, anyone on the path could publish one.
+            msg = f"{JWT_JWKS_URI_ENV_VAR}={self.jwt_jwks_uri!r} must be an https:// URL or a local file"
+            raise InvalidAuthConfigError(msg)
+        if self.mode is AuthMode.API_KEY and not self.api_key and self.api_key_registry is None:
+            msg = f"{AUTH_MODE_ENV_VAR}=api_key requires {API_KEY_ENV_VAR} or {API_KEYS_FILE_ENV_VAR} to be set"
+            raise InvalidAuthConfigError(msg)
+        for record in self.api_key_registry.records if self.api_key_registry is not None else []:
+            # The same rules as a JWT `user_id` claim: the id becomes the owner segment of every storage key.
+            if not is_safe_user_id(record.user_id) or record.user_id == SINGLE_TENANT_USER_ID:
+                msg = f"API key {record.prefix!r} maps to user_id {record.user_id!r}, which is not a usable caller id"
+                raise InvalidAuthConfigError(msg)
+
+
+def resolve_auth_settings() -> AuthSettings:
+    """Resolve the auth env vars to an `AuthSettings`.
+
+    `AUTH_MODE` defaults to `none` when unset, empty, or whitespace-only, and is otherwise matched
+    case-insensitively. Raises `InvalidAuthConfigError` for an unknown mode, or for `jwt` /
+    `api_key` without a key (`JWT_SECRET_KEY` or `JWT_JWKS_URI` / `API_KEY` or `API_KEYS_FILE`),
+    and for an `API_KEYS_FILE` that does not load.
+    """
+    raw_mode = get_optional_env(AUTH_MODE_ENV_VAR)
+    normalized = (raw_mode or "").strip().lower()
+    try:
+        mode = AuthMode(normalized) if normalized else AuthMode.NONE
+    except ValueError as exc:
+        valid = ", ".join(f"'{auth_mode}'" for auth_mode in AuthMode)
+        msg = f"{AUTH_MODE_ENV_VAR}={raw_mode!r} is not a valid auth mode. Valid values: {valid}."
+        raise InvalidAuthConfigError(msg) from exc
+    api_key_registry: ApiKeyRegistry | None = None
+    api_keys_file = get_optional_env(API_KEYS_FILE_ENV_VAR)
+    if mode is AuthMode.API_KEY and api_keys_file:
+        try:
+            api_key_registry = ApiKeyRegistry.load(Path(api_keys_file))
+        except InvalidApiKeyRegistryError as exc:
+            raise InvalidAuthConfigError(str(exc)) from exc
+    return AuthSettings(
+        mode=mode,
+        jwt_secret=get_optional_env(JWT_SECRET_KEY_ENV_VAR) or None,
+        jwt_jwks_uri=get_optional_env(JWT_JWKS_URI_ENV_VAR) or None,
+        jwt_audience=get_optional_env(JWT_AUDIENCE_ENV_VAR) or None,
+        jwt_issuer=get_optional_env(JWT_ISSUER_ENV_VAR) or None,
+        api_key=get_optional_env(API_KEY_ENV_VAR) or None,
+        api_key_registry=api_key_registry,
+        trust_forwarded_identity_headers=get_optional_env(TRUST_FORWARDED_IDENTITY_HEADERS_ENV_VAR) == "true",
+    )
+
+
+class AuthConfig:
+    """Holds the `AuthSettings` the verifiers read; `reload` replaces them in one assignment."""
+
+    def __init__(self) -> None:
+        self._settings: AuthSettings | None = None
+
+    @property
+    def settings(self) -> AuthSettings:
+        """The current settings, resolved from the env on first use if `load` never ran (an app built without `api.main`)."""
+        if self._settings is None:
+            self._settings = resolve_auth_settings()
+        return self._settings
+
+    def load(self) -> AuthSettings:
+        """Resolve the settings from the env now, raising `InvalidAuthConfigError` on a bad configuration."""
+        self._settings = resolve_auth_settings()
+        return self._settings
+
+    def reload(self, settings: AuthSettings | None = None) -> AuthSettings:
+        """Swap in `settings` (default: a fresh resolution of the env), e.g. to rotate `JWT_SECRET_KEY` or `API_KEY`.
+
+        Raises `InvalidAuthConfigError`, keeping the current settings, on a bad configuration or
+        a different `AUTH_MODE`: the routes were mounted with the boot mode's dependency, so the
+        mode itself only changes with a restart.
+        """
+        new_settings = settings if settings is not None else resolve_auth_settings()
+        current = self._settings
+        if current is not None and new_settings.mode is not current.mode:
+            msg = f"{AUTH_MODE_ENV_VAR} cannot change from '{current.mode}' to '{new_settings.mode}' without a restart"
+            raise InvalidAuthConfigError(msg)
+        self._settings = new_settings
+        log.info("Auth settings reloaded")
+        return new_settings
+
+
+AUTH_CONFIG = AuthConfig()
+
+
+def get_auth_settings() -> AuthSettings:
+    """The auth settings in force for this request."""
+    return AUTH_CONFIG.settings
+
+
+async def load_jwt_key_set() -> None:
+    """Fetch the `JWT_JWKS_URI` key set at boot, when one is configured, so a bad one fails the startup."""
+    settings = get_auth_settings()
+    if settings.mode is not AuthMode.JWT or not settings.jwt_jwks_uri:
+        return
+    from api.jwt_verification import get_jwks_key_set  # noqa: PLC0415 — see `_bind_jwt_identity`
+
+    await get_jwks_key_set(settings.jwt_jwks_uri).load()
+
+
 class ForwardedIdentityHeader(StrEnum):
     """HTTP headers a trusted reverse proxy may forward to authenticate
     a caller when `TRUST_FORWARDED_IDENTITY_HEADERS=true`.
@@ -104,29 +254,22 @@ class RequestUser(BaseModel):
     user_id: str = Field(..., description="Opaque caller identifier supplied by the auth layer or the trusted proxy")
 
 
-def _set_request_user(request: Request, user_id: str) -> None:
+def _set_request_user(connection: HTTPConnection, user_id: str) -> None:
     """Store caller identity on request.state for downstream handlers."""
-    request.state.user = RequestUser(user_id=user_id)
-
-
-def get_auth_mode() -> AuthMode:
-    """Read AUTH_MODE from environment. Defaults to 'none'."""
-    raw = get_optional_env("AUTH_MODE")
-    if not raw:
-        return AuthMode.NONE
-    try:
-        return AuthMode(raw)
-    except ValueError:
-        log.warning(f"Unknown AUTH_MODE '{raw}', falling back to 'none'")
-        return AuthMode.NONE
+    connection.state.user = RequestUser(user_id=user_id)
 
 
 async def verify_jwt(
     request: Request,
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
 ) -> dict[str, Any]:
-    """Validate JWT token from Authorization header using JWT_SECRET_KEY."""
-    if credentials is None:
+    """Validate JWT token from Authorization header against JWT_SECRET_KEY (HS256) or the JWT_JWKS_URI keys (RS256/ES256)."""
+    return await _bind_jwt_identity(request, token=credentials.credentials if credentials else None)
+
+
+async def _bind_jwt_identity(connection: HTTPConnection, *, token: str | None) -> dict[str, Any]:
+    """Verify a bearer JWT and bind its `user_id` onto the connection. Shared by `verify_jwt` and `authenticate_connection`."""
+    if token is None:
         # Missing, empty, or non-Bearer `Authorization` header. `HTTPBearer`
         # is configured with `auto_error=False` so this branch (rather than
         # FastAPI's default `HTTPException`) shapes the response — same RFC
@@ -134,19 +277,22 @@ async def verify_jwt(
         log.warning("JWT auth requested without a Bearer token")
         raise_unauthenticated("Missing or malformed Authorization header")
 
-    jwt_secret = get_optional_env("JWT_SECRET_KEY")
-    if not jwt_secret:
-        log.error("JWT_SECRET_KEY environment variable is not set")
-        raise_internal_server_error("Server configuration error: JWT_SECRET_KEY not configured", error_type=ErrorType.SERVER_MISCONFIGURED)
+    # Always set under AUTH_MODE=jwt (`AuthSettings` refuses it otherwise): only a verifier mounted
+    # outside its mode gets here without one.
+    settings = get_auth_settings()
+    if not settings.jwt_secret and not settings.jwt_jwks_uri:
+        log.error("Neither JWT_SECRET_KEY nor JWT_JWKS_URI is configured")
+        raise_internal_server_error(
+            "Server configuration error: JWT_SECRET_KEY or JWT_JWKS_URI not configured", error_type=ErrorType.SERVER_MISCONFIGURED
+        )
 
-    token = credentials.credentials
+    # Deferred: only a `jwt`-mode deployment ever decodes a token, so the others never import PyJWT.
+    import jwt  # noqa: PLC0415
+
+    from api.jwt_verification import JwksUnavailableError, decode_token  # noqa: PLC0415
 
     try:
-        payload = jwt.decode(  # type: ignore[reportUnknownMemberType]
-            token,
-            jwt_secret,
-            algorithms=[JWT_ALGORITHM],
-        )
+        payload = await decode_token(token, settings)
 
         # The caller identifier MUST be supplied as an explicit `user_id`
         # claim. We deliberately do NOT fall back to the standard `sub`
@@ -171,10 +317,15 @@ async def verify_jwt(
                 f"Invalid token: user_id claim must not be the reserved {SINGLE_TENANT_USER_ID!r} value",
                 error_type=ErrorType.INVALID_TOKEN,
             )
-        _set_request_user(request, user_id=user_id)
+        _set_request_user(connection, user_id=user_id)
 
         return payload
 
+    except JwksUnavailableError as exc:
+        log.error(f"JWT verification unavailable: {exc!s}")
+        raise_internal_server_error(
+            "Server configuration error: the JWT_JWKS_URI key set could not be loaded", error_type=ErrorType.SERVER_MISCONFIGURED
+        )
     except jwt.ExpiredSignatureError:
         log.warning("JWT token has expired")
         raise_unauthenticated("Token expired", error_type=ErrorType.TOKEN_EXPIRED)
@@ -183,29 +334,45 @@ async def verify_jwt(
         raise_unauthenticated("Invalid token", error_type=ErrorType.INVALID_TOKEN)
 
 
-async def verify_api_key(credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)]) -> str:
-    """Validate static API key from Authorization header against API_KEY env var.
+async def verify_api_key(request: Request, credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)]) -> str:
+    """Validate an API key from the Authorization header against the API_KEYS_FILE registry, then API_KEY.
 
-    No user identity is available with static API keys — this is a shared developer key.
+    A registered key binds its `user_id` and is admitted through its quota tier (429 past it).
+    The shared API_KEY binds no identity — it is a single developer key.
     """
-    if credentials is None:
+    return _check_api_key(request, token=credentials.credentials if credentials else None)
+
+
+def _check_api_key(connection: HTTPConnection, *, token: str | None) -> str:
+    """Match a bearer token against the registry, then API_KEY. Shared by `verify_api_key` and `authenticate_connection`."""
+    if token is None:
         # Missing, empty, or non-Bearer `Authorization` header. See the
         # matching branch in `verify_jwt` for why this lives here and not
         # in `HTTPBearer`'s default `auto_error=True` behavior.
         log.warning("API key auth requested without a Bearer token")
         raise_unauthenticated("Missing or malformed Authorization header")
 
-    api_key = get_optional_env("API_KEY")
-
-    if not api_key:
-        log.error("API_KEY environment variable is not set")
+    settings = get_auth_settings()
+    if not settings.api_key and settings.api_key_registry is None:
+        log.error("Neither API_KEY nor API_KEYS_FILE is configured")
         raise_internal_server_error("Server configuration error: API_KEY not configured", error_type=ErrorType.SERVER_MISCONFIGURED)
 
-    if credentials.credentials != api_key:
+    record = settings.api_key_registry.verify(token) if settings.api_key_registry is not None else None
+    if record is not None:
+        retry_after_seconds = API_KEY_QUOTAS.acquire(record)
+        if retry_after_seconds is not None:
+            tier_name = record.tier.name if record.tier is not None else ""
+            METRICS.increment("api_key_rate_limited_total", tier=tier_name)
+            log.warning(f"API key {record.prefix} is over its quota tier {tier_name!r}")
+            raise_too_many_requests(f"Rate limit of quota tier {tier_name!r} exceeded", retry_after_seconds=retry_after_seconds)
+        _set_request_user(connection, user_id=record.user_id)
+        return token
+
+    if not settings.api_key or not hmac.compare_digest(token.encode(), settings.api_key.encode()):
         log.warning("API key mismatch")
         raise_unauthenticated("Invalid authentication token", error_type=ErrorType.INVALID_TOKEN)
 
-    return credentials.credentials
+    return token
 
 
 async def no_auth(request: Request) -> None:
@@ -224,10 +391,15 @@ async def no_auth(request: Request) -> None:
     directly. With the flag enabled, you are responsible for ensuring your
     proxy strips `X-User-Id` from inbound requests before adding its own.
     """
-    if get_optional_env("TRUST_FORWARDED_IDENTITY_HEADERS") != "true":
+    _bind_forwarded_identity(request)
+
+
+def _bind_forwarded_identity(connection: HTTPConnection) -> None:
+    """Bind the proxy-forwarded `X-User-Id` when trusted. Shared by `no_auth` and `authenticate_connection`."""
+    if not get_auth_settings().trust_forwarded_identity_headers:
         return
 
-    user_id = request.headers.get(ForwardedIdentityHeader.USER_ID)
+    user_id = connection.headers.get(ForwardedIdentityHeader.USER_ID)
     if not user_id:
         # **This used to stay anonymous, and that was the bug.** Turning this flag
         # on is a deployment stating "a proxy in front of me authenticates every
@@ -243,7 +415,7 @@ async def no_auth(request: Request) -> None:
         log.warning(f"Forwarded X-User-Id is not a path-safe segment, rejecting: {user_id!r}")
         raise_bad_request("Forwarded X-User-Id must be a single path-safe segment", error_type=ErrorType.BAD_REQUEST)
 
-    _set_request_user(request, user_id=user_id)
+    _set_request_user(connection, user_id=user_id)
 
 
 async def get_request_user(request: Request) -> RequestUser | None:
@@ -261,17 +433,36 @@ async def get_request_user(request: Request) -> RequestUser | None:
 
 
 def get_auth_dependency() -> Any:
-    """Select authentication dependency based on AUTH_MODE env var.
+    """Select authentication dependency based on the AUTH_MODE resolved at startup.
 
     - none: No authentication (open source default, or behind API Gateway)
     - jwt: Validate JWT tokens
     - api_key: Validate static API key
     """
-    auth_mode = get_auth_mode()
-    match auth_mode:
+    match get_auth_settings().mode:
         case AuthMode.NONE:
             return no_auth
         case AuthMode.JWT:
             return verify_jwt
         case AuthMode.API_KEY:
             return verify_api_key
+
+
+async def authenticate_connection(connection: HTTPConnection) -> None:
+    """Authenticate a connection that is not a plain HTTP request — a WebSocket handshake.
+
+    FastAPI's router-level dependencies (and `HTTPBearer`) are typed against
+    `Request` and do not run for WebSocket routes, so a WebSocket endpoint calls
+    this once at the handshake instead. Same `AUTH_MODE`, same verifiers, same
+    `ApiError` on failure, and the caller is bound onto `connection.state.user`
+    exactly as the HTTP dependencies bind it.
+    """
+    scheme, token = get_authorization_scheme_param(connection.headers.get("Authorization"))
+    bearer_token = token if scheme.lower() == "bearer" and token else None
+    match get_auth_settings().mode:
+        case AuthMode.NONE:
+            _bind_forwarded_identity(connection)
+        case AuthMode.JWT:
+            await _bind_jwt_identity(connection, token=bearer_token)
+        case AuthMode.API_KEY:
+            _check_api_key(connection, token=bearer_token)
@@ -0,0 +1,178 @@
+"""Pre-fork multi-worker serving: `python -m api.serve`.
+
+`uvicorn --workers N` spawns N fresh interpreters, each re-importing the app and booting Pipelex
+from nothing. Here one parent does the expensive part once and forks workers that inherit it
+copy-on-write:
+
+- **In the parent, before fork.** `api.main` is imported (config load, plugin discovery, the route
+  tree), then its `lifespan` is run once end to end: `Pipelex.make` — which imports everything the
+  boot needs, the model deck's modules included, and fails the server on a bad config before any
+  worker exists — the warmup (OpenAPI bytes, route validators), then teardown. No thread or event
+  loop outlives that rehearsal, so the fork is clean.
+- **In each worker.** uvicorn serves the shared listening socket and runs `lifespan` for real. The
+  per-worker `Pipelex.make` stays — its hubs, clients and library state are per-process — but is now
+  only instantiation: everything it would import is already loaded.
+- **Recycling.** A worker exits after `MAX_REQUESTS_PER_WORKER` requests (plus jitter) and the
+  parent forks a fresh one from the same warm image, bounding per-worker memory growth. A worker
+  that fails its own startup stops the server with uvicorn's exit code 3.
+
+`SIGTERM` / `SIGINT` to the parent drains every worker gracefully, then exits. `SIGHUP` is
+forwarded to every worker, where it reloads the auth settings (`API_KEYS_FILE`) and the inference
+config (`api.inference_config`). Metrics stay process-local: `GET /metrics` answers for the worker
+that served it. So do the API-key quota buckets, which is why each worker admits only its share of
+a tier's rate (`api.api_keys.QuotaLimiter`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import uvicorn
+from uvicorn.main import STARTUP_FAILURE
+
+from api.limits import MAX_REQUESTS_JITTER, MAX_REQUESTS_PER_WORKER, WEB_CONCURRENCY
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    import socket
+    from types import FrameType
+
+    from api.openapi_schema import PipelexFastAPI
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class PreforkSupervisor:
+    """Forks `workers` uvicorn servers over one listening socket and keeps that many alive."""
+
+    def __init__(self, config: uvicorn.Config, *, workers: int) -> None:
+        self._config = config
+        self._workers = workers
+        self._children: set[int] = set()
+        self._stopping = False
+
+    def run(self) -> int:
+        """Serve until signalled. Returns the server's exit code: `STARTUP_FAILURE` if a worker could not boot."""
+        sock = self._config.bind_socket()
+        # Listening before the first fork: a connection that arrives while every worker is being
+        # recycled waits in the backlog instead of being refused.
+        sock.listen(self._config.backlog)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_hangup)
+        exit_code = 0
+        try:
+            for _ in range(self._workers):
+                self._spawn(sock)
+            while self._children:
+                pid, status = os.wait()
+                self._children.discard(pid)
+                worker_exit_code = os.waitstatus_to_exitcode(status)
+                if self._stopping:
+                    continue
+                if worker_exit_code == STARTUP_FAILURE:
+                    logger.error("Worker [%d] failed to start; stopping the server", pid)
+                    exit_code = STARTUP_FAILURE
+                    self._stop()
+                    continue
+                logger.info("Worker [%d] exited with code %d; forking a replacement", pid, worker_exit_code)
+                self._spawn(sock)
+        finally:
+            sock.close()
+        return exit_code
+
+    def _spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid == 0:
+            worker_exit_code = 1
+            try:
+                worker_exit_code = self._serve_in_worker(sock)
+            except Exception:
+                logger.exception("Worker [%d] crashed", os.getpid())
+            finally:
+                # Never unwind into the parent's supervision loop from a child.
+                os._exit(worker_exit_code)
+        self._children.add(pid)
+        # A stop that landed between `os.wait` and this fork has not signalled the new worker.
+        if self._stopping:
+            self._signal_worker(pid)
+
+    def _serve_in_worker(self, sock: socket.socket) -> int:
+        # The parent's handlers signal *its* children; uvicorn installs the worker's own around `run`.
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        # Ignored, not fatal, until the app's `lifespan` installs its own `SIGHUP` handler: a worker
+        # still booting reads the current files anyway.
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        server = uvicorn.Server(self._config)
+        server.run(sockets=[sock])
+        return 0 if server.started else STARTUP_FAILURE
+
+    def _handle_stop(self, _signum: int, _frame: FrameType | None) -> None:
+        self._stop()
+
+    def _handle_hangup(self, _signum: int, _frame: FrameType | None) -> None:
+        for pid in list(self._children):
+            self._signal_worker(pid, signal.SIGHUP)
+
+    def _stop(self) -> None:
+        self._stopping = True
+        for pid in list(self._children):
+            self._signal_worker(pid)
+
+    @staticmethod
+    def _signal_worker(pid: int, signum: signal.Signals = signal.SIGTERM) -> None:
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, signum)
+
+
+async def _rehearse_boot(fastapi_app: PipelexFastAPI) -> None:
+    from api.main import lifespan  # noqa: PLC0415 — see `main`
+
+    async with lifespan(fastapi_app):
+        pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m api.serve", description="Serve the Pipelex API from pre-forked uvicorn workers.")
+    parser.add_argument("--host", default="0.0.0.0", help="bind address (default: 0.0.0.0)")  # noqa: S104 — a container entrypoint
+    parser.add_argument("--port", type=int, default=8081, help="bind port (default: 8081)")
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY, help="worker processes (default: WEB_CONCURRENCY, else 1)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    # Imported here rather than at module top so the supervisor itself carries no app import.
+    from api.api_keys import API_KEY_QUOTAS  # noqa: PLC0415
+    from api.main import app, fastapi_app  # noqa: PLC0415
+
+    # Each worker forks with its own quota buckets: split every tier's rate between them.
+    API_KEY_QUOTAS.workers = args.workers
+
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        # "on", not "auto": a worker whose `Pipelex.make` raises must fail its startup, not serve.
+        lifespan="on",
+        limit_max_requests=MAX_REQUESTS_PER_WORKER,
+        limit_max_requests_jitter=MAX_REQUESTS_JITTER,
+    )
+    started = time.perf_counter()
+    asyncio.run(_rehearse_boot(fastapi_app))
+    # Workers count from their own boot, not the parent's rehearsal.
+    METRICS.reset()
+    logger.info("Boot rehearsed in %.2fs; forking %d worker(s)", time.perf_counter() - started, args.workers)
+    return PreforkSupervisor(config, workers=args.workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Boot-time warmup: pay the app's one-off schema costs in `lifespan`, not on the first requests.
+
+Two things are otherwise built lazily, on whichever request first needs them:
+
+- the OpenAPI document — hundreds of milliseconds of JSON-schema generation over every route's
+  models, paid by the first `GET /openapi.json` (or the first `/docs` visit);
+- any model whose core schema Pydantic could not complete at class definition (a forward
+  reference resolved later), rebuilt on its first validation.
+
+`warm_up` does both at boot, and touches every route's request/response validator and serializer
+so a deferred build surfaces here rather than under a client's latency budget. After it returns,
+the request path constructs no schema (pinned by `tests/unit/test_warmup.py`).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+
+from api.metrics import METRICS
+
+if TYPE_CHECKING:
+    from fastapi._compat import ModelField
+
+    from api.openapi_schema import PipelexFastAPI
+
+
+def _touch_field(field: ModelField) -> None:
+    """Force the field's validator and serializer (and its model's, if still incomplete) to exist."""
+    annotation = field.field_info.annotation
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel) and not annotation.__pydantic_complete__:
+        annotation.model_rebuild()
+    # FastAPI's own per-field adapter is what a request validates through, so it is the one to warm.
+    # It is private, though: should a FastAPI release rename or drop it, an adapter over the same
+    # annotation still builds (and caches) every model schema the field's own adapter reuses.
+    private_adapter: object = getattr(field, "_type_adapter", None)
+    adapter: TypeAdapter[Any] = (
+        cast("TypeAdapter[Any]", private_adapter) if isinstance(private_adapter, TypeAdapter) else TypeAdapter[Any](annotation)
+    )
+    _ = adapter.validator, adapter.serializer
+
+
+def warm_up(app: PipelexFastAPI) -> None:
+    """Prebuild the OpenAPI bytes and every route's request/response validators; record the cost."""
+    started = time.perf_counter()
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for field in (route.body_field, route.response_field):
+            if field is not None:
+                _touch_field(field)
+    app.openapi_bytes()
+    METRICS.observe("boot_warmup_seconds", time.perf_counter() - started)
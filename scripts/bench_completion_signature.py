@@ -0,0 +1,74 @@
+"""Benchmark signing a run's completion callbacks once per run against once per URL.
+
+Times two ways of producing the `X-Completion-Signature` headers for a `/start` run with `--urls`
+callback URLs:
+
+- `per-url`: the previous path — the secret read from the environment and a fresh HMAC keyed
+  and computed for every URL;
+- `keyed-once`: `CompletionSigner.headers` once per run, from an HMAC keyed once at load, the
+  result shared by every URL.
+
+Usage:
+    python scripts/bench_completion_signature.py
+    python scripts/bench_completion_signature.py --runs 100000 --urls 5
+"""
+
+import argparse
+import hashlib
+import hmac
+import os
+import statistics
+import time
+from collections.abc import Callable
+
+from pipelex.system.environment import get_required_env
+
+from api.completion_signature import COMPLETION_CALLBACK_SECRET_ENV_VAR, CompletionSigner
+
+
+def _per_url(run_ids: list[str], urls: int) -> None:
+    for run_id in run_ids:
+        for _ in range(urls):
+            secret = get_required_env(COMPLETION_CALLBACK_SECRET_ENV_VAR)
+            hmac.new(secret.encode("utf-8"), run_id.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _keyed_once(signer: CompletionSigner) -> Callable[[list[str], int], None]:
+    def sign(run_ids: list[str], urls: int) -> None:
+        for run_id in run_ids:
+            headers = signer.headers(run_id)
+            [headers for _ in range(urls)]
+
+    return sign
+
+
+def _time(sign: Callable[[list[str], int], None], run_ids: list[str], urls: int, rounds: int) -> float:
+    times: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        sign(run_ids, urls)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20_000, help="runs signed per pass")
+    parser.add_argument("--urls", type=int, default=5, help="callback URLs per run (MAX_CALLBACK_URLS defaults to 5)")
+    parser.add_argument("--rounds", type=int, default=5, help="timed passes per measurement")
+    args = parser.parse_args()
+
+    os.environ[COMPLETION_CALLBACK_SECRET_ENV_VAR] = "bench-secret-" + "x" * 32
+    run_ids = [f"run-{index:08d}" for index in range(args.runs)]
+    signer = CompletionSigner()
+    signer.load()
+
+    print(f"{args.runs} runs x {args.urls} callback URLs; {args.rounds} rounds, median per pass")
+    print(f"{'scheme':<10} {'pass ms':>10} {'us/run':>8}")
+    for name, sign in (("per-url", _per_url), ("keyed-once", _keyed_once(signer))):
+        elapsed = _time(sign, run_ids, args.urls, args.rounds)
+        print(f"{name:<10} {elapsed * 1000:>10.1f} {elapsed / args.runs * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark the error-log path: the logfmt line through the pipelex `log` against the JSON sink.
+
+Emits `--records` `api_error` records through `api.exception_handlers.emit_error_log`, from inside
+an `except` block as the handlers do, the way an error storm would (a provider answering 429 to
+every run, with a share of 5xx carrying a traceback). Two measurements per format:
+
+- `caller`: the time spent in `emit_error_log` itself — what each failing request pays;
+- `total`:  until every record is written — for `json`, including the writer thread draining.
+
+The process's `stdout` and `stderr` (where the pipelex `log` and the JSON sink write) are
+redirected to `/dev/null` while timing, so the write cost is counted but the terminal is not
+flooded. With a queue smaller than the burst, the JSON sink drops what it cannot hold; the
+`dropped` column says how many.
+
+Usage:
+    python scripts/bench_error_log.py
+    python scripts/bench_error_log.py --records 50000 --error-every 10 --queue 1000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from pipelex.pipelex import Pipelex
+from pipelex.system.runtime import IntegrationMode
+
+from api.exception_handlers import emit_error_log
+from api.log_sink import ERROR_LOG_SINK
+from api.metrics import METRICS
+
+
+def _fields(index: int, *, as_error: bool) -> dict[str, object]:
+    return {
+        "event": "api_error",
+        "request_id": f"5f0c6a52-8d1e-4f4e-9a4b-{index:012d}",
+        "route": "/v1/execute",
+        "user_id": "tenant-42",
+        "pipeline_run_id": f"run-{index:08d}",
+        "error_type": "PipelexUnexpectedError" if as_error else "RateLimitError",
+        "error_category": "unknown" if as_error else "rate_limit",
+        "error_domain": "runtime" if as_error else "provider",
+        "retryable": not as_error,
+        "status": 500 if as_error else 429,
+        "detail": 'Provider answered 429 Too Many Requests: retry after 20s (quota "gpt-4o" exhausted)',
+        "provider": "openai",
+        "model": "gpt-4o",
+    }
+
+
+def _emit_storm(records: int, error_every: int) -> float:
+    """Emit the storm; returns the seconds spent inside `emit_error_log`."""
+    spent = 0.0
+    for index in range(records):
+        as_error = index % error_every == 0
+        try:
+            msg = "provider unavailable"
+            raise RuntimeError(msg)
+        except RuntimeError:
+            started = time.perf_counter()
+            emit_error_log(fields=_fields(index, as_error=as_error), as_error=as_error)
+            spent += time.perf_counter() - started
+    return spent
+
+
+@contextmanager
+def _output_to_devnull() -> Iterator[None]:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = {fd: os.dup(fd) for fd in (1, 2)}
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    for fd in saved:
+        os.dup2(devnull, fd)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, saved_fd in saved.items():
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+        os.close(devnull)
+
+
+def _dropped() -> int:
+    return sum(METRICS.counter_value("error_log_records_total", outcome="dropped", level=level) for level in ("error", "warning"))
+
+
+def _measure(log_format: str, *, records: int, error_every: int, queue_records: int) -> tuple[float, float, int]:
+    dropped = _dropped()
+    with _output_to_devnull():
+        started = time.perf_counter()
+        if log_format == "json":
+            ERROR_LOG_SINK.start(max_records=queue_records)
+        caller = _emit_storm(records, error_every)
+        ERROR_LOG_SINK.close(timeout_seconds=600)
+        total = time.perf_counter() - started
+    return caller, total, _dropped() - dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5_000, help="records emitted per pass")
+    parser.add_argument("--error-every", type=int, default=10, help="every Nth record is a 5xx with a traceback; the rest are 429 warnings")
+    parser.add_argument("--queue", type=int, default=10_000, help="the JSON sink's queue bound (ERROR_LOG_QUEUE_RECORDS)")
+    parser.add_argument("--rounds", type=int, default=3, help="timed passes per format")
+    args = parser.parse_args()
+
+    # The logfmt arm writes through the pipelex `log`, which needs a booted runtime.
+    Pipelex.make(integration_mode=IntegrationMode.FASTAPI, needs_inference=False)
+
+    print(f"{args.records} records, one in {args.error_every} with a traceback; queue {args.queue}; {args.rounds} rounds, median per pass")
+    print(f"{'format':<8} {'caller ms':>10} {'us/record':>10} {'total ms':>10} {'dropped':>8}")
+    for log_format in ("logfmt", "json"):
+        passes = [_measure(log_format, records=args.records, error_every=args.error_every, queue_records=args.queue) for _ in range(args.rounds)]
+        caller = statistics.median(measured[0] for measured in passes)
+        total = statistics.median(measured[1] for measured in passes)
+        dropped = statistics.median(measured[2] for measured in passes)
+        print(f"{log_format:<8} {caller * 1000:>10.1f} {caller / args.records * 1e6:>10.2f} {total * 1000:>10.1f} {dropped:>8.0f}")
+
+    Pipelex.teardown_if_needed()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark the memoized lint/format path against the bare `pipelex_tools` engine.
+
+Builds a workspace-like corpus of `.mthds` bundles — several domains, each with a mix of
+`PipeLLM` and `PipeSequence` pipes, a few of them deliberately broken — then times three
+passes over it through `api.routes.pipelex.tools.run_lint` / `run_format`:
+
+- `engine`: the bare `pipelex_tools` calls, no cache (the pre-cache cost of every request);
+- `cold`:   the first cached pass (every file a miss: engine call + digest + store);
+- `warm`:   a second cached pass over the unchanged corpus (every file a hit).
+
+Usage:
+    python scripts/bench_tools_cache.py
+    python scripts/bench_tools_cache.py --files 500 --pipes 20 --rounds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import pipelex_tools
+
+from api.lanes import Lane
+from api.metrics import METRICS
+from api.routes.pipelex.tools import TOOLS_CACHE, run_format, run_lint
+
+
+def build_corpus(files: int, pipes: int) -> list[str]:
+    """`files` distinct bundles of `pipes` pipes each; every tenth one carries a syntax error."""
+    corpus: list[str] = []
+    for file_index in range(files):
+        lines = [f'domain = "bench_{file_index}"', 'main_pipe = "pipeline"', ""]
+        steps: list[str] = []
+        for pipe_index in range(pipes):
+            code = f"step_{pipe_index}"
+            steps.append(f'{{ pipe = "{code}", result = "out_{pipe_index}" }}')
+            lines += [
+                f"[pipe.{code}]",
+                'type = "PipeLLM"',
+                f'description = "Step {pipe_index} of bundle {file_index}"',
+                'inputs = { text = "Text" }',
+                'output = "Text"',
+                f'prompt = "Rewrite @text for step {pipe_index}."',
+                "",
+            ]
+        lines += [
+            "[pipe.pipeline]",
+            'type = "PipeSequence"',
+            'description = "Run every step"',
+            'inputs = { text = "Text" }',
+            'output = "Text"',
+            f"steps = [{', '.join(steps)}]",
+            "",
+        ]
+        if file_index % 10 == 0:
+            lines.append("[pipe.broken")
+        corpus.append("\n".join(lines))
+    return corpus
+
+
+async def _time_pass(corpus: list[str], call: Callable[[str], Awaitable[object]]) -> float:
+    started = time.perf_counter()
+    for content in corpus:
+        await call(content)
+    return time.perf_counter() - started
+
+
+async def _bench(corpus: list[str], rounds: int) -> None:
+    async def engine_lint(content: str) -> object:
+        return pipelex_tools.lint_mthds(content, source="bench.mthds")
+
+    async def engine_format(content: str) -> object:
+        return pipelex_tools.format_mthds(content, options=None)
+
+    async def cached_lint(content: str) -> object:
+        return await run_lint(Lane.INTERACTIVE, content, source="bench.mthds")
+
+    async def cached_format(content: str) -> object:
+        return await run_format(Lane.INTERACTIVE, content)
+
+    corpus_bytes = sum(len(content.encode()) for content in corpus)
+    print(f"corpus: {len(corpus)} files, {corpus_bytes / 1024:.0f} KiB; {rounds} rounds, median per pass")
+    print(f"{'operation':<8} {'engine ms':>10} {'cold ms':>10} {'warm ms':>10} {'speedup':>8}")
+    for name, engine, cached in (("lint", engine_lint, cached_lint), ("format", engine_format, cached_format)):
+        engine_times, cold_times, warm_times = [], [], []
+        for _ in range(rounds):
+            engine_times.append(await _time_pass(corpus, engine))
+            TOOLS_CACHE.clear()
+            cold_times.append(await _time_pass(corpus, cached))
+            warm_times.append(await _time_pass(corpus, cached))
+        engine_ms, cold_ms, warm_ms = (statistics.median(times) * 1000 for times in (engine_times, cold_times, warm_times))
+        print(f"{name:<8} {engine_ms:>10.1f} {cold_ms:>10.1f} {warm_ms:>10.1f} {engine_ms / warm_ms:>7.1f}x")
+    print(f"cache: {len(TOOLS_CACHE)} entries, {TOOLS_CACHE.total_bytes / 1024:.0f} KiB")
+    print(f"hits: {METRICS.counter_value('cache_hits_total', cache='tools')}, misses: {METRICS.counter_value('cache_misses_total', cache='tools')}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200, help="bundles in the corpus")
+    parser.add_argument("--pipes", type=int, default=12, help="PipeLLM steps per bundle")
+    parser.add_argument("--rounds", type=int, default=3, help="timed passes per measurement")
+    args = parser.parse_args()
+    asyncio.run(_bench(build_corpus(args.files, args.pipes), args.rounds))
+
+
+if __name__ == "__main__":
+    main()
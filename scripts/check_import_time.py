@@ -0,0 +1,105 @@
+"""Measure the cold import of `api.main` with `python -X importtime`, and fail on a regression.
+
+Every autoscaled replica pays this import before it can answer `/health`. Two checks, run
+against fresh interpreters so nothing is warm:
+
+- **Deferred modules.** Modules the app deliberately imports on first use (`DEFERRED_MODULES`)
+  must not appear in the startup import tree. Deterministic, so it is the check that catches a
+  stray top-level import on any machine.
+- **Budget.** The median cumulative import time of `api.main` over `--runs` interpreters must
+  stay under `--budget-ms`. Timings vary by machine; the default leaves CI-runner headroom over
+  a local measurement of about 2.5 s.
+
+The slowest modules (by self time, from the median run) are printed either way, as the first
+place to look when the budget trips.
+
+Usage:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --runs 9 --budget-ms 3000 --top 30
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+TARGET_MODULE = "api.main"
+
+# Imported inside the one function that needs them — keep them off the startup path.
+# The inference provider SDKs are imported by pipelex when their client is first built. boto3 is not
+# among them: pipelex's DynamoDB tracing backend imports it at module level, and the `/validate`
+# response model (`PipelexValidationReport`) reaches that module, so it loads with the routes.
+DEFERRED_MODULES = (
+    "jwt",
+    "pipelex.builder.operations.concept_ops",
+    "pipelex.builder.operations.pipe_ops",
+    "aioboto3",
+    "anthropic",
+    "fal_client",
+    "google.genai",
+    "instructor",
+    "mistralai",
+    "openai",
+    "portkey_ai",
+)
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+class ImportSample(NamedTuple):
+    """One interpreter's import tree: microseconds per module, self and cumulative."""
+
+    self_us: dict[str, int]
+    cumulative_us: dict[str, int]
+
+
+def sample_import() -> ImportSample:
+    completed = subprocess.run(  # noqa: S603 — a fixed argv: this interpreter, importing the app
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET_MODULE}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    self_us: dict[str, int] = {}
+    cumulative_us: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        module = match.group(4)
+        self_us[module] = int(match.group(1))
+        cumulative_us[module] = int(match.group(2))
+    return ImportSample(self_us=self_us, cumulative_us=cumulative_us)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to sample")
+    parser.add_argument("--budget-ms", type=float, default=3500.0, help=f"fail when the median `import {TARGET_MODULE}` exceeds this")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules (self time) to print")
+    args = parser.parse_args()
+
+    samples = sorted((sample_import() for _ in range(args.runs)), key=lambda sample: sample.cumulative_us[TARGET_MODULE])
+    median_sample = samples[len(samples) // 2]
+    median_ms = statistics.median(sample.cumulative_us[TARGET_MODULE] for sample in samples) / 1000
+
+    print(f"import {TARGET_MODULE}: median {median_ms:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print(f"{'self ms':>8} {'cumul ms':>9}  module")
+    for module, self_us in sorted(median_sample.self_us.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{self_us / 1000:>8.1f} {median_sample.cumulative_us[module] / 1000:>9.1f}  {module}")
+
+    failed = False
+    eagerly_imported = [module for module in DEFERRED_MODULES if module in median_sample.self_us]
+    if eagerly_imported:
+        print(f"FAILED: deferred modules imported at startup: {', '.join(eagerly_imported)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAILED: import {TARGET_MODULE} took {median_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
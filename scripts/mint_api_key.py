@@ -0,0 +1,29 @@
+"""Mint an API key for the `API_KEYS_FILE` registry (`api.api_keys`).
+
+Prints the key — shown once, hand it to its caller — and the `[[keys]]` entry to append to the
+registry file, which holds only the key's salted hash. Send the server `SIGHUP` to load it.
+
+    python scripts/mint_api_key.py --user-id team-analytics --tier standard >> keys.toml
+"""
+
+import argparse
+import sys
+
+from api.api_keys import mint_api_key_entry
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mint an API key and print its API_KEYS_FILE registry entry.")
+    parser.add_argument("--user-id", required=True, help="caller id the key authenticates as (its runs' storage namespace)")
+    parser.add_argument("--tier", default=None, help="quota tier name, defined under [tiers.<name>] in the registry (default: unlimited)")
+    args = parser.parse_args(argv)
+
+    key, entry = mint_api_key_entry(user_id=args.user_id, tier=args.tier)
+    # The key on stderr, the entry on stdout: `>> keys.toml` appends the entry and leaves the key on screen.
+    sys.stderr.write(f"API key (store it now, it is not recoverable): {key}\n")
+    sys.stdout.write(f"\n{entry}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
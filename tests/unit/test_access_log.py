@@ -0,0 +1,140 @@
+"""The sampled access log (`api.access_log`) — fields, per-route sampling, concurrency, configuration."""
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from api.access_log import (
+    ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR,
+    ACCESS_LOG_SAMPLE_RATE_ENV_VAR,
+    UNMATCHED_ROUTE,
+    AccessLogMiddleware,
+    AccessLogSampling,
+    InvalidAccessLogConfigError,
+    resolve_access_log_sampling,
+)
+from api.metrics import METRICS
+from api.middleware import RequestIdMiddleware
+
+_router = APIRouter()
+
+
+@_router.post("/v1/echo")
+async def echo(request: Request) -> dict[str, Any]:
+    request.state.pipe_code = "summarize"
+    return {"echo": (await request.json())["text"]}
+
+
+@_router.get("/v1/slow")
+async def slow() -> dict[str, bool]:
+    await asyncio.sleep(0.05)
+    return {"ok": True}
+
+
+@_router.get("/v1/explode")
+async def explode() -> None:
+    msg = "deliberate unhandled error"
+    raise RuntimeError(msg)
+
+
+def _app(sampling: AccessLogSampling) -> RequestIdMiddleware:
+    inner = FastAPI()
+    inner.include_router(_router)
+    return RequestIdMiddleware(AccessLogMiddleware(inner, sampling=sampling))
+
+
+@pytest.fixture
+def access_lines(mocker: MockerFixture) -> list[dict[str, Any]]:
+    lines: list[dict[str, Any]] = []
+
+    def record(*, fields: dict[str, Any], level: str) -> None:
+        lines.append({"level": level, **fields})
+
+    mocker.patch("api.access_log.emit_log", side_effect=record)
+    return lines
+
+
+class TestAccessLogMiddleware:
+    def test_a_sampled_request_logs_its_size_caller_and_cost(self, access_lines: list[dict[str, Any]]):
+        client = TestClient(_app(AccessLogSampling(default_rate=1.0)))
+        response = client.post("/v1/echo", content=b'{"text": "hello"}', headers={"content-type": "application/json"})
+
+        [line] = access_lines
+        assert line["level"] == "info"
+        assert line["event"] == "access"
+        assert line["request_id"] == response.headers["X-Request-ID"]
+        assert (line["method"], line["route"], line["status"]) == ("POST", "/v1/echo", 200)
+        assert line["request_bytes"] == len(b'{"text": "hello"}')
+        assert line["response_bytes"] == len(response.content)
+        assert line["pipe_code"] == "summarize"
+        assert line["duration_ms"] >= 0
+        assert line["cpu_ms"] >= 0
+        assert line["max_rss_growth_kib"] >= 0
+        assert line["concurrent"] == 0
+        assert line["sample_rate"] == 1.0
+
+    def test_route_rates_override_the_default(self, access_lines: list[dict[str, Any]]):
+        client = TestClient(_app(AccessLogSampling(default_rate=1.0, route_rates={"/v1/slow": 0.0})))
+        observed = METRICS.snapshot()["summaries"].get('http_request_seconds{route="/v1/slow"}', {"count": 0})["count"]
+
+        client.get("/v1/slow")
+        client.get("/v1/nowhere")
+
+        # Not logged, but still measured.
+        assert [line["route"] for line in access_lines] == [UNMATCHED_ROUTE]
+        assert METRICS.snapshot()["summaries"]['http_request_seconds{route="/v1/slow"}']["count"] == observed + 1
+
+    def test_the_catch_all_500_is_logged(self, access_lines: list[dict[str, Any]]):
+        client = TestClient(_app(AccessLogSampling(default_rate=1.0)), raise_server_exceptions=False)
+
+        assert client.get("/v1/explode").status_code == 500
+        assert access_lines[0]["status"] == 500
+
+    def test_overlapping_requests_are_marked_concurrent(self, access_lines: list[dict[str, Any]]):
+        transport = httpx.ASGITransport(app=_app(AccessLogSampling(default_rate=1.0)))
+
+        async def overlap() -> None:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await asyncio.gather(client.get("/v1/slow"), client.get("/v1/slow"))
+
+        asyncio.run(overlap())
+        assert [line["concurrent"] for line in access_lines] == [1, 1]
+
+    def test_with_sampling_off_nothing_is_measured(self, access_lines: list[dict[str, Any]]):
+        client = TestClient(_app(AccessLogSampling()))
+
+        assert client.get("/v1/slow").status_code == 200
+        assert access_lines == []
+
+
+class TestResolveAccessLogSampling:
+    def test_unset_turns_the_access_log_off(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv(ACCESS_LOG_SAMPLE_RATE_ENV_VAR, raising=False)
+        monkeypatch.delenv(ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR, raising=False)
+
+        assert not resolve_access_log_sampling().enabled
+
+    def test_route_rates_are_parsed(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv(ACCESS_LOG_SAMPLE_RATE_ENV_VAR, "0.1")
+        monkeypatch.setenv(ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR, " /v1/execute=1, /v1/lint=0.01 ,")
+
+        sampling = resolve_access_log_sampling()
+        assert sampling.rate_for("/v1/execute") == 1.0
+        assert sampling.rate_for("/v1/lint") == 0.01
+        assert sampling.rate_for("/v1/validate") == 0.1
+
+    @pytest.mark.parametrize(
+        ("default_rate", "route_rates"),
+        [("1.5", ""), ("often", ""), ("", "/v1/execute"), ("", "/v1/execute=-1"), ("", "=0.5")],
+    )
+    def test_a_malformed_value_fails(self, monkeypatch: pytest.MonkeyPatch, default_rate: str, route_rates: str):
+        monkeypatch.setenv(ACCESS_LOG_SAMPLE_RATE_ENV_VAR, default_rate)
+        monkeypatch.setenv(ACCESS_LOG_ROUTE_SAMPLE_RATES_ENV_VAR, route_rates)
+
+        with pytest.raises(InvalidAccessLogConfigError):
+            resolve_access_log_sampling()
@@ -0,0 +1,170 @@
+"""Per-caller API keys (`api.api_keys`) — registry loading, hashed lookup, identity binding and quota tiers."""
+
+from pathlib import Path
+from typing import Annotated
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from api.api_keys import API_KEY_QUOTAS, ApiKeyRegistry, InvalidApiKeyRegistryError, QuotaLimiter, mint_api_key_entry
+from api.exception_handlers import register_exception_handlers
+from api.metrics import METRICS
+from api.security import (
+    API_KEYS_FILE_ENV_VAR,
+    AUTH_MODE_ENV_VAR,
+    AuthMode,
+    AuthSettings,
+    InvalidAuthConfigError,
+    RequestUser,
+    get_request_user,
+    resolve_auth_settings,
+    verify_api_key,
+)
+from tests.unit._constants import RoutePath
+
+SHARED_API_KEY = "test-api-key-static"
+_ZERO_DIGEST = "00" * 32
+
+
+@pytest.fixture(autouse=True)
+def fresh_quotas() -> None:
+    API_KEY_QUOTAS.reset()
+
+
+def _registry_file(tmp_path: Path, entries: list[str], *, tiers: str = "") -> Path:
+    path = tmp_path / "keys.toml"
+    path.write_text(tiers + "\n" + "\n".join(entries))
+    return path
+
+
+async def _whoami(
+    _token: Annotated[str, Depends(verify_api_key)],
+    user: Annotated[RequestUser | None, Depends(get_request_user)],
+) -> dict[str, str | None]:
+    return {"user_id": user.user_id if user is not None else None}
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    app.add_api_route(RoutePath.WHOAMI, _whoami, methods=["GET"])
+    register_exception_handlers(app)
+    return TestClient(app)
+
+
+class TestApiKeyRegistry:
+    def test_a_minted_key_verifies_against_its_entry(self, tmp_path: Path):
+        key, entry = mint_api_key_entry(user_id="team-a")
+        registry = ApiKeyRegistry.load(_registry_file(tmp_path, [entry]))
+
+        record = registry.verify(key)
+
+        assert record is not None
+        assert record.user_id == "team-a"
+        assert key not in entry
+
+    def test_a_wrong_secret_under_a_registered_prefix_does_not_verify(self, tmp_path: Path):
+        key, entry = mint_api_key_entry(user_id="team-a")
+        registry = ApiKeyRegistry.load(_registry_file(tmp_path, [entry]))
+
+        assert registry.verify(key[:-1] + ("A" if key[-1] != "A" else "B")) is None
+        assert registry.verify("plx_00000000-unknown-prefix") is None
+
+    @pytest.mark.parametrize(
+        ("entries", "tiers", "message"),
+        [
+            (['[[keys]]\nprefix = "plx_00000000"\nsalt = "00"\nsha256 = "zz"\nuser_id = "a"'], "", "must be hex"),
+            (['[[keys]]\nprefix = "plx_00000000"\nsalt = "00"\nuser_id = "a"'], "", "sha256"),
+            (
+                ['[[keys]]\nprefix = "plx_00000000"\nsalt = "00"\nsha256 = "' + _ZERO_DIGEST + '"\nuser_id = "a"\ntier = "gold"'],
+                "",
+                "undefined quota tier",
+            ),
+            ([], "[tiers.gold]\nrequests_per_minute = 0\n", "positive integer"),
+        ],
+    )
+    def test_a_malformed_registry_is_refused(self, tmp_path: Path, entries: list[str], tiers: str, message: str):
+        with pytest.raises(InvalidApiKeyRegistryError, match=message):
+            ApiKeyRegistry.load(_registry_file(tmp_path, entries, tiers=tiers))
+
+    def test_a_prefix_registered_twice_is_refused(self, tmp_path: Path):
+        _, entry = mint_api_key_entry(user_id="team-a")
+        with pytest.raises(InvalidApiKeyRegistryError, match="registered twice"):
+            ApiKeyRegistry.load(_registry_file(tmp_path, [entry, entry]))
+
+
+class TestApiKeyAuth:
+    def test_a_registered_key_binds_its_user_id(self, mocker: MockerFixture, tmp_path: Path):
+        key, entry = mint_api_key_entry(user_id="team-a")
+        registry = ApiKeyRegistry.load(_registry_file(tmp_path, [entry]))
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.API_KEY, api_key_registry=registry))
+
+        response = _build_client().get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {key}"})
+
+        assert response.status_code == 200
+        assert response.json() == {"user_id": "team-a"}
+
+    def test_the_shared_key_still_works_beside_the_registry(self, mocker: MockerFixture, tmp_path: Path):
+        _, entry = mint_api_key_entry(user_id="team-a")
+        registry = ApiKeyRegistry.load(_registry_file(tmp_path, [entry]))
+        settings = AuthSettings(mode=AuthMode.API_KEY, api_key=SHARED_API_KEY, api_key_registry=registry)
+        mocker.patch("api.security.get_auth_settings", return_value=settings)
+        client = _build_client()
+
+        assert client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {SHARED_API_KEY}"}).json() == {"user_id": None}
+        assert client.get(RoutePath.WHOAMI, headers={"Authorization": "Bearer plx_unknown"}).status_code == 401
+
+    def test_a_key_over_its_tier_is_refused_with_retry_after(self, mocker: MockerFixture, tmp_path: Path):
+        key, entry = mint_api_key_entry(user_id="team-a", tier="trial")
+        registry = ApiKeyRegistry.load(_registry_file(tmp_path, [entry], tiers="[tiers.trial]\nrequests_per_minute = 2\n"))
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.API_KEY, api_key_registry=registry))
+        client = _build_client()
+        limited_before = METRICS.counter_value("api_key_rate_limited_total", tier="trial")
+
+        statuses = [client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {key}"}).status_code for _ in range(2)]
+        refused = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {key}"})
+
+        assert statuses == [200, 200]
+        assert refused.status_code == 429
+        assert refused.json()["error_type"] == "RateLimited"
+        # Two per minute: one request's worth refills in about 30 s.
+        assert 1 <= int(refused.headers["Retry-After"]) <= 30
+        assert METRICS.counter_value("api_key_rate_limited_total", tier="trial") == limited_before + 1
+
+    def test_each_worker_admits_its_share_of_the_tier(self, tmp_path: Path):
+        _key, entry = mint_api_key_entry(user_id="team-a", tier="standard")
+        [record] = ApiKeyRegistry.load(_registry_file(tmp_path, [entry], tiers="[tiers.standard]\nrequests_per_minute = 8\n")).records
+        limiter = QuotaLimiter(workers=4)
+
+        assert [limiter.acquire(record) is None for _ in range(3)] == [True, True, False]
+
+    def test_a_tier_slower_than_the_workers_still_admits(self, tmp_path: Path):
+        _key, entry = mint_api_key_entry(user_id="team-a", tier="trial")
+        [record] = ApiKeyRegistry.load(_registry_file(tmp_path, [entry], tiers="[tiers.trial]\nrequests_per_minute = 1\n")).records
+        limiter = QuotaLimiter(workers=4)
+
+        assert limiter.acquire(record) is None
+        # One request a minute across four workers: this worker's next one is four minutes away.
+        retry_after = limiter.acquire(record)
+        assert retry_after is not None
+        assert 239 <= retry_after <= 240
+
+    def test_the_registry_is_loaded_from_api_keys_file(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        key, entry = mint_api_key_entry(user_id="team-a")
+        monkeypatch.setenv(AUTH_MODE_ENV_VAR, "api_key")
+        monkeypatch.setenv(API_KEYS_FILE_ENV_VAR, str(_registry_file(tmp_path, [entry])))
+        monkeypatch.delenv("API_KEY", raising=False)
+
+        registry = resolve_auth_settings().api_key_registry
+
+        assert registry is not None
+        assert registry.verify(key) is not None
+
+    @pytest.mark.parametrize("user_id", ["team/a", "single-tenant"])
+    def test_a_key_mapped_to_an_unusable_user_id_fails_the_settings(self, tmp_path: Path, user_id: str):
+        _, entry = mint_api_key_entry(user_id=user_id)
+        registry = ApiKeyRegistry.load(_registry_file(tmp_path, [entry]))
+
+        with pytest.raises(InvalidAuthConfigError, match="not a usable caller id"):
+            AuthSettings(mode=AuthMode.API_KEY, api_key_registry=registry)
@@ -0,0 +1,110 @@
+"""Unit tests for auth env var resolution (`AuthSettings`) and the `AUTH_CONFIG` reload hook."""
+
+import pytest
+
+from api.security import (
+    API_KEY_ENV_VAR,
+    AUTH_MODE_ENV_VAR,
+    JWT_JWKS_URI_ENV_VAR,
+    JWT_SECRET_KEY_ENV_VAR,
+    TRUST_FORWARDED_IDENTITY_HEADERS_ENV_VAR,
+    AuthConfig,
+    AuthMode,
+    AuthSettings,
+    InvalidAuthConfigError,
+    resolve_auth_settings,
+)
+
+
+@pytest.fixture
+def clean_auth_env(monkeypatch: pytest.MonkeyPatch) -> pytest.MonkeyPatch:
+    for env_var in (AUTH_MODE_ENV_VAR, JWT_SECRET_KEY_ENV_VAR, JWT_JWKS_URI_ENV_VAR, API_KEY_ENV_VAR, TRUST_FORWARDED_IDENTITY_HEADERS_ENV_VAR):
+        monkeypatch.delenv(env_var, raising=False)
+    return monkeypatch
+
+
+class TestResolveAuthSettings:
+    def test_defaults_to_no_auth_when_unset(self, clean_auth_env: pytest.MonkeyPatch):
+        _ = clean_auth_env
+        assert resolve_auth_settings() == AuthSettings()
+
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [("", AuthMode.NONE), ("  ", AuthMode.NONE), ("none", AuthMode.NONE), ("JWT", AuthMode.JWT), (" api_key ", AuthMode.API_KEY)],
+    )
+    def test_resolves_valid_modes(self, clean_auth_env: pytest.MonkeyPatch, raw: str, expected: AuthMode):
+        clean_auth_env.setenv(AUTH_MODE_ENV_VAR, raw)
+        clean_auth_env.setenv(JWT_SECRET_KEY_ENV_VAR, "jwt-secret")
+        clean_auth_env.setenv(API_KEY_ENV_VAR, "api-key")
+        assert resolve_auth_settings().mode is expected
+
+    @pytest.mark.parametrize("raw", ["jwtt", "apikey", "off", "true"])
+    def test_rejects_unknown_mode(self, clean_auth_env: pytest.MonkeyPatch, raw: str):
+        # This used to log a warning and fall back to `none`: a typo in AUTH_MODE served an open API.
+        clean_auth_env.setenv(AUTH_MODE_ENV_VAR, raw)
+        with pytest.raises(InvalidAuthConfigError, match="not a valid auth mode"):
+            resolve_auth_settings()
+
+    @pytest.mark.parametrize(("mode", "secret_env_var"), [("jwt", JWT_SECRET_KEY_ENV_VAR), ("api_key", API_KEY_ENV_VAR)])
+    def test_rejects_a_mode_without_its_secret(self, clean_auth_env: pytest.MonkeyPatch, mode: str, secret_env_var: str):
+        clean_auth_env.setenv(AUTH_MODE_ENV_VAR, mode)
+        clean_auth_env.setenv(secret_env_var, "")
+        with pytest.raises(InvalidAuthConfigError, match=secret_env_var):
+            resolve_auth_settings()
+
+    @pytest.mark.parametrize("jwks_uri", ["http://issuer.example.com/.well-known/jwks.json", "ftp://issuer.example.com/jwks.json"])
+    def test_rejects_a_jwks_uri_that_is_not_https(self, clean_auth_env: pytest.MonkeyPatch, jwks_uri: str):
+        clean_auth_env.setenv(AUTH_MODE_ENV_VAR, "jwt")
+        clean_auth_env.setenv(JWT_JWKS_URI_ENV_VAR, jwks_uri)
+        with pytest.raises(InvalidAuthConfigError, match=JWT_JWKS_URI_ENV_VAR):
+            resolve_auth_settings()
+
+    @pytest.mark.parametrize("jwks_uri", ["https://issuer.example.com/.well-known/jwks.json", "file:///etc/jwks.json", "/etc/jwks.json"])
+    def test_accepts_an_https_or_local_jwks_uri(self, clean_auth_env: pytest.MonkeyPatch, jwks_uri: str):
+        clean_auth_env.setenv(AUTH_MODE_ENV_VAR, "jwt")
+        clean_auth_env.setenv(JWT_JWKS_URI_ENV_VAR, jwks_uri)
+        assert resolve_auth_settings().jwt_jwks_uri == jwks_uri
+
+    @pytest.mark.parametrize(("raw", "expected"), [("true", True), ("false", False), ("1", False), ("TRUE", False)])
+    def test_forwarded_identity_is_trusted_only_on_the_literal_true(self, clean_auth_env: pytest.MonkeyPatch, raw: str, expected: bool):
+        clean_auth_env.setenv(TRUST_FORWARDED_IDENTITY_HEADERS_ENV_VAR, raw)
+        assert resolve_auth_settings().trust_forwarded_identity_headers is expected
+
+
+class TestAuthConfigReload:
+    def test_reload_rotates_the_secret(self, clean_auth_env: pytest.MonkeyPatch):
+        clean_auth_env.setenv(AUTH_MODE_ENV_VAR, "api_key")
+        clean_auth_env.setenv(API_KEY_ENV_VAR, "old-key")
+        auth_config = AuthConfig()
+        auth_config.load()
+
+        clean_auth_env.setenv(API_KEY_ENV_VAR, "new-key")
+        auth_config.reload()
+
+        assert auth_config.settings.api_key == "new-key"
+
+    def test_reload_accepts_explicit_settings(self):
+        auth_config = AuthConfig()
+        auth_config.reload(AuthSettings(mode=AuthMode.NONE, trust_forwarded_identity_headers=True))
+        assert auth_config.settings.trust_forwarded_identity_headers is True
+
+    def test_a_mode_change_is_refused_and_the_current_settings_kept(self):
+        auth_config = AuthConfig()
+        current = auth_config.reload(AuthSettings(mode=AuthMode.JWT, jwt_secret="jwt-secret"))
+
+        with pytest.raises(InvalidAuthConfigError, match="without a restart"):
+            auth_config.reload(AuthSettings(mode=AuthMode.API_KEY, api_key="api-key"))
+
+        assert auth_config.settings is current
+
+    def test_an_invalid_env_is_refused_and_the_current_settings_kept(self, clean_auth_env: pytest.MonkeyPatch):
+        clean_auth_env.setenv(AUTH_MODE_ENV_VAR, "jwt")
+        clean_auth_env.setenv(JWT_SECRET_KEY_ENV_VAR, "jwt-secret")
+        auth_config = AuthConfig()
+        current = auth_config.load()
+
+        clean_auth_env.delenv(JWT_SECRET_KEY_ENV_VAR)
+        with pytest.raises(InvalidAuthConfigError):
+            auth_config.reload()
+
+        assert auth_config.settings is current
@@ -10,6 +10,8 @@ from pytest_mock import MockerFixture
 
 from api.exception_handlers import register_exception_handlers
 from api.routes import router as api_router
+from api.routes.pipelex.agent.models import MODEL_DECK_CACHE
+from api.routes.pipelex.pipeline import ApiRunner
 from tests.unit._constants import VALID_MTHDS
 
 
@@ -357,3 +359,45 @@ class TestBuildAndAgentRoutes:
         assert response.status_code == 200, response.text
         assert open_spy.call_count >= 1
         assert open_spy.call_count == teardown_spy.call_count
+
+
+class TestModelsDeckCache:
+    def test_models_carries_an_etag_and_answers_if_none_match_with_304(self):
+        client = _build_client()
+        response = client.get("/v1/models")
+        etag = response.headers["etag"]
+
+        not_modified = client.get("/v1/models", headers={"If-None-Match": f'"stale", W/{etag}'})
+
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+        assert client.get("/v1/models", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    def test_each_category_is_projected_once_then_served_from_the_cache(self, mocker: MockerFixture):
+        models_spy = mocker.spy(ApiRunner, "models")
+        MODEL_DECK_CACHE.invalidate()
+        client = _build_client()
+
+        first = client.get("/v1/models?type=llm")
+        second = client.get("/v1/models?type=llm")
+        unfiltered = client.get("/v1/models")
+
+        assert first.content == second.content
+        assert first.headers["etag"] == second.headers["etag"] != unfiltered.headers["etag"]
+        assert models_spy.call_count == 2
+
+    def test_invalidate_and_a_new_deck_both_force_a_fresh_projection(self, mocker: MockerFixture):
+        client = _build_client()
+        client.get("/v1/models")
+        models_spy = mocker.spy(ApiRunner, "models")
+
+        MODEL_DECK_CACHE.invalidate()
+        client.get("/v1/models")
+        client.get("/v1/models")
+        assert models_spy.call_count == 1
+
+        # A re-made or reloaded models manager hands out a different deck object.
+        mocker.patch("api.routes.pipelex.agent.models.get_model_deck", return_value=object())
+        client.get("/v1/models")
+        assert models_spy.call_count == 2
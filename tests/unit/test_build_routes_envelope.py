@@ -4,17 +4,23 @@ Pins the Phase-2/3 migration: the three build routes ride the shared `files[]` X
 closure selector (`MthdsFilesRequest`) plus an optional qualified `pipe_ref` that defaults to the
 closure's `main_pipe`; `/build/{inputs,output}` resolve their crate **statically** (no dry-run sweep,
 so no `allow_signatures`), while `/build/runner` keeps both. Verdicts stay on the `/validate`
-discipline — 200 discriminated on `is_valid`, non-2xx only for no-verdict conditions.
+discipline — 200 discriminated on `is_valid`, non-2xx only for no-verdict conditions. `/build/all`
+rides the same envelope and the runner's sweep, so it joins every shared assertion.
 """
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from pipelex.interpreter_hub import get_library_manager
+from pipelex.pipe_run.exceptions import DryRunError
 from pytest_mock import MockerFixture
 
 from api.exception_handlers import register_exception_handlers
+from api.metrics import METRICS
 from api.routes import router as api_router
+from api.routes.pipelex.build import runner as runner_module
+from api.routes.pipelex.crate_ops import prescan_main_pipe_ref
+from api.schemas.models import MthdsFileItem
 from tests.unit._constants import (
     COLLIDING_ECHO_LIST_MTHDS,
     INVALID_MAIN_PIPE_MTHDS,
@@ -25,7 +31,7 @@ from tests.unit._constants import (
     VALID_MTHDS,
 )
 
-BUILD_PATHS = ["/v1/build/inputs", "/v1/build/output", "/v1/build/runner"]
+BUILD_PATHS = ["/v1/build/inputs", "/v1/build/output", "/v1/build/runner", "/v1/build/all"]
 
 
 def _build_client() -> TestClient:
@@ -289,3 +295,99 @@ class TestBuildRoutesEnvelope:
         assert body["python_code"]
         assert body["structures"]["artifacts"]
         assert spy.call_count == 1
+
+
+class TestBuildAllRoute:
+    @pytest.mark.parametrize(
+        ("axes", "inputs_axes", "output_axes"),
+        [
+            ({}, {}, {}),
+            ({"inputs_format": "toml", "explicit": True, "output_format": "python"}, {"format": "toml", "explicit": True}, {"format": "python"}),
+        ],
+        ids=["defaults", "every-axis-set"],
+    )
+    def test_each_section_is_what_its_sibling_route_returns(
+        self, axes: dict[str, object], inputs_axes: dict[str, object], output_axes: dict[str, object]
+    ):
+        # The point of the route: one resolution + sweep instead of three, with no change to what the
+        # deploy flow receives — each section is its sibling's valid arm for the same pipe and axes.
+        client = _build_client()
+        closure = {"files": [{"content": VALID_MTHDS}], "pipe_ref": "smoke.echo"}
+
+        response = client.post("/v1/build/all", json={**closure, **axes})
+
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["is_valid"] is True
+        assert body["pipe_ref"] == "smoke.echo"
+        assert body["inputs"] == client.post("/v1/build/inputs", json={**closure, **inputs_axes}).json()
+        assert body["output"] == client.post("/v1/build/output", json={**closure, **output_axes}).json()
+        assert body["runner"] == client.post("/v1/build/runner", json=closure).json()
+
+    def test_the_closure_is_swept_once_for_all_three_projections(self, mocker: MockerFixture):
+        open_spy = mocker.spy(get_library_manager(), "open_library")
+        client = _build_client()
+
+        response = client.post("/v1/build/all", json={"files": [{"content": VALID_MTHDS}]})
+
+        assert response.status_code == 200, response.text
+        assert open_spy.call_count == 1
+        assert response.json()["runner"]["structures"]["artifacts"]
+
+    def test_a_failed_dry_run_is_a_200_invalid_verdict_with_no_projections(self, mocker: MockerFixture):
+        # The verdict is the runner's: the static siblings would accept this closure, but a pipe that
+        # cannot dry-run cannot be deployed, so no section of the bundle is produced.
+        mocker.patch(
+            "pipelex.pipeline.validate_bundle.BundleValidator.validate_pipes",
+            new=mocker.AsyncMock(side_effect=DryRunError("Dry run failed with 1 unexpected pipe failure(s): 'smoke.echo'")),
+        )
+        client = _build_client()
+
+        response = client.post("/v1/build/all", json={"files": [{"content": VALID_MTHDS}], "pipe_ref": "smoke.echo"})
+
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["is_valid"] is False
+        assert body["validation_errors"]
+        assert not {"inputs", "output", "runner"} & set(body)
+
+
+class TestRunnerSweepScope:
+    def test_prescan_reads_the_single_main_pipe_off_the_headers(self):
+        files = [MthdsFileItem(content=VALID_MTHDS), MthdsFileItem(content=NO_MAIN_PIPE_MTHDS), MthdsFileItem(content=COLLIDING_ECHO_LIST_MTHDS)]
+        assert prescan_main_pipe_ref(files) == "smoke.echo"
+
+    def test_prescan_is_none_whenever_it_cannot_be_sure(self):
+        assert prescan_main_pipe_ref([MthdsFileItem(content=NO_MAIN_PIPE_MTHDS)]) is None
+        assert prescan_main_pipe_ref([MthdsFileItem(content=VALID_MTHDS), MthdsFileItem(content=SECOND_MAIN_PIPE_MTHDS)]) is None
+        assert prescan_main_pipe_ref([MthdsFileItem(content=VALID_MTHDS), MthdsFileItem(content='domain = "x"\nmain_pipe = \n')]) is None
+        assert prescan_main_pipe_ref([MthdsFileItem(content='main_pipe = "echo"\n')]) is None
+
+    def test_prescan_agrees_across_files_of_one_domain(self):
+        # A domain split across files declares its main_pipe once, or consistently — either way one pipe.
+        assert prescan_main_pipe_ref([MthdsFileItem(content=VALID_MTHDS), MthdsFileItem(content=VALID_MTHDS)]) == "smoke.echo"
+
+    @pytest.mark.parametrize("path", ["/v1/build/runner", "/v1/build/all"])
+    def test_omitted_pipe_ref_sweeps_only_the_prescanned_main_pipe(self, path: str, mocker: MockerFixture):
+        # Before the pre-scan an omitted `pipe_ref` swept every pipe of the closure just to generate one runner.
+        validate_spy = mocker.spy(runner_module, "validate_bundle")
+        before = METRICS.counter_value("build_sweep_total", scope="pipe")
+        client = _build_client()
+
+        response = client.post(path, json={"files": [{"content": VALID_MTHDS}, {"content": COLLIDING_ECHO_LIST_MTHDS}]})
+
+        assert response.status_code == 200, response.text
+        assert response.json()["pipe_ref"] == "smoke.echo"
+        assert validate_spy.call_count == 1
+        assert validate_spy.call_args.kwargs["dry_run_pipe_codes"] == ["smoke.echo"]
+        assert METRICS.counter_value("build_sweep_total", scope="pipe") == before + 1
+
+    def test_an_ambiguous_prescan_falls_back_to_the_whole_closure(self, mocker: MockerFixture):
+        validate_spy = mocker.spy(runner_module, "validate_bundle")
+        client = _build_client()
+
+        response = client.post("/v1/build/runner", json={"files": [{"content": VALID_MTHDS}, {"content": SECOND_MAIN_PIPE_MTHDS}]})
+
+        assert response.status_code == 422, response.text
+        assert "several" in response.json()["detail"]
+        assert validate_spy.call_args.kwargs["dry_run_pipe_codes"] is None
@@ -0,0 +1,117 @@
+"""Callback host resolution (`api.callback_hosts`) — vetting, TTL cache, coalescing, pinned dialing."""
+
+import asyncio
+from typing import Any
+
+import httpcore
+import pytest
+from pipelex.tools.network.exceptions import SsrfBlockedError
+from pytest_mock import MockerFixture
+
+from api.callback_hosts import CallbackHostResolver
+from api.metrics import METRICS
+
+
+def _resolver(ttl_seconds: float = 60.0) -> CallbackHostResolver:
+    return CallbackHostResolver(ttl_seconds=ttl_seconds, timeout_seconds=1.0, max_bytes=64 * 1024)
+
+
+class _FakeDns:
+    """Stands in for `resolve_to_allowed_ips`: scripted answers, counted lookups."""
+
+    def __init__(self, *answers: list[str] | Exception, delay_seconds: float = 0.0) -> None:
+        self.answers = list(answers)
+        self.delay_seconds = delay_seconds
+        self.lookups = 0
+
+    def script(self, *answers: list[str] | Exception) -> None:
+        self.answers = list(answers)
+
+    async def __call__(self, *_args: Any, **_kwargs: Any) -> list[str]:
+        self.lookups += 1
+        await asyncio.sleep(self.delay_seconds)
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def fake_dns(mocker: MockerFixture) -> _FakeDns:
+    fake = _FakeDns(["93.184.215.14"])
+    mocker.patch("api.callback_hosts.resolve_to_allowed_ips", new=fake)
+    return fake
+
+
+class TestCallbackHostResolver:
+    def test_a_host_is_resolved_once_per_ttl(self, fake_dns: _FakeDns):
+        resolver = _resolver()
+        cached = METRICS.counter_value("callback_host_lookups_total", outcome="cached")
+
+        async def resolve_three_times() -> list[list[str]]:
+            return [await resolver.resolve(host, 443) for host in ("hooks.example.com", "HOOKS.example.com.", "hooks.example.com")]
+
+        assert asyncio.run(resolve_three_times()) == [["93.184.215.14"]] * 3
+        assert fake_dns.lookups == 1
+        assert METRICS.counter_value("callback_host_lookups_total", outcome="cached") == cached + 2
+
+    def test_an_expired_entry_is_resolved_again(self, fake_dns: _FakeDns):
+        resolver = _resolver(ttl_seconds=0.0)
+        fake_dns.script(["93.184.215.14"], ["93.184.215.15"])
+
+        async def resolve_twice() -> list[list[str]]:
+            return [await resolver.resolve("hooks.example.com", 443) for _ in range(2)]
+
+        assert asyncio.run(resolve_twice()) == [["93.184.215.14"], ["93.184.215.15"]]
+        assert fake_dns.lookups == 2
+
+    def test_concurrent_lookups_of_one_host_share_a_resolution(self, fake_dns: _FakeDns):
+        resolver = _resolver()
+        fake_dns.delay_seconds = 0.05
+        coalesced = METRICS.counter_value("callback_host_lookups_total", outcome="coalesced")
+
+        async def resolve_concurrently() -> list[list[str]]:
+            return await asyncio.gather(*(resolver.resolve("hooks.example.com", 443) for _ in range(5)))
+
+        assert asyncio.run(resolve_concurrently()) == [["93.184.215.14"]] * 5
+        assert fake_dns.lookups == 1
+        assert METRICS.counter_value("callback_host_lookups_total", outcome="coalesced") == coalesced + 4
+
+    def test_concurrent_lookups_share_a_failure(self, fake_dns: _FakeDns):
+        resolver = _resolver()
+        fake_dns.delay_seconds = 0.05
+        fake_dns.script(httpcore.ConnectTimeout("Timed out resolving host"))
+
+        async def resolve_concurrently() -> list[object]:
+            return await asyncio.gather(*(resolver.resolve("slow-dns.example.com", 443) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(outcome, httpcore.ConnectTimeout) for outcome in asyncio.run(resolve_concurrently()))
+        assert fake_dns.lookups == 1
+
+    def test_a_refusal_is_cached(self, fake_dns: _FakeDns):
+        resolver = _resolver()
+        fake_dns.script(SsrfBlockedError("resolved to 10.0.0.5"))
+
+        async def resolve_twice() -> None:
+            for _ in range(2):
+                with pytest.raises(SsrfBlockedError, match=r"10\.0\.0\.5"):
+                    await resolver.resolve("rebind.example.com", 443)
+
+        asyncio.run(resolve_twice())
+        assert fake_dns.lookups == 1
+
+    def test_a_failed_lookup_is_not_cached(self, fake_dns: _FakeDns):
+        resolver = _resolver()
+        fake_dns.script(httpcore.ConnectError("Could not resolve host"), ["93.184.215.14"])
+
+        async def fail_then_resolve() -> list[str]:
+            with pytest.raises(httpcore.ConnectError):
+                await resolver.resolve("flaky.example.com", 443)
+            return await resolver.resolve("flaky.example.com", 443)
+
+        assert asyncio.run(fail_then_resolve()) == ["93.184.215.14"]
+        assert fake_dns.lookups == 2
+
+    def test_a_loopback_literal_is_refused_without_a_lookup(self):
+        with pytest.raises(SsrfBlockedError):
+            asyncio.run(_resolver().resolve("127.0.0.1", 80))
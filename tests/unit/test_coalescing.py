@@ -0,0 +1,113 @@
+"""Request coalescing (`api.coalescing`) — one computation per distinct request, its verdict shared."""
+
+import asyncio
+import json
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from api.coalescing import RequestCoalescer
+from api.metrics import METRICS
+
+
+class _Body(BaseModel):
+    content: str
+    allow_signatures: bool = False
+
+
+class _FilesBody(BaseModel):
+    files: dict[str, str]
+
+
+class _Compute:
+    """A counted computation; answers a 500 on the calls listed in `failing`."""
+
+    def __init__(self, *, delay_seconds: float = 0.0, failing: tuple[int, ...] = ()) -> None:
+        self.calls = 0
+        self.delay_seconds = delay_seconds
+        self.failing = failing
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay_seconds)
+        if call in self.failing:
+            return JSONResponse(status_code=500, content={"error_type": "InternalServerError"})
+        return JSONResponse(content={"computation": call}, headers={"X-Computation": str(call)})
+
+
+def _bodies(responses: list[Response]) -> list[object]:
+    return [json.loads(bytes(response.body)) for response in responses]
+
+
+class TestRequestCoalescer:
+    def test_concurrent_identical_requests_share_one_computation(self):
+        coalescer = RequestCoalescer()
+        compute = _Compute(delay_seconds=0.05)
+        shared = METRICS.counter_value("request_coalescing_total", route="resolve", outcome="shared")
+
+        async def send_concurrently() -> list[Response]:
+            return await asyncio.gather(*(coalescer.run("resolve", _Body(content="x"), compute) for _ in range(4)))
+
+        assert _bodies(asyncio.run(send_concurrently())) == [{"computation": 1}] * 4
+        assert compute.calls == 1
+        assert METRICS.counter_value("request_coalescing_total", route="resolve", outcome="shared") == shared + 3
+
+    def test_a_shared_response_keeps_the_original_headers(self):
+        coalescer = RequestCoalescer()
+        compute = _Compute(delay_seconds=0.05)
+
+        async def send_concurrently() -> list[Response]:
+            return await asyncio.gather(*(coalescer.run("resolve", _Body(content="x"), compute) for _ in range(2)))
+
+        computed, shared = asyncio.run(send_concurrently())
+        assert shared is not computed
+        assert shared.headers["X-Computation"] == "1"
+        assert shared.headers["content-type"] == "application/json"
+        assert shared.body == computed.body
+
+    def test_dict_fields_in_another_key_order_are_coalesced(self):
+        coalescer = RequestCoalescer()
+        compute = _Compute(delay_seconds=0.05)
+
+        async def send_concurrently() -> list[Response]:
+            bodies = [_FilesBody(files={"a.mthds": "a", "b.mthds": "b"}), _FilesBody(files={"b.mthds": "b", "a.mthds": "a"})]
+            return await asyncio.gather(*(coalescer.run("resolve", body, compute) for body in bodies))
+
+        assert _bodies(asyncio.run(send_concurrently())) == [{"computation": 1}] * 2
+        assert compute.calls == 1
+
+    def test_a_request_after_a_computation_computes_again(self):
+        coalescer = RequestCoalescer()
+        compute = _Compute()
+
+        async def send_one_after_another() -> list[Response]:
+            return [await coalescer.run("resolve", _Body(content="x"), compute) for _ in range(2)]
+
+        assert _bodies(asyncio.run(send_one_after_another())) == [{"computation": 1}, {"computation": 2}]
+
+    def test_different_bodies_and_routes_are_not_coalesced(self):
+        coalescer = RequestCoalescer()
+        compute = _Compute(delay_seconds=0.05)
+
+        async def send_concurrently() -> list[Response]:
+            requests = [
+                ("resolve", _Body(content="x")),
+                ("resolve", _Body(content="x", allow_signatures=True)),
+                ("validate", _Body(content="x")),
+                ("resolve", _Body(content="x")),
+            ]
+            return await asyncio.gather(*(coalescer.run(route, body, compute) for route, body in requests))
+
+        assert _bodies(asyncio.run(send_concurrently())) == [{"computation": 1}, {"computation": 2}, {"computation": 3}, {"computation": 1}]
+
+    def test_an_error_is_not_shared(self):
+        coalescer = RequestCoalescer()
+        compute = _Compute(delay_seconds=0.05, failing=(1,))
+
+        async def send_concurrently() -> list[Response]:
+            return await asyncio.gather(*(coalescer.run("resolve", _Body(content="x"), compute) for _ in range(3)))
+
+        responses = asyncio.run(send_concurrently())
+        assert [response.status_code for response in responses] == [500, 200, 200]
+        assert compute.calls == 2
@@ -6,6 +6,8 @@ artifacts + lock on the valid arm; an unknown `kind`/`target` is a request-shape
 the artifacts a client writes verbatim pass the offline `codegen check` byte-for-byte.
 """
 
+import io
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -18,6 +20,8 @@ from pytest_mock import MockerFixture
 
 from api.exception_handlers import register_exception_handlers
 from api.routes import router as api_router
+from api.routes.pipelex import codegen as codegen_module
+from api.routes.pipelex.codegen import CODEGEN_PROJECTION_CACHE
 from tests.unit._constants import INVALID_MAIN_PIPE_MTHDS, VALID_MTHDS
 
 
@@ -28,6 +32,13 @@ def _build_client() -> TestClient:
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_projection_cache_fixture() -> None:
+    # Emission-path tests (spies, injected failures) must not be answered from a projection
+    # another test left in the process-wide cache.
+    CODEGEN_PROJECTION_CACHE.clear()
+
+
 class TestCodegenRoute:
     @pytest.mark.parametrize(
         ("target", "expected_filename"),
@@ -96,8 +107,9 @@ class TestCodegenRoute:
             {"target": "not-a-target"},
             {"kind": "inputs"},  # served by /build/inputs, deliberately not by this route
             {"pipe_ref": "smoke.echo"},  # types is concept-set-wide; a pipe selector is a shape error
+            {"targets": ["python-pydantic"]},  # `target` and `targets` are mutually exclusive
         ],
-        ids=["unknown-kind", "unknown-target", "unserved-kind", "pipe-ref-on-types"],
+        ids=["unknown-kind", "unknown-target", "unserved-kind", "pipe-ref-on-types", "target-and-targets"],
     )
     def test_request_shape_errors_are_422_problem_json(self, payload_patch: dict[str, str]):
         client = _build_client()
@@ -108,6 +120,38 @@ class TestCodegenRoute:
         assert response.headers["content-type"] == "application/problem+json"
         assert response.json()["error_type"] == "ValidationError"
 
+    def test_multiple_targets_share_one_resolution(self, mocker: MockerFixture):
+        resolve_spy = mocker.spy(codegen_module, "resolve_requested_crate")
+        client = _build_client()
+        response = client.post(
+            "/v1/codegen",
+            json={"files": [{"content": VALID_MTHDS}], "kind": "types", "targets": ["ts-zod", "python-pydantic", "python-structures"]},
+        )
+
+        assert response.status_code == 200, response.text
+        assert resolve_spy.call_count == 1
+        body = response.json()
+        projections = body["projections"]
+        assert [projection["target"] for projection in projections] == ["ts-zod", "python-pydantic", "python-structures"]
+        assert [projection["artifacts"][0]["path"] for projection in projections] == ["types.ts", "models.py", "structures.py"]
+        assert all(body["crate_fingerprint"] in projection["lock"] for projection in projections)
+        # The top-level fields mirror the first projection, so single-target readers keep working.
+        assert body["target"] == "ts-zod"
+        assert body["artifacts"] == projections[0]["artifacts"]
+        assert body["lock"] == projections[0]["lock"]
+
+    @pytest.mark.parametrize(
+        "targets_patch",
+        [{}, {"targets": ["ts-zod", "ts-zod"]}, {"targets": []}],
+        ids=["no-target", "duplicate-targets", "empty-targets"],
+    )
+    def test_target_selector_shape_errors_are_422(self, targets_patch: dict[str, list[str]]):
+        client = _build_client()
+        payload: dict[str, object] = {"files": [{"content": VALID_MTHDS}], "kind": "types", **targets_patch}
+        response = client.post("/v1/codegen", json=payload)
+        assert response.status_code == 422, response.text
+        assert response.headers["content-type"] == "application/problem+json"
+
     def test_method_ref_is_501_problem_json_until_registry_exists(self):
         client = _build_client()
         response = client.post("/v1/codegen", json={"method_ref": "acme/methods/x", "kind": "types", "target": "ts-zod"})
@@ -153,3 +197,95 @@ class TestCodegenRoute:
         assert response.status_code == 500
         assert open_spy.call_count >= 1
         assert open_spy.call_count == teardown_spy.call_count
+
+
+class TestCodegenProjectionCache:
+    def test_same_crate_is_emitted_once_per_target(self, mocker: MockerFixture):
+        emit_spy = mocker.spy(codegen_module, "emit_types")
+        client = _build_client()
+        payload = {"files": [{"content": VALID_MTHDS}], "kind": "types", "target": "ts-zod"}
+
+        first = client.post("/v1/codegen", json=payload)
+        second = client.post("/v1/codegen", json=payload)
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert emit_spy.call_count == 1
+
+    def test_closures_normalizing_to_one_crate_share_a_hit(self, mocker: MockerFixture):
+        emit_spy = mocker.spy(codegen_module, "emit_types")
+        client = _build_client()
+
+        first = client.post("/v1/codegen", json={"files": [{"content": VALID_MTHDS, "source": "a.mthds"}], "kind": "types", "target": "ts-zod"})
+        second = client.post("/v1/codegen", json={"files": [{"content": VALID_MTHDS, "source": "b.mthds"}], "kind": "types", "target": "ts-zod"})
+
+        assert first.json()["crate_fingerprint"] == second.json()["crate_fingerprint"]
+        assert emit_spy.call_count == 1
+
+    def test_only_uncached_targets_are_emitted(self, mocker: MockerFixture):
+        client = _build_client()
+        client.post("/v1/codegen", json={"files": [{"content": VALID_MTHDS}], "kind": "types", "target": "ts-zod"})
+        emit_spy = mocker.spy(codegen_module, "emit_types")
+
+        response = client.post("/v1/codegen", json={"files": [{"content": VALID_MTHDS}], "kind": "types", "targets": ["ts-zod", "python-pydantic"]})
+
+        assert response.status_code == 200, response.text
+        assert [projection["target"] for projection in response.json()["projections"]] == ["ts-zod", "python-pydantic"]
+        assert [call.kwargs["target"] for call in emit_spy.call_args_list] == ["python-pydantic"]
+
+
+_ZIP_HEADERS = {"Accept": "application/zip"}
+
+
+class TestCodegenZipDownload:
+    def test_zip_holds_the_stamped_artifacts_and_lock_and_passes_the_offline_check(self, tmp_path: Path):
+        client = _build_client()
+        payload = {"files": [{"content": VALID_MTHDS}], "kind": "types", "target": "python-pydantic"}
+        report = client.post("/v1/codegen", json=payload).json()
+
+        response = client.post("/v1/codegen", json=payload, headers=_ZIP_HEADERS)
+
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"] == "application/zip"
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert archive.namelist() == [artifact["path"] for artifact in report["artifacts"]] + ["codegen.lock"]
+        assert archive.read("codegen.lock").decode() == report["lock"]
+        archive.extractall(tmp_path)
+        assert not run_codegen_check(root=tmp_path).drifts
+
+    def test_zip_is_byte_for_byte_deterministic(self):
+        client = _build_client()
+        payload = {"files": [{"content": VALID_MTHDS}], "kind": "types", "target": "ts-zod"}
+
+        first = client.post("/v1/codegen", json=payload, headers=_ZIP_HEADERS)
+        CODEGEN_PROJECTION_CACHE.clear()
+        second = client.post("/v1/codegen", json=payload, headers=_ZIP_HEADERS)
+
+        assert first.content == second.content
+
+    def test_multi_target_zip_has_one_directory_per_target(self):
+        client = _build_client()
+        response = client.post(
+            "/v1/codegen",
+            json={"files": [{"content": VALID_MTHDS}], "kind": "types", "targets": ["ts-zod", "python-pydantic"]},
+            headers=_ZIP_HEADERS,
+        )
+
+        assert response.status_code == 200, response.text
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        assert {name.split("/", 1)[0] for name in names} == {"ts-zod", "python-pydantic"}
+        assert {"ts-zod/types.ts", "ts-zod/codegen.lock", "python-pydantic/models.py", "python-pydantic/codegen.lock"} <= set(names)
+        # Request order: every ts-zod entry precedes every python-pydantic entry.
+        assert names.index("ts-zod/codegen.lock") < names.index("python-pydantic/models.py")
+
+    def test_invalid_verdict_stays_json(self):
+        client = _build_client()
+        response = client.post(
+            "/v1/codegen",
+            json={"files": [{"content": INVALID_MAIN_PIPE_MTHDS}], "kind": "types", "target": "ts-zod"},
+            headers=_ZIP_HEADERS,
+        )
+
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["is_valid"] is False
@@ -0,0 +1,54 @@
+"""Completion callback signatures (`api.completion_signature`) — the per-run header, keyed once, reloadable."""
+
+import hashlib
+import hmac
+
+import pytest
+from pipelex.system.exceptions import EnvVarNotFoundError
+
+from api.completion_signature import COMPLETION_CALLBACK_SECRET_ENV_VAR, SIGNATURE_HEADER, CompletionSigner
+
+
+def _signer(monkeypatch: pytest.MonkeyPatch, secret: str | None) -> CompletionSigner:
+    if secret is None:
+        monkeypatch.delenv(COMPLETION_CALLBACK_SECRET_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(COMPLETION_CALLBACK_SECRET_ENV_VAR, secret)
+    signer = CompletionSigner()
+    signer.load()
+    return signer
+
+
+def _expected(secret: bytes, pipeline_run_id: bytes) -> dict[str, str]:
+    return {SIGNATURE_HEADER: hmac.new(secret, pipeline_run_id, hashlib.sha256).hexdigest()}
+
+
+class TestCompletionSigner:
+    def test_the_header_signs_the_run_id(self, monkeypatch: pytest.MonkeyPatch):
+        assert _signer(monkeypatch, "secret").headers("run-1") == _expected(b"secret", b"run-1")
+
+    def test_the_secret_is_read_once(self, monkeypatch: pytest.MonkeyPatch):
+        signer = _signer(monkeypatch, "secret")
+        monkeypatch.setenv(COMPLETION_CALLBACK_SECRET_ENV_VAR, "changed-after-boot")
+
+        assert signer.headers("run-1") == _expected(b"secret", b"run-1")
+
+    def test_a_load_picks_up_a_rotated_secret(self, monkeypatch: pytest.MonkeyPatch):
+        signer = _signer(monkeypatch, "secret")
+        monkeypatch.setenv(COMPLETION_CALLBACK_SECRET_ENV_VAR, "rotated")
+
+        signer.load()
+
+        assert signer.headers("run-1") == _expected(b"rotated", b"run-1")
+
+    def test_an_unloaded_signer_loads_on_first_use(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv(COMPLETION_CALLBACK_SECRET_ENV_VAR, "secret")
+
+        assert CompletionSigner().headers("run-1") == _expected(b"secret", b"run-1")
+
+    def test_signing_without_the_secret_raises(self, monkeypatch: pytest.MonkeyPatch):
+        signer = _signer(monkeypatch, None)
+
+        assert not signer.configured
+        with pytest.raises(EnvVarNotFoundError, match=COMPLETION_CALLBACK_SECRET_ENV_VAR):
+            signer.headers("run-1")
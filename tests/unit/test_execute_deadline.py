@@ -0,0 +1,201 @@
+"""`/execute` deadline and client-disconnect cancellation (`api.cancellation.run_cancellable`).
+
+Pins the three outcomes of the race — the run finishes, the deadline fires (504), the caller
+disconnects (499) — plus the property that makes cancellation worth having: the run task is
+actually cancelled and has finished unwinding before the error is raised, so the route's
+bundle context releases nothing out from under it. Also pins the wire side: the `timeout_seconds`
+extra is validated, capped by `MAX_EXECUTE_TIMEOUT_SECONDS`, and a deadline rides the usual
+RFC 7807 problem response.
+"""
+
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pipelex.pipe_run.delivery_assignment import DeliveryAssignment
+from pipelex.pipe_run.pipe_job import PipeJob
+from pipelex.plugins.orchestrator_registry import OrchestratorRegistry
+from pipelex.runtime_bridge.payloads import PipelexPipeDispatchAck, PipelexPipeRunOutput
+from pytest_mock import MockerFixture
+
+from api.cancellation import run_cancellable
+from api.errors import ApiError
+from api.exception_handlers import register_exception_handlers
+from api.metrics import METRICS
+from api.routes import router as api_router
+from tests.unit._constants import VALID_MTHDS
+
+_PIPELINE_NS = "api.routes.pipelex.pipeline"
+
+
+class _FakeRequest:
+    """Just enough of a Starlette `Request` for the disconnect watcher and the log fields."""
+
+    def __init__(self, *, disconnected: bool = False) -> None:
+        self._disconnected = disconnected
+        self.state = type("State", (), {})()
+
+    async def is_disconnected(self) -> bool:
+        return self._disconnected
+
+
+class _HangingOrchestrator:
+    """An orchestrator whose blocking arm never completes on its own — only cancellation ends it."""
+
+    supports_fire_and_forget = False
+
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    async def execute(self, *, pipe_job: PipeJob, delivery_assignment: DeliveryAssignment | None) -> PipelexPipeRunOutput:  # noqa: ARG002 — protocol signature
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        msg = "the run must be cancelled before it completes"
+        raise AssertionError(msg)
+
+    async def start(self, *, pipe_job: PipeJob, delivery_assignment: DeliveryAssignment | None) -> PipelexPipeDispatchAck:
+        raise NotImplementedError
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(api_router, prefix="/v1")
+    register_exception_handlers(app)
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics_fixture() -> None:
+    METRICS.reset()
+
+
+class TestRunCancellable:
+    @pytest.mark.asyncio
+    async def test_returns_the_result_when_work_finishes_first(self) -> None:
+        async def work() -> str:
+            return "done"
+
+        result = await run_cancellable(_FakeRequest(), work(), timeout_seconds=5)  # type: ignore[arg-type]
+
+        assert result == "done"
+        assert METRICS.snapshot()["counters"] == {}
+
+    @pytest.mark.asyncio
+    async def test_work_exception_propagates_untouched(self) -> None:
+        async def work() -> None:
+            msg = "boom"
+            raise ValueError(msg)
+
+        with pytest.raises(ValueError, match="boom"):
+            await run_cancellable(_FakeRequest(), work(), timeout_seconds=5)  # type: ignore[arg-type]
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_the_work_and_raises_504(self) -> None:
+        unwound: list[bool] = []
+
+        async def work() -> None:
+            try:
+                await asyncio.sleep(60)
+            finally:
+                unwound.append(True)
+
+        with pytest.raises(ApiError) as exc_info:
+            await run_cancellable(_FakeRequest(), work(), timeout_seconds=0.05)  # type: ignore[arg-type]
+
+        assert exc_info.value.status_code == 504
+        assert exc_info.value.document["error_type"] == "RunDeadlineExceeded"
+        # The work's cleanup ran before the error surfaced — nothing is left holding the library.
+        assert unwound == [True]
+        assert METRICS.counter_value("runs_cancelled_total", reason="deadline") == 1
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_the_work_and_raises_499(self) -> None:
+        unwound: list[bool] = []
+
+        async def work() -> None:
+            try:
+                await asyncio.sleep(60)
+            finally:
+                unwound.append(True)
+
+        request: Any = _FakeRequest(disconnected=True)
+        with pytest.raises(ApiError) as exc_info:
+            await run_cancellable(request, work(), timeout_seconds=5, poll_interval=0.01)
+
+        assert exc_info.value.status_code == 499
+        assert exc_info.value.document["error_type"] == "ClientClosedRequest"
+        assert unwound == [True]
+        assert METRICS.counter_value("runs_cancelled_total", reason="client_disconnect") == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_handler_while_the_work_unwinds_propagates(self) -> None:
+        unwinding = asyncio.Event()
+
+        async def work() -> None:
+            try:
+                await asyncio.sleep(60)
+            finally:
+                unwinding.set()
+                await asyncio.sleep(0.2)
+
+        handler = asyncio.ensure_future(run_cancellable(_FakeRequest(), work(), timeout_seconds=0.05))  # type: ignore[arg-type]
+        await unwinding.wait()
+        handler.cancel()
+
+        # A shutdown during the unwind is a cancellation, not a 504.
+        with pytest.raises(asyncio.CancelledError):
+            await handler
+        assert METRICS.counter_value("runs_cancelled_total", reason="deadline") == 0
+
+
+class TestExecuteDeadline:
+    def test_execute_past_its_deadline_is_a_504_and_the_run_is_cancelled(self, mocker: MockerFixture) -> None:
+        orchestrator = _HangingOrchestrator()
+        mocker.patch(f"{_PIPELINE_NS}.get_orchestrator_registry", return_value=OrchestratorRegistry({"direct": orchestrator}))
+
+        response = _build_client().post(
+            "/v1/execute",
+            json={"pipe_code": "echo", "mthds_contents": [VALID_MTHDS], "inputs": {"text": "hello"}, "timeout_seconds": 0.2},
+        )
+
+        assert response.status_code == 504, response.text
+        assert response.headers["content-type"].startswith("application/problem+json")
+        assert response.json()["error_type"] == "RunDeadlineExceeded"
+        assert orchestrator.cancelled
+
+    def test_requested_deadline_is_capped_by_the_server_max(self, mocker: MockerFixture) -> None:
+        mocker.patch(f"{_PIPELINE_NS}.get_orchestrator_registry", return_value=OrchestratorRegistry({"direct": _HangingOrchestrator()}))
+        mocker.patch(f"{_PIPELINE_NS}.MAX_EXECUTE_TIMEOUT_SECONDS", 0.2)
+
+        response = _build_client().post(
+            "/v1/execute",
+            json={"pipe_code": "echo", "mthds_contents": [VALID_MTHDS], "inputs": {"text": "hello"}, "timeout_seconds": 3600},
+        )
+
+        assert response.status_code == 504, response.text
+        assert "0.2s deadline" in response.json()["detail"]
+
+    @pytest.mark.parametrize("timeout_seconds", [0, -1, "soon"])
+    def test_invalid_timeout_is_a_422_validation_error(self, timeout_seconds: object) -> None:
+        response = _build_client().post(
+            "/v1/execute",
+            json={"pipe_code": "echo", "mthds_contents": [VALID_MTHDS], "timeout_seconds": timeout_seconds},
+        )
+
+        assert response.status_code == 422
+        assert response.json()["error_type"] == "ValidationError"
+
+    def test_start_refuses_a_timeout_it_would_not_enforce(self) -> None:
+        response = _build_client().post(
+            "/v1/start",
+            json={"pipe_code": "echo", "mthds_contents": [VALID_MTHDS], "timeout_seconds": 30},
+        )
+
+        assert response.status_code == 422
+        assert response.json()["error_type"] == "ValidationError"
+        assert "timeout_seconds" in response.json()["detail"]
@@ -0,0 +1,119 @@
+"""Idempotent responses (`api.idempotency`) — coalescing, retry after failure, expiry, scoping."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from api.errors import ApiError
+from api.idempotency import IDEMPOTENCY_KEY_HEADER, IdempotentResponses
+from api.metrics import METRICS
+
+
+def _request(key: str | None, body: bytes = b'{"pipe_code": "echo"}', path: str = "/v1/execute") -> Request:
+    headers = [] if key is None else [(IDEMPOTENCY_KEY_HEADER.lower().encode(), key.encode())]
+    delivered = False
+
+    async def receive() -> dict[str, object]:
+        nonlocal delivered
+        if delivered:
+            return {"type": "http.disconnect"}
+        delivered = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({"type": "http", "method": "POST", "path": path, "headers": headers, "query_string": b""}, receive)
+
+
+class _Run:
+    """A counted computation; fails on the calls listed in `failing`."""
+
+    def __init__(self, *, delay_seconds: float = 0.0, failing: tuple[int, ...] = ()) -> None:
+        self.calls = 0
+        self.delay_seconds = delay_seconds
+        self.failing = failing
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay_seconds)
+        if call in self.failing:
+            return JSONResponse(status_code=500, content={"error_type": "InternalServerError"})
+        return JSONResponse(content={"run": call})
+
+
+def _bodies(responses: list[Response]) -> list[object]:
+    return [json.loads(bytes(response.body)) for response in responses]
+
+
+class TestIdempotentResponses:
+    def test_concurrent_duplicates_wait_for_the_first_run(self):
+        store = IdempotentResponses(ttl_seconds=60, max_bytes=1 << 20)
+        run = _Run(delay_seconds=0.05)
+        coalesced = METRICS.counter_value("idempotency_requests_total", outcome="coalesced")
+
+        async def send_concurrently() -> list[Response]:
+            return await asyncio.gather(*(store.run(_request("key-1"), owner="alice", compute=run) for _ in range(4)))
+
+        assert _bodies(asyncio.run(send_concurrently())) == [{"run": 1}] * 4
+        assert run.calls == 1
+        assert METRICS.counter_value("idempotency_requests_total", outcome="coalesced") == coalesced + 3
+
+    def test_duplicates_of_a_failed_run_run_it_again(self):
+        store = IdempotentResponses(ttl_seconds=60, max_bytes=1 << 20)
+        run = _Run(delay_seconds=0.05, failing=(1,))
+
+        async def send_concurrently() -> list[Response]:
+            return await asyncio.gather(*(store.run(_request("key-1"), owner="alice", compute=run) for _ in range(3)))
+
+        responses = asyncio.run(send_concurrently())
+        assert [response.status_code for response in responses] == [500, 200, 200]
+        assert run.calls == 2
+
+    def test_a_different_body_is_refused_while_the_first_runs(self):
+        store = IdempotentResponses(ttl_seconds=60, max_bytes=1 << 20)
+        run = _Run(delay_seconds=0.05)
+
+        async def send_two_bodies() -> tuple[Response | BaseException, Response | BaseException]:
+            first = asyncio.create_task(store.run(_request("key-1"), owner="alice", compute=run))
+            await asyncio.sleep(0.01)
+            second = store.run(_request("key-1", body=b'{"pipe_code": "other"}'), owner="alice", compute=run)
+            return await asyncio.gather(first, second, return_exceptions=True)
+
+        first, second = asyncio.run(send_two_bodies())
+        assert isinstance(second, ApiError)
+        assert second.document["error_type"] == "IdempotencyKeyMismatch"
+        assert isinstance(first, Response)
+        assert _bodies([first]) == [{"run": 1}]
+        assert run.calls == 1
+
+    def test_an_expired_response_is_not_replayed(self):
+        store = IdempotentResponses(ttl_seconds=0, max_bytes=1 << 20)
+        run = _Run()
+
+        async def send_twice() -> list[Response]:
+            return [await store.run(_request("key-1"), owner="alice", compute=run) for _ in range(2)]
+
+        assert _bodies(asyncio.run(send_twice())) == [{"run": 1}, {"run": 2}]
+
+    def test_a_key_is_scoped_to_its_owner_and_route(self):
+        store = IdempotentResponses(ttl_seconds=60, max_bytes=1 << 20)
+        run = _Run()
+
+        async def send() -> list[Response]:
+            return [
+                await store.run(_request("key-1"), owner="alice", compute=run),
+                await store.run(_request("key-1"), owner="bob", compute=run),
+                await store.run(_request("key-1", path="/v1/start"), owner="alice", compute=run),
+                await store.run(_request("key-1"), owner="alice", compute=run),
+            ]
+
+        assert _bodies(asyncio.run(send())) == [{"run": 1}, {"run": 2}, {"run": 3}, {"run": 1}]
+
+    @pytest.mark.parametrize("key", ["", "k" * 256])
+    def test_a_malformed_key_is_refused(self, key: str):
+        store = IdempotentResponses(ttl_seconds=60, max_bytes=1 << 20)
+
+        with pytest.raises(ApiError):
+            asyncio.run(store.run(_request(key), owner="alice", compute=_Run()))
@@ -0,0 +1,35 @@
+"""Cold start — modules the app imports on first use stay off the `import api.main` path.
+
+Checked in a fresh interpreter: this one has long since imported everything. The time budget itself
+is `scripts/check_import_time.py`'s (`make check-import-time`), not a unit test's.
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+_CHECK_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "check_import_time.py"
+
+
+def _deferred_modules() -> tuple[str, ...]:
+    """`DEFERRED_MODULES` from the check script — the one list both checks hold the app to."""
+    spec = importlib.util.spec_from_file_location("check_import_time", _CHECK_SCRIPT)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    deferred_modules: tuple[str, ...] = module.DEFERRED_MODULES
+    return deferred_modules
+
+
+class TestStartupImports:
+    def test_deferred_modules_are_not_imported_by_api_main(self):
+        deferred_modules = _deferred_modules()
+        assert deferred_modules
+        probe = f"import json, sys; import api.main; print(json.dumps([m for m in {list(deferred_modules)!r} if m in sys.modules]))"
+
+        completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)  # noqa: S603
+
+        assert json.loads(completed.stdout.splitlines()[-1]) == []
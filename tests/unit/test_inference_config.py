@@ -0,0 +1,83 @@
+"""Inference config hot reload (`api.inference_config`) — atomic swap, pinned snapshots, refusals.
+
+The suite's Pipelex is booted with the stock models manager (`tests/unit/conftest.py`), so each
+test sets `INFERENCE_CONFIG` up by hand with that boot's secrets provider and tears it down after.
+"""
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+from pipelex.runtime_hub import get_sdk_client_manager, get_secrets_provider
+from pytest_mock import MockerFixture
+
+from api.inference_config import INFERENCE_CONFIG, pinned_inference_snapshot, reload_inference_config
+from api.metrics import METRICS
+
+
+@pytest.fixture
+def booted_inference_config() -> Generator[None]:
+    INFERENCE_CONFIG.setup(secrets_provider=get_secrets_provider(), gateway_config=None, gateway_config_source=None, needs_inference=False)
+    yield
+    INFERENCE_CONFIG.teardown()
+
+
+@pytest.mark.usefixtures("booted_inference_config")
+class TestInferenceConfigReload:
+    def test_reload_swaps_in_a_freshly_loaded_snapshot(self):
+        before = INFERENCE_CONFIG.current_snapshot()
+
+        assert asyncio.run(reload_inference_config()) is True
+
+        after = INFERENCE_CONFIG.current_snapshot()
+        assert after is not None
+        assert after is not before
+        assert INFERENCE_CONFIG.get_model_deck() is after.get_model_deck()
+
+    def test_a_pinned_run_and_its_tasks_keep_the_snapshot_they_started_on(self):
+        before = INFERENCE_CONFIG.current_snapshot()
+        assert before is not None
+
+        async def run_across_a_reload() -> tuple[object, object]:
+            reloaded = asyncio.Event()
+
+            async def step_after_the_reload() -> object:
+                await reloaded.wait()
+                return INFERENCE_CONFIG.get_model_deck()
+
+            with pinned_inference_snapshot():
+                spawned = asyncio.create_task(step_after_the_reload())
+                await reload_inference_config()
+                reloaded.set()
+                return await spawned, INFERENCE_CONFIG.get_model_deck()
+
+        spawned_deck, own_deck = asyncio.run(run_across_a_reload())
+
+        assert spawned_deck is before.get_model_deck()
+        assert own_deck is before.get_model_deck()
+        assert INFERENCE_CONFIG.get_model_deck() is not before.get_model_deck()
+
+    def test_a_refused_config_keeps_the_current_snapshot(self, mocker: MockerFixture):
+        before = INFERENCE_CONFIG.current_snapshot()
+        failures = METRICS.counter_value("inference_config_reloads_total", outcome="failed")
+        mocker.patch("api.inference_config._load_snapshot", side_effect=ValueError("routing_profiles.toml: bad profile"))
+
+        assert asyncio.run(reload_inference_config()) is False
+
+        assert INFERENCE_CONFIG.current_snapshot() is before
+        assert METRICS.counter_value("inference_config_reloads_total", outcome="failed") == failures + 1
+
+    def test_the_sdk_client_registry_keeps_its_clients_in_root(self):
+        """`_drop_cached_sdk_clients` replaces this pipelex field; an upgrade that renames it must fail here."""
+        registry = get_sdk_client_manager().sdk_client_registry
+
+        assert "root" in type(registry).model_fields
+        assert isinstance(registry.root, dict)
+
+    def test_a_reload_drops_the_cached_sdk_clients(self):
+        registry = get_sdk_client_manager().sdk_client_registry
+        registry.root = {"openai:stale-backend": object()}
+
+        asyncio.run(reload_inference_config())
+
+        assert registry.root == {}
@@ -0,0 +1,155 @@
+"""Bearer JWT verification (`api.jwt_verification`) — the verified-token cache and JWKS-backed RS256/ES256 keys."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Annotated, Any
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from api.exception_handlers import register_exception_handlers
+from api.jwt_verification import VERIFIED_TOKENS, decode_token
+from api.security import AuthMode, AuthSettings, verify_jwt
+from tests.unit._constants import RoutePath
+
+JWT_SECRET = "test-jwt-secret-do-not-use-in-prod"
+USER_ID = "11111111-1111-4111-1111-111111111111"
+
+_PrivateKey = rsa.RSAPrivateKey | ec.EllipticCurvePrivateKey
+
+
+def _generate_key(algorithm: str) -> _PrivateKey:
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+def _write_jwks(path: Path, keys: dict[str, tuple[str, _PrivateKey]]) -> None:
+    """Publish the public halves of `keys` (kid -> (algorithm, private key)) as a JWKS file."""
+    published: list[dict[str, Any]] = []
+    for kid, (algorithm, private_key) in keys.items():
+        algorithm_impl = jwt.get_algorithm_by_name(algorithm)
+        jwk: dict[str, Any] = json.loads(algorithm_impl.to_jwk(private_key.public_key()))
+        published.append({**jwk, "kid": kid, "alg": algorithm, "use": "sig"})
+    path.write_text(json.dumps({"keys": published}))
+
+
+async def _whoami(payload: Annotated[dict[str, Any], Depends(verify_jwt)]) -> dict[str, Any]:
+    return {"user_id": payload["user_id"]}
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    app.add_api_route(RoutePath.WHOAMI, _whoami, methods=["GET"])
+    register_exception_handlers(app)
+    return TestClient(app)
+
+
+def _whoami_status(token: str) -> tuple[int, dict[str, Any]]:
+    response = _build_client().get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
+    return response.status_code, response.json()
+
+
+class TestVerifiedTokenCache:
+    def test_a_reused_token_is_verified_once(self, mocker: MockerFixture):
+        settings = AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET)
+        token = jwt.encode({"user_id": USER_ID, "exp": int(time.time()) + 3600}, JWT_SECRET, algorithm="HS256")
+        decode_spy = mocker.spy(jwt, "decode")
+
+        claims = [asyncio.run(decode_token(token, settings)) for _ in range(3)]
+
+        assert decode_spy.call_count == 1
+        assert all(claim["user_id"] == USER_ID for claim in claims)
+
+    def test_a_cached_token_is_verified_again_past_its_exp(self, mocker: MockerFixture):
+        settings = AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET)
+        expires_at = int(time.time()) + 60
+        token = jwt.encode({"user_id": USER_ID, "exp": expires_at}, JWT_SECRET, algorithm="HS256")
+        asyncio.run(decode_token(token, settings))
+        decode_spy = mocker.spy(jwt, "decode")
+
+        # Past `exp` by the cache's clock: the entry is not served, the token goes back to PyJWT.
+        mocker.patch("api.jwt_verification.time.time", return_value=expires_at + 1)
+        asyncio.run(decode_token(token, settings))
+
+        assert decode_spy.call_count == 1
+
+    def test_rotated_settings_drop_every_verified_token(self):
+        token = jwt.encode({"user_id": USER_ID}, JWT_SECRET, algorithm="HS256")
+        asyncio.run(decode_token(token, AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET)))
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            asyncio.run(decode_token(token, AuthSettings(mode=AuthMode.JWT, jwt_secret="rotated-secret")))
+
+    def test_a_token_that_fails_verification_is_not_cached(self, mocker: MockerFixture):
+        settings = AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET)
+        token = jwt.encode({"user_id": USER_ID}, "wrong-secret", algorithm="HS256")
+        VERIFIED_TOKENS.get(token, settings)
+        put_spy = mocker.spy(VERIFIED_TOKENS, "put")
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            asyncio.run(decode_token(token, settings))
+
+        put_spy.assert_not_called()
+
+
+class TestJwksVerification:
+    @pytest.mark.parametrize("algorithm", ["RS256", "ES256"])
+    def test_a_token_signed_by_a_published_key_verifies(self, mocker: MockerFixture, tmp_path: Path, algorithm: str):
+        private_key = _generate_key(algorithm)
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, {"gateway-1": (algorithm, private_key)})
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_jwks_uri=str(jwks_path)))
+        token = jwt.encode({"user_id": USER_ID}, private_key, algorithm=algorithm, headers={"kid": "gateway-1"})
+
+        assert _whoami_status(token) == (200, {"user_id": USER_ID})
+
+    def test_a_key_rotated_in_at_the_issuer_is_fetched_on_its_first_token(self, mocker: MockerFixture, tmp_path: Path):
+        old_key, new_key = _generate_key("RS256"), _generate_key("RS256")
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, {"key-1": ("RS256", old_key)})
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_jwks_uri=str(jwks_path)))
+        mocker.patch("api.jwt_verification._MIN_REFETCH_SECONDS", 0)
+        assert _whoami_status(jwt.encode({"user_id": USER_ID}, old_key, algorithm="RS256", headers={"kid": "key-1"}))[0] == 200
+
+        _write_jwks(jwks_path, {"key-2": ("RS256", new_key)})
+
+        assert _whoami_status(jwt.encode({"user_id": USER_ID}, new_key, algorithm="RS256", headers={"kid": "key-2"}))[0] == 200
+        # The withdrawn key no longer verifies, even for a token it verified before.
+        status, body = _whoami_status(jwt.encode({"user_id": USER_ID}, old_key, algorithm="RS256", headers={"kid": "key-1"}))
+        assert (status, body["error_type"]) == (401, "InvalidToken")
+
+    def test_an_unknown_kid_is_rejected(self, mocker: MockerFixture, tmp_path: Path):
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, {"key-1": ("RS256", _generate_key("RS256"))})
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_jwks_uri=str(jwks_path)))
+        token = jwt.encode({"user_id": USER_ID}, _generate_key("RS256"), algorithm="RS256", headers={"kid": "made-up"})
+
+        status, body = _whoami_status(token)
+
+        assert (status, body["error_type"]) == (401, "InvalidToken")
+
+    def test_an_hs256_token_is_not_checked_against_the_key_set(self, mocker: MockerFixture, tmp_path: Path):
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, {"key-1": ("RS256", _generate_key("RS256"))})
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_jwks_uri=str(jwks_path)))
+        token = jwt.encode({"user_id": USER_ID}, JWT_SECRET, algorithm="HS256", headers={"kid": "key-1"})
+
+        status, body = _whoami_status(token)
+
+        assert (status, body["error_type"]) == (401, "InvalidToken")
+
+    def test_an_unreadable_key_set_is_a_server_misconfiguration(self, mocker: MockerFixture, tmp_path: Path):
+        jwks_uri = str(tmp_path / "missing-jwks.json")
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_jwks_uri=jwks_uri))
+        token = jwt.encode({"user_id": USER_ID}, _generate_key("RS256"), algorithm="RS256", headers={"kid": "key-1"})
+
+        status, body = _whoami_status(token)
+
+        assert (status, body["error_type"]) == (500, "ServerMisconfigured")
@@ -0,0 +1,224 @@
+"""Priority lanes (`api.lanes`): per-lane admission, urgency ordering, worker threads, metrics.
+
+Pins the scheduling contract the lanes exist for: a lane admits up to its cap and queues the
+rest by RFC 9218 urgency then arrival, shedding past its queue bound or deadline; a cancelled
+waiter never leaks a slot; a saturated batch lane does not delay interactive traffic; and the
+interactive lane's blocking calls run on its own threads with the request's contextvars. The route
+wiring is pinned through `/v1/lint` and `/v1/build/inputs`.
+"""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.errors import ApiError
+from api.exception_handlers import register_exception_handlers
+from api.lanes import DEFAULT_URGENCY, LANES, Lane, LanePool, parse_urgency
+from api.metrics import METRICS
+from api.routes import router as api_router
+from tests.unit._constants import VALID_MTHDS
+
+_probe: contextvars.ContextVar[str] = contextvars.ContextVar("_probe", default="unset")
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(api_router, prefix="/v1")
+    register_exception_handlers(app)
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics_fixture() -> None:
+    METRICS.reset()
+
+
+class TestParseUrgency:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            (None, DEFAULT_URGENCY),
+            ("", DEFAULT_URGENCY),
+            ("u=0", 0),
+            ("u=7", 7),
+            ("i, u=1", 1),
+            ("u=9", DEFAULT_URGENCY),
+            ("u=high", DEFAULT_URGENCY),
+            ("i", DEFAULT_URGENCY),
+        ],
+    )
+    def test_rfc_9218_urgency(self, header: str | None, expected: int) -> None:
+        assert parse_urgency(header) == expected
+
+
+class TestLanePool:
+    @pytest.mark.asyncio
+    async def test_waiters_are_admitted_by_urgency_then_arrival(self) -> None:
+        pool = LanePool(Lane.BATCH, max_concurrency=1)
+        admitted: list[str] = []
+        release_first = asyncio.Event()
+
+        async def occupy() -> None:
+            async with pool.slot():
+                await release_first.wait()
+
+        async def wait_for_slot(name: str, urgency: int) -> None:
+            async with pool.slot(urgency=urgency):
+                admitted.append(name)
+
+        holder = asyncio.create_task(occupy())
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(wait_for_slot("late-low", 5)),
+            asyncio.create_task(wait_for_slot("urgent", 0)),
+            asyncio.create_task(wait_for_slot("normal-a", 3)),
+            asyncio.create_task(wait_for_slot("normal-b", 3)),
+        ]
+        await asyncio.sleep(0)
+        release_first.set()
+        await asyncio.gather(holder, *waiters)
+
+        assert admitted == ["urgent", "normal-a", "normal-b", "late-low"]
+        assert pool.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self) -> None:
+        pool = LanePool(Lane.BATCH, max_concurrency=1)
+        release = asyncio.Event()
+
+        async def occupy() -> None:
+            async with pool.slot():
+                await release.wait()
+
+        async def wait_for_slot() -> None:
+            async with pool.slot():
+                pass
+
+        holder = asyncio.create_task(occupy())
+        await asyncio.sleep(0)
+        abandoned = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        release.set()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+
+        assert pool.in_flight == 0
+        async with pool.slot():
+            assert pool.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_a_waiter_beyond_the_queue_bound_is_shed(self) -> None:
+        pool = LanePool(Lane.BATCH, max_concurrency=1, max_queued=1)
+        release = asyncio.Event()
+
+        async def occupy() -> None:
+            async with pool.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(occupy())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(occupy())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ApiError) as shed:
+            async with pool.slot():
+                pass
+        assert shed.value.status_code == 503
+        assert shed.value.document["error_type"] == "LaneOverloaded"
+        assert shed.value.headers["Retry-After"] == "1"
+        assert METRICS.counter_value("lane_shed_total", lane="batch", reason="queue_full") == 1
+
+        release.set()
+        await asyncio.gather(holder, queued)
+        assert (pool.in_flight, pool.queued) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_a_waiter_past_its_deadline_is_shed(self) -> None:
+        pool = LanePool(Lane.BATCH, max_concurrency=1, queue_timeout_seconds=0.01)
+        release = asyncio.Event()
+
+        async def occupy() -> None:
+            async with pool.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(occupy())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ApiError) as shed:
+            async with pool.slot():
+                pass
+        assert shed.value.status_code == 503
+        assert METRICS.counter_value("lane_shed_total", lane="batch", reason="queue_timeout") == 1
+        assert pool.queued == 0
+
+        release.set()
+        await holder
+        assert pool.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_saturated_batch_lane_does_not_delay_interactive(self) -> None:
+        batch = LanePool(Lane.BATCH, max_concurrency=1)
+        interactive = LanePool(Lane.INTERACTIVE, max_concurrency=1)
+        release = asyncio.Event()
+
+        async def long_run() -> None:
+            async with batch.slot():
+                await release.wait()
+
+        runs = [asyncio.create_task(long_run()) for _ in range(3)]
+        await asyncio.sleep(0)
+        async with asyncio.timeout(1), interactive.slot():
+            assert interactive.in_flight == 1
+        release.set()
+        await asyncio.gather(*runs)
+
+    @pytest.mark.asyncio
+    async def test_run_sync_uses_the_lane_threads_and_carries_contextvars(self) -> None:
+        pool = LanePool(Lane.INTERACTIVE, max_concurrency=1, worker_threads=1)
+        _probe.set("request-scoped")
+
+        def where() -> tuple[str, str]:
+            return threading.current_thread().name, _probe.get()
+
+        thread_name, probe = await pool.run_sync(where)
+
+        assert thread_name.startswith("lane-interactive")
+        assert probe == "request-scoped"
+
+    @pytest.mark.asyncio
+    async def test_run_async_drives_a_coroutine_on_a_lane_thread(self) -> None:
+        pool = LanePool(Lane.INTERACTIVE, max_concurrency=1, worker_threads=1)
+        server_loop = asyncio.get_running_loop()
+
+        async def where() -> tuple[str, bool]:
+            await asyncio.sleep(0)
+            return threading.current_thread().name, asyncio.get_running_loop() is server_loop
+
+        thread_name, on_server_loop = await pool.run_async(where)
+
+        assert thread_name.startswith("lane-interactive")
+        assert not on_server_loop
+
+
+class TestLaneRouting:
+    def test_lint_is_admitted_through_the_interactive_lane(self) -> None:
+        response = _build_client().post("/v1/lint", json={"content": VALID_MTHDS}, headers={"Priority": "u=1"})
+
+        assert response.status_code == 200, response.text
+        snapshot = METRICS.snapshot()
+        assert snapshot["counters"]['lane_admitted_total{lane="interactive"}'] == 1
+        assert snapshot["gauges"]['lane_in_flight{lane="interactive"}'] == 0
+        assert LANES[Lane.INTERACTIVE].in_flight == 0
+
+    def test_build_inputs_is_admitted_through_the_interactive_lane(self) -> None:
+        response = _build_client().post("/v1/build/inputs", json={"files": [{"content": VALID_MTHDS}], "pipe_ref": "echo"})
+
+        assert response.status_code == 200, response.text
+        assert METRICS.counter_value("lane_admitted_total", lane="interactive") == 1
+        assert LANES[Lane.INTERACTIVE].in_flight == 0
@@ -0,0 +1,143 @@
+"""The JSON error-log sink (`api.log_sink`) — field map, tracebacks, bounded queue, format resolution."""
+
+import io
+import json
+import threading
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+from typing_extensions import override
+
+from api.exception_handlers import emit_error_log
+from api.log_sink import (
+    ERROR_LOG_FORMAT_ENV_VAR,
+    ErrorLogFormat,
+    InvalidErrorLogFormatError,
+    JsonLogSink,
+    resolve_error_log_format,
+)
+from api.metrics import METRICS
+
+
+def _written(stream: io.StringIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class _StalledStream(io.StringIO):
+    """A log stream whose writes hang until `release` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    @override
+    def write(self, s: str, /) -> int:
+        self.writing.set()
+        self.release.wait(timeout=5)
+        return super().write(s)
+
+
+class TestJsonLogSink:
+    def test_a_record_is_its_field_map_as_one_json_line(self):
+        stream = io.StringIO()
+        sink = JsonLogSink(stream)
+        sink.start(max_records=16)
+        sink.emit({"event": "api_error", "status": 429, "user_id": None, "detail": 'forged\nstatus=200 event="fake"'}, level="warning")
+        sink.close()
+
+        [record] = _written(stream)
+        assert record["level"] == "warning"
+        assert record["timestamp"].endswith("+00:00")
+        assert {key: value for key, value in record.items() if key not in {"level", "timestamp"}} == {
+            "event": "api_error",
+            "status": 429,
+            "detail": 'forged\nstatus=200 event="fake"',
+        }
+        assert "exception" not in record
+
+    def test_an_error_record_carries_the_traceback_being_handled(self):
+        stream = io.StringIO()
+        sink = JsonLogSink(stream)
+        sink.start(max_records=16)
+        try:
+            msg = "provider unavailable"
+            raise RuntimeError(msg)
+        except RuntimeError:
+            sink.emit({"event": "api_error", "status": 500}, level="error")
+        sink.close()
+
+        [record] = _written(stream)
+        assert record["level"] == "error"
+        assert "RuntimeError: provider unavailable" in record["exception"]
+
+    def test_a_full_queue_drops_and_counts(self):
+        stream = _StalledStream()
+        sink = JsonLogSink(stream)
+        dropped = METRICS.counter_value("error_log_records_total", outcome="dropped", level="warning")
+        written = METRICS.counter_value("error_log_records_total", outcome="written", level="warning")
+        sink.start(max_records=2)
+        sink.emit({"event": "first"}, level="warning")
+        assert stream.writing.wait(timeout=5)
+
+        # The writer is stuck on the stream: two records fit in the queue, the other three are dropped.
+        for index in range(5):
+            sink.emit({"event": "storm", "index": index}, level="warning")
+        stream.release.set()
+        sink.close()
+
+        assert [record["event"] for record in _written(stream)] == ["first", "storm", "storm"]
+        assert METRICS.counter_value("error_log_records_total", outcome="dropped", level="warning") == dropped + 3
+        assert METRICS.counter_value("error_log_records_total", outcome="written", level="warning") == written + 3
+
+    def test_an_unencodable_record_is_dropped_alone_and_the_writer_keeps_running(self):
+        stream = io.StringIO()
+        sink = JsonLogSink(stream)
+        dropped = METRICS.counter_value("error_log_records_total", outcome="dropped", level="warning")
+        sink.start(max_records=16)
+        sink.emit({"event": "before"}, level="warning")
+        # `json.dumps` refuses a non-string key with a TypeError, which `default=str` does not cover.
+        sink.emit({"event": "bad", "by_pipe": {("pipe", 1): 2}}, level="warning")
+        sink.emit({"event": "after"}, level="warning")
+        sink.close()
+
+        assert [record["event"] for record in _written(stream)] == ["before", "after"]
+        assert METRICS.counter_value("error_log_records_total", outcome="dropped", level="warning") == dropped + 1
+
+    def test_a_stopped_sink_drops_instead_of_blocking(self):
+        sink = JsonLogSink(io.StringIO())
+        dropped = METRICS.counter_value("error_log_records_total", outcome="dropped", level="error")
+
+        sink.emit({"event": "api_error"}, level="error")
+
+        assert not sink.is_running
+        assert METRICS.counter_value("error_log_records_total", outcome="dropped", level="error") == dropped + 1
+
+    def test_emit_error_log_routes_to_a_running_sink(self, mocker: MockerFixture):
+        stream = io.StringIO()
+        sink = JsonLogSink(stream)
+        sink.start(max_records=16)
+        mocker.patch("api.exception_handlers.ERROR_LOG_SINK", sink)
+        warning = mocker.patch("api.exception_handlers.log.warning")
+
+        emit_error_log(fields={"event": "run_cancelled", "reason": "deadline"}, as_error=False)
+        sink.close()
+
+        warning.assert_not_called()
+        assert _written(stream)[0]["reason"] == "deadline"
+
+
+class TestResolveErrorLogFormat:
+    @pytest.mark.parametrize(("raw", "expected"), [(None, ErrorLogFormat.LOGFMT), ("  ", ErrorLogFormat.LOGFMT), (" JSON ", ErrorLogFormat.JSON)])
+    def test_recognized_values(self, monkeypatch: pytest.MonkeyPatch, raw: str | None, expected: ErrorLogFormat):
+        if raw is None:
+            monkeypatch.delenv(ERROR_LOG_FORMAT_ENV_VAR, raising=False)
+        else:
+            monkeypatch.setenv(ERROR_LOG_FORMAT_ENV_VAR, raw)
+        assert resolve_error_log_format() is expected
+
+    def test_an_unknown_value_fails(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv(ERROR_LOG_FORMAT_ENV_VAR, "xml")
+        with pytest.raises(InvalidErrorLogFormatError, match="xml"):
+            resolve_error_log_format()
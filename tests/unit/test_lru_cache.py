@@ -0,0 +1,139 @@
+"""`api.lru_cache`: `ByteBudgetLRU`'s byte-budgeted eviction and metrics, `SingleFlight` and `SingleFlightCache`."""
+
+import asyncio
+
+import pytest
+
+from api.lru_cache import ByteBudgetLRU, FlightOutcome, SingleFlight, SingleFlightCache
+from api.metrics import METRICS
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics_fixture() -> None:
+    METRICS.reset()
+
+
+class TestByteBudgetLRU:
+    def test_evicts_least_recently_used_once_over_budget(self):
+        cache: ByteBudgetLRU[str, str] = ByteBudgetLRU("test", max_bytes=10)
+        cache.put("a", "A", size=4)
+        cache.put("b", "B", size=4)
+        assert cache.get("a") == "A"  # `a` is now the most recently used
+
+        cache.put("c", "C", size=4)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        assert cache.total_bytes == 8
+        assert METRICS.counter_value("cache_evictions_total", cache="test") == 1
+
+    def test_replacing_a_key_reaccounts_its_size(self):
+        cache: ByteBudgetLRU[str, str] = ByteBudgetLRU("test", max_bytes=10)
+        cache.put("a", "short", size=2)
+        cache.put("a", "longer", size=6)
+
+        assert len(cache) == 1
+        assert cache.total_bytes == 6
+
+    def test_value_larger_than_the_budget_is_not_stored(self):
+        cache: ByteBudgetLRU[str, str] = ByteBudgetLRU("test", max_bytes=10)
+        cache.put("a", "A", size=4)
+        cache.put("huge", "H", size=11)
+
+        assert cache.get("huge") is None
+        assert cache.get("a") == "A"
+
+    def test_hits_misses_and_levels_are_reported(self):
+        cache: ByteBudgetLRU[str, str] = ByteBudgetLRU("test", max_bytes=10)
+        cache.get("a")
+        cache.put("a", "A", size=3)
+        cache.get("a")
+
+        snapshot = METRICS.snapshot()
+        assert snapshot["counters"]['cache_hits_total{cache="test"}'] == 1
+        assert snapshot["counters"]['cache_misses_total{cache="test"}'] == 1
+        assert snapshot["gauges"]['cache_bytes{cache="test"}'] == 3
+        assert snapshot["gauges"]['cache_entries{cache="test"}'] == 1
+
+
+class _Counted:
+    """A counted computation, yielding to the loop for `delay_seconds`; raises on the calls in `failing`."""
+
+    def __init__(self, *, delay_seconds: float = 0.05, failing: tuple[int, ...] = ()) -> None:
+        self.calls = 0
+        self.delay_seconds = delay_seconds
+        self.failing = failing
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay_seconds)
+        if call in self.failing:
+            msg = f"computation {call} failed"
+            raise RuntimeError(msg)
+        return f"value-{call}"
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_computation(self):
+        flights: SingleFlight[str, str] = SingleFlight()
+        compute = _Counted()
+
+        async def call_concurrently() -> list[tuple[str, FlightOutcome]]:
+            return await asyncio.gather(*(flights.run("k", compute) for _ in range(3)))
+
+        assert asyncio.run(call_concurrently()) == [("value-1", "computed"), ("value-1", "coalesced"), ("value-1", "coalesced")]
+        assert compute.calls == 1
+
+    def test_waiters_compute_again_after_a_failure_or_an_unshared_value(self):
+        flights: SingleFlight[str, str] = SingleFlight()
+        compute = _Counted(failing=(1,))
+
+        async def call_concurrently() -> list[object]:
+            calls = [flights.run("k", compute, share=lambda value: value != "value-2") for _ in range(3)]
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        first, second, third = asyncio.run(call_concurrently())
+        assert isinstance(first, RuntimeError)
+        assert second == ("value-2", "computed")
+        assert third == ("value-3", "computed")
+
+    def test_a_cancelled_waiter_does_not_cancel_the_computation(self):
+        flights: SingleFlight[str, str] = SingleFlight()
+        compute = _Counted()
+
+        async def abandon_one() -> tuple[str, FlightOutcome]:
+            leader = asyncio.create_task(flights.run("k", compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(flights.run("k", compute))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await leader
+
+        assert asyncio.run(abandon_one()) == ("value-1", "computed")
+
+
+class TestSingleFlightCache:
+    def test_a_shared_value_is_kept_for_its_ttl(self):
+        cache: SingleFlightCache[str, str] = SingleFlightCache("test", ttl_seconds=60, max_bytes=1024)
+        compute = _Counted(delay_seconds=0.0)
+
+        async def call_twice() -> list[tuple[str, FlightOutcome]]:
+            return [await cache.run("k", compute, size=len) for _ in range(2)]
+
+        assert asyncio.run(call_twice()) == [("value-1", "computed"), ("value-1", "cached")]
+        assert cache.cached("k") == "value-1"
+
+    def test_an_expired_or_unsized_value_is_computed_again(self):
+        expiring: SingleFlightCache[str, str] = SingleFlightCache("test", ttl_seconds=0, max_bytes=1024)
+        unsized: SingleFlightCache[str, str] = SingleFlightCache("test", ttl_seconds=60, max_bytes=1024)
+        compute = _Counted(delay_seconds=0.0)
+
+        async def call_each_twice() -> list[str]:
+            return [
+                *[(await expiring.run("k", compute, size=len))[0] for _ in range(2)],
+                *[(await unsized.run("k", compute, size=lambda _value: None))[0] for _ in range(2)],
+            ]
+
+        assert asyncio.run(call_each_twice()) == ["value-1", "value-2", "value-3", "value-4"]
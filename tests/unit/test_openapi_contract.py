@@ -54,11 +54,12 @@ MTHDS_PROTOCOL_OPERATIONS = {
 
 # The extra statuses each route can produce on top of COMMON_STATUSES.
 ROUTE_EXTRA_STATUSES = {
-    ("/v1/execute", "post"): (403, 429),
+    ("/v1/execute", "post"): (403, 429, 504),
     ("/v1/start", "post"): (400, 403, 409, 501),
     ("/v1/validate", "post"): (403,),
     ("/v1/resolve", "post"): (501,),
     ("/v1/codegen", "post"): (501,),
+    ("/v1/build/all", "post"): (501,),
 }
 
 
@@ -141,6 +142,17 @@ class TestOpenApiErrorContract:
         for path in ("/v1/resolve", "/v1/codegen"):
             assert "x-mthds-protocol" not in openapi_schema["paths"][path]["post"]
 
+    @pytest.mark.parametrize(("path", "model_title"), [("/v1/execute", "PipelexApiExecuteRequest"), ("/v1/start", "PipelexApiStartRequest")])
+    def test_raw_request_routes_document_their_body(self, openapi_schema: dict[str, Any], path: str, model_title: str):
+        """These routes parse their raw `Request`, so their body is added when the document is built
+        (`raw_request_body_extra`) — it must still be published, required, next to the route's own extras.
+        """
+        operation = openapi_schema["paths"][path]["post"]
+        assert operation["requestBody"]["required"] is True
+        assert operation["requestBody"]["content"]["application/json"]["schema"]["title"] == model_title
+        assert operation["x-mthds-protocol"] is True
+        assert "Idempotency-Key" in {parameter["name"] for parameter in operation["parameters"]}
+
     def test_auth_challenge_and_retry_hint_headers_are_documented(self, openapi_schema: dict[str, Any]):
         """A 401 carries `WWW-Authenticate: Bearer`; the provider-429 passthrough carries `Retry-After`."""
         unauthenticated = openapi_schema["paths"]["/v1/validate"]["post"]["responses"]["401"]
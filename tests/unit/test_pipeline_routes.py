@@ -4,8 +4,10 @@ The actual pipeline runner is mocked: we only assert that the API layer
 parses, validates, dispatches, and shapes responses correctly.
 """
 
-from typing import Any, cast
+import uuid
+from typing import Any, ClassVar, cast
 
+import httpcore
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -15,6 +17,7 @@ from pipelex.cogt.usage.cost_category import CostCategory
 from pipelex.cogt.usage.token_category import TokenCategory
 from pipelex.pipeline.pipeline_response import PipelexRunResultStart, RunState
 from pipelex.system.job_metadata import JobMetadata, RunMetadata
+from pipelex.tools.network.exceptions import SsrfBlockedError
 from pytest_mock import MockerFixture
 
 import api.routes.pipelex.pipeline as pipeline_module
@@ -53,6 +56,9 @@ def _build_client(mocker: MockerFixture, *, with_request_id_middleware: bool = F
         workflow_id="wf-1",
     )
 
+    # Callback hosts resolve to a public address without touching DNS.
+    mocker.patch("api.routes.pipelex.pipeline.CALLBACK_HOST_RESOLVER.resolve", return_value=["93.184.215.14"])
+
     fake_runner = mocker.MagicMock()
     fake_runner.execute = mocker.AsyncMock(return_value=fake_execute_response)
     fake_runner.start = mocker.AsyncMock(return_value=fake_start_response)
@@ -377,6 +383,38 @@ class TestPipelineRoutes:
         assert response.json()["error_type"] == "InvalidCallbackUrls"
         start_mock.assert_not_awaited()
 
+    def test_start_rejects_a_callback_host_that_resolves_to_a_private_address(self, mocker: MockerFixture):
+        # The host passes the literal check; what it resolves to does not.
+        client, _, start_mock = _build_client(mocker)
+        mocker.patch("api.routes.pipelex.pipeline.CALLBACK_HOST_RESOLVER.resolve", side_effect=SsrfBlockedError("resolved to 10.0.0.5"))
+        response = client.post(
+            "/v1/start",
+            json={"pipe_code": "echo", "callback_urls": ["https://rebind.example.com/cb"]},
+        )
+        assert response.status_code == 422
+        problem = response.json()
+        assert problem["error_type"] == "InvalidCallbackUrls"
+        assert "resolves to a private/loopback/metadata address" in problem["detail"]
+        start_mock.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        "resolution_error",
+        [httpcore.ConnectError("Could not resolve host"), httpcore.ConnectTimeout("Timed out resolving host")],
+    )
+    def test_start_is_unavailable_when_a_callback_host_lookup_fails(self, mocker: MockerFixture, resolution_error: Exception):
+        client, _, start_mock = _build_client(mocker)
+        mocker.patch("api.routes.pipelex.pipeline.CALLBACK_HOST_RESOLVER.resolve", side_effect=resolution_error)
+        response = client.post(
+            "/v1/start",
+            json={"pipe_code": "echo", "callback_urls": ["https://flaky-dns.example.com/cb"]},
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        problem = response.json()
+        assert problem["error_type"] == "CallbackHostUnresolved"
+        assert "could not be resolved" in problem["detail"]
+        start_mock.assert_not_awaited()
+
     def test_start_rejects_too_many_callbacks(self, mocker: MockerFixture):
         client, _, start_mock = _build_client(mocker)
         response = client.post(
@@ -398,6 +436,54 @@ class TestPipelineRoutes:
         start_mock.assert_not_awaited()
 
 
+class TestIdempotencyKey:
+    """`Idempotency-Key` on `/execute` and `/start`: a retried request replays the first response."""
+
+    _BODY: ClassVar[dict[str, Any]] = {"pipe_code": "echo", "mthds_contents": [VALID_MTHDS], "inputs": {"text": "hello"}}
+
+    @pytest.mark.parametrize(("path", "status_code"), [("/v1/execute", 200), ("/v1/start", 202)])
+    def test_a_retry_replays_the_first_response(self, mocker: MockerFixture, path: str, status_code: int):
+        client, execute_mock, start_mock = _build_client(mocker)
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        first = client.post(path, json=self._BODY, headers=headers)
+        retry = client.post(path, json=self._BODY, headers=headers)
+
+        assert first.status_code == retry.status_code == status_code
+        assert retry.content == first.content
+        assert "Idempotent-Replayed" not in first.headers
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert (execute_mock if path == "/v1/execute" else start_mock).await_count == 1
+
+    def test_requests_without_a_key_all_run(self, mocker: MockerFixture):
+        client, execute_mock, _ = _build_client(mocker)
+
+        for _ in range(2):
+            assert client.post("/v1/execute", json=self._BODY).status_code == 200
+
+        assert execute_mock.await_count == 2
+
+    def test_a_key_reused_with_another_body_is_refused(self, mocker: MockerFixture):
+        client, execute_mock, _ = _build_client(mocker)
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        client.post("/v1/execute", json=self._BODY, headers=headers)
+
+        response = client.post("/v1/execute", json={**self._BODY, "inputs": {"text": "other"}}, headers=headers)
+
+        assert response.status_code == 422
+        assert response.json()["error_type"] == "IdempotencyKeyMismatch"
+        assert execute_mock.await_count == 1
+
+    def test_a_failed_run_is_not_replayed(self, mocker: MockerFixture):
+        client, execute_mock, _ = _build_client(mocker)
+        execute_mock.side_effect = [PipelexConfigError("boom"), execute_mock.return_value]
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        assert client.post("/v1/execute", json=self._BODY, headers=headers).status_code == 500
+        assert client.post("/v1/execute", json=self._BODY, headers=headers).status_code == 200
+        assert execute_mock.await_count == 2
+
+
 class TestStorageScopeReachesTheRun:
     """`storage_scope` must survive the wire -> extras -> runner hop.
 
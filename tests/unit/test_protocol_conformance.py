@@ -39,6 +39,7 @@ from pipelex.pipeline.pipeline_response import RunState
 from pipelex.runtime_bridge.payloads import PipelexPipeDispatchAck
 from typing_extensions import override
 
+from api.completion_signature import CompletionSigner
 from api.exception_handlers import register_exception_handlers
 from api.routes import router as api_router
 from api.routes.version import router as version_router
@@ -160,8 +161,9 @@ class TestProtocolConformance:
         (storage skipped — no pipe output), so headers and payload bytes come
         from the production delivery code path. The SSRF guards are relaxed for
         the loopback receiver: the request-time host check in
-        `api.schemas.models` and the connect-time guarded transport in
-        `pipelex.pipe_run.delivery_executor` both block loopback by design.
+        `api.schemas.models`, the host resolution in `api.callback_hosts` and
+        the connect-time guarded transport in
+        `pipelex.pipe_run.delivery_executor` all block loopback by design.
         """
         # --- local HTTP receiver -------------------------------------------------
         _CallbackReceiver.captured = []
@@ -172,6 +174,7 @@ class TestProtocolConformance:
 
         # --- relax both SSRF layers for the loopback receiver (test-only) --------
         mocker.patch("api.schemas.models._is_disallowed_host", return_value=False)
+        mocker.patch("api.routes.pipelex.pipeline.CALLBACK_HOST_RESOLVER.resolve", return_value=["127.0.0.1"])
         mocker.patch("pipelex.pipe_run.delivery_executor.SsrfGuardedTransport", httpx.AsyncHTTPTransport)
 
         # The signing secret is pinned HERE rather than relying on the ambient
@@ -181,6 +184,10 @@ class TestProtocolConformance:
         # existing empty value.
         test_secret = "conformance-shared-callback-secret"
         mocker.patch.dict(os.environ, {"COMPLETION_CALLBACK_SECRET": test_secret})
+        # The secret is read once per process, so this test's signer reads it afresh.
+        signer = CompletionSigner()
+        signer.load()
+        mocker.patch("api.routes.pipelex.pipeline.COMPLETION_SIGNER", signer)
 
         # --- fake orchestrator: deliver the completion in-process -----------------
         # The runner now dispatches the locally-built PipeJob through the hub's
@@ -250,9 +257,8 @@ class TestProtocolConformance:
         assert len(_CallbackReceiver.captured) == 1
         delivery = _CallbackReceiver.captured[0]
 
-        # Signature: HMAC-SHA256(secret, pipeline_run_id) hex digest — the signing scheme
-        # `_completion_signature` implements with the shared
-        # COMPLETION_CALLBACK_SECRET.
+        # Signature (`api.completion_signature`): HMAC-SHA256(COMPLETION_CALLBACK_SECRET, pipeline_run_id),
+        # computed at `/start` and carried unchanged by the delivery.
         expected_signature = hmac.new(test_secret.encode("utf-8"), client_pipeline_run_id.encode("utf-8"), hashlib.sha256).hexdigest()
         assert delivery["headers"].get("X-Completion-Signature") == expected_signature
 
@@ -6,6 +6,9 @@ crate on the valid arm; request-shape errors are 422 problem+json; `method_ref`
 until the method registry exists.
 """
 
+import asyncio
+
+import httpx
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from mthds.package.manifest.schema import MTHDS_STANDARD_VERSION
@@ -13,6 +16,7 @@ from pipelex.interpreter_hub import get_library_manager
 from pytest_mock import MockerFixture
 
 from api.exception_handlers import register_exception_handlers
+from api.metrics import METRICS
 from api.routes import router as api_router
 from tests.unit._constants import INVALID_MAIN_PIPE_MTHDS, VALID_MTHDS
 
@@ -109,3 +113,20 @@ class TestResolveRoute:
         assert response.status_code == 200, response.text
         assert open_spy.call_count >= 1
         assert open_spy.call_count == teardown_spy.call_count
+
+    def test_identical_requests_share_one_resolution(self, mocker: MockerFixture):
+        open_spy = mocker.spy(get_library_manager(), "open_library")
+        shared = METRICS.counter_value("request_coalescing_total", route="resolve", outcome="shared")
+        transport = httpx.ASGITransport(app=_build_client().app)
+
+        async def post_concurrently() -> list[httpx.Response]:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(client.post("/v1/resolve", json={"files": [{"content": VALID_MTHDS}]}) for _ in range(2)))
+
+        responses = asyncio.run(post_concurrently())
+
+        assert [response.status_code for response in responses] == [200, 200]
+        assert responses[0].json() == responses[1].json()
+        # The second request is answered from the first one's verdict: the library is loaded once.
+        assert open_spy.call_count == 1
+        assert METRICS.counter_value("request_coalescing_total", route="resolve", outcome="shared") == shared + 1
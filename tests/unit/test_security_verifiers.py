@@ -9,7 +9,7 @@ from fastapi.testclient import TestClient
 from pytest_mock import MockerFixture
 
 from api.exception_handlers import register_exception_handlers
-from api.security import SINGLE_TENANT_USER_ID, RequestUser, get_request_user, verify_api_key, verify_jwt
+from api.security import SINGLE_TENANT_USER_ID, AuthMode, AuthSettings, RequestUser, get_request_user, verify_api_key, verify_jwt
 from tests.unit._constants import RoutePath
 
 JWT_SECRET = "test-jwt-secret-do-not-use-in-prod"
@@ -49,7 +49,7 @@ def _build_api_key_client() -> TestClient:
 class TestSecurityVerifiers:
     def test_jwt_happy_path_user_id_claim(self, mocker: MockerFixture):
         """Preferred claim: explicit `user_id` containing a UUID."""
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         token = jwt.encode({"user_id": USER_ID_UUID}, JWT_SECRET, algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -65,7 +65,7 @@ class TestSecurityVerifiers:
         `/resolve-storage-url` would later refuse to resolve. Deployments
         using OAuth must mint their own `user_id` claim.
         """
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         token = jwt.encode({"sub": "google#abc"}, JWT_SECRET, algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -75,7 +75,7 @@ class TestSecurityVerifiers:
 
     def test_jwt_missing_user_id_claim_rejected(self, mocker: MockerFixture):
         """No `user_id` claim means no caller identifier — reject."""
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         token = jwt.encode({"iat": 0}, JWT_SECRET, algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -106,7 +106,7 @@ class TestSecurityVerifiers:
         boundary. (Identity/shape is otherwise the issuer's concern; the runner
         treats `user_id` as opaque.)
         """
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         token = jwt.encode({"user_id": unsafe_user_id}, JWT_SECRET, algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -125,7 +125,7 @@ class TestSecurityVerifiers:
     )
     def test_jwt_opaque_user_id_accepted(self, mocker: MockerFixture, opaque_user_id: str):
         """An opaque, path-safe `user_id` claim is accepted as-is (no shape check)."""
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         token = jwt.encode({"user_id": opaque_user_id}, JWT_SECRET, algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -144,7 +144,7 @@ class TestSecurityVerifiers:
         (This case previously guarded the `anonymous` sentinel, which no longer
         exists: identity is required wherever a deployment claims to have one.)
         """
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         token = jwt.encode({"user_id": SINGLE_TENANT_USER_ID}, JWT_SECRET, algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -154,7 +154,7 @@ class TestSecurityVerifiers:
         assert response.json()["error_type"] == "InvalidToken"
 
     def test_jwt_invalid_token_rejected(self, mocker: MockerFixture):
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": "Bearer not.a.real.token"})
         assert response.status_code == 401
@@ -163,7 +163,7 @@ class TestSecurityVerifiers:
         assert response.json()["error_type"] == "InvalidToken"
 
     def test_jwt_wrong_secret_rejected(self, mocker: MockerFixture):
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         token = jwt.encode({"user_id": USER_ID_UUID}, "different-secret", algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -173,7 +173,7 @@ class TestSecurityVerifiers:
         assert response.json()["error_type"] == "InvalidToken"
 
     def test_jwt_missing_secret_returns_500(self, mocker: MockerFixture):
-        mocker.patch("api.security.get_optional_env", return_value=None)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings())
         client = _build_jwt_client()
         token = jwt.encode({"user_id": USER_ID_UUID}, "anything", algorithm="HS256")
         response = client.get(RoutePath.WHOAMI, headers={"Authorization": f"Bearer {token}"})
@@ -182,14 +182,14 @@ class TestSecurityVerifiers:
         assert response.json()["error_type"] == "ServerMisconfigured"
 
     def test_api_key_happy_path(self, mocker: MockerFixture):
-        mocker.patch("api.security.get_optional_env", return_value=API_KEY)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.API_KEY, api_key=API_KEY))
         client = _build_api_key_client()
         response = client.get(RoutePath.PING, headers={"Authorization": f"Bearer {API_KEY}"})
         assert response.status_code == 200
         assert response.json() == {"ok": "yes"}
 
     def test_api_key_wrong_key_rejected(self, mocker: MockerFixture):
-        mocker.patch("api.security.get_optional_env", return_value=API_KEY)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.API_KEY, api_key=API_KEY))
         client = _build_api_key_client()
         response = client.get(RoutePath.PING, headers={"Authorization": "Bearer wrong-key"})
         assert response.status_code == 401
@@ -198,7 +198,7 @@ class TestSecurityVerifiers:
         assert response.json()["error_type"] == "InvalidToken"
 
     def test_api_key_missing_env_returns_500(self, mocker: MockerFixture):
-        mocker.patch("api.security.get_optional_env", return_value=None)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings())
         client = _build_api_key_client()
         response = client.get(RoutePath.PING, headers={"Authorization": "Bearer anything"})
         assert response.status_code == 500
@@ -223,7 +223,7 @@ class TestSecurityVerifiers:
         `verify_api_key` sees `credentials is None` and calls
         `raise_unauthenticated(...)` — same problem document as every other 401.
         """
-        mocker.patch("api.security.get_optional_env", return_value=API_KEY)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.API_KEY, api_key=API_KEY))
         client = _build_api_key_client()
         headers: dict[str, str] = {} if authorization is None else {"Authorization": authorization}
         response = client.get(RoutePath.PING, headers=headers)
@@ -243,7 +243,7 @@ class TestSecurityVerifiers:
     )
     def test_jwt_missing_or_malformed_header_rejected(self, mocker: MockerFixture, authorization: str | None):
         """JWT counterpart of the API-key case: same RFC 7807 401 shape."""
-        mocker.patch("api.security.get_optional_env", return_value=JWT_SECRET)
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.JWT, jwt_secret=JWT_SECRET))
         client = _build_jwt_client()
         headers: dict[str, str] = {} if authorization is None else {"Authorization": authorization}
         response = client.get(RoutePath.WHOAMI, headers=headers)
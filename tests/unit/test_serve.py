@@ -0,0 +1,97 @@
+"""Pre-fork serving (`api.serve.PreforkSupervisor`) — worker recycling, startup failure, graceful stop.
+
+Each test runs the supervisor in its own interpreter: it forks, and a pytest process must not. The
+served app is a stub that answers with its worker's pid, so the supervisor is tested without
+booting Pipelex (the rehearsal in `api.serve.main` is the app's own `lifespan`).
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+_SERVER_SCRIPT = """
+import os, sys
+
+import uvicorn
+
+from api.serve import PreforkSupervisor
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                failed = os.environ.get("FAIL_STARTUP") == "1"
+                await send({"type": "lifespan.startup.failed" if failed else "lifespan.startup.complete"})
+            else:
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+config = uvicorn.Config(app, port=int(sys.argv[1]), lifespan="on", limit_max_requests=1, log_level="warning")
+sys.exit(PreforkSupervisor(config, workers=2).run())
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port: int = probe.getsockname()[1]
+        return port
+
+
+def _start_server(port: int, *, fail_startup: bool = False) -> subprocess.Popen[str]:
+    env = {"FAIL_STARTUP": "1"} if fail_startup else {}
+    return subprocess.Popen(  # noqa: S603
+        [sys.executable, "-c", _SERVER_SCRIPT, str(port)],
+        env={**os.environ, **env},
+        text=True,
+    )
+
+
+def _get_worker_pid(port: int) -> int:
+    deadline = time.monotonic() + 20
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=10) as response:
+                return int(response.read())
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+class TestPreforkSupervisor:
+    def test_workers_are_recycled_after_max_requests_and_stop_on_sigterm(self):
+        port = _free_port()
+        server = _start_server(port)
+        try:
+            worker_pids: list[int] = []
+            for _ in range(6):
+                worker_pids.append(_get_worker_pid(port))
+                # uvicorn checks `limit_max_requests` on its 0.1 s tick: give a spent worker time to exit.
+                time.sleep(0.3)
+
+            # `limit_max_requests=1` with two workers: more than two pids means replacements were forked.
+            assert len(set(worker_pids)) > 2
+            assert server.pid not in worker_pids
+
+            server.send_signal(signal.SIGTERM)
+            assert server.wait(timeout=20) == 0
+        finally:
+            server.kill()
+
+    def test_a_worker_startup_failure_stops_the_server(self):
+        server = _start_server(_free_port(), fail_startup=True)
+        try:
+            # uvicorn's STARTUP_FAILURE, as a single-process uvicorn would exit with.
+            assert server.wait(timeout=20) == 3
+        finally:
+            server.kill()
@@ -0,0 +1,123 @@
+import json
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from api.exception_handlers import register_exception_handlers
+from api.lanes import LANES, Lane
+from api.limits import MAX_TOOLS_BATCH_FILES
+from api.metrics import METRICS
+from api.negotiation import accepts_media_type
+from api.problem_document import PROBLEM_JSON_MEDIA_TYPE
+from api.routes import router as api_router
+from api.routes.pipelex.tools import TOOLS_CACHE, LintResponse
+from api.routes.pipelex.tools_batch import NDJSON_MEDIA_TYPE
+from tests.unit._constants import VALID_MTHDS
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(api_router, prefix="/v1")
+    register_exception_handlers(app)
+    return TestClient(app)
+
+
+_FILES = [
+    {"content": VALID_MTHDS, "source": "clean.mthds"},
+    {"content": "key = ", "source": "broken.mthds"},
+    {"content": "a=1\n"},
+]
+
+
+class TestAcceptsMediaType:
+    def test_matches_the_media_range_and_ignores_parameters(self):
+        assert accepts_media_type(f"application/json, {NDJSON_MEDIA_TYPE}; q=0.9", NDJSON_MEDIA_TYPE)
+        assert not accepts_media_type("application/json", NDJSON_MEDIA_TYPE)
+        assert not accepts_media_type(None, NDJSON_MEDIA_TYPE)
+
+
+class TestLintBatchRoute:
+    def test_results_are_per_file_and_in_input_order(self):
+        response = _build_client().post("/v1/lint/batch", json={"files": _FILES})
+
+        assert response.status_code == 200, response.text
+        results = response.json()["results"]
+        assert [result["index"] for result in results] == [0, 1, 2]
+        assert [result["source"] for result in results] == ["clean.mthds", "broken.mthds", None]
+        assert results[0]["diagnostics"] == []
+        assert results[1]["diagnostics"][0]["kind"] == "syntax"
+
+    def test_ndjson_streams_one_result_per_line_in_input_order(self):
+        response = _build_client().post("/v1/lint/batch", json={"files": _FILES}, headers={"Accept": NDJSON_MEDIA_TYPE})
+
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 1, 2]
+        assert lines[1]["diagnostics"][0]["kind"] == "syntax"
+
+    def test_a_streamed_batch_runs_its_files_inside_its_own_lane_slot(self, mocker: MockerFixture):
+        slots_held: list[int] = []
+
+        async def lint(*_args: Any, **_kwargs: Any) -> LintResponse:
+            slots_held.append(LANES[Lane.TOOLS_BATCH].in_flight)
+            return LintResponse(diagnostics=[])
+
+        mocker.patch("api.routes.pipelex.tools_batch.run_lint", new=lint)
+        admitted = METRICS.counter_value("lane_admitted_total", lane="tools_batch")
+        files = [{"content": f"a = {index}\n"} for index in range(20)]
+
+        response = _build_client().post("/v1/lint/batch", json={"files": files}, headers={"Accept": NDJSON_MEDIA_TYPE})
+
+        assert len(response.text.splitlines()) == 20
+        # Every file ran while the request still held its slot, though the path operation had returned.
+        assert slots_held == [1] * 20
+        assert LANES[Lane.TOOLS_BATCH].in_flight == 0
+        assert METRICS.counter_value("lane_admitted_total", lane="tools_batch") == admitted + 1
+
+    def test_too_many_files_returns_rfc7807_422(self):
+        files = [{"content": "a = 1\n"}] * (MAX_TOOLS_BATCH_FILES + 1)
+
+        response = _build_client().post("/v1/lint/batch", json={"files": files})
+
+        assert response.status_code == 422, response.text
+        assert response.headers["content-type"] == PROBLEM_JSON_MEDIA_TYPE
+
+    def test_empty_batch_returns_rfc7807_422(self):
+        response = _build_client().post("/v1/lint/batch", json={"files": []})
+
+        assert response.status_code == 422, response.text
+
+
+class TestFormatBatchRoute:
+    def test_every_file_is_formatted_with_the_shared_options(self):
+        response = _build_client().post("/v1/format/batch", json={"files": _FILES, "options": {"column_width": 120}})
+
+        assert response.status_code == 200, response.text
+        results = response.json()["results"]
+        assert [result["index"] for result in results] == [0, 1, 2]
+        assert results[1]["changed"] is False
+        assert results[1]["diagnostics"]
+        assert results[2]["formatted"] == "a = 1\n"
+        assert results[2]["changed"] is True
+
+    def test_checking_the_options_caches_nothing(self):
+        TOOLS_CACHE.clear()
+
+        response = _build_client().post("/v1/format/batch", json={"files": [{"content": "a=1\n"}], "options": {"column_width": 100}})
+
+        assert response.status_code == 200, response.text
+        assert len(TOOLS_CACHE) == 1
+
+    def test_malformed_options_fail_the_whole_batch_before_streaming(self):
+        response = _build_client().post(
+            "/v1/format/batch",
+            json={"files": _FILES, "options": {"column_width": "wide"}},
+            headers={"Accept": NDJSON_MEDIA_TYPE},
+        )
+
+        assert response.status_code == 422, response.text
+        assert response.headers["content-type"] == PROBLEM_JSON_MEDIA_TYPE
+        assert "column_width" in response.json()["detail"]
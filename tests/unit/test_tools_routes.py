@@ -1,11 +1,14 @@
+import pipelex_tools
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
 
 from api.exception_handlers import register_exception_handlers
 from api.limits import MAX_MTHDS_FILE_BYTES
 from api.openapi_schema import PipelexFastAPI
 from api.problem_document import PROBLEM_JSON_MEDIA_TYPE
 from api.routes import router as api_router
+from api.routes.pipelex.tools import TOOLS_CACHE
 from tests.unit._constants import VALID_MTHDS
 
 SCHEMA_INVALID_MTHDS = """\
@@ -124,3 +127,38 @@ class TestToolsRouteSchema:
         for path in ("/v1/lint", "/v1/format"):
             error_content = schema["paths"][path]["post"]["responses"]["422"]["content"]
             assert set(error_content) == {PROBLEM_JSON_MEDIA_TYPE}
+
+
+class TestToolsResultCache:
+    def test_unchanged_file_is_linted_once(self, mocker: MockerFixture):
+        TOOLS_CACHE.clear()
+        engine = mocker.spy(pipelex_tools, "lint_mthds")
+        client = _build_client()
+
+        first = client.post("/v1/lint", json={"content": "key = ", "source": "a.mthds"})
+        second = client.post("/v1/lint", json={"content": "key = ", "source": "a.mthds"})
+
+        assert first.json() == second.json()
+        assert engine.call_count == 1
+
+    def test_options_are_part_of_the_format_key(self, mocker: MockerFixture):
+        TOOLS_CACHE.clear()
+        engine = mocker.spy(pipelex_tools, "format_mthds")
+        client = _build_client()
+
+        client.post("/v1/format", json={"content": "a=1\n", "options": {"column_width": 80}})
+        client.post("/v1/format", json={"content": "a=1\n", "options": {"column_width": 80}})
+        client.post("/v1/format", json={"content": "a=1\n", "options": {"column_width": 100}})
+
+        assert engine.call_count == 2
+
+    def test_malformed_options_are_never_cached(self, mocker: MockerFixture):
+        TOOLS_CACHE.clear()
+        engine = mocker.spy(pipelex_tools, "format_mthds")
+        client = _build_client()
+
+        for _ in range(2):
+            response = client.post("/v1/format", json={"content": "a = 1\n", "options": {"column_width": "wide"}})
+            assert response.status_code == 422
+
+        assert engine.call_count == 2
@@ -0,0 +1,215 @@
+"""`WS /v1/tools/ws` — the persistent lint/format editor session.
+
+Pins the session contract: diagnostics are pushed after `open` / `change` (debounced, stale
+versions never sent), byte-offset edits apply in order, `format` answers against the current
+text, a bad message or a failed lint/format is an `error` frame rather than a disconnect, a
+binary frame closes with 1003, and the handshake is authenticated under the deployment's
+AUTH_MODE with an RFC 7807 denial.
+"""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+from starlette.testclient import WebSocketDenialResponse
+
+from api.metrics import METRICS
+from api.problem_document import PROBLEM_JSON_MEDIA_TYPE
+from api.routes.pipelex.tools import FormatResponse
+from api.routes.tools_ws import TextEdit, ToolsSession, apply_text_edits
+from api.routes.tools_ws import router as tools_ws_router
+from api.security import AuthMode, AuthSettings
+from tests.unit._constants import VALID_MTHDS
+
+_URI = "file:///bundle.mthds"
+_API_KEY = "ws-test-key"
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(tools_ws_router, prefix="/v1")
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fast_debounce_fixture(mocker: MockerFixture) -> None:
+    mocker.patch("api.routes.tools_ws.TOOLS_WS_DEBOUNCE_SECONDS", 0.01)
+    METRICS.reset()
+
+
+class TestApplyTextEdits:
+    def test_edits_apply_in_order_on_utf8_byte_offsets(self):
+        text = 'name = "café"\n'
+        edits = [
+            TextEdit(start_offset=8, end_offset=13, text="tea"),  # "café" is 5 bytes
+            TextEdit(start_offset=0, end_offset=4, text="drink"),
+        ]
+
+        assert apply_text_edits(text, edits) == 'drink = "tea"\n'
+
+    def test_edit_without_offsets_replaces_the_whole_text(self):
+        assert apply_text_edits("old", [TextEdit(text="new")]) == "new"
+
+
+class TestToolsSession:
+    def test_open_pushes_diagnostics_for_the_opened_version(self):
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_json({"type": "open", "uri": _URI, "text": "key = ", "version": 1})
+            message = websocket.receive_json()
+
+        assert message["type"] == "diagnostics"
+        assert message["uri"] == _URI
+        assert message["version"] == 1
+        assert message["diagnostics"][0]["kind"] == "syntax"
+
+    def test_change_applies_edits_and_only_the_latest_version_is_linted(self):
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_json({"type": "open", "uri": _URI, "text": "key = ", "version": 1})
+            websocket.send_json({"type": "change", "uri": _URI, "version": 2, "changes": [{"text": VALID_MTHDS}]})
+            message = websocket.receive_json()
+
+        assert message == {"type": "diagnostics", "uri": _URI, "version": 2, "diagnostics": []}
+
+    def test_format_answers_against_the_current_text(self):
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_json({"type": "open", "uri": _URI, "text": "a=1\n", "version": 1})
+            websocket.receive_json()
+            websocket.send_json({"type": "format", "id": "f1", "uri": _URI})
+            message = websocket.receive_json()
+
+        assert message["type"] == "format_result"
+        assert message["id"] == "f1"
+        assert message["version"] == 1
+        assert message["formatted"] == "a = 1\n"
+        assert message["changed"] is True
+
+    @pytest.mark.parametrize(
+        ("payload", "error_type"),
+        [
+            ("not json", "InvalidJSON"),
+            ('{"type": "teleport"}', "ValidationError"),
+            ('{"type": "format", "id": "f9", "uri": "file:///never-opened.mthds"}', "UnknownDocument"),
+        ],
+    )
+    def test_bad_message_is_an_error_frame_and_the_session_survives(self, payload: str, error_type: str):
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_text(payload)
+            error: dict[str, Any] = websocket.receive_json()
+            websocket.send_json({"type": "open", "uri": _URI, "text": VALID_MTHDS})
+            follow_up = websocket.receive_json()
+
+        assert error["type"] == "error"
+        assert error["error_type"] == error_type
+        assert follow_up["type"] == "diagnostics"
+
+    def test_stale_change_version_is_rejected(self):
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_json({"type": "open", "uri": _URI, "text": VALID_MTHDS, "version": 3})
+            websocket.receive_json()
+            websocket.send_json({"type": "change", "uri": _URI, "version": 3, "changes": [{"text": "x"}]})
+            error = websocket.receive_json()
+
+        assert error["error_type"] == "ValidationError"
+        assert "must be greater" in error["message"]
+
+    def test_cancel_of_an_unknown_format_is_a_no_op(self):
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_json({"type": "cancel", "id": "nothing-pending"})
+            websocket.send_json({"type": "open", "uri": _URI, "text": VALID_MTHDS})
+            message = websocket.receive_json()
+
+        assert message["type"] == "diagnostics"
+        assert METRICS.counter_value("tools_ws_messages_total", type="cancel") == 1
+
+    @pytest.mark.asyncio
+    async def test_a_superseded_format_leaves_the_newer_one_with_its_id_pending(self, mocker: MockerFixture):
+        async def slow_format(*_args: Any, **_kwargs: Any) -> FormatResponse:
+            await asyncio.sleep(30)
+            raise AssertionError
+
+        mocker.patch("api.routes.tools_ws.run_format", new=slow_format)
+        websocket = mocker.Mock(send_json=mocker.AsyncMock())
+        session = ToolsSession(websocket)
+        await session.dispatch(json.dumps({"type": "open", "uri": _URI, "text": VALID_MTHDS}))
+        await session.dispatch(json.dumps({"type": "format", "id": "f1", "uri": _URI}))
+        await asyncio.sleep(0)  # the first format starts, so its cancellation runs its cleanup
+        await session.dispatch(json.dumps({"type": "format", "id": "f1", "uri": _URI}))
+        await asyncio.sleep(0)
+
+        # The newer format is still pending under the reused id, so a `cancel` reaches it.
+        await session.dispatch(json.dumps({"type": "cancel", "id": "f1"}))
+        frames = [call.args[0] for call in websocket.send_json.await_args_list]
+        await session.aclose()
+
+        assert frames == [{"type": "cancelled", "id": "f1"}, {"type": "cancelled", "id": "f1"}]
+
+    @pytest.mark.asyncio
+    async def test_reopening_a_document_cancels_its_pending_format(self, mocker: MockerFixture):
+        async def slow_format(*_args: Any, **_kwargs: Any) -> FormatResponse:
+            await asyncio.sleep(30)
+            raise AssertionError
+
+        mocker.patch("api.routes.tools_ws.run_format", new=slow_format)
+        websocket = mocker.Mock(send_json=mocker.AsyncMock())
+        session = ToolsSession(websocket)
+        await session.dispatch(json.dumps({"type": "open", "uri": _URI, "text": "a=1\n", "version": 1}))
+        await session.dispatch(json.dumps({"type": "format", "id": "f1", "uri": _URI}))
+        await asyncio.sleep(0)
+
+        # The format was of the replaced content: it is cancelled, and no result for it can follow.
+        await session.dispatch(json.dumps({"type": "open", "uri": _URI, "text": VALID_MTHDS, "version": 1}))
+        frames = [call.args[0] for call in websocket.send_json.await_args_list]
+        await session.aclose()
+
+        assert frames == [{"type": "cancelled", "id": "f1"}]
+
+    def test_a_failing_lint_is_an_error_frame_and_the_session_survives(self, mocker: MockerFixture):
+        mocker.patch("api.routes.tools_ws.run_lint", side_effect=RuntimeError("engine crashed"))
+        emit = mocker.patch("api.routes.tools_ws.emit_error_log")
+
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_json({"type": "open", "uri": _URI, "text": VALID_MTHDS})
+            error = websocket.receive_json()
+            websocket.send_json({"type": "format", "id": "f1", "uri": _URI})
+            follow_up = websocket.receive_json()
+
+        assert error == {"type": "error", "id": None, "error_type": "InternalServerError", "message": "The request failed on the server."}
+        assert emit.call_args.kwargs["fields"]["event"] == "tools_ws_task_failed"
+        assert follow_up["type"] == "format_result"
+
+    def test_a_binary_frame_closes_the_session_as_unsupported_data(self):
+        with _build_client().websocket_connect("/v1/tools/ws") as websocket:
+            websocket.send_bytes(b'{"type": "open"}')
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+
+        assert closed.value.code == 1003
+
+
+class TestToolsSessionAuth:
+    @staticmethod
+    def _api_key_env(mocker: MockerFixture) -> None:
+        mocker.patch("api.security.get_auth_settings", return_value=AuthSettings(mode=AuthMode.API_KEY, api_key=_API_KEY))
+
+    def test_missing_credential_is_denied_with_a_problem_document(self, mocker: MockerFixture):
+        self._api_key_env(mocker)
+
+        with pytest.raises(WebSocketDenialResponse) as denial, _build_client().websocket_connect("/v1/tools/ws"):
+            pass
+
+        assert denial.value.status_code == 401
+        assert denial.value.headers["content-type"] == PROBLEM_JSON_MEDIA_TYPE
+        assert denial.value.json()["error_type"] == "Unauthenticated"
+
+    def test_valid_credential_opens_the_session(self, mocker: MockerFixture):
+        self._api_key_env(mocker)
+
+        with _build_client().websocket_connect("/v1/tools/ws", headers={"Authorization": f"Bearer {_API_KEY}"}) as websocket:
+            websocket.send_json({"type": "open", "uri": _URI, "text": VALID_MTHDS})
+            message = websocket.receive_json()
+
+        assert message["type"] == "diagnostics"
@@ -0,0 +1,89 @@
+"""Boot warmup (`api.warmup`) — after it, the request path builds no schema.
+
+`api.main` is imported inside the fixture, as in `test_openapi_contract.py`, so a bad env var fails
+these tests rather than collection.
+"""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, cast
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from pydantic._internal._generate_schema import GenerateSchema
+from pydantic.fields import FieldInfo
+from pydantic.json_schema import GenerateJsonSchema
+
+from api.metrics import METRICS
+from api.warmup import _touch_field, warm_up  # pyright: ignore[reportPrivateUsage]
+
+if TYPE_CHECKING:
+    from fastapi._compat import ModelField
+    from pytest_mock import MockerFixture
+
+    from api.openapi_schema import PipelexFastAPI
+
+
+class _Parent(BaseModel):
+    # `_Child` is defined below: the schema is incomplete until a rebuild resolves it.
+    child: _Child
+
+
+class _Child(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def warmed_app() -> PipelexFastAPI:
+    from api.main import fastapi_app  # noqa: PLC0415 — see the module docstring
+
+    warm_up(fastapi_app)
+    return fastapi_app
+
+
+class TestWarmup:
+    def test_no_schema_is_constructed_on_the_request_path(self, warmed_app: PipelexFastAPI, mocker: MockerFixture):
+        # FastAPI's OpenAPI build goes through `generate_definitions`; `model_json_schema` through `generate`.
+        json_schema_spy = mocker.spy(GenerateJsonSchema, "generate")
+        definitions_spy = mocker.spy(GenerateJsonSchema, "generate_definitions")
+        core_schema_spy = mocker.spy(GenerateSchema, "generate_schema")
+        client = TestClient(warmed_app)
+
+        for _ in range(2):
+            assert client.get("/openapi.json").status_code == 200
+        assert client.post("/v1/lint", json={"content": 'domain = "x"\n'}).status_code == 200
+        assert client.get("/health").status_code == 200
+
+        assert json_schema_spy.call_count == 0
+        assert definitions_spy.call_count == 0
+        assert core_schema_spy.call_count == 0
+
+    def test_openapi_json_is_served_from_the_prebuilt_bytes(self, warmed_app: PipelexFastAPI):
+        response = TestClient(warmed_app).get("/openapi.json")
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.content is not None
+        assert response.content == warmed_app.openapi_bytes()
+        assert json.loads(response.content) == warmed_app.openapi()
+
+    def test_root_path_outside_the_servers_is_still_added_per_request(self, warmed_app: PipelexFastAPI):
+        response = TestClient(warmed_app, root_path="/gateway").get("/openapi.json")
+
+        assert response.json()["servers"][0] == {"url": "/gateway"}
+        assert "servers" not in warmed_app.openapi()
+
+    def test_a_field_without_fastapis_private_adapter_is_still_warmed(self):
+        assert not _Parent.__pydantic_complete__
+        _touch_field(cast("ModelField", SimpleNamespace(field_info=FieldInfo(annotation=_Parent))))
+
+        assert _Parent.__pydantic_complete__
+
+    def test_the_warmup_cost_is_recorded(self, warmed_app: PipelexFastAPI):
+        before = METRICS.snapshot()["summaries"].get("boot_warmup_seconds", {}).get("count", 0)
+
+        warm_up(warmed_app)
+
+        assert METRICS.snapshot()["summaries"]["boot_warmup_seconds"]["count"] == before + 1